@@ -21,10 +21,16 @@ def pretty_print_json(data: Any, indent: int = 2):
 class AASQueryClient:
     """AAS Server Query Client for retrieving registered data"""
     
-    def __init__(self, ip: str, port: int):
+    def __init__(self, ip: str, port: int, pool_maxsize: int = 10):
         self.base_url = f"http://{ip}:{port}"
         self.ip = ip
         self.port = port
+
+        # 요청 간 keep-alive 연결 재사용 (여러 스레드에서 동시 조회 시 pool_maxsize까지 유지)
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
     
     def get_all_shells(self) -> Optional[List[Dict]]:
         """
@@ -35,7 +41,7 @@ class AASQueryClient:
         """
         url = f"{self.base_url}/shells"
         try:
-            response = requests.get(url)
+            response = self.session.get(url)
             response.raise_for_status()
             shells = response.json()
             print(f"Found {len(shells)} Asset Administration Shells")
@@ -57,7 +63,7 @@ class AASQueryClient:
         encoded_id = base64url_encode(aas_id)
         url = f"{self.base_url}/shells/{encoded_id}"
         try:
-            response = requests.get(url)
+            response = self.session.get(url)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -73,7 +79,7 @@ class AASQueryClient:
         """
         url = f"{self.base_url}/submodels"
         try:
-            response = requests.get(url)
+            response = self.session.get(url)
             response.raise_for_status()
             submodels = response.json()
             print(f"Found {len(submodels)} Submodels")
@@ -95,7 +101,7 @@ class AASQueryClient:
         encoded_id = base64url_encode(submodel_id)
         url = f"{self.base_url}/submodels/{encoded_id}"
         try:
-            response = requests.get(url)
+            response = self.session.get(url)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -115,7 +121,7 @@ class AASQueryClient:
         encoded_id = base64url_encode(submodel_id)
         url = f"{self.base_url}/submodels/{encoded_id}/submodel-elements"
         try:
-            response = requests.get(url)
+            response = self.session.get(url)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -136,7 +142,7 @@ class AASQueryClient:
         encoded_id = base64url_encode(submodel_id)
         url = f"{self.base_url}/submodels/{encoded_id}/submodel-elements/{element_path}"
         try:
-            response = requests.get(url)
+            response = self.session.get(url)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -152,7 +158,7 @@ class AASQueryClient:
         """
         url = f"{self.base_url}/concept-descriptions"
         try:
-            response = requests.get(url)
+            response = self.session.get(url)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -172,7 +178,7 @@ class AASQueryClient:
         url = f"{self.base_url}/lookup/shells"
         params = {"assetIds": asset_id}
         try:
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -188,7 +194,7 @@ class AASQueryClient:
         """
         url = f"{self.base_url}/description"
         try:
-            response = requests.get(url)
+            response = self.session.get(url)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -208,7 +214,7 @@ class AASQueryClient:
         encoded_id = base64url_encode(aas_id)
         url = f"{self.base_url}/shells/{encoded_id}/submodel-refs"
         try:
-            response = requests.get(url)
+            response = self.session.get(url)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -228,7 +234,7 @@ class AASQueryClient:
         url = f"{self.base_url}/submodels"
         params = {"semanticId": semantic_id}
         try:
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -0,0 +1,146 @@
+"""
+Goal3 Execution DAG (운영 버전)
+시연용 goal3_execution DAG와 달리 실제 런타임 핸들러로 AAS 데이터를 수집하고 시뮬레이션을 실행한다.
+
+- 메니페스트의 data_sources마다 YamlBindingHandler 태스크 1개 (동적 태스크 매핑, Airflow 2.3+)
+- XCom에는 작업 디렉터리 아티팩트 참조만 전달 (QueryGoal/단계 결과는 <work_dir>/artifacts/*.json)
+- QUERYGOAL_RUNTIME_URL이 설정되면 QueryGoalRuntimeHook이 상주 API 서버에서 단계를 실행
+  (태스크 프로세스는 매번 새로 뜨므로 온톨로지/커넥션 풀이 유지되는 곳은 상주 서버뿐)
+- DAG 파일에서는 querygoal 모듈을 임포트하지 않음 (스케줄러의 DAG 파싱이 가벼움)
+
+실행 방법:
+    airflow dags trigger goal3_execution_production \\
+        --conf '{"natural_language": "Predict production time for product TEST_RUNTIME quantity 30"}'
+"""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# 프로젝트 루트 및 Hook 모듈 경로를 Python path에 추가
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "airflow" / "plugins"))
+
+from airflow.decorators import dag, task
+
+from querygoal_runtime_hook import ArtifactStore, QueryGoalRuntimeHook
+
+DEFAULT_NATURAL_LANGUAGE_INPUT = "Predict production time for product TEST_RUNTIME quantity 30"
+
+default_args = {
+    'owner': 'factory-automation',
+    'depends_on_past': False,
+    'email_on_failure': False,
+    'email_on_retry': False,
+    'retries': 1,
+}
+
+
+@dag(
+    dag_id='goal3_execution_production',
+    default_args=default_args,
+    description='Goal3 운영 DAG: 실제 런타임 핸들러 + 데이터 소스별 동적 태스크 매핑',
+    schedule_interval=None,
+    start_date=datetime(2025, 1, 1),
+    catchup=False,
+    params={'natural_language': DEFAULT_NATURAL_LANGUAGE_INPUT},
+    tags=['goal3', 'querygoal', 'factory-automation', 'production'],
+)
+def goal3_execution_production():
+
+    @task(task_id='PIPELINE_Build_QueryGoal')
+    def build_querygoal(params=None):
+        """자연어 입력 → QueryGoal 생성 후 작업 디렉터리에 저장"""
+        natural_language = (params or {}).get('natural_language', DEFAULT_NATURAL_LANGUAGE_INPUT)
+
+        hook = QueryGoalRuntimeHook()
+        querygoal = hook.build_querygoal(natural_language)
+        work_dir = hook.create_work_directory(querygoal['QueryGoal']['goalId'])
+        print(f"📦 QueryGoal {querygoal['QueryGoal']['goalId']} → {work_dir}")
+
+        return ArtifactStore(work_dir).put('querygoal', querygoal)
+
+    @task(task_id='RUNTIME1_Manifest_Selection', multiple_outputs=True)
+    def select_manifest(querygoal_ref):
+        """swrlSelection 실행 후 바인딩할 data_sources 목록 반환 (매핑 입력)"""
+        hook = QueryGoalRuntimeHook()
+        store = ArtifactStore.from_ref(querygoal_ref)
+        querygoal = store.get('querygoal')
+
+        selection_result = hook.run_stage('swrlSelection', querygoal, store.work_directory)
+        manifest_data = hook.parse_manifest(selection_result['manifestPath'])
+        data_sources = manifest_data.get('data_sources', [])
+
+        print(f"📋 Manifest: {selection_result['manifestPath']} ({len(data_sources)} data sources)")
+
+        return {
+            'selection': store.put('swrlSelection', selection_result),
+            'data_sources': data_sources
+        }
+
+    @task(task_id='RUNTIME2_AAS_Data_Binding')
+    def bind_source(source, selection_ref):
+        """데이터 소스 1개 바인딩 (매핑된 태스크마다 하나, 실패는 jsonFiles 항목의 error로 기록)"""
+        hook = QueryGoalRuntimeHook()
+        entry = hook.bind_source(source, Path(selection_ref['workDirectory']))
+
+        status = f"❌ {entry['error']}" if 'error' in entry else f"✅ {entry.get('record_count')} records"
+        print(f"📄 {source['name']}: {status}")
+
+        return {'name': source['name'], 'entry': entry}
+
+    @task(task_id='RUNTIME2_Binding_Gate')
+    def collect_binding(selection_ref, data_sources, bindings):
+        """소스별 결과를 yamlBinding 결과로 합치고 Stage-Gate 검증 (필수 소스 100% 성공)"""
+        hook = QueryGoalRuntimeHook()
+        store = ArtifactStore.from_ref(selection_ref)
+        selection_result = store.get('swrlSelection')
+
+        json_files = {binding['name']: binding['entry'] for binding in bindings}
+        binding_result = hook.summarize_binding(
+            selection_result['manifestPath'], data_sources, json_files, store.work_directory
+        )
+
+        print(f"✅ YAML Binding: {binding_result['successfulSources']}/{binding_result['totalDataSources']} sources")
+        return store.put('yamlBinding', binding_result)
+
+    @task(task_id='RUNTIME3_NSGA2_Simulation')
+    def run_simulation(binding_ref):
+        """SimulationHandler 실행 (QueryGoal outputs 갱신 후 저장)"""
+        hook = QueryGoalRuntimeHook()
+        store = ArtifactStore.from_ref(binding_ref)
+        querygoal = store.get('querygoal')
+
+        simulation_result = hook.run_stage('simulation', querygoal, store.work_directory, {
+            'swrlSelection': store.get('swrlSelection'),
+            'yamlBinding': store.get('yamlBinding')
+        })
+
+        store.put('querygoal', querygoal)
+        return store.put('simulation', simulation_result)
+
+    @task(task_id='SUMMARY_Final_Report')
+    def summarize(simulation_ref):
+        store = ArtifactStore.from_ref(simulation_ref)
+        qg = store.get('querygoal')['QueryGoal']
+        outputs = qg.get('outputs', {})
+
+        print(f"🎯 Goal {qg['goalId']} ({qg['goalType']})")
+        print(f"   - Estimated Production Time: {outputs.get('estimatedTime', 'N/A')}")
+        print(f"   - Confidence Level: {outputs.get('confidence', 'N/A')}")
+        print(f"   - Work Directory: {store.work_directory}")
+
+        return {
+            'goal_id': qg['goalId'],
+            'estimated_time': outputs.get('estimatedTime'),
+            'work_directory': str(store.work_directory)
+        }
+
+    querygoal_ref = build_querygoal()
+    selection = select_manifest(querygoal_ref)
+    bindings = bind_source.partial(selection_ref=selection['selection']).expand(source=selection['data_sources'])
+    binding_ref = collect_binding(selection['selection'], selection['data_sources'], bindings)
+    summarize(run_simulation(binding_ref))
+
+
+goal3_execution_production()
@@ -0,0 +1,227 @@
+"""
+QueryGoal Runtime Hook
+Airflow 태스크에서 런타임 핸들러(SwrlSelection / YamlBinding / Simulation)를 실행하기 위한 Hook
+
+- Airflow는 태스크마다 새 프로세스에서 실행하므로 태스크 프로세스 안의 캐시는 다음 태스크로 이어지지 않는다.
+  QUERYGOAL_RUNTIME_URL이 설정되면 상주 API 서버(api/main.py의 /runtime/* 엔드포인트)에서 단계를 실행하여
+  서버에 유지되는 QueryGoalExecutor(rdflib/온톨로지, AAS 커넥션 풀, 메니페스트 파싱 캐시)를 재사용한다.
+- 설정되지 않으면 태스크 프로세스 안에서 QueryGoalExecutor를 생성한다 (태스크마다 초기화 비용 발생).
+- 태스크 간에는 XCom으로 작업 디렉터리 아티팩트 참조만 전달한다 (ArtifactStore).
+- 원격 실행 시 작업 디렉터리는 ID(서버 작업 디렉터리 기본 경로 아래 이름)로만 전달한다.
+- querygoal 모듈은 로컬 실행 시에만 임포트한다 (DAG 파싱/원격 실행 시 rdflib 등을 로드하지 않음).
+"""
+import asyncio
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+from airflow.exceptions import AirflowException
+from airflow.hooks.base import BaseHook
+
+ARTIFACT_DIR_NAME = "artifacts"
+
+
+class ArtifactStore:
+    """
+    작업 디렉터리 기반 아티팩트 저장소
+
+    아티팩트는 <work_directory>/artifacts/<name>.json에 기록되고,
+    XCom에는 {"workDirectory": ..., "artifact": ...} 형태의 참조만 전달된다.
+    """
+
+    def __init__(self, work_directory: Path):
+        self.work_directory = Path(work_directory)
+        self.artifact_dir = self.work_directory / ARTIFACT_DIR_NAME
+        self.artifact_dir.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_ref(cls, ref: Dict[str, str]) -> "ArtifactStore":
+        return cls(Path(ref["workDirectory"]))
+
+    def put(self, name: str, data: Any) -> Dict[str, str]:
+        """아티팩트 기록 후 참조 반환 (임시 파일에 쓴 뒤 교체하여 부분 기록 방지)"""
+        path = self.artifact_dir / f"{name}.json"
+        temp_path = path.with_suffix(".json.tmp")
+        temp_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        temp_path.replace(path)
+        return {"workDirectory": str(self.work_directory), "artifact": name}
+
+    def get(self, name: str) -> Any:
+        with open(self.artifact_dir / f"{name}.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def load(ref: Dict[str, str]) -> Any:
+        """참조가 가리키는 아티팩트 로드"""
+        return ArtifactStore.from_ref(ref).get(ref["artifact"])
+
+
+class QueryGoalRuntimeHook(BaseHook):
+    """
+    런타임 단계 실행 (상주 API 서버 또는 태스크 프로세스)
+
+    Stage-Gate 기준은 QueryGoalExecutor.stage_criteria를 그대로 사용한다.
+
+    Args:
+        runtime_url: 상주 API 서버 주소 (기본: 환경변수 QUERYGOAL_RUNTIME_URL, 없으면 로컬 실행)
+        timeout: 원격 요청 timeout (초, 기본: 환경변수 QUERYGOAL_RUNTIME_TIMEOUT 또는 900)
+    """
+
+    # 로컬 실행 시 프로세스당 한 번만 생성
+    _executor = None
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _lock = threading.Lock()
+
+    def __init__(self, runtime_url: Optional[str] = None, timeout: Optional[float] = None):
+        super().__init__()
+        self.runtime_url = (runtime_url or os.environ.get("QUERYGOAL_RUNTIME_URL", "")).rstrip("/") or None
+        self.timeout = timeout or float(os.environ.get("QUERYGOAL_RUNTIME_TIMEOUT", 900))
+
+    # ---------- 원격 실행 ----------
+
+    def _post(self, path: str, payload: Dict[str, Any]) -> Any:
+        """상주 API 서버 호출 (Stage-Gate 실패는 422)"""
+        try:
+            response = requests.post(f"{self.runtime_url}{path}", json=payload, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise AirflowException(f"QueryGoal runtime service unreachable ({self.runtime_url}): {e}")
+
+        if response.status_code == 422:
+            raise AirflowException(f"Stage-Gate failed: {response.json().get('detail')}")
+        if not response.ok:
+            raise AirflowException(f"QueryGoal runtime service error {response.status_code} on {path}: {response.text}")
+        return response.json()
+
+    # ---------- 로컬 실행 ----------
+
+    @classmethod
+    def get_executor(cls):
+        """프로세스당 한 번만 생성 (같은 프로세스의 이후 호출은 생성 비용 없음)"""
+        if cls._executor is None:
+            with cls._lock:
+                if cls._executor is None:
+                    from querygoal.runtime.executor import QueryGoalExecutor
+                    # AAS 클라이언트(httpx)가 같은 루프에 묶여 있도록 루프도 함께 유지
+                    cls._loop = asyncio.new_event_loop()
+                    cls._executor = QueryGoalExecutor()
+        return cls._executor
+
+    def run(self, coroutine) -> Any:
+        """프로세스 전역 이벤트 루프에서 코루틴 실행"""
+        self.get_executor()
+        return self._loop.run_until_complete(coroutine)
+
+    def create_context(self,
+                       querygoal: Dict[str, Any],
+                       work_directory: Path,
+                       stage_results: Optional[Dict[str, Any]] = None):
+        from querygoal.runtime.executor import ExecutionContext
+
+        qg = querygoal["QueryGoal"]
+        return ExecutionContext(
+            goal_id=qg["goalId"],
+            goal_type=qg["goalType"],
+            work_directory=Path(work_directory),
+            start_time=datetime.utcnow(),
+            pipeline_stages=qg["metadata"].get("pipelineStages", []),
+            stage_results=dict(stage_results or {})
+        )
+
+    def check_gate(self, stage_name: str, stage_result: Dict[str, Any]):
+        """QueryGoalExecutor와 같은 기준으로 Stage-Gate 검증"""
+        from querygoal.runtime.exceptions import StageGateFailureError
+
+        executor = self.get_executor()
+        gate_result = executor.stage_gate_validator.validate_stage(
+            stage_name, stage_result, executor.stage_criteria
+        )
+        if not gate_result.passed:
+            raise StageGateFailureError(f"Stage-Gate failed for {stage_name}: {gate_result.reason}")
+
+    # ---------- 태스크에서 사용하는 작업 ----------
+
+    def build_querygoal(self, natural_language: str) -> Dict[str, Any]:
+        """자연어 입력 -> QueryGoal"""
+        if self.runtime_url:
+            response = requests.post(
+                f"{self.runtime_url}/querygoal/batch",
+                data=json.dumps({"input": natural_language}, ensure_ascii=False).encode("utf-8"),
+                headers={"Content-Type": "application/x-ndjson"},
+                timeout=self.timeout
+            )
+            if not response.ok:
+                raise AirflowException(f"QueryGoal generation failed ({response.status_code}): {response.text}")
+            record = json.loads(response.text.splitlines()[0])
+            if "error" in record:
+                raise AirflowException(f"QueryGoal generation failed: {record['error']}")
+            return {"QueryGoal": record["QueryGoal"]}
+
+        from querygoal.pipeline.orchestrator import PipelineOrchestrator
+        return PipelineOrchestrator().process_natural_language(natural_language)
+
+    def create_work_directory(self, goal_id: str) -> Path:
+        if self.runtime_url:
+            return Path(self._post("/runtime/work-directories", {"goalId": goal_id})["workDirectory"])
+        return self.get_executor().work_dir_manager.create_work_directory(goal_id)
+
+    def run_stage(self,
+                  stage_name: str,
+                  querygoal: Dict[str, Any],
+                  work_directory: Path,
+                  stage_results: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """런타임 단계 하나를 실행하고 Stage-Gate 검증 (querygoal의 outputs 등은 제자리에서 갱신)"""
+        if self.runtime_url:
+            response = self._post(f"/runtime/stages/{stage_name}", {
+                "querygoal": querygoal,
+                "workDirectoryId": Path(work_directory).name,
+                "stageResults": stage_results or {}
+            })
+            querygoal.clear()
+            querygoal.update(response["querygoal"])
+            return response["stageResult"]
+
+        context = self.create_context(querygoal, work_directory, stage_results)
+        stage_result, _ = self.run(self.get_executor().run_stage(stage_name, querygoal, context))
+        return stage_result
+
+    def parse_manifest(self, manifest_path: str) -> Dict[str, Any]:
+        if self.runtime_url:
+            return self._post("/runtime/manifest", {"manifestPath": manifest_path})
+        binding_handler = self.get_executor().stage_handlers["yamlBinding"]
+        return self.run(binding_handler.manifest_parser.parse_manifest(Path(manifest_path)))
+
+    def bind_source(self, source: Dict[str, Any], work_directory: Path) -> Dict[str, Any]:
+        """데이터 소스 하나를 바인딩하여 jsonFiles 항목 반환 (실패 시 {"error": ...})"""
+        if self.runtime_url:
+            return self._post("/runtime/bindings/source", {
+                "source": source,
+                "workDirectoryId": Path(work_directory).name
+            })
+        binding_handler = self.get_executor().stage_handlers["yamlBinding"]
+        json_files = self.run(binding_handler.bind_data_sources([source], Path(work_directory)))
+        return json_files[source.get("name", "unknown")]
+
+    def summarize_binding(self,
+                          manifest_path: str,
+                          data_sources: List[Dict[str, Any]],
+                          json_files: Dict[str, Dict[str, Any]],
+                          work_directory: Path) -> Dict[str, Any]:
+        """소스별 바인딩 결과를 yamlBinding 단계 결과로 합치고 Stage-Gate 검증"""
+        if self.runtime_url:
+            return self._post("/runtime/bindings/summary", {
+                "manifestPath": manifest_path,
+                "dataSources": data_sources,
+                "jsonFiles": json_files,
+                "workDirectoryId": Path(work_directory).name
+            })
+        binding_handler = self.get_executor().stage_handlers["yamlBinding"]
+        stage_result = binding_handler.create_success_result(
+            binding_handler.summarize_binding(manifest_path, data_sources, json_files, Path(work_directory))
+        )
+        stage_result["stage"] = "yamlBinding"
+        self.check_gate("yamlBinding", stage_result)
+        return stage_result
@@ -1,13 +1,28 @@
 # api/main.py
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 import sys
+from datetime import datetime
 from pathlib import Path
+from typing import Any, Dict
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
-from api.schemas import DslRequest, ApiResponse
+from api.schemas import (
+    DslRequest, ApiResponse, BulkTrackingRequest, SweepRequest,
+    RuntimeWorkDirectoryRequest, RuntimeStageRequest, RuntimeManifestRequest,
+    RuntimeSourceBindingRequest, RuntimeBindingSummaryRequest
+)
 from execution_engine.planner import ExecutionPlanner
 from execution_engine.agent import ExecutionAgent
+from querygoal.runtime.warmup import get_warmup_service
+from querygoal.runtime.anytime import get_anytime_registry
+from querygoal.runtime.executor import ExecutionContext, QueryGoalExecutor
+from querygoal.runtime.exceptions import RuntimeExecutionError, StageGateFailureError, WorkDirectoryError
+from querygoal.runtime.sweep import ParameterSweep
+from querygoal.pipeline.orchestrator import PipelineOrchestrator
+from querygoal.pipeline.structure import to_json
+from config import AAS_WARMUP_ENABLED, TRACKING_BULK_MAX_WORKERS
 import requests
 
 app = FastAPI(
@@ -25,6 +40,205 @@ except Exception as e:
     planner = None
     agent = None
 
+# 자연어 -> QueryGoal 파이프라인 (템플릿/온톨로지/모델 레지스트리/패턴을 요청 간 공유, 첫 요청 시 초기화)
+pipeline_orchestrator = None
+
+def get_pipeline_orchestrator() -> PipelineOrchestrator:
+    global pipeline_orchestrator
+    if pipeline_orchestrator is None:
+        pipeline_orchestrator = PipelineOrchestrator()
+    return pipeline_orchestrator
+
+# QueryGoal 런타임 (Stage 핸들러를 요청 간 공유, 첫 요청 시 초기화)
+querygoal_executor = None
+
+def get_querygoal_executor() -> QueryGoalExecutor:
+    global querygoal_executor
+    if querygoal_executor is None:
+        querygoal_executor = QueryGoalExecutor()
+    return querygoal_executor
+
+@app.on_event("startup")
+async def start_warmup():
+    # 메니페스트/Submodel warm cache를 백그라운드에서 채움 (/ready가 완료 여부를 보고)
+    if AAS_WARMUP_ENABLED:
+        get_warmup_service().start()
+
+@app.on_event("shutdown")
+async def stop_warmup():
+    await get_warmup_service().stop()
+
+@app.get("/ready")
+def ready():
+    warmup_status = get_warmup_service().readiness() if AAS_WARMUP_ENABLED else {"ready": True, "status": "disabled"}
+    is_ready = bool(planner and agent) and warmup_status["ready"]
+
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={
+            "ready": is_ready,
+            "plannerReady": planner is not None,
+            "agentReady": agent is not None,
+            "warmup": warmup_status
+        }
+    )
+
+@app.get("/inference/metrics")
+def inference_metrics():
+    """ai_model_inference 런타임의 모델별 배치/지연/처리량 지표"""
+    if not agent:
+        raise HTTPException(status_code=503, detail="Server is not ready. Check initialization logs.")
+    runtime = agent.handlers["ai_model_inference"].inference_runtime
+    return {"servableModels": runtime.servable_models(), "models": runtime.metrics()}
+
+@app.get("/querygoal/metrics")
+def querygoal_metrics():
+    """QueryGoal 런타임 지표 (speculative pre-binding 적중률)"""
+    prebinder = get_querygoal_executor().prebinder
+    return {"speculativeBinding": {"enabled": True, **prebinder.metrics()} if prebinder is not None else {"enabled": False}}
+
+@app.get("/simulations/{run_id}")
+def simulation_status(run_id: str):
+    """deadlineMs로 먼저 응답한 Goal3 시뮬레이션의 현재 best-so-far 또는 최종 결과"""
+    run = get_anytime_registry().get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Simulation run not found: {run_id}")
+    return run.to_dict()
+
+@app.post("/querygoal/sweep")
+async def querygoal_sweep(request: SweepRequest):
+    """
+    Goal3 what-if 비교
+
+    기준 QueryGoal의 데이터 바인딩은 한 번만 수행하고, grid의 변형 시나리오들을
+    컨테이너 배치로 실행해 하나의 비교표(rows)로 반환한다.
+    """
+    querygoal = request.querygoal.dict()
+    if "simulation" not in querygoal["QueryGoal"]["metadata"]["pipelineStages"]:
+        raise HTTPException(status_code=400, detail="Parameter sweep requires a QueryGoal with a simulation stage.")
+
+    try:
+        return await ParameterSweep(get_querygoal_executor()).run(querygoal, request.grid)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeExecutionError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ---------- 런타임 단계 원격 실행 (Airflow QueryGoalRuntimeHook, QUERYGOAL_RUNTIME_URL) ----------
+# Airflow 태스크 프로세스 대신 상주 API 서버의 QueryGoalExecutor(온톨로지, 메니페스트 캐시, AAS 커넥션 풀)를 사용
+# 작업 디렉터리는 ID로만 지정하고, 요청에 포함된 경로는 작업 디렉터리(메니페스트는 config/) 밖이면 400
+
+MANIFEST_DIR = Path(__file__).resolve().parents[1] / "config"
+
+
+def _is_within(path: Path, root: Path) -> bool:
+    path, root = path.resolve(), root.resolve()
+    return path == root or root in path.parents
+
+
+def _runtime_work_directory(work_directory_id: str) -> Path:
+    try:
+        return get_querygoal_executor().work_dir_manager.resolve_work_directory(work_directory_id)
+    except WorkDirectoryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _runtime_manifest_path(manifest_path: str) -> Path:
+    path = Path(manifest_path)
+    if not _is_within(path, MANIFEST_DIR):
+        raise HTTPException(status_code=400, detail=f"Manifest must be under {MANIFEST_DIR}: {manifest_path}")
+    return path
+
+
+def _check_json_files(json_files: Dict[str, Any], work_directory: Path):
+    """바인딩 결과 파일은 모두 해당 작업 디렉터리 안에 있어야 함"""
+    for name, entry in json_files.items():
+        path = entry.get("path") if isinstance(entry, dict) else None
+        if path is not None and not _is_within(Path(path), work_directory):
+            raise HTTPException(status_code=400, detail=f"Binding file for {name} is outside the work directory: {path}")
+
+
+def _check_stage_results(stage_results: Dict[str, Any], work_directory: Path):
+    """이전 단계 결과 중 이후 단계가 읽는 경로 (메니페스트, 바인딩 파일) 검증"""
+    manifest_path = stage_results.get("swrlSelection", {}).get("manifestPath")
+    if manifest_path:
+        _runtime_manifest_path(manifest_path)
+    _check_json_files(stage_results.get("yamlBinding", {}).get("jsonFiles", {}), work_directory)
+
+
+@app.post("/runtime/work-directories")
+def runtime_work_directory(request: RuntimeWorkDirectoryRequest):
+    work_directory = get_querygoal_executor().work_dir_manager.create_work_directory(request.goalId)
+    return {"workDirectoryId": work_directory.name, "workDirectory": str(work_directory)}
+
+@app.post("/runtime/stages/{stage_name}")
+async def runtime_stage(stage_name: str, request: RuntimeStageRequest):
+    """Stage 하나 실행 + Stage-Gate 검증 (실패 시 422), 갱신된 QueryGoal(outputs 등)도 함께 반환"""
+    executor = get_querygoal_executor()
+    if stage_name not in executor.stage_handlers:
+        raise HTTPException(status_code=404, detail=f"Unknown stage: {stage_name}")
+
+    work_directory = _runtime_work_directory(request.workDirectoryId)
+    _check_stage_results(request.stageResults, work_directory)
+
+    querygoal = request.querygoal
+    qg = querygoal["QueryGoal"]
+    context = ExecutionContext(
+        goal_id=qg["goalId"],
+        goal_type=qg["goalType"],
+        work_directory=work_directory,
+        start_time=datetime.utcnow(),
+        pipeline_stages=qg["metadata"].get("pipelineStages", []),
+        stage_results=dict(request.stageResults),
+        current_stage=stage_name
+    )
+    try:
+        stage_result, _ = await executor.run_stage(stage_name, querygoal, context)
+    except StageGateFailureError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except RuntimeExecutionError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"stageResult": stage_result, "querygoal": querygoal}
+
+@app.post("/runtime/manifest")
+async def runtime_manifest(request: RuntimeManifestRequest):
+    binding_handler = get_querygoal_executor().stage_handlers["yamlBinding"]
+    try:
+        return await binding_handler.manifest_parser.parse_manifest(_runtime_manifest_path(request.manifestPath))
+    except RuntimeExecutionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/runtime/bindings/source")
+async def runtime_bind_source(request: RuntimeSourceBindingRequest):
+    """데이터 소스 1개 바인딩 -> jsonFiles 항목 (실패는 항목의 error로 기록)"""
+    work_directory = _runtime_work_directory(request.workDirectoryId)
+    source_name = request.source.get("name", "unknown")
+    if not isinstance(source_name, str) or Path(source_name).name != source_name or source_name in (".", ".."):
+        # 소스 이름이 작업 디렉터리 안의 파일 이름으로 쓰이므로 경로 형태는 거부
+        raise HTTPException(status_code=400, detail=f"Invalid data source name: {source_name!r}")
+    binding_handler = get_querygoal_executor().stage_handlers["yamlBinding"]
+    json_files = await binding_handler.bind_data_sources([request.source], work_directory)
+    return json_files[source_name]
+
+@app.post("/runtime/bindings/summary")
+def runtime_binding_summary(request: RuntimeBindingSummaryRequest):
+    """소스별 바인딩 결과를 yamlBinding 결과로 합치고 Stage-Gate 검증 (실패 시 422)"""
+    work_directory = _runtime_work_directory(request.workDirectoryId)
+    _runtime_manifest_path(request.manifestPath)
+    _check_json_files(request.jsonFiles, work_directory)
+
+    executor = get_querygoal_executor()
+    binding_handler = executor.stage_handlers["yamlBinding"]
+    stage_result = binding_handler.create_success_result(binding_handler.summarize_binding(
+        request.manifestPath, request.dataSources, request.jsonFiles, work_directory
+    ))
+    stage_result["stage"] = "yamlBinding"
+
+    gate_result = executor.stage_gate_validator.validate_stage("yamlBinding", stage_result, executor.stage_criteria)
+    if not gate_result.passed:
+        raise HTTPException(status_code=422, detail=f"Stage-Gate failed for yamlBinding: {gate_result.reason}")
+    return stage_result
+
 @app.post("/execute-goal", response_model=ApiResponse)
 def execute_goal(request: DslRequest):
     if not planner or not agent:
@@ -49,4 +263,105 @@ def execute_goal(request: DslRequest):
     except Exception as e:
         import traceback
         traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {e}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {e}")
+
+@app.post("/track-products")
+def track_products(request: BulkTrackingRequest):
+    """
+    Goal 4 다중 제품 위치 추적
+
+    온톨로지의 track_product_position 플랜을 한 번만 조회하고 제품별로 동시에 실행한다.
+    같은 제품의 동시 조회는 하나의 AAS 요청으로 병합되고, 최근 값은 추적 캐시에서 응답한다.
+    """
+    if not planner or not agent:
+        raise HTTPException(status_code=503, detail="Server is not ready. Check initialization logs.")
+
+    goal = "track_product_position"
+    action_plan = planner.create_plan(goal)
+    if not action_plan:
+        raise HTTPException(status_code=404, detail=f"Goal '{goal}' could not be resolved into an action plan.")
+
+    # 중복 제품은 한 번만 실행 (입력 순서 유지)
+    product_ids = list(dict.fromkeys(request.product_ids))
+    params_list = [DslRequest(goal=goal, product_id=product_id).dict() for product_id in product_ids]
+    runs = agent.run_many(action_plan, params_list, max_workers=min(TRACKING_BULK_MAX_WORKERS, len(params_list)))
+
+    def outcome(index, result_data, error):
+        if error is not None:
+            return {"product_id": product_ids[index], "error": str(error)}
+        return {
+            "product_id": product_ids[index],
+            "result": result_data.get("final_result", "Process completed, but no final result was marked.")
+        }
+
+    if request.stream:
+        def stream_results():
+            for index, result_data, error in runs:
+                yield to_json(outcome(index, result_data, error)) + "\n"
+
+        return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+    outcomes = {}
+    for index, result_data, error in runs:
+        outcomes[index] = outcome(index, result_data, error)
+
+    return {
+        "goal": goal,
+        "results": [outcomes[index] for index in range(len(product_ids))]
+    }
+
+@app.get("/track-products/{product_id}/history")
+def track_product_history(product_id: str):
+    """
+    Goal 4 제품 위치 변경 이력 (추적 캐시에 남아 있는 기록, 오래된 순)
+
+    최근 요청된 제품만 이력이 쌓이며 TRACKING_IDLE_TTL_SECONDS 동안 요청이 없으면 이력도 제거된다.
+    """
+    if not agent:
+        raise HTTPException(status_code=503, detail="Server is not ready. Check initialization logs.")
+
+    tracking_service = agent.handlers["aas_query"].tracking_service
+    history = tracking_service.history(product_id)
+    if not history:
+        raise HTTPException(status_code=404, detail=f"No tracking history for product '{product_id}'.")
+
+    return {"product_id": product_id, "history": history, "metrics": tracking_service.metrics()}
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """
+    요청 본문을 읽는 동안 응답을 스트리밍
+
+    StreamingResponse는 ASGI spec 2.4 미만 서버에서 연결 종료 감지를 위해 receive()를 함께 호출하는데,
+    이 경우 아직 읽지 않은 요청 본문 메시지를 가로채므로 응답 전송만 수행한다.
+    (클라이언트 연결 종료는 request.stream()의 ClientDisconnect로 전달됨)
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+async def _iter_request_lines(request: Request):
+    """요청 본문 스트림을 도착하는 대로 줄 단위(bytes)로 분리"""
+    pending = b""
+    async for chunk in request.stream():
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r")
+    if pending:
+        yield pending.rstrip(b"\r")
+
+@app.post("/querygoal/batch")
+async def querygoal_batch(request: Request):
+    """
+    JSONL 자연어 입력 일괄 변환
+
+    요청 본문: 한 줄에 하나씩 {"input": "...", "id": "..."} (application/x-ndjson)
+    응답: 완성된 QueryGoal(또는 error)을 입력 순서대로 JSONL 스트리밍
+    (본문 전체를 기다리지 않고 도착한 줄부터 처리, UTF-8이 아닌 줄은 해당 줄의 error로 응답)
+    """
+    orchestrator = get_pipeline_orchestrator()
+
+    async def stream_results():
+        async for record in orchestrator.process_batch_stream(_iter_request_lines(request)):
+            yield to_json(record) + "\n"
+
+    return _DuplexStreamingResponse(stream_results(), media_type="application/x-ndjson")
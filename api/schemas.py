@@ -17,6 +17,13 @@ class DslRequest(BaseModel):
     quantity: Optional[int] = None
 
 
+class BulkTrackingRequest(BaseModel):
+    """Goal 4 다중 제품 위치 추적 요청"""
+    product_ids: List[str] = Field(..., min_length=1, example=["P1", "P2", "P3"])
+    # true면 제품별 결과를 완료되는 순서대로 JSONL로 스트리밍
+    stream: bool = False
+
+
 # ========== QueryGoal 스키마 ==========
 class QueryGoalParameter(BaseModel):
     """QueryGoal 파라미터"""
@@ -59,6 +66,46 @@ class QueryGoalRequest(BaseModel):
     QueryGoal: QueryGoalCore
 
 
+class SweepRequest(BaseModel):
+    """Goal3 파라미터 sweep 요청 (기준 QueryGoal + 파라미터 grid)"""
+    querygoal: QueryGoalRequest
+    # 키별 후보 목록 또는 {"start", "stop", "step"} 범위, 예: {"quantity": {"start": 10, "stop": 100, "step": 10}, "machineDown": [null, "M1"]}
+    grid: Dict[str, Any] = Field(..., example={"quantity": [10, 50, 100], "machineDown": [None, "M1"]})
+
+
+# ========== 런타임 단계 원격 실행 스키마 (Airflow QueryGoalRuntimeHook) ==========
+class RuntimeWorkDirectoryRequest(BaseModel):
+    """작업 디렉터리 생성 요청"""
+    goalId: str
+
+
+class RuntimeStageRequest(BaseModel):
+    """Stage 하나 실행 요청 (이전 Stage 결과는 stageResults로 전달)"""
+    querygoal: Dict[str, Any]
+    # /runtime/work-directories가 반환한 작업 디렉터리 ID
+    workDirectoryId: str
+    stageResults: Dict[str, Any] = {}
+
+
+class RuntimeManifestRequest(BaseModel):
+    """메니페스트 파싱 요청"""
+    manifestPath: str
+
+
+class RuntimeSourceBindingRequest(BaseModel):
+    """데이터 소스 1개 바인딩 요청"""
+    source: Dict[str, Any]
+    workDirectoryId: str
+
+
+class RuntimeBindingSummaryRequest(BaseModel):
+    """소스별 바인딩 결과 -> yamlBinding 결과 (Stage-Gate 검증)"""
+    manifestPath: str
+    dataSources: List[Dict[str, Any]]
+    jsonFiles: Dict[str, Dict[str, Any]]
+    workDirectoryId: str
+
+
 # ========== 자연어 입력 스키마 ==========
 class NaturalLanguageRequest(BaseModel):
     """자연어 입력 요청"""
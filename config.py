@@ -8,6 +8,7 @@ BASE_DIR = Path(__file__).resolve().parent
 # 온톨로지 및 AAS 데이터 파일 경로
 ONTOLOGY_FILE_PATH = BASE_DIR / "ontology" / "factory_ontology_v2_final_corrected.ttl"
 AAS_DATA_FILE_PATH = BASE_DIR / "aas_mock_server" / "data" / "aas_model_final_expanded.json"
+MODEL_REGISTRY_FILE_PATH = BASE_DIR / "config" / "model_registry.json"
 
 # ============================================================
 # AAS 서버 설정 - 외부 표준 AAS 서버 전용
@@ -55,6 +56,83 @@ else:
     
     print(f"📦 [DEPRECATED] Mock AAS Server configuration (not in use)")
 
+# AAS 클라이언트 resilience 설정 (재시도 / hedged 요청 / 서킷 브레이커)
+AAS_RETRY_ATTEMPTS = int(os.environ.get("AAS_RETRY_ATTEMPTS", 3))
+AAS_HEDGE_ENABLED = os.environ.get("AAS_HEDGE_ENABLED", "true").lower() == "true"
+AAS_CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("AAS_CIRCUIT_FAILURE_THRESHOLD", 5))
+AAS_CIRCUIT_RESET_SECONDS = float(os.environ.get("AAS_CIRCUIT_RESET_SECONDS", 30))
+# 장애 시 대신 제공하는 last-value 캐시 (최대 URL 수, 최대 경과 시간 초)
+AAS_STALE_CACHE_MAX_ENTRIES = int(os.environ.get("AAS_STALE_CACHE_MAX_ENTRIES", 1000))
+AAS_STALE_CACHE_MAX_AGE_SECONDS = float(os.environ.get("AAS_STALE_CACHE_MAX_AGE_SECONDS", 300))
+
+# AAS 요청 스케줄러 / 연결 풀 설정 (프로세스 전역, QueryGoal 런타임과 ExecutionAgent 공유)
+# AAS_RATE_LIMIT_RPS <= 0 이면 rate limit 없음
+AAS_RATE_LIMIT_RPS = float(os.environ.get("AAS_RATE_LIMIT_RPS", 50))
+AAS_RATE_LIMIT_BURST = int(os.environ.get("AAS_RATE_LIMIT_BURST", 20))
+AAS_MAX_CONNECTIONS = int(os.environ.get("AAS_MAX_CONNECTIONS", 50))
+AAS_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("AAS_MAX_KEEPALIVE_CONNECTIONS", 10))
+
+# Submodel warm cache 설정 (API 시작 시 config/ 메니페스트 기반 prefetch)
+AAS_WARMUP_ENABLED = os.environ.get("AAS_WARMUP_ENABLED", "true").lower() == "true"
+# 일부 Submodel prefetch 실패 시 /ready로 보고하는 최소 성공 비율
+AAS_WARMUP_MIN_READY_FRACTION = float(os.environ.get("AAS_WARMUP_MIN_READY_FRACTION", 0.8))
+AAS_WARM_CACHE_TTL_SECONDS = float(os.environ.get("AAS_WARM_CACHE_TTL_SECONDS", 30))
+AAS_WARM_CACHE_REFRESH_SECONDS = float(os.environ.get("AAS_WARM_CACHE_REFRESH_SECONDS", 10))
+
+# swrlSelection 진행 중 예측한 메니페스트의 데이터 소스를 미리 수집 (예측이 맞으면 yamlBinding에서 재사용)
+# 현재 swrlSelection은 I/O가 없어 겹치는 구간이 거의 없으므로 기본 비활성화
+SPECULATIVE_BINDING_ENABLED = os.environ.get("SPECULATIVE_BINDING_ENABLED", "false").lower() == "true"
+
+# Goal 1/4 필터 조건을 AAS 서버에 $filter 쿼리 파라미터로 전달 (표준 AAS API에는 없는 확장이므로
+# $filter를 적용하고 X-Filter-Applied: true로 응답하는 서버에서만 켬, 그렇지 않으면 클라이언트에서 평가)
+AAS_FILTER_PUSHDOWN = os.environ.get("AAS_FILTER_PUSHDOWN", "false").lower() == "true"
+
+# Goal 4 제품 위치 추적 캐시 (백그라운드 polling 주기, 캐시 값 허용 경과 시간, 제품별 이력 개수, 미요청 제품의 최신 값/이력 보관 시간)
+TRACKING_POLL_INTERVAL_SECONDS = float(os.environ.get("TRACKING_POLL_INTERVAL_SECONDS", 1.0))
+TRACKING_MAX_STALENESS_SECONDS = float(os.environ.get("TRACKING_MAX_STALENESS_SECONDS", 2.0))
+TRACKING_HISTORY_SIZE = int(os.environ.get("TRACKING_HISTORY_SIZE", 100))
+TRACKING_IDLE_TTL_SECONDS = float(os.environ.get("TRACKING_IDLE_TTL_SECONDS", 300))
+# 마지막 요청 이후 polling을 계속하는 시간 (초, 이후에는 다음 요청 시 조회)
+TRACKING_POLL_WINDOW_SECONDS = float(os.environ.get("TRACKING_POLL_WINDOW_SECONDS", 10))
+# /track-products 요청당 동시에 실행하는 제품 수
+TRACKING_BULK_MAX_WORKERS = int(os.environ.get("TRACKING_BULK_MAX_WORKERS", 16))
+
+# Goal 2 센서 이상 감지 (설비별 ring buffer 크기 = rolling quantile 창, EWMA 평활 계수, 이상 판단 |z| 기준, z-score 계산 전 최소 샘플 수)
+SENSOR_BUFFER_SIZE = int(os.environ.get("SENSOR_BUFFER_SIZE", 1024))
+SENSOR_EWMA_ALPHA = float(os.environ.get("SENSOR_EWMA_ALPHA", 0.1))
+SENSOR_ANOMALY_Z_THRESHOLD = float(os.environ.get("SENSOR_ANOMALY_Z_THRESHOLD", 3.0))
+SENSOR_WARMUP_SAMPLES = int(os.environ.get("SENSOR_WARMUP_SAMPLES", 10))
+
+# ai_model_inference 추론 런타임 (레지스트리 항목에 값이 없을 때의 모델별 최대 배치 크기, 첫 요청 이후 배치를 모으는 최대 대기 시간)
+INFERENCE_MAX_BATCH_SIZE = int(os.environ.get("INFERENCE_MAX_BATCH_SIZE", 64))
+INFERENCE_MAX_BATCH_DELAY_MS = float(os.environ.get("INFERENCE_MAX_BATCH_DELAY_MS", 5))
+# 추론 결과 최대 대기 시간 (초, 초과 시 InferenceError)
+INFERENCE_TIMEOUT_SECONDS = float(os.environ.get("INFERENCE_TIMEOUT_SECONDS", 10))
+
+# Goal3 surrogate (시뮬레이터 결과 학습 데이터 경로, surrogate 사용 여부, 레지스트리 minConfidence가 없을 때의 최소 신뢰도)
+SURROGATE_DATASET_PATH = Path(os.environ.get("SURROGATE_DATASET_PATH", BASE_DIR / "temp" / "surrogate" / "goal3_samples.jsonl"))
+SURROGATE_ENABLED = os.environ.get("SURROGATE_ENABLED", "true").lower() == "true"
+SURROGATE_MIN_CONFIDENCE = float(os.environ.get("SURROGATE_MIN_CONFIDENCE", 0.8))
+
+# Goal3 NSGA-II warm-start (사용 여부, lineage별 이전 실행 결과 저장 경로, warm-start를 허용하는 최대 job 변경 비율)
+WARM_START_ENABLED = os.environ.get("WARM_START_ENABLED", "true").lower() == "true"
+WARM_START_DIR = Path(os.environ.get("WARM_START_DIR", BASE_DIR / "temp" / "warm_start"))
+WARM_START_MAX_JOB_CHANGE_RATIO = float(os.environ.get("WARM_START_MAX_JOB_CHANGE_RATIO", 0.2))
+
+# Goal3 anytime 시뮬레이션 (QueryGoal 파라미터 timeLimit이 없을 때의 시뮬레이터 시간 제한(초), 시뮬레이터 best-so-far 기록 주기(초),
+# 보관하는 백그라운드 실행 수)
+SIMULATION_TIME_LIMIT = float(os.environ.get("SIMULATION_TIME_LIMIT", 300))
+ANYTIME_REPORT_INTERVAL_SECONDS = float(os.environ.get("ANYTIME_REPORT_INTERVAL_SECONDS", 1.0))
+ANYTIME_MAX_RUNS = int(os.environ.get("ANYTIME_MAX_RUNS", 100))
+
+# Goal3 파라미터 sweep (컨테이너 한 번에 실행하는 변형 수, 동시 실행 컨테이너 수, 요청당 최대 변형 수)
+SWEEP_BATCH_SIZE = int(os.environ.get("SWEEP_BATCH_SIZE", 8))
+SWEEP_MAX_PARALLEL = int(os.environ.get("SWEEP_MAX_PARALLEL", 2))
+SWEEP_MAX_VARIANTS = int(os.environ.get("SWEEP_MAX_VARIANTS", 200))
+
+# Goal 1 job_log 인덱스 저장소 (SQLite 파일 경로, ":memory:"면 프로세스 메모리에만 유지)
+JOB_LOG_STORE_PATH = os.environ.get("JOB_LOG_STORE_PATH", ":memory:")
+
 # ============================================================
 # 작업 디렉토리 설정 - 환경별 동적 경로 해결
 # ============================================================
@@ -63,6 +141,15 @@ else:
 SIMULATION_WORK_DIR = os.environ.get("SIMULATION_WORK_DIR", None)  # None이면 자동 감지
 FORCE_LOCAL_MODE = os.environ.get("FORCE_LOCAL_MODE", "false").lower() == "true"
 
+# ============================================================
+# 단계 간 데이터 교환 포맷 설정
+# ============================================================
+
+# yamlBinding 출력 포맷: "json" (기본값), "msgpack", "npz" (행렬형 소스만 npz, 나머지는 msgpack)
+# msgpack/numpy가 설치되어 있지 않으면 JSON으로 대체됩니다. (msgpack/numpy는 requirements.txt에 포함)
+# 행렬의 필드에 정수/실수 또는 숫자/문자열이 섞여 있으면 npz 대신 msgpack(JSON)으로 기록합니다.
+INTERCHANGE_FORMAT = os.environ.get("INTERCHANGE_FORMAT", "json").lower()
+
 # 디버그 정보 출력 (개발 중에만 사용)
 DEBUG_MODE = os.environ.get("DEBUG_MODE", "false").lower() == "true"
 if DEBUG_MODE:
@@ -10,24 +10,42 @@ import base64
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
 
 logger = logging.getLogger(__name__)
 
+SIMULATION_DATA_SUBMODEL = "urn:factory:submodel:simulation_data"
+MACHINE_SHELL_PREFIX = "urn:factory:machine:"
+
+# 출력 파일 -> (기본 element_id, 최상위 래핑 키)
+SIMULATION_DATA_FILES = {
+    "jobs.json": ("jobs_data", "jobs"),
+    "operations.json": ("operations_data", "operations"),
+    "operation_durations.json": ("operation_durations_data", None),
+    "machine_transfer_time.json": ("machine_transfer_time_data", None),
+    "job_release.json": ("job_release_data", "job_releases")
+}
+
 class AASXDataOrchestrator:
-    def __init__(self, config_path: str = "config/NSGA2Model_sources.yaml", base_url: str = "http://127.0.0.1:5001"):
+    def __init__(self,
+                 config_path: str = "config/NSGA2Model_sources.yaml",
+                 base_url: str = "http://127.0.0.1:5001",
+                 max_workers: int = 8):
         """
         AASX Data Orchestrator 초기화
         
         Args:
             config_path: NSGA2Model_sources.yaml 파일 경로
             base_url: AASX 서버 기본 URL
+            max_workers: 서브모델 조회 / 파일 기록 동시 실행 수
         """
         self.base_url = base_url
         self.config_path = Path(config_path)
         self.config = self._load_config()
+        self.max_workers = max_workers
         self.session = requests.Session()
-        self.session.timeout = self.config.get('aasx_server', {}).get('timeout', 30)
+        self.timeout = self.config.get('aasx_server', {}).get('timeout', 30)
         
     def _load_config(self) -> Dict[str, Any]:
         """YAML 설정 파일 로드"""
@@ -42,46 +60,26 @@ class AASXDataOrchestrator:
         """AAS ID를 Base64 URL-safe 형태로 인코딩"""
         return base64.urlsafe_b64encode(id_string.encode()).decode().rstrip('=')
     
-    def _get_submodel_element_value(self, shell_id: str, submodel_id: str, element_id: str) -> Optional[str]:
+    def _fetch_submodel(self, submodel_id: str) -> Optional[Dict[str, Any]]:
         """
-        서브모델 엘리먼트 값 조회 (서브모델 직접 접근)
+        서브모델 전체 조회 (서브모델 직접 접근, 1회 GET)
 
         Args:
-            shell_id: AAS Shell ID (사용되지 않음, 호환성 유지용)
             submodel_id: Submodel ID
-            element_id: Element ID
 
         Returns:
-            Element 값 (문자열)
+            서브모델 JSON (실패 시 None)
         """
         try:
-            # 서브모델에 직접 접근 (Shell을 거치지 않음)
             encoded_submodel = self._encode_id(submodel_id)
-            
-            # 서브모델 직접 조회 API 사용
             submodel_url = urljoin(self.base_url + "/", f"submodels/{encoded_submodel}")
-            
+
             logger.info(f"Requesting submodel: {submodel_url}")
-            response = self.session.get(submodel_url)
+            response = self.session.get(submodel_url, timeout=self.timeout)
 
             if response.status_code == 200:
                 try:
-                    submodel_data = response.json()
-                    submodel_elements = submodel_data.get('submodelElements', [])
-                    
-                    # element_id와 일치하는 엘리먼트 찾기
-                    for element in submodel_elements:
-                        if element.get('idShort') == element_id:
-                            if element.get('modelType') == 'Property' and 'value' in element:
-                                logger.info(f"✅ Found element {element_id} with value")
-                                return element['value']
-                            else:
-                                logger.warning(f"Element {element_id} is not a Property or has no value field")
-                                return None
-                    
-                    logger.warning(f"Element {element_id} not found in submodel {submodel_id}")
-                    return None
-                    
+                    return response.json()
                 except json.JSONDecodeError:
                     logger.error(f"Failed to parse JSON response for submodel {submodel_id}")
                     return None
@@ -90,15 +88,140 @@ class AASXDataOrchestrator:
                 return None
 
         except Exception as e:
-            logger.error(f"Error getting element value: {e}")
+            logger.error(f"Error getting submodel {submodel_id}: {e}")
             return None
-    
-    def _get_machine_data(self, machine_id: str) -> Dict[str, Any]:
+
+    def _extract_element_value(self, submodel_data: Optional[Dict[str, Any]], element_id: str) -> Optional[str]:
+        """이미 조회한 서브모델에서 Property 엘리먼트 값 추출"""
+        if not submodel_data:
+            return None
+
+        for element in submodel_data.get('submodelElements', []):
+            if element.get('idShort') == element_id:
+                if element.get('modelType') == 'Property' and 'value' in element:
+                    logger.info(f"✅ Found element {element_id} with value")
+                    return element['value']
+                else:
+                    logger.warning(f"Element {element_id} is not a Property or has no value field")
+                    return None
+
+        logger.warning(f"Element {element_id} not found in submodel {submodel_data.get('id')}")
+        return None
+
+    def _get_submodel_element_value(self, shell_id: str, submodel_id: str, element_id: str) -> Optional[str]:
+        """
+        서브모델 엘리먼트 값 조회 (단건 조회용, 여러 엘리먼트는 fetch plan 사용)
+
+        Args:
+            shell_id: AAS Shell ID (사용되지 않음, 호환성 유지용)
+            submodel_id: Submodel ID
+            element_id: Element ID
+
+        Returns:
+            Element 값 (문자열)
+        """
+        return self._extract_element_value(self._fetch_submodel(submodel_id), element_id)
+
+    def _build_fetch_plan(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        시뮬레이션 파일 생성 계획을 서브모델 단위로 그룹화
+
+        config의 legacy 'sources' 항목(submodel_id/element_id/output_file)을 사용하고,
+        없으면 기본 simulation_data 매핑을 사용한다.
+
+        Returns:
+            {submodel_id: [{element_id, output_file, wrapper_key}, ...]}
+        """
+        sources = self.config.get('sources', {})
+        plan: Dict[str, List[Dict[str, Any]]] = {}
+
+        for output_file, (element_id, wrapper_key) in SIMULATION_DATA_FILES.items():
+            source = next(
+                (s for s in sources.values() if isinstance(s, dict) and s.get('output_file') == output_file),
+                {}
+            )
+            submodel_id = source.get('submodel_id', SIMULATION_DATA_SUBMODEL)
+            plan.setdefault(submodel_id, []).append({
+                "element_id": source.get('element_id', element_id),
+                "output_file": output_file,
+                "wrapper_key": wrapper_key
+            })
+
+        return plan
+
+    def discover_machines(self) -> List[Dict[str, str]]:
+        """
+        AASX 서버의 Shell 목록에서 머신 목록 탐색
+
+        Shell 탐색이 실패하면 config의 Machines.machine_sources를 사용한다.
+
+        Returns:
+            [{machine_id, capability_submodel, status_submodel}, ...]
+        """
+        machines = []
+        try:
+            response = self.session.get(f"{self.base_url}/shells", timeout=self.timeout)
+            response.raise_for_status()
+            shells = response.json()
+            if isinstance(shells, dict):
+                shells = shells.get("result", shells.get("shells", []))
+
+            for shell in shells:
+                shell_id = shell.get("id", "")
+                if not shell_id.startswith(MACHINE_SHELL_PREFIX):
+                    continue
+
+                machine_id = shell.get("idShort") or shell_id[len(MACHINE_SHELL_PREFIX):]
+                submodel_refs = [
+                    key.get("value", "")
+                    for ref in shell.get("submodels", [])
+                    for key in ref.get("keys", [])
+                ]
+                machines.append({
+                    "machine_id": machine_id,
+                    "capability_submodel": next(
+                        (r for r in submodel_refs if ":capability:" in r),
+                        f"urn:factory:submodel:capability:{machine_id}"
+                    ),
+                    "status_submodel": next(
+                        (r for r in submodel_refs if ":status:" in r),
+                        f"urn:factory:submodel:status:{machine_id}"
+                    )
+                })
+
+        except Exception as e:
+            logger.warning(f"Shell discovery failed, falling back to manifest machine_sources: {e}")
+
+        if not machines:
+            machine_sources = self.config.get('sources', {}).get('Machines', {}).get('machine_sources', [])
+            machines = [
+                {
+                    "machine_id": source["machine_id"],
+                    "capability_submodel": source.get(
+                        "capability_submodel", f"urn:factory:submodel:capability:{source['machine_id']}"
+                    ),
+                    "status_submodel": source.get(
+                        "status_submodel", f"urn:factory:submodel:status:{source['machine_id']}"
+                    )
+                }
+                for source in machine_sources
+            ]
+
+        machines.sort(key=lambda m: m["machine_id"])
+        logger.info(f"🔍 Discovered {len(machines)} machines: {[m['machine_id'] for m in machines]}")
+        return machines
+
+    def _get_machine_data(self,
+                          machine_id: str,
+                          capability_submodel: Optional[str] = None,
+                          status_submodel: Optional[str] = None) -> Dict[str, Any]:
         """
-        개별 머신의 capability와 status 데이터 조회
+        개별 머신의 capability와 status 데이터 조회 (서브모델별 1회 GET)
         
         Args:
             machine_id: 머신 ID (예: M1, M2, M3, M4)
+            capability_submodel: Capability 서브모델 ID (기본값: 명명 규칙)
+            status_submodel: Status 서브모델 ID (기본값: 명명 규칙)
             
         Returns:
             머신 데이터 딕셔너리
@@ -114,68 +237,71 @@ class AASXDataOrchestrator:
         }
         
         try:
-            shell_id = f"urn:factory:machine:{machine_id}"
-            
-            # Capability 서브모델에서 데이터 조회
-            capability_submodel = f"urn:factory:submodel:capability:{machine_id}"
-            
-            # machine_type 조회
-            machine_type = self._get_submodel_element_value(shell_id, capability_submodel, "machine_type")
+            # Capability 서브모델 1회 조회 후 엘리먼트 추출
+            capability = self._fetch_submodel(
+                capability_submodel or f"urn:factory:submodel:capability:{machine_id}"
+            )
+
+            machine_type = self._extract_element_value(capability, "machine_type")
             if machine_type:
                 machine_data["type"] = machine_type
-            
+
             # performable_operations 조회 (리스트 형태)
             # 실제 구현에서는 SubmodelElementList를 처리해야 할 수도 있음
-            operations = self._get_submodel_element_value(shell_id, capability_submodel, "performable_operations")
+            operations = self._extract_element_value(capability, "performable_operations")
             if operations:
-                try:
-                    if isinstance(operations, str):
-                        machine_data["capabilities"] = [operations]
-                    else:
-                        machine_data["capabilities"] = operations
-                except:
-                    machine_data["capabilities"] = ["drilling", "welding", "testing", "assembly"]  # 기본값
-            
-            # efficiency 조회
-            efficiency = self._get_submodel_element_value(shell_id, capability_submodel, "efficiency")
+                if isinstance(operations, str):
+                    machine_data["capabilities"] = [operations]
+                else:
+                    machine_data["capabilities"] = operations
+
+            efficiency = self._extract_element_value(capability, "efficiency")
             if efficiency:
                 try:
                     machine_data["efficiency"] = float(efficiency)
-                except:
+                except (TypeError, ValueError):
                     pass
-            
-            # Status 서브모델에서 데이터 조회
-            status_submodel = f"urn:factory:submodel:status:{machine_id}"
-            
-            # status 조회
-            status = self._get_submodel_element_value(shell_id, status_submodel, "status")
+
+            # Status 서브모델 1회 조회 후 엘리먼트 추출
+            status_data = self._fetch_submodel(
+                status_submodel or f"urn:factory:submodel:status:{machine_id}"
+            )
+
+            status = self._extract_element_value(status_data, "status")
             if status:
                 machine_data["status"] = status
-            
-            # next_available_time 조회
-            next_time = self._get_submodel_element_value(shell_id, status_submodel, "next_available_time")
+
+            next_time = self._extract_element_value(status_data, "next_available_time")
             if next_time:
                 try:
                     machine_data["next_available_time"] = int(next_time)
-                except:
+                except (TypeError, ValueError):
                     pass
-            
-            # queue_length 조회
-            queue_len = self._get_submodel_element_value(shell_id, status_submodel, "queue_length")
+
+            queue_len = self._extract_element_value(status_data, "queue_length")
             if queue_len:
                 try:
                     machine_data["queue_length"] = int(queue_len)
-                except:
+                except (TypeError, ValueError):
                     pass
             
         except Exception as e:
             logger.error(f"Error getting machine data for {machine_id}: {e}")
         
         return machine_data
+
+    def _write_json(self, file_path: Path, payload: Any) -> str:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+        return str(file_path)
     
     def generate_simulation_files(self, output_dir: str = "temp/simulation_scenario") -> Dict[str, str]:
         """
         AASX 서버에서 데이터를 추출하여 NSGA-II용 6개 JSON 파일 생성
+
+        1. fetch plan에 따라 서브모델별 1회 조회 (머신 서브모델과 함께 동시 실행)
+        2. 조회된 서브모델에서 엘리먼트 추출
+        3. 6개 파일 병렬 기록
         
         Args:
             output_dir: 출력 디렉토리
@@ -187,98 +313,53 @@ class AASXDataOrchestrator:
         output_path.mkdir(parents=True, exist_ok=True)
         
         generated_files = {}
-        sources = self.config.get('sources', {})
+        fetch_plan = self._build_fetch_plan()
         
         try:
-            # 1. jobs.json 생성
-            logger.info("Generating jobs.json...")
-            jobs_data = self._get_submodel_element_value(
-                "urn:factory:simulation:main",
-                "urn:factory:submodel:simulation_data",
-                "jobs_data"
-            )
-            if jobs_data:
-                jobs_json = json.loads(jobs_data)
-                jobs_file = output_path / "jobs.json"
-                with open(jobs_file, 'w', encoding='utf-8') as f:
-                    json.dump({"jobs": jobs_json}, f, indent=2, ensure_ascii=False)
-                generated_files["jobs.json"] = str(jobs_file)
-                logger.info(f"✅ jobs.json generated with {len(jobs_json)} jobs")
-            
-            # 2. operations.json 생성
-            logger.info("Generating operations.json...")
-            operations_data = self._get_submodel_element_value(
-                "urn:factory:simulation:main",
-                "urn:factory:submodel:simulation_data",
-                "operations_data"
-            )
-            if operations_data:
-                operations_json = json.loads(operations_data)
-                operations_file = output_path / "operations.json"
-                with open(operations_file, 'w', encoding='utf-8') as f:
-                    json.dump({"operations": operations_json}, f, indent=2, ensure_ascii=False)
-                generated_files["operations.json"] = str(operations_file)
-                logger.info(f"✅ operations.json generated with {len(operations_json)} operations")
-            
-            # 3. operation_durations.json 생성
-            logger.info("Generating operation_durations.json...")
-            durations_data = self._get_submodel_element_value(
-                "urn:factory:simulation:main",
-                "urn:factory:submodel:simulation_data",
-                "operation_durations_data"
-            )
-            if durations_data:
-                durations_json = json.loads(durations_data)
-                durations_file = output_path / "operation_durations.json"
-                with open(durations_file, 'w', encoding='utf-8') as f:
-                    json.dump(durations_json, f, indent=2, ensure_ascii=False)
-                generated_files["operation_durations.json"] = str(durations_file)
-                logger.info(f"✅ operation_durations.json generated")
-            
-            # 4. machine_transfer_time.json 생성
-            logger.info("Generating machine_transfer_time.json...")
-            transfer_data = self._get_submodel_element_value(
-                "urn:factory:simulation:main",
-                "urn:factory:submodel:simulation_data",
-                "machine_transfer_time_data"
-            )
-            if transfer_data:
-                transfer_json = json.loads(transfer_data)
-                transfer_file = output_path / "machine_transfer_time.json"
-                with open(transfer_file, 'w', encoding='utf-8') as f:
-                    json.dump(transfer_json, f, indent=2, ensure_ascii=False)
-                generated_files["machine_transfer_time.json"] = str(transfer_file)
-                logger.info(f"✅ machine_transfer_time.json generated")
-            
-            # 5. job_release.json 생성
-            logger.info("Generating job_release.json...")
-            release_data = self._get_submodel_element_value(
-                "urn:factory:simulation:main",
-                "urn:factory:submodel:simulation_data",
-                "job_release_data"
-            )
-            if release_data:
-                release_json = json.loads(release_data)
-                release_file = output_path / "job_release.json"
-                with open(release_file, 'w', encoding='utf-8') as f:
-                    json.dump({"job_releases": release_json}, f, indent=2, ensure_ascii=False)
-                generated_files["job_release.json"] = str(release_file)
-                logger.info(f"✅ job_release.json generated with {len(release_json)} releases")
-            
-            # 6. machines.json 생성 (개별 머신 데이터 조합)
-            logger.info("Generating machines.json...")
-            machine_ids = ["M1", "M2", "M3", "M4"]
-            machines_data = []
-            
-            for machine_id in machine_ids:
-                machine_data = self._get_machine_data(machine_id)
-                machines_data.append(machine_data)
-            
-            machines_file = output_path / "machines.json"
-            with open(machines_file, 'w', encoding='utf-8') as f:
-                json.dump({"machines": machines_data}, f, indent=2, ensure_ascii=False)
-            generated_files["machines.json"] = str(machines_file)
-            logger.info(f"✅ machines.json generated with {len(machines_data)} machines")
+            machines = self.discover_machines()
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                # 1. 서브모델 조회 (simulation_data 등)와 머신 데이터 조회를 동시에 실행
+                submodel_futures = {
+                    submodel_id: pool.submit(self._fetch_submodel, submodel_id)
+                    for submodel_id in fetch_plan
+                }
+                machine_futures = [
+                    pool.submit(
+                        self._get_machine_data,
+                        machine["machine_id"],
+                        machine["capability_submodel"],
+                        machine["status_submodel"]
+                    )
+                    for machine in machines
+                ]
+
+                # 2. 파일별 payload 구성
+                payloads: Dict[str, Any] = {}
+                for submodel_id, entries in fetch_plan.items():
+                    submodel_data = submodel_futures[submodel_id].result()
+                    for entry in entries:
+                        raw_value = self._extract_element_value(submodel_data, entry["element_id"])
+                        if not raw_value:
+                            continue
+                        parsed = json.loads(raw_value)
+                        wrapper_key = entry["wrapper_key"]
+                        payloads[entry["output_file"]] = {wrapper_key: parsed} if wrapper_key else parsed
+                        logger.info(f"✅ {entry['output_file']} prepared ({len(parsed)} entries)")
+
+                machines_data = [future.result() for future in machine_futures]
+                payloads["machines.json"] = {"machines": machines_data}
+                logger.info(f"✅ machines.json prepared with {len(machines_data)} machines")
+
+                # 3. 파일 병렬 기록
+                write_futures = {
+                    file_name: pool.submit(self._write_json, output_path / file_name, payload)
+                    for file_name, payload in payloads.items()
+                }
+                for file_name, future in write_futures.items():
+                    generated_files[file_name] = future.result()
+
+            logger.info(f"✅ Generated {len(generated_files)} simulation files in {output_path}")
             
         except Exception as e:
             logger.error(f"Error generating simulation files: {e}")
@@ -316,7 +397,7 @@ class AASXDataOrchestrator:
         try:
             jobs_data = self._get_submodel_element_value(
                 "urn:factory:simulation:main",
-                "urn:factory:submodel:simulation_data", 
+                SIMULATION_DATA_SUBMODEL,
                 "jobs_data"
             )
             if jobs_data:
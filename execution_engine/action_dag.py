@@ -0,0 +1,158 @@
+# execution_engine/action_dag.py
+"""
+Action Plan DAG 실행기
+
+온톨로지 액션 시퀀스 순서와 핸들러가 읽는 컨텍스트 키(데이터 흐름)로 의존성을 만들고,
+서로 독립적인 액션(예: Goal 3의 ActionFetchProductSpec / ActionFetchAllMachineData)을
+동시에 실행한다. 각 액션은 순차 실행 때와 같은 키(step_<순번>_<action_id>)로 의존 액션의
+결과만 받으므로 결과는 순차 실행과 동일하다.
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# 핸들러가 컨텍스트를 어떻게 읽는지 선언하지 않은 경우: 앞선 모든 액션에 의존 (순차 실행과 동일)
+READS_ALL = None
+
+
+def context_key(index: int, step: Dict[str, Any]) -> str:
+    """순차 실행과 같은 컨텍스트 키 (step_<1부터 시작하는 순번>_<action_id>)"""
+    return f"step_{index + 1}_{step['action_id']}"
+
+
+def build_dependencies(plan: List[Dict[str, Any]],
+                       reads_for: Callable[[Dict[str, Any]], Optional[Tuple[str, ...]]]) -> List[Set[int]]:
+    """
+    액션별 선행 액션 인덱스 집합
+
+    - 의존성은 항상 시퀀스상 앞선 액션으로만 향한다 (온톨로지 순서 유지, 순환 없음)
+    - reads_for(step)가 action_id 부분 문자열 튜플을 반환하면 해당 문자열을 포함하는 앞선 액션에 의존
+    - READS_ALL(None)이거나 step["parallelizable"]이 False면 앞선 모든 액션에 의존
+    """
+    dependencies: List[Set[int]] = []
+
+    for index, step in enumerate(plan):
+        reads = reads_for(step)
+        if reads is READS_ALL or step.get("parallelizable") is False:
+            dependencies.append(set(range(index)))
+            continue
+
+        dependencies.append({
+            earlier for earlier in range(index)
+            if any(pattern in plan[earlier]["action_id"] for pattern in reads)
+        })
+
+    return dependencies
+
+
+class ActionDagExecutor:
+    """의존성이 충족된 액션을 스레드 풀에서 동시에 실행"""
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+
+    def run(self,
+            plan: List[Dict[str, Any]],
+            execute: Callable[[int, Dict[str, Any], Dict[str, Any]], Optional[Dict[str, Any]]],
+            reads_for: Callable[[Dict[str, Any]], Optional[Tuple[str, ...]]]
+            ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Args:
+            plan: 액션 플랜 (온톨로지 시퀀스 순서)
+            execute: (index, step, context) -> 결과 (None이면 결과 없이 건너뜀)
+            reads_for: 액션이 읽는 컨텍스트 (build_dependencies 참고)
+
+        Returns:
+            (시퀀스 순서의 전체 컨텍스트, 액션별 실행 시간 기록)
+
+        Raises:
+            시퀀스상 가장 앞선 실패 액션의 예외 (아직 시작하지 않은 액션은 실행하지 않음)
+        """
+        dependencies = build_dependencies(plan, reads_for)
+        if self.max_workers <= 1 or all(dependencies[index] == set(range(index)) for index in range(len(plan))):
+            # 동시에 실행할 액션이 없는 플랜(순차 체인)은 스레드 풀 없이 호출 스레드에서 실행
+            return self._run_inline(plan, execute, dependencies)
+
+        results: Dict[int, Optional[Dict[str, Any]]] = {}
+        timings: Dict[int, Dict[str, Any]] = {}
+        errors: Dict[int, BaseException] = {}
+        pending = set(range(len(plan)))
+        running: Dict[Future, int] = {}
+        run_start = time.perf_counter()
+
+        def run_step(index: int) -> Optional[Dict[str, Any]]:
+            # 의존 액션 결과만 시퀀스 순서대로 전달
+            context = {
+                context_key(dep, plan[dep]): results[dep]
+                for dep in sorted(dependencies[index]) if results.get(dep) is not None
+            }
+            started = time.perf_counter()
+            try:
+                return execute(index, plan[index], context)
+            finally:
+                timings[index] = {
+                    "step": index + 1,
+                    "action_id": plan[index]["action_id"],
+                    "dependsOn": [plan[dep]["action_id"] for dep in sorted(dependencies[index])],
+                    "startOffsetMs": round((started - run_start) * 1000, 3),
+                    "durationMs": round((time.perf_counter() - started) * 1000, 3)
+                }
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                if not errors:
+                    ready = sorted(index for index in pending if dependencies[index].issubset(results))
+                    for index in ready:
+                        pending.discard(index)
+                        running[pool.submit(run_step, index)] = index
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:
+                        errors[index] = e
+
+        if errors:
+            raise errors[min(errors)]
+
+        context = {
+            context_key(index, plan[index]): results[index]
+            for index in range(len(plan)) if results.get(index) is not None
+        }
+        return context, [timings[index] for index in sorted(timings)]
+
+    def _run_inline(self,
+                    plan: List[Dict[str, Any]],
+                    execute: Callable[[int, Dict[str, Any], Dict[str, Any]], Optional[Dict[str, Any]]],
+                    dependencies: List[Set[int]]
+                    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """시퀀스 순서대로 실행 (각 액션은 앞선 액션 결과 중 의존하는 것만 받음)"""
+        context: Dict[str, Any] = {}
+        timings: List[Dict[str, Any]] = []
+        run_start = time.perf_counter()
+
+        for index, step in enumerate(plan):
+            step_context = {
+                context_key(dep, plan[dep]): context[context_key(dep, plan[dep])]
+                for dep in sorted(dependencies[index]) if context_key(dep, plan[dep]) in context
+            }
+            started = time.perf_counter()
+            try:
+                result = execute(index, step, step_context)
+            finally:
+                timings.append({
+                    "step": index + 1,
+                    "action_id": step["action_id"],
+                    "dependsOn": [plan[dep]["action_id"] for dep in sorted(dependencies[index])],
+                    "startOffsetMs": round((started - run_start) * 1000, 3),
+                    "durationMs": round((time.perf_counter() - started) * 1000, 3)
+                })
+            if result is not None:
+                context[context_key(index, step)] = result
+
+        return context, timings
@@ -4,18 +4,47 @@
 Mock 서버와의 기존 호환성을 유지하면서 표준 서버 지원 추가
 """
 import requests, sys, time, json, uuid, base64, os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, Any, Optional
 from kubernetes import client, config as k8s_config
 from simulation_data_converter import SimulationDataConverter
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
+from execution_engine.action_dag import ActionDagExecutor, READS_ALL
+from execution_engine.job_log_store import JobLogStore
+from execution_engine.tracking_service import ProductTrackingService
+from execution_engine.sensor_store import SensorStore
+from execution_engine.inference_runtime import InferenceError, get_inference_runtime
+from querygoal.runtime.clients.scheduler import get_request_scheduler, priority_for_goal_type
+from execution_engine.filter_plan import (
+    FILTER_APPLIED_HEADER,
+    compile_filter_plan,
+    pushdown_supported,
+    record_pushdown_support
+)
 from config import (
     AAS_SERVER_URL, 
     AAS_SERVER_IP, 
     AAS_SERVER_PORT, 
     AAS_SERVER_TYPE,
-    USE_STANDARD_SERVER
+    USE_STANDARD_SERVER,
+    AAS_MAX_CONNECTIONS,
+    JOB_LOG_STORE_PATH,
+    AAS_FILTER_PUSHDOWN,
+    TRACKING_POLL_INTERVAL_SECONDS,
+    TRACKING_MAX_STALENESS_SECONDS,
+    TRACKING_HISTORY_SIZE,
+    TRACKING_IDLE_TTL_SECONDS,
+    TRACKING_POLL_WINDOW_SECONDS,
+    SENSOR_BUFFER_SIZE,
+    SENSOR_EWMA_ALPHA,
+    SENSOR_ANOMALY_Z_THRESHOLD,
+    SENSOR_WARMUP_SAMPLES,
+    MODEL_REGISTRY_FILE_PATH,
+    INFERENCE_MAX_BATCH_SIZE,
+    INFERENCE_MAX_BATCH_DELAY_MS,
+    INFERENCE_TIMEOUT_SECONDS
 )
 
 # 표준 서버를 사용할 경우에만 AASQueryClient 임포트
@@ -29,35 +58,64 @@ class AASQueryHandler:
     AAS 서버에 데이터를 요청하는 핸들러
     Mock과 Standard 서버 모두 지원
     """
+    # 이전 단계 결과를 읽지 않음 (다른 조회 액션과 동시 실행 가능)
+    context_reads = ()
+
     def __init__(self):
         self.server_type = AAS_SERVER_TYPE
         
+        # 여러 제품/액션 동시 조회 시 연결 재사용
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=AAS_MAX_CONNECTIONS)
+        self.session.mount("http://", adapter)
+
         if USE_STANDARD_SERVER:
             # 표준 서버 사용 시 AASQueryClient 인스턴스 생성
-            self.client = AASQueryClient(AAS_SERVER_IP, AAS_SERVER_PORT)
+            self.client = AASQueryClient(AAS_SERVER_IP, AAS_SERVER_PORT, pool_maxsize=AAS_MAX_CONNECTIONS)
             print(f"🔄 AASQueryHandler: Using STANDARD server client")
         else:
             # Mock 서버 사용 시 기존 방식 유지
             self.client = None
             print(f"📦 AASQueryHandler: Using MOCK server (direct HTTP)")
+
+        # AAS 서버 요청은 QueryGoal 런타임과 같은 서버별 rate limit/우선순위 대기열을 거침
+        self.scheduler = get_request_scheduler()
+
+        # Goal 4 제품 위치는 메모리 캐시 + 백그라운드 polling으로 제공
+        # (요청 경로 조회는 interactive, 백그라운드 polling은 normal 우선순위)
+        self.tracking_service = ProductTrackingService(
+            fetch=lambda sm_id: self._query_server(sm_id, "interactive"),
+            poll_fetch=lambda sm_id: self._query_server(sm_id, "normal"),
+            poll_interval=TRACKING_POLL_INTERVAL_SECONDS,
+            max_staleness=TRACKING_MAX_STALENESS_SECONDS,
+            history_size=TRACKING_HISTORY_SIZE,
+            idle_ttl=TRACKING_IDLE_TTL_SECONDS,
+            poll_window=TRACKING_POLL_WINDOW_SECONDS
+        )
     
     def _to_base64url(self, s: str) -> str:
         """Base64 URL 인코딩 (Mock 서버용)"""
         return base64.urlsafe_b64encode(s.encode()).decode().rstrip("=")
     
-    def _query_mock_server(self, target_sm_id: str) -> Dict[str, Any]:
+    def _admit(self, priority: str):
+        """AAS 서버 요청 1건 발송 허가 대기 (token bucket + 우선순위)"""
+        self.scheduler.acquire_blocking(AAS_SERVER_URL, priority)
+
+    def _query_mock_server(self, target_sm_id: str, priority: str = "normal") -> Dict[str, Any]:
         """Mock 서버에 직접 쿼리 (기존 로직)"""
         b64id = self._to_base64url(target_sm_id)
         url = f"{AAS_SERVER_URL}/submodels/{b64id}"
         
         print(f"INFO: Requesting from MOCK server: {url}")
-        response = requests.get(url, timeout=10)
+        self._admit(priority)
+        response = self.session.get(url, timeout=10)
         response.raise_for_status()
         return response.json()
     
-    def _query_standard_server(self, target_sm_id: str) -> Dict[str, Any]:
+    def _query_standard_server(self, target_sm_id: str, priority: str = "normal") -> Dict[str, Any]:
         """표준 서버에 AASQueryClient를 통해 쿼리"""
         print(f"INFO: Requesting from STANDARD server: {target_sm_id}")
+        self._admit(priority)
         
         try:
             # AASQueryClient의 get_submodel_by_id 메소드 사용
@@ -69,11 +127,51 @@ class AASQueryHandler:
         except Exception as e:
             print(f"ERROR: Standard server query failed: {e}")
             raise
+
+    def _query_server(self, target_sm_id: str, priority: str = "normal") -> Dict[str, Any]:
+        """서버 타입에 따라 Submodel 조회"""
+        if USE_STANDARD_SERVER:
+            return self._query_standard_server(target_sm_id, priority)
+        return self._query_mock_server(target_sm_id, priority)
+
+    def _query_with_pushdown(self, target_sm_id: str, plan, priority: str = "normal") -> Optional[Dict[str, Any]]:
+        """
+        FilterPlan을 $filter 쿼리 파라미터로 전달하여 조회
+
+        Returns:
+            - 서버가 필터를 적용한 응답 (filter_pushdown 키 포함)
+            - 서버가 $filter를 무시한 경우 그대로 받은 전체 응답
+            - None: 거부/요청 실패 (호출 측에서 전체 조회)
+        """
+        url = f"{AAS_SERVER_URL}/submodels/{self._to_base64url(target_sm_id)}"
+        self._admit(priority)
+        try:
+            response = self.session.get(url, params=plan.to_query_params(), timeout=10)
+        except requests.RequestException as e:
+            print(f"WARNING: Filter pushdown request failed, fetching full submodel: {e}")
+            return None
+
+        if response.status_code in (400, 405, 501):
+            # $filter를 거부한 서버 → 이후 요청은 바로 전체 조회
+            record_pushdown_support(AAS_SERVER_URL, False)
+            return None
+        if not response.ok:
+            return None
+
+        if response.headers.get(FILTER_APPLIED_HEADER, "").lower() != "true":
+            # $filter를 무시하고 전체 Submodel을 반환한 서버
+            record_pushdown_support(AAS_SERVER_URL, False)
+            return response.json()
+
+        record_pushdown_support(AAS_SERVER_URL, True)
+        print(f"INFO: Filter pushed down to AAS server ({len(response.content)} bytes)")
+        return {**response.json(), "filter_pushdown": plan.to_dict()}
     
     def execute(self, step_details: dict, context: dict) -> dict:
         params = step_details.get('params', {})
         goal = params.get('goal')
         action_id = step_details.get('action_id')
+        priority = priority_for_goal_type(goal)
         
         # Goal 3의 ActionFetchProductSpec: J1, J2, J3 process_plan 조회
         if action_id == 'ActionFetchProductSpec' and goal == 'predict_first_completion_time':
@@ -84,10 +182,7 @@ class AASQueryHandler:
             for job_id in ['J1', 'J2', 'J3']:
                 try:
                     target_sm_id = f"urn:factory:submodel:process_plan:{job_id}"
-                    if USE_STANDARD_SERVER:
-                        result = self._query_standard_server(target_sm_id)
-                    else:
-                        result = self._query_mock_server(target_sm_id)
+                    result = self._query_server(target_sm_id, priority)
                     all_process_data.append(result)
                     print(f"  ✅ {job_id} process_plan fetched")
                 except Exception as e:
@@ -104,10 +199,7 @@ class AASQueryHandler:
             for machine_id in ['M1', 'M2', 'M3']:
                 try:
                     target_sm_id = f"urn:factory:submodel:process_data:{machine_id}"
-                    if USE_STANDARD_SERVER:
-                        result = self._query_standard_server(target_sm_id)
-                    else:
-                        result = self._query_mock_server(target_sm_id)
+                    result = self._query_server(target_sm_id, priority)
                     all_machine_data.append(result)
                     print(f"  ✅ {machine_id} process_data fetched")
                 except Exception as e:
@@ -117,13 +209,12 @@ class AASQueryHandler:
         
         # 기존 로직
         else:
+            # Goal 조건(date/status/process step/product_id)을 조회 대상 + 레코드 조건으로 컴파일
+            plan = compile_filter_plan(goal, params, step_details.get('target_submodel_id'))
             target_sm_id = step_details.get('target_submodel_id')
             if not target_sm_id:
-                if goal == 'track_product_position':
-                    product_id = params.get('product_id')
-                    if not product_id:
-                        raise ValueError("product_id is required for track_product_position")
-                    target_sm_id = f"urn:factory:submodel:tracking_data:{product_id.lower()}"
+                if plan is not None:
+                    target_sm_id = plan.submodel_id
                 elif goal == 'detect_anomaly_for_product':
                     target_machine = params.get('target_machine')
                     if not target_machine:
@@ -132,12 +223,20 @@ class AASQueryHandler:
                 else:
                     raise ValueError(f"Cannot determine target for goal: {goal}")
         
+            # Goal 4: 최신 위치가 충분히 새로우면 AAS 서버 왕복 없이 응답
+            if goal == 'track_product_position' and target_sm_id == plan.submodel_id:
+                return self.tracking_service.get_position(params['product_id'])
+
+            # 레코드 조건은 서버가 지원하면 서버에서 평가 (미지원이 확인된 서버는 건너뜀)
+            if (plan is not None and plan.predicates and AAS_FILTER_PUSHDOWN
+                    and pushdown_supported(AAS_SERVER_URL) is not False):
+                pushed = self._query_with_pushdown(target_sm_id, plan, priority)
+                if pushed is not None:
+                    return pushed
+        
         # 서버 타입에 따라 다른 쿼리 방식 사용
         try:
-            if USE_STANDARD_SERVER:
-                return self._query_standard_server(target_sm_id)
-            else:
-                return self._query_mock_server(target_sm_id)
+            return self._query_server(target_sm_id, priority)
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
                 # Goal 3의 경우 404 에러를 무시하고 빈 데이터 반환 (fallback 로직이 처리)
@@ -151,10 +250,15 @@ class AASQueryHandler:
 
 class DataFilteringHandler:
     """AAS에서 가져온 데이터를 DSL 조건에 맞게 필터링하거나 가공하는 핸들러"""
-    
-    def _parse_value(self, data: Any) -> Any:
+    context_reads = ("ActionFetchJobLog", "ActionFetchTrackingData")
+
+    def __init__(self):
+        # Goal 1 job_log는 한 번 적재 후 인덱스로 조회 (로그가 바뀐 경우에만 증분 갱신)
+        self.job_log_store = JobLogStore(JOB_LOG_STORE_PATH)
+
+    def _extract_value(self, data: Any) -> Any:
         """
-        서버 응답의 value 필드를 파싱
+        서버 응답의 value 필드 원문 추출 (JSON 문자열은 파싱하지 않음)
         Mock과 Standard 서버의 다른 응답 형식 처리
         """
         if isinstance(data, dict):
@@ -162,24 +266,24 @@ class DataFilteringHandler:
             if 'submodelElements' in data:
                 elements = data.get('submodelElements', [])
                 if elements and len(elements) > 0:
-                    value = elements[0].get('value')
-                    # value가 문자열이면 JSON 파싱 시도
-                    if isinstance(value, str):
-                        try:
-                            return json.loads(value)
-                        except json.JSONDecodeError:
-                            return value
-                    return value
+                    return elements[0].get('value')
             # 직접 value가 있는 경우
             elif 'value' in data:
-                value = data.get('value')
-                if isinstance(value, str):
-                    try:
-                        return json.loads(value)
-                    except json.JSONDecodeError:
-                        return value
-                return value
+                return data.get('value')
         return data
+
+    def _parse_value(self, data: Any) -> Any:
+        """
+        서버 응답의 value 필드를 파싱
+        Mock과 Standard 서버의 다른 응답 형식 처리
+        """
+        value = self._extract_value(data)
+        if value is not data and isinstance(value, str):
+            try:
+                return json.loads(value)
+            except json.JSONDecodeError:
+                return value
+        return value
     
     def execute(self, step_details: dict, context: dict) -> dict:
         params = step_details.get('params', {})
@@ -187,28 +291,27 @@ class DataFilteringHandler:
         
         # Goal 1: 실패한 냉각 Job 필터링 로직
         if goal == 'query_failed_jobs_with_cooling':
-            data_to_filter = None
+            plan = compile_filter_plan(goal, params)
+            fetched = None
             for key, value in context.items():
                 if 'ActionFetchJobLog' in key:
-                    data_to_filter = self._parse_value(value)
+                    fetched = value
                     break
             
-            if data_to_filter is None:
+            if fetched is None:
                 raise ValueError("Could not find data from previous step for Goal 1.")
-            
-            # 리스트가 아니면 리스트로 변환
-            if not isinstance(data_to_filter, list):
-                data_to_filter = [data_to_filter] if data_to_filter else []
 
-            request_date = params.get('date')
-            filtered_jobs = [
-                job for job in data_to_filter
-                if job.get('date') == request_date
-                and job.get('status') == 'FAILED'
-                and 'cooling' in job.get('process_steps', [])
-            ]
-            return {"final_result": filtered_jobs}
-        
+            # 서버가 조건을 적용한 응답: 축소된 결과를 같은 조건으로 확인만 (인덱스에는 적재하지 않음)
+            if isinstance(fetched, dict) and fetched.get('filter_pushdown'):
+                return {"final_result": plan.evaluate(self._parse_value(fetched))}
+
+            # 전체 로그: 바뀌지 않았으면 파싱 없이, 뒤에 추가된 경우 추가분만 인덱스에 적재
+            raw_log = self._extract_value(fetched)
+            refresh = self.job_log_store.refresh(raw_log if raw_log else [])
+            print(f"INFO: Job log index {refresh} ({self.job_log_store.count()} jobs)")
+
+            return {"final_result": self.job_log_store.query_plan(plan)}
+
         # Goal 4: 제품 위치 추적 로직
         elif goal == 'track_product_position':
             tracking_data = None
@@ -227,6 +330,7 @@ class DataFilteringHandler:
 
 class SimulationInputHandler:
     """여러 소스의 데이터를 조합하여 시뮬레이터 입력 파일을 생성하는 핸들러"""
+    context_reads = ("ActionFetchProductSpec", "ActionFetchAllMachineData")
     def execute(self, step_details: dict, context: dict) -> dict:
         params = step_details.get('params', {})
         job_id = str(uuid.uuid4())
@@ -263,7 +367,9 @@ class EnhancedDockerRunHandler:
     AASX-main simulator를 실행하는 향상된 핸들러
     온톨로지 변경 없이 기존 ActionRunSimulator 액션에서 호출됨
     """
-    
+    # 시뮬레이터 입력 파일(simulation_inputs.json)을 만드는 조립 단계 이후에 실행되어야 함
+    context_reads = ("ActionAssembleSimulatorInputs", "ActionFetchProductSpec", "ActionFetchAllMachine")
+
     def __init__(self):
         # Kubernetes 설정
         try: 
@@ -913,16 +1019,85 @@ class K8sJobHandler(EnhancedDockerRunHandler):
     pass
 
 class AIModelHandler:
+    """
+    ai_model_inference 액션 핸들러
+
+    - 온톨로지 액션에 factory:usesModel이 지정된 경우: 레지스트리 모델을 추론 런타임(micro-batch)으로 실행
+    - Goal 2: 센서 데이터를 설비별 ring buffer에 적재하고 누적 통계(EWMA z-score, rolling quantile)로 이상 감지
+    """
+    context_reads = READS_ALL
+
+    def __init__(self):
+        # 요청마다 전체 이력을 다시 계산하지 않도록 설비별 통계를 프로세스 메모리에 유지
+        self.sensor_store = SensorStore(
+            capacity=SENSOR_BUFFER_SIZE,
+            alpha=SENSOR_EWMA_ALPHA,
+            z_threshold=SENSOR_ANOMALY_Z_THRESHOLD,
+            warmup=SENSOR_WARMUP_SAMPLES
+        )
+        # 레지스트리 모델은 프로세스당 한 번만 로드 (inference 항목이 있는 모델을 시작 시 미리 로드)
+        self.inference_runtime = get_inference_runtime(
+            str(MODEL_REGISTRY_FILE_PATH),
+            max_batch_size=INFERENCE_MAX_BATCH_SIZE,
+            max_batch_delay=INFERENCE_MAX_BATCH_DELAY_MS / 1000.0
+        )
+        self.inference_runtime.warm_up()
+
+    def _model_inputs(self, params: dict, context: dict) -> dict:
+        """feature 값: 요청 파라미터 우선, 없으면 이전 단계 결과의 최상위 값"""
+        inputs = {}
+        for step_result in context.values():
+            if isinstance(step_result, dict):
+                inputs.update(step_result)
+        inputs.update(params)
+        return inputs
+
     def execute(self, step_details: dict, context: dict) -> dict:
-        print("INFO: AI Model Handler (Not Implemented)")
-        return {"result": "AI model placeholder"}
+        params = step_details.get('params', {})
+        goal = params.get('goal')
+
+        model_id = step_details.get('model_id') or params.get('model_id')
+        if model_id:
+            try:
+                outputs = self.inference_runtime.predict(model_id, self._model_inputs(params, context),
+                                                         timeout=INFERENCE_TIMEOUT_SECONDS)
+            except InferenceError as e:
+                raise ValueError(f"Inference with {model_id} failed: {e}")
+            return {"final_result": {"model_id": model_id, **outputs}}
+
+        if goal != 'detect_anomaly_for_product':
+            print("INFO: AI Model Handler (Not Implemented)")
+            return {"result": "AI model placeholder"}
+
+        sensor_data = None
+        for key, value in context.items():
+            if 'ActionFetchSensorData' in key:
+                sensor_data = value
+                break
+
+        if sensor_data is None:
+            raise ValueError("Could not find sensor data from previous step for Goal 2.")
+
+        machine = (params.get('target_machine') or
+                   (sensor_data.get('id') if isinstance(sensor_data, dict) else None) or 'unknown').lower()
+        appended = self.sensor_store.ingest(machine, sensor_data)
+        result = self.sensor_store.detect(machine)
+        print(f"INFO: Sensor store {machine}: +{appended} samples ({result['samples']} total), "
+              f"anomaly={result['anomaly']}")
+
+        return {"final_result": result}
 
 # --- ExecutionAgent 최종본 ---
 class ExecutionAgent:
-    def __init__(self):
+    def __init__(self, max_workers: int = 4, handlers: Optional[dict] = None):
+        """
+        Args:
+            max_workers: 서로 의존하지 않는 액션의 동시 실행 수 (1이면 순차 실행)
+            handlers: 실행 유형별 핸들러 (None이면 기본 핸들러 생성)
+        """
         print(f"🚀 Initializing ExecutionAgent with {AAS_SERVER_TYPE} server")
         
-        self.handlers = {
+        self.handlers = handlers if handlers is not None else {
             "aas_query": AASQueryHandler(),
             "aas_query_multiple": AASQueryHandler(),
             "internal_processing": SimulationInputHandler(),
@@ -930,30 +1105,69 @@ class ExecutionAgent:
             "data_filtering": DataFilteringHandler(),
             "ai_model_inference": AIModelHandler(),
         }
-        
+        # 서로 의존하지 않는 액션은 동시에 실행
+        self.dag_executor = ActionDagExecutor(max_workers=max_workers)
+
+    def _context_reads(self, step: dict):
+        """액션이 읽는 이전 단계 결과 (핸들러에 선언이 없으면 앞선 모든 단계)"""
+        handler = self.handlers.get(step.get("type"))
+        return getattr(handler, "context_reads", READS_ALL) if handler else ()
+
+    def _execute_step(self, index: int, step: dict, context: dict):
+        action_type = step.get("type")
+        handler = self.handlers.get(action_type)
+
+        if not handler:
+            print(f"WARN: No handler for action type '{action_type}', skipping.")
+            return None
+
+        try:
+            return handler.execute(step, context)
+        except Exception as e:
+            print(f"ERROR: Step {index+1} ({step.get('action_id')}) failed: {e}")
+            raise
+
     def run(self, plan: list, initial_params: dict) -> dict:
-        execution_context = {}
-        final_result = {}
-        
-        for i, step in enumerate(plan):
-            step['params'] = initial_params
+        """플랜 실행 결과 (마지막 final_result 단계 결과, 없으면 전체 컨텍스트 - 순차 실행과 같은 형태)"""
+        result, _ = self.run_with_timings(plan, initial_params)
+        return result
 
-            action_type = step.get("type")
-            handler = self.handlers.get(action_type)
+    def run_with_timings(self, plan: list, initial_params: dict):
+        """
+        run()과 같은 결과 + 액션별 실행 시간 기록
 
-            if not handler:
-                print(f"WARN: No handler for action type '{action_type}', skipping.")
-                continue
-            
-            try:
-                step_result = handler.execute(step, execution_context)
-                execution_context[f"step_{i+1}_{step['action_id']}"] = step_result
+        Returns:
+            (결과, [{"step", "action_id", "dependsOn", "startOffsetMs", "durationMs"}, ...])
+        """
+        # 공유 플랜 dict를 수정하지 않도록 실행용 복사본에 파라미터 설정
+        steps = [{**step, "params": initial_params} for step in plan]
 
-                if "final_result" in step_result:
-                    final_result = step_result
-                    
-            except Exception as e:
-                print(f"ERROR: Step {i+1} ({step.get('action_id')}) failed: {e}")
-                raise
+        execution_context, timings = self.dag_executor.run(steps, self._execute_step, self._context_reads)
+
+        for timing in timings:
+            print(f"INFO: Step {timing['step']} ({timing['action_id']}) "
+                  f"took {timing['durationMs']:.1f} ms (deps: {timing['dependsOn'] or '-'})")
+
+        # 순차 실행과 동일하게 시퀀스상 마지막 final_result 결과 사용
+        final_result = {}
+        for step_result in execution_context.values():
+            if "final_result" in step_result:
+                final_result = step_result
+
+        result = final_result if final_result else execution_context
+        return result, timings
 
-        return final_result if final_result else execution_context
\ No newline at end of file
+    def run_many(self, plan: list, params_list: list, max_workers: int = 16):
+        """
+        같은 플랜을 여러 파라미터로 동시에 실행 (예: Goal 4 다중 제품 추적)
+
+        Yields:
+            (params_list 인덱스, 결과 또는 None, 예외 또는 None) - 완료되는 순서대로
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(self.run, plan, params): index for index, params in enumerate(params_list)}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result(), None
+                except Exception as e:
+                    yield futures[future], None, e
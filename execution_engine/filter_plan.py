@@ -0,0 +1,134 @@
+# execution_engine/filter_plan.py
+"""
+DataFilteringHandler 필터 조건의 FilterPlan 컴파일 및 서버 측 pushdown
+
+Goal 파라미터(date, status, process step, product_id)를 FilterPlan으로 만들어
+- AAS_FILTER_PUSHDOWN이 켜져 있으면 $filter 쿼리 파라미터로 AAS 서버에 전달하고 (응답 헤더 X-Filter-Applied로 적용 여부 확인)
+  표준 AAS API에는 $filter/X-Filter-Applied가 없으므로 이를 구현한 서버(프록시 등)에서만 켠다.
+- 지원하지 않으면 전체 Submodel을 받아 클라이언트에서 같은 조건으로 평가한다.
+
+서버가 필터링한 결과도 클라이언트에서 한 번 더 평가하므로(축소된 결과라 비용이 작음)
+두 경로의 결과는 항상 같다.
+"""
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from execution_engine.tracking_service import tracking_submodel_id
+
+# 서버가 $filter를 적용했음을 알리는 응답 헤더 (없으면 필터를 무시한 전체 응답으로 간주)
+FILTER_APPLIED_HEADER = "X-Filter-Applied"
+
+JOB_LOG_SUBMODEL_ID = "urn:factory:submodel:job_log"
+
+
+def _literal(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return str(value).lower() if isinstance(value, bool) else str(value)
+
+
+@dataclass(frozen=True)
+class FilterPredicate:
+    """레코드 조건 하나 (op: eq = 값 일치, contains = 리스트 필드에 값 포함)"""
+    field: str
+    op: str
+    value: Any
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        if self.op == "eq":
+            return record.get(self.field) == self.value
+        if self.op == "contains":
+            return self.value in (record.get(self.field) or [])
+        raise ValueError(f"Unsupported filter operator: {self.op}")
+
+    def to_expression(self) -> str:
+        """OData 스타일 $filter 식"""
+        if self.op == "eq":
+            return f"{self.field} eq {_literal(self.value)}"
+        return f"contains({self.field},{_literal(self.value)})"
+
+
+@dataclass(frozen=True)
+class FilterPlan:
+    """
+    Goal별 조회 대상 Submodel과 레코드 조건
+
+    predicates가 비어 있으면 Submodel 주소 지정(product_id 등)만으로 조건이 반영된 것이다.
+    """
+    goal: str
+    submodel_id: str
+    predicates: Tuple[FilterPredicate, ...] = field(default_factory=tuple)
+
+    def evaluate(self, records: Any) -> List[Dict[str, Any]]:
+        """클라이언트 측 평가 (원래 레코드 순서 유지, dict가 아닌 항목은 제외)"""
+        if not isinstance(records, list):
+            records = [records] if records else []
+        return [
+            record for record in records
+            if isinstance(record, dict) and all(p.matches(record) for p in self.predicates)
+        ]
+
+    def to_query_params(self) -> Dict[str, str]:
+        """서버 pushdown용 쿼리 파라미터 (조건이 없으면 빈 dict)"""
+        if not self.predicates:
+            return {}
+        return {"$filter": " and ".join(p.to_expression() for p in self.predicates)}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "goal": self.goal,
+            "submodelId": self.submodel_id,
+            "predicates": [{"field": p.field, "op": p.op, "value": p.value} for p in self.predicates]
+        }
+
+
+def compile_filter_plan(goal: str,
+                        params: Dict[str, Any],
+                        target_submodel_id: Optional[str] = None) -> Optional[FilterPlan]:
+    """
+    Goal 파라미터로 FilterPlan 생성 (필터링 대상이 아닌 Goal은 None)
+
+    Raises:
+        ValueError: 필수 파라미터 누락
+    """
+    if goal == "query_failed_jobs_with_cooling":
+        return FilterPlan(
+            goal=goal,
+            submodel_id=target_submodel_id or JOB_LOG_SUBMODEL_ID,
+            predicates=(
+                FilterPredicate("date", "eq", params.get("date")),
+                FilterPredicate("status", "eq", "FAILED"),
+                FilterPredicate("process_steps", "contains", "cooling"),
+            )
+        )
+
+    if goal == "track_product_position":
+        # 제품별 tracking Submodel을 직접 지정하므로 레코드 조건 없음
+        product_id = params.get("product_id")
+        if not product_id:
+            raise ValueError("product_id is required for track_product_position")
+        return FilterPlan(
+            goal=goal,
+            submodel_id=target_submodel_id or tracking_submodel_id(product_id)
+        )
+
+    return None
+
+
+_pushdown_support: Dict[str, bool] = {}
+_pushdown_lock = threading.Lock()
+
+
+def pushdown_supported(server_url: str) -> Optional[bool]:
+    """서버의 $filter 지원 여부 (아직 확인 전이면 None)"""
+    return _pushdown_support.get(server_url)
+
+
+def record_pushdown_support(server_url: str, supported: bool):
+    with _pushdown_lock:
+        if _pushdown_support.get(server_url) != supported:
+            _pushdown_support[server_url] = supported
+            print(f"INFO: AAS filter pushdown {'supported' if supported else 'not supported'} by {server_url}")
@@ -0,0 +1,384 @@
+# execution_engine/inference_runtime.py
+"""
+CPU 추론 런타임 (ai_model_inference 액션)
+
+model_registry.json에서 "inference" 항목이 있는 모델을 프로세스당 한 번만 로드하여 유지하고,
+동시에 들어온 요청을 모델별 micro-batch로 묶어 한 번의 predict 호출로 처리한다.
+
+레지스트리 항목 예시:
+    "inference": {
+        "runtime": "onnx" | "sklearn",
+        "artifact": "models/nsga2_surrogate.onnx",   # 레지스트리 파일 기준 상대 경로
+        "features": ["jobCount", "quantity"],
+        "outputs": ["predicted_completion_time"],
+        "maxBatchSize": 64,                           # 생략 시 INFERENCE_MAX_BATCH_SIZE
+        "maxBatchDelayMs": 5                          # 첫 요청 이후 배치를 모으는 최대 대기 시간
+    }
+
+- onnx: onnxruntime CPUExecutionProvider (선택적 의존성)
+- sklearn: pickle로 저장된 estimator (predict 메서드를 가진 객체)
+- 레지스트리가 재로드되어 모델 version/artifact가 바뀌면 다음 요청에서 다시 로드
+"""
+import pickle
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from execution_engine.swrl.model_registry import ModelRegistry, get_model_registry
+
+try:
+    import onnxruntime as ort
+except ImportError:  # 선택적 의존성
+    ort = None
+
+SUPPORTED_RUNTIMES = ["onnx", "sklearn"]
+
+
+class InferenceError(Exception):
+    """모델 로드 / 추론 에러"""
+    pass
+
+
+def _onnx_predictor(path: Path) -> Callable[[np.ndarray], np.ndarray]:
+    if ort is None:
+        raise InferenceError(f"onnxruntime is required to load {path}")
+    session = ort.InferenceSession(str(path), providers=["CPUExecutionProvider"])
+    input_name = session.get_inputs()[0].name
+    input_type = session.get_inputs()[0].type
+    dtype = np.float64 if "double" in input_type else np.float32
+
+    def predict(batch: np.ndarray) -> np.ndarray:
+        return np.asarray(session.run(None, {input_name: batch.astype(dtype)})[0])
+
+    return predict
+
+
+def _sklearn_predictor(path: Path) -> Callable[[np.ndarray], np.ndarray]:
+    with open(path, "rb") as f:
+        estimator = pickle.load(f)
+    if not hasattr(estimator, "predict"):
+        raise InferenceError(f"Pickled object in {path} has no predict method")
+    return lambda batch: np.asarray(estimator.predict(batch))
+
+
+def _mtime(path: Path) -> Optional[float]:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+_LOADERS = {
+    "onnx": _onnx_predictor,
+    "sklearn": _sklearn_predictor,
+}
+
+
+class MicroBatcher:
+    """
+    요청을 모아 배치 단위로 predict 호출 (모델당 worker 스레드 1개)
+
+    첫 요청이 도착한 뒤 max_delay 안에 들어온 요청을 max_batch_size까지 한 배치로 묶는다.
+    요청이 하나뿐이면 max_delay만큼만 지연되고, 부하가 높을수록 배치가 커진다.
+    """
+
+    def __init__(self,
+                 predict: Callable[[np.ndarray], np.ndarray],
+                 max_batch_size: int = 64,
+                 max_delay: float = 0.005,
+                 name: str = "model"):
+        self.predict = predict
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._queue: "queue.Queue[Optional[Tuple[np.ndarray, Future, float]]]" = queue.Queue()
+        self._latencies: Deque[float] = deque(maxlen=1000)
+        self._started = time.monotonic()
+        self.stats = {"requests": 0, "batches": 0, "errors": 0, "maxBatch": 0}
+        self._worker = threading.Thread(target=self._run, name=f"inference-{name}", daemon=True)
+        self._worker.start()
+
+    def submit(self, row: np.ndarray) -> Future:
+        future: Future = Future()
+        self._queue.put((row, future, time.monotonic()))
+        return future
+
+    def _collect(self) -> List[Tuple[np.ndarray, Future, float]]:
+        first = self._queue.get()
+        if first is None:
+            return []
+        batch = [first]
+        deadline = first[2] + self.max_delay
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # 남은 배치 처리 후 종료
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if not batch:
+                return
+            try:
+                outputs = self.predict(np.stack([row for row, _, _ in batch]))
+                outputs = outputs.reshape(len(batch), -1)
+            except Exception as e:
+                self.stats["errors"] += 1
+                for _, future, _ in batch:
+                    future.set_exception(InferenceError(f"Inference failed: {e}"))
+                continue
+
+            done = time.monotonic()
+            for (_, future, enqueued), output in zip(batch, outputs):
+                self._latencies.append(done - enqueued)
+                future.set_result(output)
+
+            self.stats["requests"] += len(batch)
+            self.stats["batches"] += 1
+            self.stats["maxBatch"] = max(self.stats["maxBatch"], len(batch))
+
+    def close(self):
+        self._queue.put(None)
+        self._worker.join(timeout=1)
+
+    def metrics(self) -> Dict[str, Any]:
+        latencies = np.array(self._latencies) * 1000.0
+        elapsed = time.monotonic() - self._started
+        return {
+            **self.stats,
+            "avgBatchSize": self.stats["requests"] / self.stats["batches"] if self.stats["batches"] else 0.0,
+            "queueDepth": self._queue.qsize(),
+            "throughputRps": self.stats["requests"] / elapsed if elapsed > 0 else 0.0,
+            "latencyMs": {
+                "p50": float(np.percentile(latencies, 50)) if latencies.size else None,
+                "p95": float(np.percentile(latencies, 95)) if latencies.size else None,
+                "p99": float(np.percentile(latencies, 99)) if latencies.size else None
+            }
+        }
+
+
+@dataclass
+class LoadedModel:
+    """로드된 모델과 배치 처리기"""
+    model_id: str
+    version: Optional[str]
+    artifact: Path
+    features: List[str]
+    outputs: List[str]
+    batcher: MicroBatcher
+    load_time_ms: float
+
+
+class InferenceRuntime:
+    """
+    레지스트리 모델의 프로세스 전역 추론 런타임
+
+    Args:
+        registry: 모델 레지스트리 (artifact 상대 경로는 레지스트리 파일 위치 기준)
+        max_batch_size / max_batch_delay: 레지스트리 항목에 값이 없을 때 사용하는 기본값
+    """
+
+    def __init__(self, registry: ModelRegistry, max_batch_size: int = 64, max_batch_delay: float = 0.005):
+        self.registry = registry
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self._models: Dict[str, LoadedModel] = {}
+        # 로드 실패 캐시: 모델 ID -> ((version, artifact, artifact mtime), 에러 메시지)
+        self._load_failures: Dict[str, Tuple[Tuple[Any, Path, Optional[float]], str]] = {}
+        self._lock = threading.Lock()
+
+    def servable_models(self) -> List[str]:
+        """inference 항목이 있고 모델 파일이 준비된 모델 ID (아직 학습되지 않은 모델은 제외)"""
+        self.registry.refresh_if_changed()
+        return [model["modelId"] for model in self.registry.models() if self.registry.is_servable(model)]
+
+    def get(self, model_id: str) -> LoadedModel:
+        """
+        로드된 모델 반환 (처음 요청되었거나 레지스트리 항목이 바뀐 경우에만 로드)
+
+        Raises:
+            InferenceError: 레지스트리에 없거나 inference 항목이 없는 모델, 로드 실패
+        """
+        self.registry.refresh_if_changed()
+        spec = self.registry.get(model_id)
+        if spec is None:
+            raise InferenceError(f"Model not found in registry: {model_id}")
+        inference = spec.get("inference")
+        if not isinstance(inference, dict):
+            raise InferenceError(f"Model {model_id} has no inference spec")
+
+        artifact = self.registry.artifact_path(spec)
+        if artifact is None:
+            raise InferenceError(f"Model {model_id} has no inference artifact")
+        loaded = self._models.get(model_id)
+        if loaded is not None and loaded.version == spec.get("version") and loaded.artifact == artifact:
+            return loaded
+
+        with self._lock:
+            loaded = self._models.get(model_id)
+            if loaded is not None and loaded.version == spec.get("version") and loaded.artifact == artifact:
+                return loaded
+
+            # 같은 version/파일로 이미 실패한 모델은 다시 읽지 않음 (파일이나 레지스트리가 바뀌면 재시도)
+            failure_key = (spec.get("version"), artifact, _mtime(artifact))
+            failure = self._load_failures.get(model_id)
+            if failure is not None and failure[0] == failure_key:
+                raise InferenceError(failure[1])
+
+            try:
+                new_model = self._load(model_id, spec, inference, artifact)
+            except InferenceError as e:
+                self._load_failures[model_id] = (failure_key, str(e))
+                print(f"WARNING: {e}")
+                raise
+            self._load_failures.pop(model_id, None)
+            self._models[model_id] = new_model
+        if loaded is not None:
+            loaded.batcher.close()
+        return new_model
+
+    def _load(self, model_id: str, spec: Dict[str, Any], inference: Dict[str, Any], artifact: Path) -> LoadedModel:
+        runtime = inference.get("runtime")
+        if runtime not in _LOADERS:
+            raise InferenceError(f"Unsupported inference runtime for {model_id}: {runtime} "
+                                 f"(supported: {SUPPORTED_RUNTIMES})")
+        if not artifact.exists():
+            raise InferenceError(f"Model artifact not found for {model_id}: {artifact}")
+
+        started = time.perf_counter()
+        try:
+            predict = _LOADERS[runtime](artifact)
+        except InferenceError:
+            raise
+        except Exception as e:
+            raise InferenceError(f"Failed to load {model_id} from {artifact}: {e}")
+        load_time_ms = (time.perf_counter() - started) * 1000
+
+        max_delay_ms = inference.get("maxBatchDelayMs")
+        batcher = MicroBatcher(
+            predict,
+            max_batch_size=int(inference.get("maxBatchSize", self.max_batch_size)),
+            max_delay=self.max_batch_delay if max_delay_ms is None else float(max_delay_ms) / 1000.0,
+            name=model_id
+        )
+        print(f"INFO: Loaded {runtime} model {model_id}@{spec.get('version')} in {load_time_ms:.1f} ms")
+
+        return LoadedModel(
+            model_id=model_id,
+            version=spec.get("version"),
+            artifact=artifact,
+            features=list(inference.get("features", [])),
+            outputs=list(inference.get("outputs", [])),
+            batcher=batcher,
+            load_time_ms=load_time_ms
+        )
+
+    def warm_up(self, model_ids: Optional[Sequence[str]] = None) -> Dict[str, Optional[str]]:
+        """모델을 미리 로드 (모델 ID -> 실패 시 에러 메시지, 성공 시 None)"""
+        errors: Dict[str, Optional[str]] = {}
+        for model_id in (model_ids if model_ids is not None else self.servable_models()):
+            try:
+                self.get(model_id)
+                errors[model_id] = None
+            except InferenceError as e:
+                print(f"WARNING: Inference warm-up failed for {model_id}: {e}")
+                errors[model_id] = str(e)
+        return errors
+
+    def submit(self, model_id: str, inputs: Dict[str, Any]) -> Future:
+        """
+        입력 dict(feature 이름 -> 값)를 배치 큐에 넣고 Future 반환 (결과: output 이름 -> 값)
+
+        Raises:
+            InferenceError: 필요한 feature 누락 또는 숫자가 아닌 값
+        """
+        model = self.get(model_id)
+        missing = [name for name in model.features if inputs.get(name) is None]
+        if missing:
+            raise InferenceError(f"Missing features for {model_id}: {missing}")
+        try:
+            row = np.array([float(inputs[name]) for name in model.features], dtype=np.float64)
+        except (TypeError, ValueError) as e:
+            raise InferenceError(f"Non-numeric feature for {model_id}: {e}")
+
+        raw: Future = model.batcher.submit(row)
+        result: Future = Future()
+
+        def to_outputs(done: Future):
+            error = done.exception()
+            if error is not None:
+                result.set_exception(error)
+                return
+            # 출력 변환 실패도 Future로 전달 (callback 예외는 삼켜져 호출 측이 무한 대기하게 됨)
+            try:
+                values = np.atleast_1d(done.result())
+                names = model.outputs or [f"output_{i}" for i in range(len(values))]
+                outputs = {name: float(value) for name, value in zip(names, values)}
+            except Exception as e:
+                result.set_exception(InferenceError(f"Invalid output from {model_id}: {e}"))
+                return
+            result.set_result(outputs)
+
+        raw.add_done_callback(to_outputs)
+        return result
+
+    def predict(self, model_id: str, inputs: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, float]:
+        """
+        Raises:
+            InferenceError: 입력/추론/출력 오류 또는 timeout(초) 초과
+        """
+        try:
+            return self.submit(model_id, inputs).result(timeout=timeout)
+        except FutureTimeoutError:
+            raise InferenceError(f"Inference with {model_id} timed out after {timeout}s")
+
+    def predict_many(self, model_id: str, inputs_list: Sequence[Dict[str, Any]]) -> List[Dict[str, float]]:
+        """여러 입력을 한 번에 큐에 넣어 같은 배치로 처리"""
+        futures = [self.submit(model_id, inputs) for inputs in inputs_list]
+        return [future.result() for future in futures]
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            model_id: {
+                "version": model.version,
+                "loadTimeMs": model.load_time_ms,
+                **model.batcher.metrics()
+            }
+            for model_id, model in list(self._models.items())
+        }
+
+    def close(self):
+        with self._lock:
+            for model in self._models.values():
+                model.batcher.close()
+            self._models.clear()
+
+
+_runtimes: Dict[str, InferenceRuntime] = {}
+_runtimes_lock = threading.Lock()
+
+
+def get_inference_runtime(registry_file: str, max_batch_size: int = 64, max_batch_delay: float = 0.005) -> InferenceRuntime:
+    """레지스트리 파일별 프로세스 전역 InferenceRuntime (모델은 프로세스 수명 동안 유지)"""
+    key = str(Path(registry_file).resolve())
+    runtime = _runtimes.get(key)
+    if runtime is None:
+        with _runtimes_lock:
+            runtime = _runtimes.get(key)
+            if runtime is None:
+                runtime = InferenceRuntime(get_model_registry(key), max_batch_size, max_batch_delay)
+                _runtimes[key] = runtime
+    return runtime
@@ -0,0 +1,262 @@
+# execution_engine/job_log_store.py
+"""
+Job Log 인덱스 저장소 (Goal 1)
+
+AAS job_log Submodel의 JSON 문자열 전체를 매 요청마다 파싱/전체 순회하지 않도록
+SQLite(표준 라이브러리)에 한 번 적재하고 date / status / process_step 보조 인덱스로 조회한다.
+
+갱신 규칙 (refresh):
+1. 원문이 마지막 적재분과 같으면 (길이 + SHA-1) 파싱 없이 기존 인덱스 사용
+2. 원문이 마지막 적재분 뒤에 job만 추가된 형태면 추가된 부분만 파싱하여 적재
+3. 그 외(기존 job 수정/삭제 등)는 전체 재적재
+
+조회 결과는 FilterPlan.evaluate(기존 클라이언트 필터)와 같다.
+process_steps가 문자열인 job은 기존 필터('cooling' in process_steps)처럼 부분 문자열로 일치한다.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from execution_engine.filter_plan import FilterPlan
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    seq INTEGER PRIMARY KEY,
+    job_id TEXT,
+    date TEXT,
+    status TEXT,
+    steps_text TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_date ON jobs(date);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+CREATE TABLE IF NOT EXISTS job_steps (
+    seq INTEGER NOT NULL,
+    step TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_job_steps_step ON job_steps(step, seq);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_INDEXED_COLUMNS = ("job_id", "date", "status")
+# 리스트 process_steps는 항목 일치, 문자열 process_steps는 부분 문자열 일치 (인자 2개)
+_STEP_CLAUSE = ("(EXISTS (SELECT 1 FROM job_steps s WHERE s.step = ? AND s.seq = j.seq)"
+                " OR instr(j.steps_text, ?) > 0)")
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _scalar(value: Any) -> Any:
+    """인덱스 컬럼 값 (문자열/숫자는 그대로, 그 외는 JSON 문자열)"""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _array_body_end(raw: str) -> Optional[int]:
+    """JSON 배열 원문에서 마지막 요소의 끝 위치 (닫는 괄호 앞 공백 제외, 배열이 아니면 None)"""
+    stripped = raw.rstrip()
+    if not stripped.startswith("[") or not stripped.endswith("]"):
+        return None
+    return len(stripped[:-1].rstrip())
+
+
+class JobLogStore:
+    """
+    job_log 레코드 인덱스 저장소
+
+    Args:
+        path: SQLite 파일 경로 (":memory:"면 프로세스 메모리에만 유지)
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        # ExecutionAgent는 액션을 스레드 풀에서 실행하므로 연결 공유 + 잠금
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self._lock = threading.Lock()
+        self.stats = {"unchanged": 0, "appended": 0, "rebuilt": 0}
+
+    def _migrate(self):
+        """steps_text 컬럼이 없는 이전 인덱스 파일은 비우고 다음 refresh에서 전체 재적재"""
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")]
+        if "steps_text" not in columns:
+            with self._conn:
+                self._conn.executescript("DROP TABLE jobs; DROP TABLE job_steps; DELETE FROM meta;")
+            self._conn.executescript(_SCHEMA)
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, **values: Any):
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [(key, str(value)) for key, value in values.items()]
+        )
+
+    def refresh(self, raw_log: Any) -> str:
+        """
+        job_log 원문으로 인덱스 갱신
+
+        Args:
+            raw_log: JSON 배열 문자열 또는 이미 파싱된 job 리스트
+
+        Returns:
+            "unchanged" | "appended" | "rebuilt"
+        """
+        if not isinstance(raw_log, str):
+            raw_log = json.dumps(raw_log if isinstance(raw_log, list) else [raw_log], ensure_ascii=False)
+
+        with self._lock, self._conn:
+            if self._get_meta("length") == str(len(raw_log)) and self._get_meta("digest") == _digest(raw_log):
+                self.stats["unchanged"] += 1
+                return "unchanged"
+
+            appended = self._append_tail(raw_log)
+            if appended is None:
+                self._rebuild(raw_log)
+                outcome = "rebuilt"
+            else:
+                outcome = "appended"
+
+            body_end = _array_body_end(raw_log)
+            prefix_end = body_end if body_end is not None else 0
+            self._set_meta(
+                length=len(raw_log),
+                digest=_digest(raw_log),
+                prefix_length=prefix_end,
+                prefix_digest=_digest(raw_log[:prefix_end])
+            )
+
+        self.stats[outcome] += 1
+        return outcome
+
+    def _append_tail(self, raw_log: str) -> Optional[int]:
+        """이전 원문의 배열 본문이 그대로 앞부분에 있으면 뒤에 추가된 job만 적재 (추가 건수 반환)"""
+        prefix_length = self._get_meta("prefix_length")
+        if not prefix_length:
+            return None
+
+        prefix_length = int(prefix_length)
+        if len(raw_log) <= prefix_length or _digest(raw_log[:prefix_length]) != self._get_meta("prefix_digest"):
+            return None
+
+        tail = raw_log[prefix_length:].lstrip()
+        if tail.startswith(","):
+            tail = tail[1:]
+        elif not tail.startswith("]") and raw_log[:prefix_length].rstrip() != "[":
+            return None
+
+        try:
+            jobs = json.loads("[" + tail)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(jobs, list):
+            return None
+
+        next_seq = self._conn.execute("SELECT COALESCE(MAX(seq), -1) + 1 FROM jobs").fetchone()[0]
+        self._insert(jobs, next_seq)
+        return len(jobs)
+
+    def _rebuild(self, raw_log: str):
+        try:
+            jobs = json.loads(raw_log)
+        except json.JSONDecodeError:
+            jobs = []
+        if not isinstance(jobs, list):
+            jobs = [jobs] if jobs else []
+
+        self._conn.execute("DELETE FROM jobs")
+        self._conn.execute("DELETE FROM job_steps")
+        self._insert(jobs, 0)
+
+    def _insert(self, jobs: List[Any], first_seq: int):
+        job_rows: List[Tuple[Any, ...]] = []
+        step_rows: List[Tuple[int, str]] = []
+
+        for offset, job in enumerate(jobs):
+            if not isinstance(job, dict):
+                continue
+            seq = first_seq + offset
+            steps = job.get("process_steps") or []
+            steps_text = steps if isinstance(steps, str) else None
+            job_rows.append((
+                seq,
+                _scalar(job.get("job_id")),
+                _scalar(job.get("date")),
+                _scalar(job.get("status")),
+                steps_text,
+                json.dumps(job, ensure_ascii=False)
+            ))
+
+            if steps_text is None and isinstance(steps, (list, dict)):
+                step_rows.extend((seq, str(step)) for step in dict.fromkeys(steps) if step is not None)
+
+        self._conn.executemany(
+            "INSERT INTO jobs (seq, job_id, date, status, steps_text, record) VALUES (?, ?, ?, ?, ?, ?)", job_rows
+        )
+        self._conn.executemany("INSERT INTO job_steps (seq, step) VALUES (?, ?)", step_rows)
+
+    def query(self,
+              date: Optional[str] = None,
+              status: Optional[str] = None,
+              process_step: Optional[str] = None) -> List[Dict[str, Any]]:
+        """조건에 맞는 job (원래 로그 순서, None인 조건은 무시)"""
+        clauses = []
+        args: List[Any] = []
+        if date is not None:
+            clauses.append("j.date = ?")
+            args.append(date)
+        if status is not None:
+            clauses.append("j.status = ?")
+            args.append(status)
+        if process_step is not None:
+            clauses.append(_STEP_CLAUSE)
+            args.extend((process_step, process_step))
+        return self._select(clauses, args)
+
+    def query_plan(self, plan: FilterPlan) -> List[Dict[str, Any]]:
+        """
+        FilterPlan 조건으로 조회 (FilterPlan.evaluate와 같은 결과)
+
+        인덱스 컬럼 일치(eq) / process_steps 포함(contains)은 SQL로 후보를 줄이고,
+        줄어든 후보에 FilterPlan.evaluate를 적용한다 (SQLite 타입 변환으로 더 넓게 일치한 job 제외).
+        """
+        clauses = []
+        args: List[Any] = []
+        for predicate in plan.predicates:
+            if predicate.op == "eq" and predicate.field in _INDEXED_COLUMNS:
+                # None도 누락 필드와 일치하도록 IS 비교
+                clauses.append(f"j.{predicate.field} IS ?")
+                args.append(_scalar(predicate.value))
+            elif predicate.op == "contains" and predicate.field == "process_steps" and isinstance(predicate.value, str):
+                clauses.append(_STEP_CLAUSE)
+                args.extend((predicate.value, predicate.value))
+
+        return plan.evaluate(self._select(clauses, args))
+
+    def _select(self, clauses: List[str], args: List[Any]) -> List[Dict[str, Any]]:
+        sql = "SELECT j.record FROM jobs j"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY j.seq"
+
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
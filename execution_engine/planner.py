@@ -14,22 +14,31 @@ class ExecutionPlanner:
         self.g = Graph()
         self.g.parse(str(ONTOLOGY_FILE_PATH), format="turtle")
         self.g.bind("factory", FACTORY)
+        # 온톨로지는 시작 시 한 번만 로드되므로 Goal별 플랜도 한 번만 조회
+        self._plans = {}
         print("✅ Ontology file (v2_final) loaded successfully.")
 
     def create_plan(self, goal: str) -> list:
         """
         주어진 Goal에 대한 Action Plan을 동적으로 생성합니다. (일반화된 버전)
         """
+        if goal not in self._plans:
+            self._plans[goal] = self._query_plan(goal)
+        # 호출 측이 수정해도 캐시된 플랜에 영향이 없도록 단계별 복사본 반환
+        return [dict(step) for step in self._plans[goal]]
+
+    def _query_plan(self, goal: str) -> list:
         query = f"""
             PREFIX factory: <{str(FACTORY)}>
             PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
             
-            SELECT ?action ?execType ?targetSubmodelId
+            SELECT ?action ?execType ?targetSubmodelId ?modelId
             WHERE {{
                 factory:{goal} factory:hasActionSequence ?list .
                 ?list rdf:rest*/rdf:first ?action .
                 OPTIONAL {{ ?action factory:hasExecutionType ?execType . }}
                 OPTIONAL {{ ?action factory:targetsSubmodelId ?targetSubmodelId . }}
+                OPTIONAL {{ ?action factory:usesModel ?modelId . }}
             }}
             ORDER BY ?list
         """
@@ -39,7 +48,9 @@ class ExecutionPlanner:
             step = {
                 "action_id": str(row.action).split('#')[-1],
                 "type": str(row.execType),
-                "target_submodel_id": str(row.targetSubmodelId) if row.targetSubmodelId else None
+                "target_submodel_id": str(row.targetSubmodelId) if row.targetSubmodelId else None,
+                # ai_model_inference 액션이 사용할 레지스트리 모델 (없으면 핸들러 기본 동작)
+                "model_id": str(row.modelId) if row.modelId else None
             }
             action_plan.append(step)
         
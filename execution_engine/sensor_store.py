@@ -0,0 +1,370 @@
+# execution_engine/sensor_store.py
+"""
+설비 센서 시계열 저장소 및 이상 감지 (Goal 2)
+
+sensor_data Submodel 값을 설비별 NumPy ring buffer에 적재하면서 채널별 통계를 점진적으로 갱신하고,
+이상 감지 요청은 전체 이력을 다시 계산하지 않고 유지 중인 상태로 응답한다.
+
+- ring buffer: (capacity, channels) 배열, 가장 오래된 샘플부터 덮어씀
+- EWMA 평균/분산: 샘플 적재 시 O(channels)로 갱신, z-score는 갱신 전 통계 기준 (이상치가 자기 자신을 흡수하지 않도록)
+- rolling quantile: 버퍼 창(window) 기준, 새 샘플이 적재된 뒤 첫 조회에서만 다시 계산 (버전별 캐시)
+- 적재 시 z-score 기준 이상 여부를 샘플별로 기록하여 최근 이상 구간을 바로 조회
+- 마지막 적재 시각보다 이전/같은 timestamp의 샘플은 무시 (같은 Submodel을 반복 조회해도 중복 적재 없음)
+- timestamp가 없는 측정값(현재 값 스냅샷 등)은 조회 시각으로 적재되므로, Submodel 내용 digest가 직전과 같으면
+  적재를 건너뛰고 직전에 적재한 timestamp 없는 측정값과 겹치는 앞부분은 제외
+"""
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_TIMESTAMP_KEYS = ("timestamp", "time", "ts")
+DEFAULT_QUANTILES = (0.05, 0.5, 0.95)
+
+
+def _to_epoch(value: Any) -> Optional[float]:
+    """숫자(epoch 초/밀리초) 또는 ISO 8601 문자열 -> epoch 초"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value / 1000.0 if value > 1e11 else float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            try:
+                return _to_epoch(float(value))
+            except ValueError:
+                return None
+    return None
+
+
+def _to_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def readings_from_submodel(data: Any) -> List[Dict[str, Any]]:
+    """
+    sensor_data Submodel 응답 -> 측정값 dict 리스트
+
+    지원 형식:
+    - value가 측정값 리스트(JSON 문자열 포함)인 Submodel (Mock 서버 / 표준 서버 단일 Property)
+    - 센서별 Property(idShort -> value)로 구성된 Submodel (현재 값 스냅샷 1건)
+    - 이미 파싱된 측정값 리스트 / dict
+    """
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except json.JSONDecodeError:
+            return []
+
+    if isinstance(data, dict):
+        elements = data.get("submodelElements")
+        if isinstance(elements, list):
+            if len(elements) == 1 and isinstance(elements[0].get("value"), (str, list)):
+                parsed = readings_from_submodel(elements[0].get("value"))
+                if parsed:
+                    return parsed
+            snapshot = {
+                element.get("idShort"): element.get("value")
+                for element in elements if isinstance(element, dict) and element.get("idShort")
+            }
+            return [snapshot] if snapshot else []
+        if "value" in data and not isinstance(data.get("value"), (int, float)):
+            return readings_from_submodel(data.get("value"))
+        return [data]
+
+    if isinstance(data, list):
+        return [reading for reading in data if isinstance(reading, dict)]
+
+    return []
+
+
+def _has_timestamp(reading: Dict[str, Any]) -> bool:
+    return any(key in reading for key in _TIMESTAMP_KEYS)
+
+
+def content_digest(data: Any) -> str:
+    """Submodel 응답 내용 digest (키 순서와 무관)"""
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _unseen_tail(previous: List[Dict[str, Any]], current: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    current 중 previous에 이어서 새로 추가된 부분
+
+    previous의 끝부분과 current의 앞부분이 겹치면 겹친 만큼 제외
+    (같은 스냅샷 재조회 -> [], 값이 추가된 목록/이동하는 창 -> 새 값만)
+    """
+    for overlap in range(min(len(previous), len(current)), 0, -1):
+        if previous[-overlap:] == current[:overlap]:
+            return current[overlap:]
+    return current
+
+
+def to_samples(readings: Sequence[Dict[str, Any]],
+               now: Optional[float] = None) -> List[Tuple[float, Dict[str, float]]]:
+    """측정값 dict -> (timestamp, {채널: 값}) (timestamp가 없으면 now, 숫자가 아닌 필드는 제외)"""
+    now = now if now is not None else time.time()
+    samples = []
+    for reading in readings:
+        timestamp = None
+        for key in _TIMESTAMP_KEYS:
+            if key in reading:
+                timestamp = _to_epoch(reading[key])
+                break
+
+        values = {}
+        for key, value in reading.items():
+            if key in _TIMESTAMP_KEYS:
+                continue
+            number = _to_number(value)
+            if number is not None:
+                values[str(key)] = number
+
+        if values:
+            samples.append((timestamp if timestamp is not None else now, values))
+
+    samples.sort(key=lambda sample: sample[0])
+    return samples
+
+
+class SensorRingBuffer:
+    """
+    설비 1대의 센서 ring buffer와 채널별 누적 통계
+
+    Args:
+        capacity: 보관 샘플 수 (rolling quantile 창 크기)
+        alpha: EWMA 평활 계수 (클수록 최근 샘플 비중이 큼)
+        z_threshold: 적재 시 이상으로 기록할 |z| 기준
+        warmup: z-score를 계산하기 전에 필요한 채널별 최소 샘플 수
+    """
+
+    def __init__(self, capacity: int = 1024, alpha: float = 0.1, z_threshold: float = 3.0, warmup: int = 10):
+        self.capacity = capacity
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.warmup = warmup
+
+        self.channels: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.values = np.empty((capacity, 0), dtype=np.float64)
+        self.flags = np.zeros((capacity, 0), dtype=bool)
+        self.zscores = np.empty((capacity, 0), dtype=np.float64)
+
+        self.mean = np.empty(0, dtype=np.float64)
+        self.var = np.empty(0, dtype=np.float64)
+        self.observations = np.empty(0, dtype=np.int64)
+
+        self.total = 0  # 지금까지 적재한 샘플 수 (버전으로도 사용)
+        self.last_timestamp = float("-inf")
+        self._quantile_cache: Dict[Tuple[float, ...], Tuple[int, np.ndarray]] = {}
+
+    def _ensure_channels(self, names: Sequence[str]):
+        new = [name for name in names if name not in self._index]
+        if not new:
+            return
+        for name in new:
+            self._index[name] = len(self.channels)
+            self.channels.append(name)
+
+        width = len(new)
+        self.values = np.hstack([self.values, np.full((self.capacity, width), np.nan)])
+        self.flags = np.hstack([self.flags, np.zeros((self.capacity, width), dtype=bool)])
+        self.zscores = np.hstack([self.zscores, np.full((self.capacity, width), np.nan)])
+        self.mean = np.concatenate([self.mean, np.zeros(width)])
+        self.var = np.concatenate([self.var, np.zeros(width)])
+        self.observations = np.concatenate([self.observations, np.zeros(width, dtype=np.int64)])
+        self._quantile_cache.clear()
+
+    def append(self, samples: Sequence[Tuple[float, Dict[str, float]]]) -> int:
+        """마지막 적재 시각 이후 샘플만 적재 (적재 건수 반환)"""
+        samples = [sample for sample in samples if sample[0] > self.last_timestamp]
+        if not samples:
+            return 0
+
+        self._ensure_channels(list(dict.fromkeys(name for _, values in samples for name in values)))
+        rows = np.full((len(samples), len(self.channels)), np.nan)
+        for row, (_, values) in enumerate(samples):
+            for name, value in values.items():
+                rows[row, self._index[name]] = value
+
+        for (timestamp, _), row in zip(samples, rows):
+            self._append_row(timestamp, row)
+
+        self.last_timestamp = samples[-1][0]
+        return len(samples)
+
+    def _append_row(self, timestamp: float, row: np.ndarray):
+        present = ~np.isnan(row)
+        std = np.sqrt(self.var)
+        ready = present & (self.observations >= self.warmup) & (std > 0)
+
+        z = np.full(row.shape, np.nan)
+        np.divide(row - self.mean, std, out=z, where=ready)
+
+        # EWMA 평균/분산 (첫 샘플은 평균 초기값)
+        first = present & (self.observations == 0)
+        update = present & ~first
+        diff = np.where(update, row - self.mean, 0.0)
+        increment = self.alpha * diff
+        self.mean = np.where(first, row, self.mean + increment)
+        self.var = np.where(update, (1 - self.alpha) * (self.var + diff * increment), self.var)
+        self.observations += present
+
+        slot = self.total % self.capacity
+        self.timestamps[slot] = timestamp
+        self.values[slot] = row
+        self.zscores[slot] = z
+        self.flags[slot] = ready & (np.abs(z) > self.z_threshold)
+        self.total += 1
+
+    def _window_order(self) -> np.ndarray:
+        """버퍼에 남은 샘플의 slot 인덱스 (오래된 순)"""
+        size = min(self.total, self.capacity)
+        start = self.total - size
+        return (start + np.arange(size)) % self.capacity
+
+    def quantiles(self, qs: Sequence[float] = DEFAULT_QUANTILES) -> np.ndarray:
+        """창 기준 채널별 분위수 (len(qs), channels) - 적재 이후 첫 조회에서만 계산"""
+        key = tuple(qs)
+        cached = self._quantile_cache.get(key)
+        if cached is not None and cached[0] == self.total:
+            return cached[1]
+
+        window = self.values[self._window_order()]
+        result = np.full((len(qs), len(self.channels)), np.nan)
+        if window.size:
+            # 창 안에 값이 하나도 없는 채널은 NaN 유지 (nanquantile 경고 방지)
+            observed = ~np.all(np.isnan(window), axis=0)
+            if observed.any():
+                result[:, observed] = np.nanquantile(window[:, observed], qs, axis=0)
+        self._quantile_cache[key] = (self.total, result)
+        return result
+
+    def recent_anomalies(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """창 안에서 이상으로 기록된 샘플 (최근 순)"""
+        order = self._window_order()
+        flagged = order[self.flags[order].any(axis=1)][::-1][:limit]
+        anomalies = []
+        for slot in flagged:
+            channels = np.flatnonzero(self.flags[slot])
+            anomalies.append({
+                "timestamp": float(self.timestamps[slot]),
+                "channels": {
+                    self.channels[c]: {"value": float(self.values[slot, c]), "zScore": float(self.zscores[slot, c])}
+                    for c in channels
+                }
+            })
+        return anomalies
+
+    def summary(self, qs: Sequence[float] = DEFAULT_QUANTILES, limit: int = 20) -> Dict[str, Any]:
+        """채널별 최신 값 / EWMA 통계 / z-score / 분위수 및 현재 이상 여부"""
+        if self.total == 0:
+            return {"samples": 0, "channels": {}, "anomaly": False, "recentAnomalies": []}
+
+        latest_slot = (self.total - 1) % self.capacity
+        order = self._window_order()
+        quantiles = self.quantiles(qs)
+        window_flags = self.flags[order].sum(axis=0)
+
+        channels = {}
+        for c, name in enumerate(self.channels):
+            latest = self.values[latest_slot, c]
+            z = self.zscores[latest_slot, c]
+            channels[name] = {
+                "latest": None if np.isnan(latest) else float(latest),
+                "ewmaMean": float(self.mean[c]),
+                "ewmaStd": float(np.sqrt(self.var[c])),
+                "zScore": None if np.isnan(z) else float(z),
+                "quantiles": {f"p{int(round(q * 100)):02d}": (None if np.isnan(v) else float(v))
+                              for q, v in zip(qs, quantiles[:, c])},
+                "anomaly": bool(self.flags[latest_slot, c]),
+                "anomaliesInWindow": int(window_flags[c])
+            }
+
+        return {
+            "samples": int(self.total),
+            "windowSize": int(len(order)),
+            "lastTimestamp": float(self.timestamps[latest_slot]),
+            "channels": channels,
+            "anomaly": bool(self.flags[latest_slot].any()),
+            "recentAnomalies": self.recent_anomalies(limit)
+        }
+
+
+class SensorStore:
+    """
+    설비별 SensorRingBuffer 모음
+
+    Args:
+        capacity / alpha / z_threshold / warmup: SensorRingBuffer 설정 (모든 설비 공통)
+    """
+
+    def __init__(self, capacity: int = 1024, alpha: float = 0.1, z_threshold: float = 3.0, warmup: int = 10):
+        self.capacity = capacity
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.warmup = warmup
+        self._buffers: Dict[str, SensorRingBuffer] = {}
+        # 설비별 직전 Submodel digest / 직전에 적재한 timestamp 없는 측정값
+        self._digests: Dict[str, str] = {}
+        self._untimed: Dict[str, List[Dict[str, Any]]] = {}
+        # ExecutionAgent는 여러 요청을 스레드 풀에서 실행하므로 설비 단위가 아닌 저장소 전체 잠금 (적재/조회 모두 짧음)
+        self._lock = threading.Lock()
+        self.stats = {"ingested": 0, "duplicates": 0, "queries": 0}
+
+    def ingest(self, machine: str, data: Any) -> int:
+        """Submodel 응답 또는 측정값 리스트 적재 (새로 적재한 샘플 수 반환)"""
+        readings = readings_from_submodel(data)
+        digest = content_digest(data)
+        with self._lock:
+            if self._digests.get(machine) == digest:
+                # 직전과 같은 내용 -> timestamp 없는 측정값이 조회 시각으로 다시 적재되지 않도록 건너뜀
+                self.stats["duplicates"] += len(readings)
+                return 0
+            self._digests[machine] = digest
+
+            untimed = [reading for reading in readings if not _has_timestamp(reading)]
+            fresh = _unseen_tail(self._untimed.get(machine, []), untimed)
+            self._untimed[machine] = untimed
+            samples = to_samples([reading for reading in readings if _has_timestamp(reading)] + fresh)
+
+            buffer = self._buffers.get(machine)
+            if buffer is None:
+                buffer = self._buffers[machine] = SensorRingBuffer(
+                    self.capacity, self.alpha, self.z_threshold, self.warmup
+                )
+            appended = buffer.append(samples)
+        self.stats["ingested"] += appended
+        self.stats["duplicates"] += len(readings) - appended
+        return appended
+
+    def detect(self, machine: str, limit: int = 20) -> Dict[str, Any]:
+        """유지 중인 통계로 이상 감지 결과 반환 (적재된 샘플이 없으면 samples=0)"""
+        self.stats["queries"] += 1
+        with self._lock:
+            buffer = self._buffers.get(machine)
+            if buffer is None:
+                return {"machine": machine, "samples": 0, "channels": {}, "anomaly": False, "recentAnomalies": []}
+            return {"machine": machine, **buffer.summary(limit=limit)}
+
+    def machines(self) -> List[str]:
+        return list(self._buffers)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {**self.stats, "machines": len(self._buffers)}
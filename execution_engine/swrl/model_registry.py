@@ -0,0 +1,211 @@
+"""
+모델 레지스트리: model_registry.json 로드, 인덱스 구성 및 변경 시 자동 재로드
+SelectionEngine과 ModelSelector가 같은 파일에 대해 하나의 인스턴스를 공유한다.
+"""
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+
+class ModelRegistryError(Exception):
+    """모델 레지스트리 로드 에러"""
+    pass
+
+
+class ModelRegistry(Mapping):
+    """
+    modelId -> 모델 메타데이터 매핑 (읽기 전용)
+
+    purpose / capability / 컨테이너 이미지별 인덱스를 함께 유지한다.
+    파일에서 로드한 경우 check_interval마다 mtime을 확인하여 변경되면 다시 로드하며,
+    재로드마다 generation이 증가한다 (파생 캐시 무효화용).
+    """
+
+    def __init__(self, registry_file: Optional[Path] = None, check_interval: float = 1.0):
+        self.registry_file = Path(registry_file) if registry_file else None
+        self.check_interval = check_interval
+        self.generation = 0
+        self.data: Dict[str, Any] = {"models": []}
+
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._positions: Dict[str, int] = {}
+        self._by_purpose: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_capability: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_image: Dict[str, List[Dict[str, Any]]] = {}
+        self._derived: Dict[Any, Tuple[int, Any]] = {}
+
+        self._mtime: Optional[float] = None
+        self._last_check = time.monotonic()
+        self._lock = threading.Lock()
+
+        if self.registry_file is not None:
+            self.reload()
+
+    @classmethod
+    def from_models(cls, models: List[Dict[str, Any]]) -> "ModelRegistry":
+        """메모리상의 모델 목록으로 레지스트리 생성 (파일 감시 없음)"""
+        registry = cls()
+        registry._index({"models": models})
+        return registry
+
+    def reload(self):
+        """레지스트리 파일을 다시 읽고 인덱스 재구성"""
+        try:
+            mtime = self.registry_file.stat().st_mtime
+            with open(self.registry_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            raise ModelRegistryError(f"Model registry file not found: {self.registry_file}")
+        except json.JSONDecodeError as e:
+            raise ModelRegistryError(f"Invalid JSON in model registry: {e}")
+
+        self._index(data)
+        self._mtime = mtime
+
+    def _index(self, data: Dict[str, Any]):
+        by_id: Dict[str, Dict[str, Any]] = {}
+        positions: Dict[str, int] = {}
+        by_purpose: Dict[str, List[Dict[str, Any]]] = {}
+        by_capability: Dict[str, List[Dict[str, Any]]] = {}
+        by_image: Dict[str, List[Dict[str, Any]]] = {}
+
+        for model in data.get("models", []):
+            model_id = model.get("modelId")
+            if not model_id:
+                continue
+
+            by_id[model_id] = model
+            positions.setdefault(model_id, len(positions))
+            if model.get("purpose"):
+                by_purpose.setdefault(model["purpose"], []).append(model)
+            for capability in model.get("capabilities", []):
+                by_capability.setdefault(capability, []).append(model)
+
+            container = model.get("container")
+            image = container.get("image") if isinstance(container, dict) else container
+            if image:
+                by_image.setdefault(image, []).append(model)
+
+        # 인덱스는 통째로 교체 (조회 중인 스레드는 이전 인덱스를 그대로 사용)
+        self.data = data
+        self._by_id = by_id
+        self._positions = positions
+        self._by_purpose = by_purpose
+        self._by_capability = by_capability
+        self._by_image = by_image
+        self._derived = {}
+        self.generation += 1
+
+    def refresh_if_changed(self) -> bool:
+        """check_interval마다 파일 mtime을 확인하여 변경 시 재로드 (재로드 여부 반환)"""
+        if self.registry_file is None:
+            return False
+
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return False
+
+        with self._lock:
+            if now - self._last_check < self.check_interval:
+                return False
+            self._last_check = now
+
+            try:
+                mtime = self.registry_file.stat().st_mtime
+            except OSError:
+                # 파일이 사라지면 마지막으로 로드된 레지스트리를 계속 사용
+                return False
+            if mtime == self._mtime:
+                return False
+
+            try:
+                self.reload()
+            except ModelRegistryError as e:
+                print(f"Warning: model registry reload failed, keeping previous version: {e}")
+                return False
+
+            print(f"Model registry reloaded: {len(self._by_id)} models (generation {self.generation})")
+            return True
+
+    # Mapping 인터페이스 (modelId -> 모델)
+    def __getitem__(self, model_id: str) -> Dict[str, Any]:
+        return self._by_id[model_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._by_id)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def models(self) -> List[Dict[str, Any]]:
+        """등록 순서대로 모델 목록"""
+        return list(self._by_id.values())
+
+    def by_purpose(self, purpose: str) -> List[Dict[str, Any]]:
+        return self._by_purpose.get(purpose, [])
+
+    def by_purposes(self, purposes: List[str]) -> List[Dict[str, Any]]:
+        """여러 purpose 중 하나라도 일치하는 모델 (등록 순서, 중복 제거)"""
+        if len(purposes) == 1:
+            return self.by_purpose(purposes[0])
+
+        matched = {model["modelId"]: model for purpose in purposes for model in self.by_purpose(purpose)}
+        return sorted(matched.values(), key=lambda model: self._positions[model["modelId"]])
+
+    def by_capability(self, capability: str) -> List[Dict[str, Any]]:
+        return self._by_capability.get(capability, [])
+
+    def by_image(self, image: str) -> List[Dict[str, Any]]:
+        return self._by_image.get(image, [])
+
+    def artifact_path(self, model: Dict[str, Any]) -> Optional[Path]:
+        """inference 항목의 모델 파일 경로 (상대 경로는 레지스트리 파일 위치 기준, inference 항목이 없으면 None)"""
+        inference = model.get("inference")
+        if not isinstance(inference, dict) or not inference.get("artifact"):
+            return None
+        path = Path(inference["artifact"])
+        if not path.is_absolute() and self.registry_file is not None:
+            path = self.registry_file.parent / path
+        return path
+
+    def is_servable(self, model: Dict[str, Any]) -> bool:
+        """학습된 모델 파일이 있어 추론 런타임으로 실행 가능한지 여부"""
+        path = self.artifact_path(model)
+        return path is not None and path.exists()
+
+    def surrogates_for(self, model_id: str) -> List[Dict[str, Any]]:
+        """model_id의 surrogate로 등록된 모델 (surrogateFor 기준, 등록 순서)"""
+        return [model for model in self._by_id.values() if model.get("surrogateFor") == model_id]
+
+    def derived(self, key: Any, build: Callable[[], Any]) -> Any:
+        """
+        현재 generation 기준으로 계산 결과 캐시 (goalType별 후보 점수 등)
+
+        레지스트리가 재로드되면 다시 계산한다.
+        """
+        cached = self._derived.get(key)
+        if cached is not None and cached[0] == self.generation:
+            return cached[1]
+
+        value = build()
+        self._derived[key] = (self.generation, value)
+        return value
+
+
+_registries: Dict[str, ModelRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_model_registry(registry_file: str) -> ModelRegistry:
+    """레지스트리 파일별 프로세스 전역 ModelRegistry"""
+    key = str(Path(registry_file).resolve())
+    registry = _registries.get(key)
+    if registry is None:
+        with _registries_lock:
+            registry = _registries.get(key)
+            if registry is None:
+                registry = ModelRegistry(Path(key))
+                _registries[key] = registry
+    return registry
@@ -24,22 +24,33 @@ def preprocess_query_goal(query_goal: Dict[str, Any]) -> Dict[str, Any]:
     Raises:
         UnknownTokenError: 알 수 없는 토큰 발견시
     """
-    # Deep copy to avoid modifying original
-    processed_goal = json.loads(json.dumps(query_goal))
-
     # QueryGoal 구조 확인
-    if "QueryGoal" not in processed_goal:
-        return processed_goal
+    if "QueryGoal" not in query_goal:
+        return dict(query_goal)
+
+    query_goal_obj = query_goal["QueryGoal"]
+    parameters = query_goal_obj.get("parameters")
+
+    # 원본은 수정하지 않고, 바뀌는 경로(QueryGoal -> parameters -> param)만 새로 만든다.
+    # 나머지 하위 구조는 원본과 공유한다.
+    if isinstance(parameters, list):
+        parameters = [_process_parameter(param) for param in parameters]
+        query_goal_obj = {**query_goal_obj, "parameters": parameters}
+    else:
+        query_goal_obj = dict(query_goal_obj)
+
+    return {**query_goal, "QueryGoal": query_goal_obj}
 
-    query_goal_obj = processed_goal["QueryGoal"]
 
-    # parameters 배열 처리
-    if "parameters" in query_goal_obj and isinstance(query_goal_obj["parameters"], list):
-        for param in query_goal_obj["parameters"]:
-            if isinstance(param, dict) and "value" in param:
-                param["value"] = _process_token(param["value"])
+def _process_parameter(param: Any) -> Any:
+    """토큰이 치환된 파라미터만 복사하고, 그대로인 파라미터는 원본 객체를 반환"""
+    if not isinstance(param, dict) or "value" not in param:
+        return param
 
-    return processed_goal
+    value = _process_token(param["value"])
+    if value is param["value"]:
+        return param
+    return {**param, "value": value}
 
 
 def _process_token(value: str) -> str:
@@ -9,6 +9,7 @@ from rdflib.plugins.stores.memory import Memory
 
 from .preprocessor import preprocess_query_goal, UnknownTokenError
 from .schema_validator import validate_query_goal_schema, ValidationError
+from .model_registry import ModelRegistry, ModelRegistryError, get_model_registry
 
 
 class SelectionEngineError(Exception):
@@ -39,7 +40,7 @@ class SelectionEngine:
         self.rdf = Namespace("http://www.w3.org/1999/02/22-rdf-syntax-ns#")
 
         # 모델 레지스트리 로드
-        self.model_registry = self._load_model_registry()
+        self.registry = self._load_model_registry()
 
     def select_model(self, query_goal_dict: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -55,6 +56,9 @@ class SelectionEngine:
             SelectionEngineError: 선택 과정에서 오류 발생시
         """
         try:
+            # 레지스트리 파일이 바뀌었으면 재로드
+            self.registry.refresh_if_changed()
+
             # Phase 1: 전처리 및 검증
             processed_goal = preprocess_query_goal(query_goal_dict)
             validate_query_goal_schema(processed_goal)
@@ -70,7 +74,9 @@ class SelectionEngine:
 
             # Phase 3: 메타데이터 통합
             model_metadata = self._get_model_metadata(selected_model_id)
-            provenance = self._generate_provenance(selected_model_id, processed_goal["QueryGoal"]["goalType"])
+            provenance = self._generate_provenance(
+                selected_model_id, processed_goal["QueryGoal"]["goalType"], model_metadata
+            )
 
             # Phase 4: 최종 JSON 조합
             return self._build_final_response(processed_goal, model_metadata, provenance)
@@ -80,15 +86,17 @@ class SelectionEngine:
         except Exception as e:
             raise SelectionEngineError(f"Selection process failed: {e}")
 
-    def _load_model_registry(self) -> Dict[str, Any]:
-        """모델 레지스트리 JSON 로드"""
+    def _load_model_registry(self) -> ModelRegistry:
+        """모델 레지스트리 로드 (같은 파일을 쓰는 컴포넌트와 인덱스 공유)"""
         try:
-            with open(self.model_registry_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except FileNotFoundError:
-            raise SelectionEngineError(f"Model registry file not found: {self.model_registry_file}")
-        except json.JSONDecodeError as e:
-            raise SelectionEngineError(f"Invalid JSON in model registry: {e}")
+            return get_model_registry(self.model_registry_file)
+        except ModelRegistryError as e:
+            raise SelectionEngineError(str(e))
+
+    @property
+    def model_registry(self) -> Dict[str, Any]:
+        """레지스트리 원본 JSON ({"models": [...], "metadata": {...}})"""
+        return self.registry.data
 
     def _create_rdf_graph(self) -> Graph:
         """RDF 그래프 생성 및 온톨로지 로드"""
@@ -132,7 +140,7 @@ class SelectionEngine:
 
     def _add_models_to_graph(self, graph: Graph) -> None:
         """모델 레지스트리의 모델들을 RDF 그래프에 추가"""
-        for model in self.model_registry.get("models", []):
+        for model in self.registry.models():
             model_uri = URIRef(f"http://example.com/data#{model['modelId']}")
             graph.add((model_uri, RDF.type, self.ex.Model))
             graph.add((model_uri, self.ex.modelId, Literal(model["modelId"])))
@@ -161,7 +169,7 @@ class SelectionEngine:
                     print(f"Rule execution warning: {e}")
 
             # 선택된 모델 조회
-            return self._query_selected_model(graph, goal_type)
+            return self._choose_model(self._query_selected_models(graph, goal_type))
 
         except FileNotFoundError:
             raise SelectionEngineError(f"Rules file not found: {self.rules_file}")
@@ -216,8 +224,8 @@ class SelectionEngine:
 
         return complete_queries
 
-    def _query_selected_model(self, graph: Graph, goal_type: str) -> Optional[str]:
-        """선택된 모델 ID 조회"""
+    def _query_selected_models(self, graph: Graph, goal_type: str) -> List[str]:
+        """규칙으로 선택된 모델 ID 목록"""
         query = """
         PREFIX ex: <http://example.com/ontology#>
 
@@ -230,29 +238,50 @@ class SelectionEngine:
         """
 
         results = graph.query(query, initBindings={'target_goal_type': Literal(goal_type)})
+        return [str(row.modelId) for row in results]
+
+    def _choose_model(self, model_ids: List[str]) -> Optional[str]:
+        """
+        규칙에 맞는 모델이 여러 개면 하나를 결정
+
+        학습된(모델 파일이 있는) surrogate가 있으면 우선 선택하고 (신뢰도가 낮으면 SimulationHandler가 원본 시뮬레이터로 대체),
+        그 외에는 레지스트리 등록 순서상 첫 모델을 선택한다.
+        """
+        from config import SURROGATE_ENABLED
+
+        matched = set(model_ids)
+        candidates = [model for model in self.registry.models() if model["modelId"] in matched]
+        if not candidates:
+            return None
 
-        for row in results:
-            return str(row.modelId)
+        if SURROGATE_ENABLED:
+            for model in candidates:
+                if model.get("surrogateFor") and self.registry.is_servable(model):
+                    return model["modelId"]
 
-        return None
+        primary = [model for model in candidates if not model.get("surrogateFor")]
+        return (primary or candidates)[0]["modelId"]
 
     def _get_model_metadata(self, model_id: str) -> Dict[str, Any]:
         """모델 레지스트리에서 모델 메타데이터 조회"""
-        for model in self.model_registry.get("models", []):
-            if model["modelId"] == model_id:
-                return model
-
-        raise SelectionEngineError(f"Model metadata not found for: {model_id}")
+        model = self.registry.get(model_id)
+        if model is None:
+            raise SelectionEngineError(f"Model metadata not found for: {model_id}")
+        return model
 
-    def _generate_provenance(self, model_id: str, goal_type: str) -> Dict[str, Any]:
+    def _generate_provenance(self, model_id: str, goal_type: str,
+                             model_metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """선택 과정에 대한 provenance 정보 생성"""
+        if model_metadata is None:
+            model_metadata = self._get_model_metadata(model_id)
+
         return {
             "ruleName": f"SWRL:Goal2{model_id}",
             "engine": "Rule-based Module (SPARQL)",
             "evidence": {
                 "matched": [
                     f"goalType=={goal_type}",
-                    f"purpose=={self._get_model_metadata(model_id)['purpose']}"
+                    f"purpose=={model_metadata['purpose']}"
                 ]
             },
             "timestamp": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
@@ -270,8 +299,14 @@ class SelectionEngine:
             # NSGA2 모델은 항상 통일된 파일명 사용
             metadata_file = "NSGA2Model_sources.yaml"
         
-        # 원본 QueryGoal 복사
-        result = json.loads(json.dumps(processed_goal))
+        # surrogate는 원본 시뮬레이터의 컨테이너를 대체 실행 경로로 사용
+        container = model_metadata.get("container")
+        fallback_model = self.registry.get(model_metadata.get("surrogateFor") or "")
+        if container is None and fallback_model is not None:
+            container = fallback_model.get("container")
+
+        # 최상위/QueryGoal 객체만 복사하고 하위 구조(parameters, metadata 등)는 공유
+        result = {**processed_goal, "QueryGoal": dict(processed_goal["QueryGoal"])}
 
         # 확장 필드 추가
         result["QueryGoal"]["selectedModelRef"] = model_metadata["modelRef"]
@@ -283,13 +318,16 @@ class SelectionEngine:
                 "units.time": "s",
                 "runtime.freshness": "PT30S"
             },
-            "container": model_metadata.get("container", {
+            "container": container or {
                 "image": "factory-nsga2:latest",
                 "digest": "sha256:factory-nsga2-latest"
-            }),
+            },
             "catalogVersion": model_metadata["version"],
             "frozenAt": datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
         }
+        if model_metadata.get("surrogateFor"):
+            result["QueryGoal"]["selectedModel"]["surrogateFor"] = model_metadata["surrogateFor"]
+            result["QueryGoal"]["selectedModel"]["minConfidence"] = model_metadata.get("minConfidence")
         result["QueryGoal"]["selectionProvenance"] = {
             "ruleName": provenance["ruleName"],
             "ruleVersion": "v1.0",
@@ -0,0 +1,227 @@
+# execution_engine/tracking_service.py
+"""
+제품 위치 추적 서비스 (Goal 4)
+
+제품별 최신 tracking_data를 메모리에 유지하고 백그라운드 poller가 주기적으로 갱신한다.
+Goal 4 요청은 최신 값이 충분히 새로우면 AAS 서버 왕복 없이 dict 조회로 응답한다.
+
+- 최신 값: product_id -> TrackingSnapshot (조회는 dict 조회 + 시각 비교)
+- 이력: 제품별 최근 history_size개 위치 변경 (collections.deque ring buffer)
+- 갱신 경로: 요청 시 조회(request) / 백그라운드 polling(poll) / 서버 이벤트 구독(event, publish 호출)
+- 최근(poll_window) 요청된 제품만 polling, 한동안 요청되지 않은 제품(idle_ttl)은 최신 값/이력도 제거
+- 제품 ID는 대소문자/앞뒤 공백을 무시 ("P1"과 " p1"은 같은 제품)
+- 같은 제품의 동시 조회는 진행 중인 AAS 요청 하나로 병합 (single-flight)
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+def normalize_product_id(product_id: str) -> str:
+    """캐시/이력 키 (tracking_data Submodel ID와 같은 소문자 규칙)"""
+    return product_id.strip().lower()
+
+
+def tracking_submodel_id(product_id: str) -> str:
+    return f"urn:factory:submodel:tracking_data:{normalize_product_id(product_id)}"
+
+
+@dataclass(frozen=True)
+class TrackingSnapshot:
+    """제품의 마지막 tracking_data"""
+    product_id: str
+    data: Any
+    updated_at: float
+    source: str
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now if now is not None else time.time()) - self.updated_at
+
+
+class ProductTrackingService:
+    """
+    Args:
+        fetch: Submodel ID -> tracking_data 조회 함수 (AAS 서버 호출)
+        poll_fetch: 백그라운드 polling용 조회 함수 (기본: fetch)
+        poll_interval: 백그라운드 polling 주기 (초)
+        max_staleness: 요청 시 캐시 값을 그대로 쓰는 최대 경과 시간 (초)
+        history_size: 제품별 위치 이력 최대 개수
+        idle_ttl: 마지막 요청 이후 최신 값/이력을 보관하는 시간 (초)
+        max_workers: polling 동시 요청 수
+        poll_window: 마지막 요청 이후 polling을 계속하는 시간 (초, 기본 max_staleness의 5배)
+    """
+
+    def __init__(self,
+                 fetch: Callable[[str], Any],
+                 poll_interval: float = 1.0,
+                 max_staleness: float = 2.0,
+                 history_size: int = 100,
+                 idle_ttl: float = 300.0,
+                 max_workers: int = 8,
+                 poll_fetch: Optional[Callable[[str], Any]] = None,
+                 poll_window: Optional[float] = None):
+        self.fetch = fetch
+        self.poll_fetch = poll_fetch or fetch
+        self.poll_interval = poll_interval
+        self.max_staleness = max_staleness
+        self.history_size = history_size
+        self.idle_ttl = idle_ttl
+        self.max_workers = max_workers
+        # 요청이 끊긴 제품을 idle_ttl 동안 계속 polling하면 AAS 부하만 늘어남
+        self.poll_window = min(poll_window if poll_window is not None else max_staleness * 5, idle_ttl)
+
+        self._latest: Dict[str, TrackingSnapshot] = {}
+        self._history: Dict[str, Deque[Tuple[float, Any]]] = {}
+        self._last_requested: Dict[str, float] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+        self._poller: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "polls": 0, "poll_errors": 0, "events": 0}
+
+    # --- 조회 ---
+
+    def get_latest(self, product_id: str, max_age: Optional[float] = None) -> Optional[TrackingSnapshot]:
+        """max_age(기본 max_staleness) 이내의 최신 값 (없거나 오래됐으면 None)"""
+        product_id = normalize_product_id(product_id)
+        now = time.time()
+        self._last_requested[product_id] = now
+
+        snapshot = self._latest.get(product_id)
+        if snapshot is None or now - snapshot.updated_at > (self.max_staleness if max_age is None else max_age):
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        return snapshot
+
+    def get_position(self, product_id: str) -> Any:
+        """
+        Goal 4 요청 처리: 새로운 캐시 값이 있으면 그대로, 없으면 AAS 조회 후 polling 대상에 등록
+
+        Raises:
+            fetch 함수의 예외 (캐시 값이 없을 때만)
+        """
+        product_id = normalize_product_id(product_id)
+        snapshot = self.get_latest(product_id)
+        if snapshot is not None:
+            return snapshot.data
+
+        with self._lock:
+            inflight = self._inflight.get(product_id)
+            owner = inflight is None
+            if owner:
+                inflight = self._inflight[product_id] = Future()
+
+        if not owner:
+            # 같은 제품을 이미 조회 중인 요청의 결과 사용
+            self.stats["coalesced"] += 1
+            return inflight.result()
+
+        try:
+            data = self.fetch(tracking_submodel_id(product_id))
+            self.publish(product_id, data, source="request")
+            inflight.set_result(data)
+        except Exception as e:
+            inflight.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(product_id, None)
+
+        self._ensure_poller()
+        return data
+
+    def history(self, product_id: str) -> List[Dict[str, Any]]:
+        """위치 변경 이력 (오래된 순)"""
+        with self._lock:
+            entries = list(self._history.get(normalize_product_id(product_id), ()))
+        return [{"timestamp": timestamp, "data": data} for timestamp, data in entries]
+
+    def tracked_products(self) -> List[str]:
+        return list(self._latest)
+
+    # --- 갱신 ---
+
+    def publish(self, product_id: str, data: Any, source: str = "event", timestamp: Optional[float] = None):
+        """
+        최신 값 갱신 (poller, 요청 시 조회, 서버 이벤트 구독에서 호출)
+
+        값이 바뀐 경우에만 이력에 추가한다.
+        """
+        product_id = normalize_product_id(product_id)
+        timestamp = timestamp if timestamp is not None else time.time()
+        with self._lock:
+            previous = self._latest.get(product_id)
+            if previous is not None and previous.updated_at > timestamp:
+                return  # 늦게 도착한 오래된 값
+            self._latest[product_id] = TrackingSnapshot(product_id, data, timestamp, source)
+
+            if previous is None or previous.data != data:
+                history = self._history.get(product_id)
+                if history is None:
+                    history = self._history[product_id] = deque(maxlen=self.history_size)
+                history.append((timestamp, data))
+
+        if source == "event":
+            self.stats["events"] += 1
+
+    def _ensure_poller(self):
+        if self._poller is not None and self._poller.is_alive():
+            return
+        with self._lock:
+            if self._poller is not None and self._poller.is_alive():
+                return
+            self._stop.clear()
+            self._poller = threading.Thread(target=self._poll_loop, name="product-tracking-poller", daemon=True)
+            self._poller.start()
+
+    def _poll_loop(self):
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tracking-poll") as pool:
+            while not self._stop.wait(self.poll_interval):
+                products = self._active_products()
+                if not products:
+                    continue
+                list(pool.map(self._poll_product, products))
+
+    def _active_products(self) -> List[str]:
+        """poll_window 이내에 요청된 제품 (idle_ttl 동안 요청되지 않은 제품은 최신 값/이력과 함께 제거)"""
+        now = time.time()
+        requested = list(self._last_requested.items())
+        idle = [product_id for product_id, last in requested if now - last > self.idle_ttl]
+        if idle:
+            with self._lock:
+                for product_id in idle:
+                    self._last_requested.pop(product_id, None)
+                    self._latest.pop(product_id, None)
+                    self._history.pop(product_id, None)
+        return [product_id for product_id, last in requested
+                if now - last <= self.poll_window and product_id in self._latest]
+
+    def _poll_product(self, product_id: str):
+        try:
+            data = self.poll_fetch(tracking_submodel_id(product_id))
+        except Exception as e:
+            self.stats["poll_errors"] += 1
+            print(f"WARNING: Tracking poll failed for {product_id}: {e}")
+            return
+        self.stats["polls"] += 1
+        self.publish(product_id, data, source="poll")
+
+    def stop(self):
+        self._stop.set()
+        if self._poller is not None:
+            self._poller.join(timeout=self.poll_interval + 1)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "trackedProducts": len(self._latest),
+            "polledProducts": sum(1 for last in list(self._last_requested.values())
+                                  if time.time() - last <= self.poll_window),
+            "pollerRunning": self._poller is not None and self._poller.is_alive()
+        }
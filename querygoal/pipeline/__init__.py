@@ -4,6 +4,8 @@ from .parameter_filler import ParameterFiller
 from .actionplan_resolver import ActionPlanResolver
 from .model_selector import ModelSelector
 from .validator import QueryGoalValidator
+from .compiled_validator import CompiledGoalValidator, CompiledValidatorRegistry, ValidationIssue
+from .structure import FrozenDict, freeze, thaw, assoc_in, to_json
 
 __all__ = [
     'PatternMatcher',
@@ -11,5 +13,13 @@ __all__ = [
     'ParameterFiller',
     'ActionPlanResolver',
     'ModelSelector',
-    'QueryGoalValidator'
+    'QueryGoalValidator',
+    'CompiledGoalValidator',
+    'CompiledValidatorRegistry',
+    'ValidationIssue',
+    'FrozenDict',
+    'freeze',
+    'thaw',
+    'assoc_in',
+    'to_json'
 ]
\ No newline at end of file
@@ -168,13 +168,15 @@ class ActionPlanResolver:
 
     def resolve_action_plan(self,
                             querygoal: Dict[str, Any],
-                            goal_type: str) -> Dict[str, Any]:
+                            goal_type: str,
+                            action_sequence: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         QueryGoal에 액션 플랜 주입
 
         Args:
             querygoal: QueryGoal 딕셔너리
             goal_type: Goal 타입
+            action_sequence: 미리 조회한 액션 시퀀스 (배치 처리 시 goalType별 1회 조회 결과 재사용)
 
         Returns:
             업데이트된 QueryGoal
@@ -182,7 +184,8 @@ class ActionPlanResolver:
         qg = querygoal["QueryGoal"]
 
         # 온톨로지에서 액션 시퀀스 가져오기
-        action_sequence = self.get_action_sequence_from_ontology(goal_type)
+        if action_sequence is None:
+            action_sequence = self.get_action_sequence_from_ontology(goal_type)
 
         # 모델 필요 여부에 따라 액션 조정
         requires_model = qg["metadata"].get("requiresModel", False)
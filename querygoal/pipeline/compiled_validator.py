@@ -0,0 +1,388 @@
+"""
+Compiled Validator Module
+goalType별로 미리 컴파일된 QueryGoal 검증기 - 단일 패스 검증, 구조화된 오류, 변경 필드만 재검증
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set
+
+from pydantic import TypeAdapter, ValidationError
+
+from .validator import QueryGoalSchema, QueryGoalParameter, OutputSpecItem, QueryGoalMetadata
+
+# 재사용되는 Pydantic v2 TypeAdapter (프로세스당 1회 생성)
+QUERYGOAL_ADAPTER = TypeAdapter(QueryGoalSchema)
+FIELD_ADAPTERS = {
+    "goalId": TypeAdapter(str),
+    "goalType": TypeAdapter(str),
+    "parameters": TypeAdapter(List[QueryGoalParameter]),
+    "outputSpec": TypeAdapter(List[OutputSpecItem]),
+    "metadata": TypeAdapter(QueryGoalMetadata),
+    "selectedModelRef": TypeAdapter(Optional[str]),
+    "selectedModel": TypeAdapter(Optional[Dict[str, Any]]),
+    "selectionProvenance": TypeAdapter(Optional[Dict[str, Any]])
+}
+
+CATEGORY_LABELS = {
+    "schema": "Schema",
+    "business": "Business",
+    "consistency": "Consistency",
+    "completeness": "Completeness"
+}
+_CATEGORY_RANK = {category: rank for rank, category in enumerate(CATEGORY_LABELS)}
+
+
+@dataclass
+class ValidationIssue:
+    """구조화된 검증 결과 항목"""
+    category: str           # schema | business | consistency | completeness
+    code: str               # 검사 식별자 (예: missing_required_params)
+    path: str               # QueryGoal 내 필드 경로 (예: QueryGoal.parameters)
+    message: str
+    severity: str = "error"  # error | warning
+
+    def to_message(self) -> str:
+        """기존 QueryGoalValidator와 동일한 문자열 형식"""
+        return f"[{CATEGORY_LABELS[self.category]}] {self.message}"
+
+
+@dataclass(frozen=True)
+class _Check:
+    code: str
+    category: str
+    depends_on: FrozenSet[str]
+    run: Callable[[Dict[str, Any]], List[ValidationIssue]]
+
+
+class CompiledGoalValidator:
+    """
+    단일 goalType용 컴파일된 검증기
+
+    validation_rules / parameter_rules / 모델 레지스트리에서 필요한 값을 생성 시점에
+    집합·튜플로 미리 계산해두고, 검증 시에는 QueryGoal을 한 번만 순회한다.
+    """
+
+    def __init__(self,
+                 goal_type: str,
+                 validation_rules: Optional[Dict[str, Any]],
+                 parameter_rules: Optional[Dict[str, Any]],
+                 model_ids: Iterable[str]):
+        self.goal_type = goal_type
+        self.known_goal_type = validation_rules is not None
+
+        rules = validation_rules or {}
+        self.required_params = tuple(rules.get("required_params", []))
+        self.required_stages = tuple(rules.get("required_stages", []))
+        self.requires_model = rules.get("requires_model", False)
+
+        param_rules = parameter_rules or {}
+        self.expected_outputs = tuple(spec["name"] for spec in param_rules.get("outputSpec", []))
+        self.model_ids = frozenset(model_ids)
+
+        self.checks = self._compile_checks()
+
+    def _compile_checks(self) -> List[_Check]:
+        """goalType 규칙에 해당하는 검사만 선택"""
+        checks = []
+
+        if not self.known_goal_type:
+            checks.append(_Check("unknown_goal_type", "business", frozenset({"goalType"}), self._check_unknown_goal_type))
+        else:
+            if self.required_params:
+                checks.append(_Check("missing_required_params", "business", frozenset({"parameters"}),
+                                     self._check_required_params))
+            if self.required_stages:
+                checks.append(_Check("missing_required_stages", "business", frozenset({"metadata"}),
+                                     self._check_required_stages))
+            checks.append(_Check("model_requirement", "business", frozenset({"metadata", "selectedModel"}),
+                                 self._check_model_requirement))
+
+        checks.extend([
+            _Check("model_reference", "consistency", frozenset({"selectedModelRef", "selectedModel"}),
+                   self._check_model_reference),
+            _Check("action_plan_stages", "consistency", frozenset({"metadata"}), self._check_action_plan_stages)
+        ])
+
+        if self.model_ids:
+            checks.append(_Check("registered_model", "consistency", frozenset({"selectedModel"}),
+                                 self._check_registered_model))
+
+        # 카테고리 순서(business -> consistency -> completeness)대로 배치하여 결과 정렬 불필요
+        checks.extend([
+            _Check("goal_identity", "completeness", frozenset({"goalId", "goalType"}), self._check_goal_identity),
+            _Check("empty_required_values", "completeness", frozenset({"parameters"}), self._check_empty_values),
+            _Check("output_spec", "completeness", frozenset({"outputSpec"}), self._check_output_spec),
+            _Check("action_plan_present", "completeness", frozenset({"metadata"}), self._check_action_plan_present)
+        ])
+
+        return checks
+
+    # ------------------------------------------------------------------
+    # 검사 함수 (QueryGoal 코어 딕셔너리를 받아 ValidationIssue 목록 반환)
+    # ------------------------------------------------------------------
+
+    def _check_unknown_goal_type(self, qg: Dict[str, Any]) -> List[ValidationIssue]:
+        return [ValidationIssue("business", "unknown_goal_type", "QueryGoal.goalType",
+                                f"Unknown goal type: {qg.get('goalType', '')}")]
+
+    def _check_required_params(self, qg: Dict[str, Any]) -> List[ValidationIssue]:
+        param_keys = {p.get("key") for p in qg.get("parameters", [])}
+        missing = [p for p in self.required_params if p not in param_keys]
+        if missing:
+            return [ValidationIssue("business", "missing_required_params", "QueryGoal.parameters",
+                                    f"Missing required parameters: {missing}")]
+        return []
+
+    def _check_required_stages(self, qg: Dict[str, Any]) -> List[ValidationIssue]:
+        stages = qg.get("metadata", {}).get("pipelineStages", [])
+        missing = [s for s in self.required_stages if s not in stages]
+        if missing:
+            return [ValidationIssue("business", "missing_required_stages", "QueryGoal.metadata.pipelineStages",
+                                    f"Missing required pipeline stages: {missing}")]
+        return []
+
+    def _check_model_requirement(self, qg: Dict[str, Any]) -> List[ValidationIssue]:
+        issues = []
+        requires_model = qg.get("metadata", {}).get("requiresModel", False)
+        if self.requires_model != requires_model:
+            issues.append(ValidationIssue(
+                "business", "model_requirement", "QueryGoal.metadata.requiresModel",
+                f"Model requirement mismatch: expected {self.requires_model}, got {requires_model}"
+            ))
+        if requires_model and not qg.get("selectedModel"):
+            issues.append(ValidationIssue("business", "model_requirement", "QueryGoal.selectedModel",
+                                          "Model required but no model selected"))
+        return issues
+
+    def _check_model_reference(self, qg: Dict[str, Any]) -> List[ValidationIssue]:
+        model_ref = qg.get("selectedModelRef")
+        selected_model = qg.get("selectedModel")
+        if model_ref and selected_model:
+            model_id = selected_model.get("modelId")
+            if model_ref != model_id:
+                return [ValidationIssue(
+                    "consistency", "model_reference", "QueryGoal.selectedModelRef",
+                    f"Model reference inconsistency: ref={model_ref}, model.modelId={model_id}"
+                )]
+        return []
+
+    def _check_registered_model(self, qg: Dict[str, Any]) -> List[ValidationIssue]:
+        selected_model = qg.get("selectedModel")
+        if selected_model and selected_model.get("modelId") not in self.model_ids:
+            return [ValidationIssue(
+                "consistency", "registered_model", "QueryGoal.selectedModel.modelId",
+                f"Selected model '{selected_model.get('modelId')}' is not in the model registry",
+                severity="warning"
+            )]
+        return []
+
+    def _check_action_plan_stages(self, qg: Dict[str, Any]) -> List[ValidationIssue]:
+        issues = []
+        metadata = qg.get("metadata", {})
+        stages = metadata.get("pipelineStages", [])
+        action_types = [a.get("actionType", "") for a in metadata.get("actionPlan", [])]
+
+        if "swrlSelection" in stages and not any("Model" in t for t in action_types):
+            issues.append(ValidationIssue("consistency", "action_plan_stages", "QueryGoal.metadata.actionPlan",
+                                          "Pipeline includes swrlSelection but no model selection action in plan"))
+        if "simulation" in stages and not any("Simulator" in t for t in action_types):
+            issues.append(ValidationIssue("consistency", "action_plan_stages", "QueryGoal.metadata.actionPlan",
+                                          "Pipeline includes simulation but no simulator action in plan"))
+        return issues
+
+    def _check_goal_identity(self, qg: Dict[str, Any]) -> List[ValidationIssue]:
+        issues = []
+        if not qg.get("goalId") or qg.get("goalId") == "{auto-generated}":
+            issues.append(ValidationIssue("completeness", "goal_identity", "QueryGoal.goalId",
+                                          "Goal ID not properly generated", severity="warning"))
+        if not qg.get("goalType") or qg.get("goalType") == "{dynamic}":
+            issues.append(ValidationIssue("completeness", "goal_identity", "QueryGoal.goalType",
+                                          "Goal type not properly set", severity="warning"))
+        return issues
+
+    def _check_empty_values(self, qg: Dict[str, Any]) -> List[ValidationIssue]:
+        return [
+            ValidationIssue("completeness", "empty_required_values", f"QueryGoal.parameters[{i}].value",
+                            f"Required parameter '{p.get('key')}' has empty value", severity="warning")
+            for i, p in enumerate(qg.get("parameters", []))
+            if p.get("required") and not p.get("value")
+        ]
+
+    def _check_output_spec(self, qg: Dict[str, Any]) -> List[ValidationIssue]:
+        output_spec = qg.get("outputSpec")
+        if not output_spec:
+            return [ValidationIssue("completeness", "output_spec", "QueryGoal.outputSpec",
+                                    "No output specification defined", severity="warning")]
+
+        names = {spec.get("name") for spec in output_spec if isinstance(spec, dict)}
+        missing = [name for name in self.expected_outputs if name not in names]
+        if missing:
+            return [ValidationIssue("completeness", "output_spec", "QueryGoal.outputSpec",
+                                    f"Output specification missing expected fields: {missing}",
+                                    severity="warning")]
+        return []
+
+    def _check_action_plan_present(self, qg: Dict[str, Any]) -> List[ValidationIssue]:
+        if not qg.get("metadata", {}).get("actionPlan"):
+            return [ValidationIssue("completeness", "action_plan_present", "QueryGoal.metadata.actionPlan",
+                                    "No action plan defined", severity="warning")]
+        return []
+
+    # ------------------------------------------------------------------
+    # 검증 실행
+    # ------------------------------------------------------------------
+
+    def validate(self, querygoal: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        전체 검증 (스키마 + 규칙 검사 단일 패스)
+
+        Returns:
+            QueryGoalValidator.validate()와 동일한 구조 + "issues" (구조화된 항목)
+        """
+        try:
+            QUERYGOAL_ADAPTER.validate_python(querygoal)
+            issues = []
+        except ValidationError as e:
+            issues = self._schema_issues(e)
+
+        qg = querygoal.get("QueryGoal", {})
+        if isinstance(qg, dict):
+            for check in self.checks:
+                issues.extend(check.run(qg))
+
+        return self._build_result(issues)
+
+    def revalidate(self,
+                   querygoal: Dict[str, Any],
+                   previous_result: Dict[str, Any],
+                   changed_fields: Set[str]) -> Dict[str, Any]:
+        """
+        변경된 QueryGoal 필드에 의존하는 스키마/규칙 검사만 다시 실행
+
+        Args:
+            querygoal: 수정된 QueryGoal
+            previous_result: 직전 validate()/revalidate() 결과
+            changed_fields: 변경된 QueryGoal 최상위 필드 이름
+        """
+        if not changed_fields:
+            return previous_result
+
+        rerun_checks = [c for c in self.checks if c.depends_on & changed_fields]
+        rerun_codes = {c.code for c in rerun_checks}
+
+        kept = [
+            ValidationIssue(**issue)
+            for issue in previous_result.get("issues", [])
+            if issue["code"] not in rerun_codes
+            and not (issue["category"] == "schema" and _top_level_field(issue["path"]) in changed_fields)
+        ]
+
+        qg = querygoal.get("QueryGoal", {})
+        issues = kept
+        for field_name in sorted(changed_fields):
+            adapter = FIELD_ADAPTERS.get(field_name)
+            if adapter is not None and field_name in qg:
+                try:
+                    adapter.validate_python(qg[field_name])
+                except ValidationError as e:
+                    issues.extend(self._schema_issues(e, prefix=("QueryGoal", field_name)))
+
+        for check in rerun_checks:
+            issues.extend(check.run(qg))
+
+        # 유지된 항목과 새 항목이 섞이므로 카테고리 순서로 정렬 (안정 정렬)
+        issues.sort(key=lambda i: _CATEGORY_RANK[i.category])
+        return self._build_result(issues)
+
+    def _schema_issues(self, error: ValidationError, prefix: tuple = ()) -> List[ValidationIssue]:
+        issues = []
+        for detail in error.errors():
+            loc = prefix + tuple(detail["loc"])
+            field_path = " -> ".join(str(part) for part in loc)
+            issues.append(ValidationIssue(
+                "schema", detail["type"], ".".join(str(part) for part in loc),
+                f"Schema error at {field_path}: {detail['msg']}"
+            ))
+        return issues
+
+    def _build_result(self, issues: List[ValidationIssue]) -> Dict[str, Any]:
+        """issues는 카테고리 순서로 정렬되어 있어야 한다"""
+        errors = [i for i in issues if i.severity == "error"]
+        warnings = [i for i in issues if i.severity == "warning"]
+        failed_categories = {i.category for i in errors}
+
+        return {
+            "isValid": not errors,
+            "errors": [i.to_message() for i in errors],
+            "warnings": [i.to_message() for i in warnings],
+            "issues": [dict(vars(i)) for i in errors + warnings],
+            "validatedAt": datetime.now().isoformat(),
+            "goalType": self.goal_type,
+            "summary": {
+                "errorCount": len(errors),
+                "warningCount": len(warnings),
+                "schemaValid": "schema" not in failed_categories,
+                "businessRulesValid": "business" not in failed_categories,
+                "consistencyValid": "consistency" not in failed_categories,
+                "completenessValid": not any(i.category == "completeness" for i in warnings)
+            }
+        }
+
+
+def _top_level_field(path: str) -> str:
+    """'QueryGoal.parameters.0.key' -> 'parameters'"""
+    parts = path.split(".")
+    return parts[1] if len(parts) > 1 and parts[0] == "QueryGoal" else parts[0]
+
+
+class CompiledValidatorRegistry:
+    """goalType별 CompiledGoalValidator 캐시"""
+
+    def __init__(self,
+                 validation_rules: Dict[str, Dict[str, Any]],
+                 parameter_rules: Dict[str, Dict[str, Any]],
+                 model_registry: Optional[Mapping[str, Any]] = None):
+        self.validation_rules = validation_rules
+        self.parameter_rules = parameter_rules
+        self.model_registry = model_registry if model_registry is not None else {}
+        self.model_ids = frozenset(self.model_registry.keys())
+        self._registry_generation = getattr(self.model_registry, "generation", None)
+        self._validators: Dict[str, CompiledGoalValidator] = {}
+
+    def for_goal_type(self, goal_type: str) -> CompiledGoalValidator:
+        """goalType용 검증기 (최초 요청 시 컴파일, 모델 레지스트리가 재로드되면 다시 컴파일)"""
+        generation = getattr(self.model_registry, "generation", None)
+        if generation != self._registry_generation:
+            self.model_ids = frozenset(self.model_registry.keys())
+            self._registry_generation = generation
+            self._validators = {}
+
+        validator = self._validators.get(goal_type)
+        if validator is None:
+            validator = CompiledGoalValidator(
+                goal_type,
+                self.validation_rules.get(goal_type),
+                self.parameter_rules.get(goal_type),
+                self.model_ids
+            )
+            self._validators[goal_type] = validator
+        return validator
+
+    def validate(self, querygoal: Dict[str, Any]) -> Dict[str, Any]:
+        """QueryGoal의 goalType에 맞는 검증기로 전체 검증"""
+        goal_type = querygoal.get("QueryGoal", {}).get("goalType", "")
+        return self.for_goal_type(goal_type).validate(querygoal)
+
+    def revalidate(self,
+                   querygoal: Dict[str, Any],
+                   previous_result: Dict[str, Any],
+                   changed_fields: Set[str]) -> Dict[str, Any]:
+        """
+        변경 필드만 재검증
+
+        goalType이 바뀌면 적용 규칙 자체가 달라지므로 새 검증기로 전체 검증한다.
+        """
+        goal_type = querygoal.get("QueryGoal", {}).get("goalType", "")
+        if "goalType" in changed_fields or previous_result.get("goalType") != goal_type:
+            return self.for_goal_type(goal_type).validate(querygoal)
+        return self.for_goal_type(goal_type).revalidate(querygoal, previous_result, changed_fields)
@@ -13,6 +13,9 @@ from datetime import datetime
 # 기존 SelectionEngine 임포트
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from execution_engine.swrl.selection_engine import SelectionEngine, SelectionEngineError
+from execution_engine.swrl.model_registry import ModelRegistry, ModelRegistryError, get_model_registry
+
+from .structure import assoc, assoc_in
 
 
 class ModelSelectorError(Exception):
@@ -38,7 +41,7 @@ class ModelSelector:
 
         # 레지스트리 경로 설정 (항상 필요)
         self.registry_path = Path(registry_file)
-        self.model_registry = {}
+        self.registry: ModelRegistry = ModelRegistry.from_models([])
 
         try:
             self.selection_engine = SelectionEngine(
@@ -77,23 +80,18 @@ class ModelSelector:
             }
         }
 
+    @property
+    def model_registry(self) -> ModelRegistry:
+        """modelId -> 모델 정보 (SelectionEngine과 공유되는 인덱스 레지스트리)"""
+        return self.registry
+
     def _load_registry(self):
-        """모델 레지스트리 파일 로드"""
+        """모델 레지스트리 파일 로드 (같은 파일의 SelectionEngine 인스턴스와 공유)"""
         if self.registry_path.exists():
             try:
-                with open(self.registry_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    models_list = data.get("models", [])
-
-                    # 리스트를 딕셔너리로 변환
-                    self.model_registry = {}
-                    for model in models_list:
-                        model_id = model.get("modelId")
-                        if model_id:
-                            self.model_registry[model_id] = model
-
-                    print(f"Model registry loaded: {len(self.model_registry)} models")
-            except Exception as e:
+                self.registry = get_model_registry(str(self.registry_path))
+                print(f"Model registry loaded: {len(self.registry)} models")
+            except ModelRegistryError as e:
                 print(f"Error loading model registry: {e}")
                 self._create_default_registry()
         else:
@@ -102,7 +100,7 @@ class ModelSelector:
 
     def _create_default_registry(self):
         """기본 모델 레지스트리 생성"""
-        self.model_registry = {
+        default_models = {
             "NSGA2SimulatorModel": {
                 "modelId": "NSGA2SimulatorModel",
                 "name": "NSGA-II Simulator Model",
@@ -140,6 +138,8 @@ class ModelSelector:
                 }
             }
         }
+        self.registry = ModelRegistry.from_models(list(default_models.values()))
+
 
     def select_model(self,
                      goal_type: str,
@@ -192,6 +192,10 @@ class ModelSelector:
                         "container": selected_model.get("container", {}),
                         "metaDataFile": selected_model.get("MetaData", ""),
                     }
+                    # surrogate 선택 시 대체 시뮬레이터 / 최소 신뢰도 전달
+                    if selected_model.get("surrogateFor"):
+                        model_info["surrogateFor"] = selected_model["surrogateFor"]
+                        model_info["minConfidence"] = selected_model.get("minConfidence")
 
                     formatted_provenance = {
                         "selectedAt": provenance.get("timestamp", datetime.now().isoformat()),
@@ -213,7 +217,8 @@ class ModelSelector:
     def _convert_params_to_strings(self, querygoal_dict: Dict[str, Any]) -> Dict[str, Any]:
         """
         SelectionEngine용으로 QueryGoal의 parameter values를 string으로 변환
-        원본은 보존하고 복사본을 수정하여 반환
+        원본은 보존하고, 변경 경로(QueryGoal -> parameters)만 새로 만든 복사본 반환
+        (나머지 필드는 원본과 공유하므로 SelectionEngine은 입력을 수정하지 않아야 함)
 
         Args:
             querygoal_dict: 원본 QueryGoal 딕셔너리
@@ -221,18 +226,13 @@ class ModelSelector:
         Returns:
             parameter values가 string으로 변환된 복사본
         """
-        import copy
-        qg_copy = copy.deepcopy(querygoal_dict)
-
-        parameters = qg_copy["QueryGoal"].get("parameters", [])
-        for param in parameters:
-            value = param.get("value")
-            if value is not None:
-                param["value"] = str(value)
-            else:
-                param["value"] = ""
+        parameters = querygoal_dict["QueryGoal"].get("parameters", [])
+        converted = [
+            assoc(param, "value", "" if param.get("value") is None else str(param.get("value")))
+            for param in parameters
+        ]
 
-        return qg_copy
+        return assoc_in(querygoal_dict, ("QueryGoal", "parameters"), converted)
 
     def _legacy_select_model(self,
                             goal_type: str,
@@ -251,36 +251,33 @@ class ModelSelector:
         Returns:
             (선택된 모델, 선택 근거)
         """
-        # 적합한 모델 필터링
-        candidate_models = []
-        for model_id, model_info in self.model_registry.items():
-            model_purpose = model_info.get("purpose")
-            # purpose 매칭 (리스트 내 어느 하나라도 일치하면 OK)
-            if model_purpose in purposes:
-                candidate_models.append(model_info)
-
-        if not candidate_models:
-            return None, {"reason": f"No models found for purposes: {purposes}"}
+        # 레지스트리 파일이 바뀌었으면 재로드
+        self.registry.refresh_if_changed()
 
-        # 모델 점수 계산
         rules = self.selection_rules.get(goal_type, {})
-        scored_models = []
         scoring_criteria = rules.get("scoring_criteria", {})
 
-        for model in candidate_models:
-            score = self._calculate_model_score(model, scoring_criteria, constraints)
-            scored_models.append((model, score))
+        if constraints:
+            # 제약사항 점수는 요청마다 달라지므로 직접 계산
+            scored_models = self._score_candidates(purposes, scoring_criteria, constraints)
+        else:
+            # goalType별 후보 점수는 레지스트리 버전마다 한 번만 계산
+            scored_models = self.registry.derived(
+                ("scored_candidates", goal_type, tuple(purposes)),
+                lambda: self._score_candidates(purposes, scoring_criteria, None)
+            )
+
+        if not scored_models:
+            return None, {"reason": f"No models found for purposes: {purposes}"}
 
-        # 최고 점수 모델 선택
-        scored_models.sort(key=lambda x: x[1]["totalScore"], reverse=True)
         best_model, best_score = scored_models[0]
 
         # 선택 근거 생성
         provenance = {
             "selectedAt": datetime.now().isoformat(),
             "selectionMethod": "rule-based-scoring",
-            "candidatesEvaluated": len(candidate_models),
-            "scores": best_score,
+            "candidatesEvaluated": len(scored_models),
+            "scores": dict(best_score),
             "reason": f"Highest scoring model for purposes: {purposes}",
             "alternatives": [
                 {"modelId": m[0]["modelId"], "score": m[1]["totalScore"]}
@@ -290,6 +287,20 @@ class ModelSelector:
 
         return best_model, provenance
 
+    def _score_candidates(self,
+                          purposes: List[str],
+                          scoring_criteria: Dict[str, float],
+                          constraints: Optional[Dict[str, Any]]) -> List[tuple]:
+        """purpose 인덱스로 후보 모델을 찾고 점수 내림차순으로 정렬한 (모델, 점수) 목록"""
+        # 아직 학습되지 않은 surrogate는 후보에서 제외
+        scored_models = [
+            (model, self._calculate_model_score(model, scoring_criteria, constraints))
+            for model in self.registry.by_purposes(purposes)
+            if not model.get("surrogateFor") or self.registry.is_servable(model)
+        ]
+        scored_models.sort(key=lambda x: x[1]["totalScore"], reverse=True)
+        return scored_models
+
     def _calculate_model_score(self,
                                model: Dict[str, Any],
                                criteria: Dict[str, float],
@@ -340,13 +351,15 @@ class ModelSelector:
 
     def bind_model_to_querygoal(self,
                                 querygoal: Dict[str, Any],
-                                goal_type: str) -> Dict[str, Any]:
+                                goal_type: str,
+                                selection: Optional[tuple] = None) -> Dict[str, Any]:
         """
         QueryGoal에 모델 바인딩 - Fail-fast 로직 포함
 
         Args:
             querygoal: QueryGoal 딕셔너리
             goal_type: Goal 타입
+            selection: 미리 선택된 (모델, 선택 근거) - 배치 처리 시 goalType별 1회 선택 결과 재사용
 
         Returns:
             업데이트된 QueryGoal
@@ -365,11 +378,14 @@ class ModelSelector:
         parameters = qg.get("parameters", [])
 
         # 모델 선택 - QueryGoal 전체를 전달 (SelectionEngine용)
-        selected_model, provenance = self.select_model(
-            goal_type=goal_type,
-            parameters=parameters,
-            querygoal_dict=querygoal
-        )
+        if selection is not None:
+            selected_model, provenance = selection
+        else:
+            selected_model, provenance = self.select_model(
+                goal_type=goal_type,
+                parameters=parameters,
+                querygoal_dict=querygoal
+            )
 
         if selected_model:
             # 모델 정보 바인딩
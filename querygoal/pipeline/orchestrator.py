@@ -2,8 +2,9 @@
 Pipeline Orchestrator Module
 QueryGoal 파이프라인 전체를 조율하고 Stage-Gated 성공 판정을 수행하는 모듈
 """
+import asyncio
 import json
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterable, AsyncIterator, Iterable, Iterator, Tuple, Union
 from datetime import datetime
 from pathlib import Path
 
@@ -11,8 +12,43 @@ from .pattern_matcher import PatternMatcher
 from .template_loader import TemplateLoader
 from .parameter_filler import ParameterFiller
 from .actionplan_resolver import ActionPlanResolver
-from .model_selector import ModelSelector
+from .model_selector import ModelSelector, ModelSelectorError
 from .validator import QueryGoalValidator
+from .compiled_validator import CompiledValidatorRegistry
+from .structure import freeze, thaw
+
+
+def _parse_batch_line(line: Union[str, bytes]) -> Tuple[Optional[str], str]:
+    """
+    배치 입력 한 줄 파싱
+
+    Returns:
+        (요청 ID, 자연어 입력)
+
+    Raises:
+        ValueError: UTF-8/JSON이 아니거나 입력 문장이 없는 경우
+    """
+    if isinstance(line, bytes):
+        try:
+            line = line.decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Batch line must be UTF-8 encoded: {e}") from e
+
+    try:
+        item = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON line: {e}") from e
+
+    if isinstance(item, str):
+        return None, item
+
+    if isinstance(item, dict):
+        input_text = item.get("input") or item.get("text")
+        if isinstance(input_text, str) and input_text.strip():
+            request_id = item.get("id", item.get("request_id"))
+            return (str(request_id) if request_id is not None else None), input_text
+
+    raise ValueError("Batch line must be a JSON string or an object with an 'input' field")
 
 
 class PipelineOrchestrator:
@@ -27,6 +63,13 @@ class PipelineOrchestrator:
         self.model_selector = ModelSelector()
         self.validator = QueryGoalValidator()
 
+        # goalType별 컴파일된 검증기 (검증 규칙 + 파라미터 규칙 + 모델 레지스트리)
+        self.compiled_validators = CompiledValidatorRegistry(
+            validation_rules=self.validator.validation_rules,
+            parameter_rules=self.parameter_filler.parameter_rules,
+            model_registry=self.model_selector.model_registry
+        )
+
         # Stage-Gated 성공 판정 기준
         self.stage_criteria = {
             "aasQuery": {
@@ -70,96 +113,246 @@ class PipelineOrchestrator:
         try:
             # Stage 1: 패턴 매칭
             analysis_result = self.pattern_matcher.analyze(input_text)
-            goal_type = analysis_result["goalType"]
-            metadata = analysis_result["metadata"]
-            extracted_params = analysis_result["extractedParameters"]
+            return self._build_querygoal(analysis_result, pipeline_log)
 
+        except Exception as e:
             pipeline_log["stages"].append({
-                "stage": "patternMatching",
-                "status": "completed",
-                "result": analysis_result
+                "stage": "error",
+                "status": "failed",
+                "error": str(e)
             })
+            raise
 
-            # Stage 2: 템플릿 로드 및 초기화
-            querygoal = self.template_loader.create_querygoal(
-                goal_type=goal_type,
-                category=metadata.get("category", "unknown"),
-                requires_model=metadata.get("requiresModel", False),
-                pipeline_stages=metadata.get("pipelineStages", [])
-            )
+    def _build_querygoal(self,
+                         analysis_result: Dict[str, Any],
+                         pipeline_log: Dict[str, Any],
+                         group: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        패턴 매칭 결과로부터 QueryGoal 생성 (Stage 2~6)
 
-            pipeline_log["stages"].append({
-                "stage": "templateLoading",
-                "status": "completed",
-                "result": {"goalId": querygoal["QueryGoal"]["goalId"]}
-            })
+        Args:
+            analysis_result: PatternMatcher.analyze() 결과
+            pipeline_log: 단계별 로그를 기록할 딕셔너리
+            group: 같은 goalType 입력 간 공유 상태 (배치 처리 시 액션 플랜/모델 선택 결과 재사용)
 
-            # Stage 3: 파라미터 채움
-            querygoal = self.parameter_filler.process(
-                querygoal=querygoal,
-                extracted_params=extracted_params,
-                goal_type=goal_type
-            )
+        Returns:
+            완성된 QueryGoal 딕셔너리
+        """
+        goal_type = analysis_result["goalType"]
+        metadata = analysis_result["metadata"]
+        extracted_params = analysis_result["extractedParameters"]
+
+        pipeline_log["stages"].append({
+            "stage": "patternMatching",
+            "status": "completed",
+            "result": analysis_result
+        })
 
-            pipeline_log["stages"].append({
-                "stage": "parameterFilling",
-                "status": "completed",
-                "result": {"paramCount": len(querygoal["QueryGoal"]["parameters"])}
-            })
+        # Stage 2: 템플릿 로드 및 초기화
+        querygoal = self.template_loader.create_querygoal(
+            goal_type=goal_type,
+            category=metadata.get("category", "unknown"),
+            requires_model=metadata.get("requiresModel", False),
+            pipeline_stages=metadata.get("pipelineStages", [])
+        )
 
-            # Stage 4: 액션 플랜 결정
-            querygoal = self.actionplan_resolver.resolve_action_plan(
-                querygoal=querygoal,
-                goal_type=goal_type
+        pipeline_log["stages"].append({
+            "stage": "templateLoading",
+            "status": "completed",
+            "result": {"goalId": querygoal["QueryGoal"]["goalId"]}
+        })
+
+        # Stage 3: 파라미터 채움
+        querygoal = self.parameter_filler.process(
+            querygoal=querygoal,
+            extracted_params=extracted_params,
+            goal_type=goal_type
+        )
+
+        pipeline_log["stages"].append({
+            "stage": "parameterFilling",
+            "status": "completed",
+            "result": {"paramCount": len(querygoal["QueryGoal"]["parameters"])}
+        })
+
+        # Stage 4: 액션 플랜 결정 (그룹 내 첫 입력에서만 온톨로지 조회)
+        cached_plan = group.get("actionPlan") if group is not None else None
+        querygoal = self.actionplan_resolver.resolve_action_plan(
+            querygoal=querygoal,
+            goal_type=goal_type,
+            action_sequence=thaw(cached_plan) if cached_plan is not None else None
+        )
+        if group is not None and cached_plan is None:
+            group["actionPlan"] = freeze(querygoal["QueryGoal"]["metadata"]["actionPlan"])
+
+        pipeline_log["stages"].append({
+            "stage": "actionPlanResolution",
+            "status": "completed",
+            "result": {"actionCount": len(querygoal["QueryGoal"]["metadata"]["actionPlan"])}
+        })
+
+        # Stage 5: 모델 선택 (필요한 경우, 그룹 내 첫 입력에서만 선택 수행)
+        querygoal = self._bind_model(querygoal, goal_type, group)
+
+        model_status = "selected" if querygoal["QueryGoal"].get("selectedModel") else "not_required"
+        pipeline_log["stages"].append({
+            "stage": "modelSelection",
+            "status": "completed",
+            "result": {"modelStatus": model_status}
+        })
+
+        # Stage 6: 최종 검증
+        validation_result = self.compiled_validators.validate(querygoal)
+
+        pipeline_log["stages"].append({
+            "stage": "validation",
+            "status": "completed" if validation_result["isValid"] else "failed",
+            "result": validation_result["summary"]
+        })
+
+        # 공통 문제 자동 수정
+        if not validation_result["isValid"]:
+            changed_fields = set()
+            querygoal = self.validator.fix_common_issues(querygoal, changed_fields)
+            # 재검증 (수정된 필드에 의존하는 검사만)
+            validation_result = self.compiled_validators.revalidate(
+                querygoal, validation_result, changed_fields
             )
 
-            pipeline_log["stages"].append({
-                "stage": "actionPlanResolution",
-                "status": "completed",
-                "result": {"actionCount": len(querygoal["QueryGoal"]["metadata"]["actionPlan"])}
-            })
+        # 파이프라인 메타 정보 추가
+        querygoal["pipelineLog"] = pipeline_log
+        querygoal["validationResult"] = validation_result
+
+        return querygoal
+
+    def _bind_model(self,
+                    querygoal: Dict[str, Any],
+                    goal_type: str,
+                    group: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """모델 바인딩 - 그룹 상태가 있으면 첫 선택 결과(또는 실패)를 그룹 전체에 재사용"""
+        if group is None or not querygoal["QueryGoal"]["metadata"].get("requiresModel", False):
+            return self.model_selector.bind_model_to_querygoal(querygoal=querygoal, goal_type=goal_type)
+
+        if "selectionError" in group:
+            raise ModelSelectorError(group["selectionError"])
 
-            # Stage 5: 모델 선택 (필요한 경우)
-            querygoal = self.model_selector.bind_model_to_querygoal(
+        if "selection" in group:
+            selected_model, provenance = group["selection"]
+            return self.model_selector.bind_model_to_querygoal(
                 querygoal=querygoal,
-                goal_type=goal_type
+                goal_type=goal_type,
+                selection=(thaw(selected_model), thaw(provenance))
             )
 
-            model_status = "selected" if querygoal["QueryGoal"].get("selectedModel") else "not_required"
-            pipeline_log["stages"].append({
-                "stage": "modelSelection",
-                "status": "completed",
-                "result": {"modelStatus": model_status}
-            })
+        try:
+            querygoal = self.model_selector.bind_model_to_querygoal(querygoal=querygoal, goal_type=goal_type)
+        except ModelSelectorError as e:
+            group["selectionError"] = str(e)
+            raise
 
-            # Stage 6: 최종 검증
-            validation_result = self.validator.validate(querygoal)
+        qg = querygoal["QueryGoal"]
+        group["selection"] = (freeze(qg["selectedModel"]), freeze(qg["selectionProvenance"]))
+        return querygoal
 
-            pipeline_log["stages"].append({
-                "stage": "validation",
-                "status": "completed" if validation_result["isValid"] else "failed",
-                "result": validation_result["summary"]
-            })
+    def process_batch(self,
+                      lines: Iterable[str],
+                      chunk_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        JSONL 자연어 입력 일괄 처리
 
-            # 공통 문제 자동 수정
-            if not validation_result["isValid"]:
-                querygoal = self.validator.fix_common_issues(querygoal)
-                # 재검증
-                validation_result = self.validator.validate(querygoal)
+        각 줄은 {"input": "...", "id": "..."} 형태의 JSON 객체 또는 JSON 문자열이다.
+        chunk_size 줄씩 읽어 goalType별로 묶어 처리하며, 액션 플랜 조회와 모델 선택은
+        배치 전체에서 goalType별로 한 번만 수행한다. 결과는 입력 순서대로 생성된다.
 
-            # 파이프라인 메타 정보 추가
-            querygoal["pipelineLog"] = pipeline_log
-            querygoal["validationResult"] = validation_result
+        Args:
+            lines: JSONL 줄 iterable (파일 객체, 요청 본문 등)
+            chunk_size: 한 번에 묶어 처리할 입력 수
 
-            return querygoal
+        Yields:
+            {"index", "id", "input", "QueryGoal", "pipelineLog", "validationResult"} 또는
+            {"index", "id", "input", "error"} (실패한 입력)
+        """
+        groups: Dict[str, Dict[str, Any]] = {}
+        chunk: List[tuple] = []
 
-        except Exception as e:
-            pipeline_log["stages"].append({
-                "stage": "error",
-                "status": "failed",
-                "error": str(e)
-            })
-            raise
+        for index, line in enumerate(lines):
+            if not line.strip():
+                continue
+
+            chunk.append((index, line))
+            if len(chunk) >= chunk_size:
+                yield from self._process_chunk(chunk, groups)
+                chunk = []
+
+        if chunk:
+            yield from self._process_chunk(chunk, groups)
+
+    async def process_batch_stream(self,
+                                   lines: AsyncIterable[Union[str, bytes]],
+                                   chunk_size: int = 500) -> AsyncIterator[Dict[str, Any]]:
+        """
+        process_batch의 비동기 입력 버전 (요청 본문 스트림처럼 도착하는 대로 처리)
+
+        chunk_size 줄이 도착할 때마다 묶음을 처리해 결과를 내보내므로 전체 입력을 메모리에 올리지 않는다.
+        묶음 처리는 이벤트 루프를 막지 않도록 별도 스레드에서 실행한다.
+        """
+        groups: Dict[str, Dict[str, Any]] = {}
+        chunk: List[tuple] = []
+        index = 0
+
+        async for line in lines:
+            if line.strip():
+                chunk.append((index, line))
+            index += 1
+
+            if len(chunk) >= chunk_size:
+                for record in await asyncio.to_thread(lambda c=chunk: list(self._process_chunk(c, groups))):
+                    yield record
+                chunk = []
+
+        if chunk:
+            for record in await asyncio.to_thread(lambda c=chunk: list(self._process_chunk(c, groups))):
+                yield record
+
+    def _process_chunk(self,
+                       chunk: List[tuple],
+                       groups: Dict[str, Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """입력 묶음을 goalType별로 처리하고 입력 순서대로 결과 반환"""
+        results: Dict[int, Dict[str, Any]] = {}
+        by_goal_type: Dict[str, List[tuple]] = {}
+
+        for index, line in chunk:
+            try:
+                request_id, input_text = _parse_batch_line(line)
+            except ValueError as e:
+                results[index] = {"index": index, "id": None, "input": None, "error": str(e)}
+                continue
+
+            analysis_result = self.pattern_matcher.analyze(input_text)
+            by_goal_type.setdefault(analysis_result["goalType"], []).append(
+                (index, request_id, input_text, analysis_result)
+            )
+
+        for goal_type, items in by_goal_type.items():
+            group = groups.setdefault(goal_type, {})
+
+            for index, request_id, input_text, analysis_result in items:
+                record = {"index": index, "id": request_id, "input": input_text}
+                pipeline_log = {
+                    "input": input_text,
+                    "stages": [],
+                    "timestamp": datetime.now().isoformat()
+                }
+
+                try:
+                    record.update(self._build_querygoal(analysis_result, pipeline_log, group))
+                except Exception as e:
+                    record["error"] = str(e)
+
+                results[index] = record
+
+        for index in sorted(results):
+            yield results[index]
 
     def execute_querygoal(self, querygoal: Dict[str, Any]) -> Dict[str, Any]:
         """
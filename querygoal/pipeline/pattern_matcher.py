@@ -3,8 +3,10 @@ Pattern Matcher Module
 자연어 입력에서 Goal 타입과 카테고리를 결정하는 모듈
 """
 import re
-from typing import Dict, Any, Tuple, Optional
+from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
 
 
 class GoalType(Enum):
@@ -14,10 +16,36 @@ class GoalType(Enum):
     UNKNOWN = "unknown"
 
 
+@dataclass(frozen=True)
+class _CompiledPattern:
+    """컴파일된 Goal 패턴 (literals: 매칭에 반드시 필요한 고정 문자열, 사전 필터용)"""
+    goal_index: int
+    regex: Pattern
+    literals: Tuple[str, ...]
+
+
+def _required_literals(pattern: str) -> Tuple[str, ...]:
+    """
+    ".*"로만 연결된 고정 문자열 패턴의 구성 문자열 추출
+
+    예: "cooling.*failure" -> ("cooling", "failure")
+    정규식 특수 문자가 포함된 패턴은 사전 필터 없이 정규식으로만 확인한다 (빈 튜플).
+    """
+    fragments = pattern.split(".*")
+    for fragment in fragments:
+        if re.escape(fragment).replace("\\ ", " ") != fragment:
+            return ()
+    return tuple(fragment for fragment in fragments if fragment)
+
+
 class PatternMatcher:
     """자연어 입력을 분석하여 Goal 타입과 메타데이터를 결정"""
 
-    def __init__(self):
+    def __init__(self, cache_size: int = 1024):
+        """
+        Args:
+            cache_size: analyze() 결과 LRU 캐시 크기 (반복되는 입력 문장용)
+        """
         self.patterns = {
             GoalType.GOAL1: [
                 r"cooling.*failure",
@@ -65,6 +93,80 @@ class PatternMatcher:
             }
         }
 
+        # Goal별 파라미터 추출 규칙: (파라미터명, 정규식, 값 변환 함수)
+        self.parameter_patterns = {
+            GoalType.GOAL1: [
+                ("machineId", r"machine[_\s]*(?:id[_\s]*)?[:\s]*([A-Za-z0-9_-]+)", None),
+                ("timestamp", r"time[:\s]*(\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2})", None)
+            ],
+            GoalType.GOAL3: [
+                ("productType", r"product[_\s]*(?:type[_\s]*)?[:\s]*([A-Za-z0-9_-]+)", None),
+                ("quantity", r"(?:quantity|qty|amount)[:\s]*(\d+)", int)
+            ],
+            GoalType.GOAL4: [
+                ("productId", r"product[_\s]*(?:id[_\s]*)?[:\s]*([A-Za-z0-9_-]+)", None),
+                ("locationType", r"location[_\s]*(?:type[_\s]*)?[:\s]*([A-Za-z0-9_-]+)", None)
+            ]
+        }
+
+        self._compile()
+        self._analyze_cached = lru_cache(maxsize=cache_size)(self._analyze)
+
+    def _compile(self):
+        """
+        패턴을 생성 시 한 번만 컴파일
+
+        - 패턴별 고정 문자열을 사전 필터 인덱스로 구성: 입력에 없는 문자열을 요구하는
+          패턴은 정규식을 실행하지 않는다
+        - 파라미터 추출 정규식 컴파일
+        """
+        self._goal_order: List[GoalType] = list(self.patterns)
+        self._prefiltered: Dict[str, List[_CompiledPattern]] = {}
+        self._unfiltered: List[_CompiledPattern] = []
+
+        for goal_index, goal_type in enumerate(self._goal_order):
+            for pattern in self.patterns[goal_type]:
+                compiled = _CompiledPattern(goal_index, re.compile(pattern), _required_literals(pattern))
+
+                if compiled.literals:
+                    # 가장 긴(선택도가 높은) 고정 문자열을 인덱스 키로 사용
+                    anchor = max(compiled.literals, key=len)
+                    self._prefiltered.setdefault(anchor, []).append(compiled)
+                else:
+                    self._unfiltered.append(compiled)
+
+        self._parameter_regexes: Dict[GoalType, List[Tuple[str, Pattern, Optional[Callable]]]] = {
+            goal_type: [(name, re.compile(pattern, re.I), convert) for name, pattern, convert in rules]
+            for goal_type, rules in self.parameter_patterns.items()
+        }
+
+    def score_goals(self, input_text: str) -> Dict[GoalType, int]:
+        """
+        Goal 타입별 매칭된 패턴 수
+
+        Args:
+            input_text: 사용자 입력 자연어
+
+        Returns:
+            {GoalType: 매칭 패턴 수} (매칭이 없는 Goal은 제외)
+        """
+        input_lower = input_text.lower()
+        scores = [0] * len(self._goal_order)
+
+        candidates = list(self._unfiltered)
+        for anchor, patterns in self._prefiltered.items():
+            if anchor in input_lower:
+                candidates.extend(patterns)
+
+        for compiled in candidates:
+            if all(literal in input_lower for literal in compiled.literals) and compiled.regex.search(input_lower):
+                scores[compiled.goal_index] += 1
+
+        return {
+            self._goal_order[index]: score
+            for index, score in enumerate(scores) if score
+        }
+
     def match_goal_type(self, input_text: str) -> Tuple[GoalType, Dict[str, Any]]:
         """
         입력 텍스트에서 Goal 타입을 결정
@@ -75,14 +177,13 @@ class PatternMatcher:
         Returns:
             (GoalType, metadata dict)
         """
-        input_lower = input_text.lower()
+        scores = self.score_goals(input_text)
 
-        # 각 Goal 타입의 패턴을 확인
-        for goal_type, patterns in self.patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, input_lower):
-                    metadata = self.goal_metadata.get(goal_type, {})
-                    return goal_type, metadata
+        if scores:
+            # 매칭 패턴 수가 가장 많은 Goal 선택 (동점이면 먼저 정의된 Goal)
+            goal_type = max(scores, key=lambda g: (scores[g], -self._goal_order.index(g)))
+            metadata = self.goal_metadata.get(goal_type, {})
+            return goal_type, metadata
 
         # 매칭되는 패턴이 없으면 UNKNOWN 반환
         return GoalType.UNKNOWN, {
@@ -104,38 +205,11 @@ class PatternMatcher:
         """
         parameters = {}
 
-        if goal_type == GoalType.GOAL1:
-            # Machine ID 추출
-            machine_match = re.search(r"machine[_\s]*(?:id[_\s]*)?[:\s]*([A-Za-z0-9_-]+)", input_text, re.I)
-            if machine_match:
-                parameters["machineId"] = machine_match.group(1)
-
-            # Timestamp 추출
-            timestamp_match = re.search(r"time[:\s]*(\d{4}-\d{2}-\d{2}[T\s]\d{2}:\d{2}:\d{2})", input_text, re.I)
-            if timestamp_match:
-                parameters["timestamp"] = timestamp_match.group(1)
-
-        elif goal_type == GoalType.GOAL3:
-            # Product type 추출
-            product_match = re.search(r"product[_\s]*(?:type[_\s]*)?[:\s]*([A-Za-z0-9_-]+)", input_text, re.I)
-            if product_match:
-                parameters["productType"] = product_match.group(1)
-
-            # Quantity 추출
-            qty_match = re.search(r"(?:quantity|qty|amount)[:\s]*(\d+)", input_text, re.I)
-            if qty_match:
-                parameters["quantity"] = int(qty_match.group(1))
-
-        elif goal_type == GoalType.GOAL4:
-            # Product ID 추출
-            product_match = re.search(r"product[_\s]*(?:id[_\s]*)?[:\s]*([A-Za-z0-9_-]+)", input_text, re.I)
-            if product_match:
-                parameters["productId"] = product_match.group(1)
-
-            # Location type 추출
-            location_match = re.search(r"location[_\s]*(?:type[_\s]*)?[:\s]*([A-Za-z0-9_-]+)", input_text, re.I)
-            if location_match:
-                parameters["locationType"] = location_match.group(1)
+        for name, regex, convert in self._parameter_regexes.get(goal_type, []):
+            match = regex.search(input_text)
+            if match:
+                value = match.group(1)
+                parameters[name] = convert(value) if convert else value
 
         return parameters
 
@@ -149,12 +223,21 @@ class PatternMatcher:
         Returns:
             분석 결과 딕셔너리
         """
-        goal_type, metadata = self.match_goal_type(input_text)
-        parameters = self.extract_parameters(input_text, goal_type)
+        goal_type, metadata, parameters = self._analyze_cached(input_text)
 
+        # 캐시된 결과가 호출자 수정으로 오염되지 않도록 파라미터는 새 dict로 반환
         return {
             "goalType": goal_type.value,
             "metadata": metadata,
-            "extractedParameters": parameters,
+            "extractedParameters": dict(parameters),
             "originalInput": input_text
-        }
\ No newline at end of file
+        }
+
+    def _analyze(self, input_text: str) -> Tuple[GoalType, Dict[str, Any], Dict[str, Any]]:
+        """Goal 분류와 파라미터 추출을 한 번에 수행 (LRU 캐시 대상)"""
+        goal_type, metadata = self.match_goal_type(input_text)
+        return goal_type, metadata, self.extract_parameters(input_text, goal_type)
+
+    def cache_info(self):
+        """analyze() LRU 캐시 통계"""
+        return self._analyze_cached.cache_info()
\ No newline at end of file
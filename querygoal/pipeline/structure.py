@@ -0,0 +1,102 @@
+"""
+QueryGoal Structural Sharing
+QueryGoal 전체 복사 없이 단계 간 전달하기 위한 불변 구조 및 copy-on-write 유틸리티
+
+- FrozenDict / tuple로 고정된 구조는 여러 QueryGoal이 안전하게 공유할 수 있다.
+- assoc / assoc_in은 변경 경로상의 컨테이너만 새로 만들고 나머지는 원본과 공유한다.
+- FrozenDict는 dict 하위 클래스이므로 json.dumps로 그대로 직렬화된다 (to_json).
+"""
+import json
+from typing import Any, Callable, Dict, Mapping, Sequence
+
+
+class FrozenDict(dict):
+    """수정 불가능한 dict (JSON 직렬화 및 dict 조회는 그대로 동작)"""
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("FrozenDict is immutable; use assoc()/assoc_in() or thaw()")
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    clear = _immutable
+    pop = _immutable
+    popitem = _immutable
+    setdefault = _immutable
+    update = _immutable
+
+    def __copy__(self) -> "FrozenDict":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "FrozenDict":
+        # 불변이므로 복사 없이 공유
+        return self
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value: Any) -> Any:
+    """dict/list를 재귀적으로 FrozenDict/tuple로 변환 (이미 고정된 하위 구조는 재사용)"""
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """고정된 구조를 수정 가능한 dict/list로 변환 (컨테이너만 복사, 스칼라는 공유)"""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+def assoc(mapping: Mapping[str, Any], key: str, value: Any) -> Dict[str, Any]:
+    """key만 바뀐 얕은 복사본 반환 (FrozenDict는 FrozenDict로 유지)"""
+    updated = dict(mapping)
+    updated[key] = value
+    return FrozenDict(updated) if isinstance(mapping, FrozenDict) else updated
+
+
+def assoc_in(data: Mapping[str, Any], path: Sequence[str], value: Any) -> Dict[str, Any]:
+    """
+    중첩 경로의 값을 바꾼 복사본 반환
+
+    경로상의 dict만 새로 만들고 나머지 하위 구조는 원본과 공유한다.
+    중간 키가 없으면 빈 dict를 만든다.
+    """
+    if not path:
+        raise ValueError("path must not be empty")
+
+    key = path[0]
+    if len(path) == 1:
+        return assoc(data, key, value)
+
+    child = data.get(key)
+    return assoc(data, key, assoc_in(child if isinstance(child, Mapping) else {}, path[1:], value))
+
+
+def update_in(data: Mapping[str, Any],
+              path: Sequence[str],
+              func: Callable[[Any], Any]) -> Dict[str, Any]:
+    """중첩 경로의 값에 func를 적용한 복사본 반환 (값이 그대로면 원본 반환)"""
+    current: Any = data
+    for key in path:
+        current = current.get(key) if isinstance(current, Mapping) else None
+
+    updated = func(current)
+    if updated is current:
+        return data  # type: ignore[return-value]
+    return assoc_in(data, path, updated)
+
+
+def to_json(data: Any, **kwargs: Any) -> str:
+    """경계(API 응답, 파일 저장)에서의 JSON 직렬화 (FrozenDict/tuple 포함)"""
+    kwargs.setdefault("ensure_ascii", False)
+    return json.dumps(data, **kwargs)
@@ -2,23 +2,65 @@
 Template Loader Module
 QueryGoal 템플릿을 로드하고 복제/초기화하는 모듈
 """
+import itertools
 import json
-import copy
 import os
-from datetime import datetime
 import random
 import string
-from typing import Dict, Any, Optional
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
 from pathlib import Path
 
+from .structure import freeze, thaw
+
+_BASE36 = string.digits + string.ascii_lowercase
+
+# 프로세스별 식별자 + 단조 증가 시퀀스 (여러 프로세스/스레드에서 동시에 생성해도 충돌 없음)
+_PROCESS_TOKEN = ''.join(random.choices(_BASE36, k=4))
+_goal_sequence = itertools.count(1)
+
+
+def _to_base36(number: int) -> str:
+    digits = ""
+    while number:
+        number, remainder = divmod(number, 36)
+        digits = _BASE36[remainder] + digits
+    return digits or "0"
+
+
+def generate_goal_id() -> str:
+    """
+    고유한 Goal ID 생성
+
+    Returns:
+        goal_YYYYMMDD_HHMMSS_<프로세스 토큰><시퀀스> 형식의 ID
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # itertools.count의 next()는 GIL 하에서 원자적이므로 스레드 간 중복 없음
+    sequence = _to_base36(next(_goal_sequence)).rjust(5, "0")
+    return f"goal_{timestamp}_{_PROCESS_TOKEN}{sequence}"
+
+
+def compile_template(template: Dict[str, Any]) -> Callable[[], Dict[str, Any]]:
+    """
+    템플릿을 새 인스턴스를 만드는 팩토리 함수로 컴파일
+
+    템플릿은 한 번 고정(freeze)해 두고, 팩토리는 호출마다 thaw로 dict/list만 새로 만든다.
+    (스칼라 값은 공유하므로 deepcopy보다 가볍고, NaN/Infinity 등 모든 JSON 값을 그대로 유지)
+    """
+    frozen = freeze(template)
+    return lambda: thaw(frozen)
+
 
 class TemplateLoader:
     """QueryGoal 템플릿 로드 및 초기화"""
 
-    def __init__(self, template_dir: Optional[str] = None):
+    def __init__(self, template_dir: Optional[str] = None, check_interval: float = 1.0):
         """
         Args:
             template_dir: 템플릿 디렉토리 경로
+            check_interval: 템플릿 파일 변경(mtime) 확인 주기 (초)
         """
         if template_dir is None:
             # 기본 경로 설정
@@ -27,7 +69,11 @@ class TemplateLoader:
         else:
             self.template_dir = Path(template_dir)
 
+        self.check_interval = check_interval
         self.templates = {}
+        self._factories: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._mtimes: Dict[str, float] = {}
+        self._last_check = time.monotonic()
         self._load_templates()
 
     def _load_templates(self):
@@ -35,13 +81,41 @@ class TemplateLoader:
         template_files = self.template_dir.glob("*.json")
 
         for template_file in template_files:
-            template_name = template_file.stem
+            self._load_template(template_file)
+
+    def _load_template(self, template_file: Path) -> bool:
+        """템플릿 파일 하나를 로드하고 팩토리로 컴파일"""
+        template_name = template_file.stem
+        try:
+            mtime = template_file.stat().st_mtime
+            with open(template_file, 'r', encoding='utf-8') as f:
+                template = json.load(f)
+
+            self.templates[template_name] = freeze(template)
+            self._factories[template_name] = compile_template(self.templates[template_name])
+            self._mtimes[template_name] = mtime
+            print(f"Loaded template: {template_name}")
+            return True
+        except Exception as e:
+            print(f"Error loading template {template_file}: {e}")
+            return False
+
+    def _refresh_changed_templates(self):
+        """check_interval마다 로드된 템플릿 파일의 mtime을 확인하여 변경된 파일만 다시 로드"""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+
+        for template_name, mtime in list(self._mtimes.items()):
+            template_file = self.template_dir / f"{template_name}.json"
             try:
-                with open(template_file, 'r', encoding='utf-8') as f:
-                    self.templates[template_name] = json.load(f)
-                    print(f"Loaded template: {template_name}")
-            except Exception as e:
-                print(f"Error loading template {template_file}: {e}")
+                current_mtime = template_file.stat().st_mtime
+            except OSError:
+                # 삭제된 템플릿은 마지막으로 로드된 내용을 계속 사용
+                continue
+            if current_mtime != mtime:
+                self._load_template(template_file)
 
     def get_template(self, template_name: str = "base_querygoal") -> Dict[str, Any]:
         """
@@ -51,27 +125,26 @@ class TemplateLoader:
             template_name: 템플릿 이름 (기본값: base_querygoal)
 
         Returns:
-            템플릿 딕셔너리의 딥카피
+            컴파일된 팩토리로 생성한 새 템플릿 인스턴스
         """
-        if template_name not in self.templates:
-            # 템플릿이 없으면 다시 로드 시도
-            self._load_templates()
+        self._refresh_changed_templates()
 
-        if template_name not in self.templates:
-            raise ValueError(f"Template '{template_name}' not found")
+        if template_name not in self._factories:
+            # 템플릿이 없으면 해당 파일만 로드 시도
+            template_file = self.template_dir / f"{template_name}.json"
+            if not template_file.exists() or not self._load_template(template_file):
+                raise ValueError(f"Template '{template_name}' not found")
 
-        return copy.deepcopy(self.templates[template_name])
+        return self._factories[template_name]()
 
     def generate_goal_id(self) -> str:
         """
         고유한 Goal ID 생성
 
         Returns:
-            goal_YYYYMMDD_HHMMSS_XXXXX 형식의 ID
+            goal_YYYYMMDD_HHMMSS_<프로세스 토큰><시퀀스> 형식의 ID
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        random_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=5))
-        return f"goal_{timestamp}_{random_suffix}"
+        return generate_goal_id()
 
     def create_querygoal(self,
                          goal_type: str,
@@ -132,7 +205,7 @@ class TemplateLoader:
         Returns:
             업데이트된 템플릿
         """
-        cloned = copy.deepcopy(template)
+        cloned = thaw(template)
 
         # QueryGoal 객체에 업데이트 적용
         qg = cloned["QueryGoal"]
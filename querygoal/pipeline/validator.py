@@ -2,7 +2,7 @@
 Validator Module
 QueryGoal 최종 검증을 수행하는 모듈
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set
 from pydantic import BaseModel, Field, ValidationError
 from datetime import datetime
 from enum import Enum
@@ -272,41 +272,47 @@ class QueryGoalValidator:
 
         return validation_result
 
-    def fix_common_issues(self, querygoal: Dict[str, Any]) -> Dict[str, Any]:
+    def fix_common_issues(self,
+                          querygoal: Dict[str, Any],
+                          changed_fields: Optional[Set[str]] = None) -> Dict[str, Any]:
         """
         일반적인 문제 자동 수정
 
         Args:
             querygoal: QueryGoal 딕셔너리
+            changed_fields: 전달되면 실제로 수정한 QueryGoal 최상위 필드 이름을 추가 (부분 재검증용)
 
         Returns:
             수정된 QueryGoal
         """
         qg = querygoal.get("QueryGoal", {})
+        changed = changed_fields if changed_fields is not None else set()
 
         # Goal ID 자동 생성
         if not qg.get("goalId") or qg.get("goalId") == "{auto-generated}":
-            from ..pipeline.template_loader import TemplateLoader
-            loader = TemplateLoader()
-            qg["goalId"] = loader.generate_goal_id()
+            from .template_loader import generate_goal_id
+            qg["goalId"] = generate_goal_id()
+            changed.add("goalId")
 
         # Goal Type 정리
         if qg.get("goalType") == "{dynamic}":
             qg["goalType"] = "unknown"
+            changed.add("goalType")
 
         # 카테고리 정리
         metadata = qg.get("metadata", {})
         if metadata.get("category") == "{dynamic}":
             metadata["category"] = "unknown"
-
-        # 빈 리스트 초기화
-        if not qg.get("parameters"):
-            qg["parameters"] = []
-        if not qg.get("outputSpec"):
-            qg["outputSpec"] = []
-        if not metadata.get("actionPlan"):
-            metadata["actionPlan"] = []
-        if not metadata.get("pipelineStages"):
-            metadata["pipelineStages"] = []
+            changed.add("metadata")
+
+        # 빈 리스트 초기화 (이미 빈 리스트면 변경 아님)
+        for field_name in ("parameters", "outputSpec"):
+            if not qg.get(field_name) and qg.get(field_name) != []:
+                qg[field_name] = []
+                changed.add(field_name)
+        for field_name in ("actionPlan", "pipelineStages"):
+            if not metadata.get(field_name) and metadata.get(field_name) != []:
+                metadata[field_name] = []
+                changed.add("metadata")
 
         return querygoal
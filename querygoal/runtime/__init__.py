@@ -9,9 +9,11 @@ from .exceptions import (
     StageExecutionError,
     StageGateFailureError,
     AASConnectionError,
+    CircuitOpenError,
     SimulationExecutionError,
     ManifestParsingError,
-    WorkDirectoryError
+    WorkDirectoryError,
+    PayloadDecodeError
 )
 
 __all__ = [
@@ -22,7 +24,9 @@ __all__ = [
     "StageExecutionError",
     "StageGateFailureError",
     "AASConnectionError",
+    "CircuitOpenError",
     "SimulationExecutionError",
     "ManifestParsingError",
-    "WorkDirectoryError"
+    "WorkDirectoryError",
+    "PayloadDecodeError"
 ]
\ No newline at end of file
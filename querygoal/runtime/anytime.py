@@ -0,0 +1,230 @@
+"""
+Goal3 Anytime Simulation
+시뮬레이터가 results/에 주기적으로 기록하는 best-so-far 해를 증분으로 읽고,
+QueryGoal 파라미터 deadlineMs가 지나면 현재까지의 최선 추정치로 먼저 응답
+
+- BestSoFarWatcher: best_so_far.jsonl을 마지막으로 읽은 위치부터 읽어 최신 기록 유지
+- AnytimeRunRegistry: 컨테이너 실행을 별도 스레드의 이벤트 루프에서 끝까지 진행하고
+  완료 시 최종 결과로 실행 상태를 갱신 (호출 측 이벤트 루프가 끝나도 실행은 계속됨)
+
+best_so_far.jsonl 한 줄 형식 (시뮬레이터가 BEST_SO_FAR_PATH에 append):
+    {"elapsed": 1.8, "generation": 12, "predicted_completion_time": 812.0, "makespan": 1460.0, "confidence": 0.71}
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger("querygoal.anytime")
+
+BEST_SO_FAR_FILE = "best_so_far.jsonl"
+RESULT_FILE = "anytime_result.json"
+
+
+class BestSoFarWatcher:
+    """best-so-far 파일 증분 reader (완성된 줄만 파싱, 파일이 다시 쓰이면 처음부터)"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.latest: Optional[Dict[str, Any]] = None
+        self.updates = 0
+        self._offset = 0
+        self._partial = b""
+        self._lock = threading.Lock()
+
+    def poll(self) -> Optional[Dict[str, Any]]:
+        """새로 추가된 기록을 반영한 최신 best-so-far (아직 없으면 None)"""
+        with self._lock:
+            return self._read_new_records()
+
+    def _read_new_records(self) -> Optional[Dict[str, Any]]:
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return self.latest
+
+        if size < self._offset:
+            self._offset, self._partial = 0, b""
+        if size == self._offset:
+            return self.latest
+
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            chunk = f.read(size - self._offset)
+        self._offset += len(chunk)
+
+        lines = (self._partial + chunk).split(b"\n")
+        self._partial = lines.pop()
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                self.latest = record
+                self.updates += 1
+        return self.latest
+
+
+def anytime_estimate(record: Dict[str, Any], elapsed: float, time_limit: float, updates: int) -> Dict[str, Any]:
+    """
+    best-so-far 기록 -> simulation 단계 출력 형식 (SimulationHandler._parse_simulation_output과 같은 구조)
+
+    기록에 confidence가 없으면 시간 제한 대비 진행률로 추정 (0.5에서 시작해 시간 제한 도달 시 0.95)
+    """
+    predicted = record.get("predicted_completion_time", record.get("first_completion_time", record.get("makespan")))
+    confidence = record.get("confidence")
+    if confidence is None:
+        progress = min(elapsed / time_limit, 1.0) if time_limit > 0 else 0.0
+        confidence = 0.5 + 0.45 * progress
+
+    return {
+        "estimatedTime": predicted,
+        "confidence": round(float(confidence), 4),
+        "simulator_type": "anytime-best-so-far",
+        "productionPlan": {},
+        "bottlenecks": [],
+        "execution_metadata": {
+            "partial": True,
+            "elapsedSeconds": round(elapsed, 3),
+            "generation": record.get("generation"),
+            "makespan": record.get("makespan"),
+            "bestSoFarUpdates": updates,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    }
+
+
+@dataclass
+class AnytimeRun:
+    """백그라운드에서 계속 진행되는 시뮬레이션 실행 상태"""
+    run_id: str
+    goal_id: str
+    work_directory: Path
+    time_limit: float
+    started_at: float = field(default_factory=time.time)
+    status: str = "running"
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    finished_at: Optional[float] = None
+    watcher: Optional[BestSoFarWatcher] = None
+
+    def __post_init__(self):
+        if self.watcher is None:
+            self.watcher = BestSoFarWatcher(self.work_directory / "results" / BEST_SO_FAR_FILE)
+
+    def best_estimate(self) -> Optional[Dict[str, Any]]:
+        record = self.watcher.poll()
+        if record is None:
+            return None
+        elapsed = record.get("elapsed", time.time() - self.started_at)
+        return anytime_estimate(record, float(elapsed), self.time_limit, self.watcher.updates)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "runId": self.run_id,
+            "goalId": self.goal_id,
+            "status": self.status,
+            "startedAt": datetime.utcfromtimestamp(self.started_at).isoformat(),
+            "finishedAt": datetime.utcfromtimestamp(self.finished_at).isoformat() if self.finished_at else None,
+            "bestSoFar": self.best_estimate() if self.status == "running" else None,
+            "result": self.result,
+            "error": self.error,
+            "workDirectory": str(self.work_directory)
+        }
+
+
+class AnytimeRunRegistry:
+    """
+    프로세스 전역 anytime 실행 목록
+
+    Args:
+        max_runs: 보관하는 실행 수 (초과 시 끝난 실행부터 제거)
+    """
+
+    def __init__(self, max_runs: int = 100):
+        self.max_runs = max_runs
+        self._runs: "OrderedDict[str, AnytimeRun]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, run: AnytimeRun, runner: Callable[[], Awaitable[Dict[str, Any]]]) -> "asyncio.Future":
+        """
+        runner 코루틴을 전용 스레드 이벤트 루프에서 실행
+
+        Returns:
+            호출 측 이벤트 루프에서 await 가능한 Future (최종 결과 또는 예외)
+        """
+        loop = asyncio.get_running_loop()
+        done: asyncio.Future = loop.create_future()
+
+        def complete(result: Optional[Dict[str, Any]], error: Optional[BaseException]):
+            if done.cancelled():
+                return
+            if error is not None:
+                done.set_exception(error)
+            else:
+                done.set_result(result)
+
+        def run_to_completion():
+            result, error = None, None
+            try:
+                result = asyncio.run(runner())
+                run.status, run.result = "completed", result
+                self._store_result(run)
+            except BaseException as e:
+                error = e
+                run.status, run.error = "failed", str(e)
+                logger.error(f"❌ Anytime run {run.run_id} failed: {e}")
+            run.finished_at = time.time()
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(complete, result, error)
+
+        with self._lock:
+            self._runs[run.run_id] = run
+            self._evict()
+
+        threading.Thread(target=run_to_completion, name=f"anytime-{run.run_id}", daemon=True).start()
+        return done
+
+    def _store_result(self, run: AnytimeRun):
+        try:
+            with open(run.work_directory / RESULT_FILE, 'w', encoding='utf-8') as f:
+                json.dump({"runId": run.run_id, "goalId": run.goal_id, "result": run.result},
+                          f, indent=2, ensure_ascii=False, default=str)
+        except OSError as e:
+            logger.warning(f"⚠️ Failed to store anytime result for {run.run_id}: {e}")
+        logger.info(f"🏁 Anytime run {run.run_id} finished, stored final result")
+
+    def _evict(self):
+        excess = len(self._runs) - self.max_runs
+        for run_id in [run_id for run_id, run in self._runs.items() if run.status != "running"][:max(excess, 0)]:
+            del self._runs[run_id]
+
+    def get(self, run_id: str) -> Optional[AnytimeRun]:
+        return self._runs.get(run_id)
+
+    def runs(self) -> List[AnytimeRun]:
+        return list(self._runs.values())
+
+
+_registry: Optional[AnytimeRunRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_anytime_registry() -> AnytimeRunRegistry:
+    """프로세스 전역 AnytimeRunRegistry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                from config import ANYTIME_MAX_RUNS
+                _registry = AnytimeRunRegistry(ANYTIME_MAX_RUNS)
+    return _registry
@@ -4,8 +4,19 @@ Runtime Clients
 
 from .aas_client import AASClient
 from .container_client import ContainerClient
+from .resilience import ResilientRequester, RetryPolicy, CircuitBreaker, LatencyTracker, get_resilient_requester, is_stale
+from .scheduler import AASRequestScheduler, get_request_scheduler, set_request_priority
 
 __all__ = [
     "AASClient",
-    "ContainerClient"
+    "ContainerClient",
+    "ResilientRequester",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "LatencyTracker",
+    "get_resilient_requester",
+    "is_stale",
+    "AASRequestScheduler",
+    "get_request_scheduler",
+    "set_request_priority"
 ]
\ No newline at end of file
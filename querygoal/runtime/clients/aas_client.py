@@ -9,6 +9,9 @@ import logging
 from typing import Dict, Any, List, Optional
 from urllib.parse import urljoin
 
+from .resilience import ResilientRequester, get_resilient_requester, is_stale
+from .scheduler import AASRequestScheduler, get_request_scheduler
+from .submodel_cache import SubmodelCache, get_submodel_cache
 from ..exceptions import AASConnectionError
 
 logger = logging.getLogger("querygoal.aas_client")
@@ -17,7 +20,12 @@ logger = logging.getLogger("querygoal.aas_client")
 class AASClient:
     """AAS 서버 REST API 클라이언트"""
 
-    def __init__(self, base_url: str = None, timeout: int = 30):
+    def __init__(self,
+                 base_url: str = None,
+                 timeout: int = 30,
+                 resilience: Optional[ResilientRequester] = None,
+                 scheduler: Optional[AASRequestScheduler] = None,
+                 submodel_cache: Optional[SubmodelCache] = None):
         # 설정에서 AAS 서버 URL 가져오기
         if base_url is None:
             from config import AAS_SERVER_URL
@@ -27,6 +35,15 @@ class AASClient:
         self.timeout = timeout
         self.client = None
 
+        # 재시도 / hedging / 서킷 브레이커 레이어 (서버별로 프로세스 전역 공유)
+        self.resilience = resilience or get_resilient_requester(self.base_url)
+
+        # 프로세스 전역 요청 스케줄러 (rate limit / 우선순위 / 요청 병합)
+        self.scheduler = scheduler or get_request_scheduler()
+
+        # 프로세스 전역 Submodel warm cache (API 시작 시 prefetch)
+        self.submodel_cache = submodel_cache or get_submodel_cache()
+
     async def __aenter__(self):
         await self._ensure_client()
         return self
@@ -38,11 +55,38 @@ class AASClient:
     async def _ensure_client(self):
         """HTTP 클라이언트 초기화"""
         if self.client is None:
+            from config import AAS_MAX_CONNECTIONS, AAS_MAX_KEEPALIVE_CONNECTIONS
             self.client = httpx.AsyncClient(
                 timeout=httpx.Timeout(self.timeout),
-                limits=httpx.Limits(max_keepalive_connections=10, max_connections=50)
+                limits=httpx.Limits(
+                    max_keepalive_connections=AAS_MAX_KEEPALIVE_CONNECTIONS,
+                    max_connections=AAS_MAX_CONNECTIONS
+                )
             )
 
+    async def _get_json(self, url: str) -> Any:
+        """
+        idempotent GET 요청
+
+        동일 URL의 진행 중 요청은 병합되고, 재시도/hedge를 포함한 실제 HTTP 호출은
+        각각 스케줄러의 rate limit과 현재 컨텍스트의 우선순위를 따른다.
+        """
+        await self._ensure_client()
+
+        async def send() -> httpx.Response:
+            await self.scheduler.acquire(self.base_url)
+            return await self.client.get(url)
+
+        return await self.scheduler.coalesce(url, lambda: self.resilience.get_json(send, url))
+
+    def metrics(self) -> Dict[str, Any]:
+        """엔드포인트별 지연시간, 재시도/hedge/캐시 카운터, 서킷 상태, 스케줄러 대기열"""
+        return {
+            **self.resilience.metrics(),
+            "scheduler": self.scheduler.metrics(),
+            "submodel_cache": self.submodel_cache.metrics()
+        }
+
     def _encode_id(self, id_string: str) -> str:
         """AAS ID를 Base64 URL-safe 형태로 인코딩"""
         return base64.urlsafe_b64encode(id_string.encode()).decode().rstrip('=')
@@ -55,10 +99,7 @@ class AASClient:
         try:
             url = urljoin(self.base_url, "/shells")
 
-            response = await self.client.get(url)
-            response.raise_for_status()
-
-            shells_data = response.json()
+            shells_data = await self._get_json(url)
 
             # AAS 서버 응답 형식에 따라 조정
             if isinstance(shells_data, dict):
@@ -70,6 +111,8 @@ class AASClient:
 
         except httpx.HTTPStatusError as e:
             raise AASConnectionError(f"HTTP error while listing shells: {e.response.status_code}") from e
+        except AASConnectionError:
+            raise
         except Exception as e:
             raise AASConnectionError(f"Failed to list AAS shells: {e}") from e
 
@@ -83,15 +126,14 @@ class AASClient:
             encoded_shell_id = shell_id  # 필요하면 URL 인코딩
             url = urljoin(self.base_url, f"/shells/{encoded_shell_id}")
 
-            response = await self.client.get(url)
-            response.raise_for_status()
-
-            return response.json()
+            return await self._get_json(url)
 
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 raise AASConnectionError(f"Shell not found: {shell_id}") from e
             raise AASConnectionError(f"HTTP error while getting shell {shell_id}: {e.response.status_code}") from e
+        except AASConnectionError:
+            raise
         except Exception as e:
             raise AASConnectionError(f"Failed to get shell {shell_id}: {e}") from e
 
@@ -108,10 +150,7 @@ class AASClient:
                 # 전체 Submodel 목록
                 url = urljoin(self.base_url, "/submodels")
 
-            response = await self.client.get(url)
-            response.raise_for_status()
-
-            submodels_data = response.json()
+            submodels_data = await self._get_json(url)
 
             if isinstance(submodels_data, dict):
                 return submodels_data.get("result", submodels_data.get("submodels", []))
@@ -122,9 +161,37 @@ class AASClient:
 
         except httpx.HTTPStatusError as e:
             raise AASConnectionError(f"HTTP error while listing submodels: {e.response.status_code}") from e
+        except AASConnectionError:
+            raise
         except Exception as e:
             raise AASConnectionError(f"Failed to list submodels: {e}") from e
 
+    async def get_submodel(self,
+                           submodel_id: str,
+                           use_cache: bool = True,
+                           pin: bool = False) -> Dict[str, Any]:
+        """
+        Submodel 전체 조회 (warm cache 우선)
+
+        Args:
+            submodel_id: Submodel ID
+            use_cache: False면 캐시를 건너뛰고 서버에서 가져와 캐시 갱신
+            pin: 캐시 항목을 제거 대상에서 제외 (메니페스트 prefetch 항목)
+        """
+        if use_cache:
+            cached = self.submodel_cache.get(self.base_url, submodel_id)
+            if cached is not None:
+                return cached
+
+        url = urljoin(self.base_url + "/", f"submodels/{self._encode_id(submodel_id)}")
+        logger.debug(f"Requesting submodel: {url}")
+
+        submodel_data = await self._get_json(url)
+        # 장애 시 받은 stale 응답은 새 값으로 캐시하지 않음 (캐시 나이가 초기화되어 max age가 적용되지 않음)
+        if not is_stale(submodel_data):
+            self.submodel_cache.put(self.base_url, submodel_id, submodel_data, pinned=pin)
+        return submodel_data
+
     async def get_submodel_property(self,
                                    submodel_id: str,
                                    property_path: str,
@@ -138,18 +205,8 @@ class AASClient:
         await self._ensure_client()
 
         try:
-            # ID 인코딩
-            encoded_submodel = self._encode_id(submodel_id)
-
-            # 서브모델 직접 조회 (Shell을 거치지 않음)
-            url = urljoin(self.base_url + "/", f"submodels/{encoded_submodel}")
-
-            logger.debug(f"Requesting submodel: {url}")
-            response = await self.client.get(url)
-            response.raise_for_status()
-
-            # 서브모델 데이터 파싱
-            submodel_data = response.json()
+            # 서브모델 직접 조회 (Shell을 거치지 않음, warm cache 우선)
+            submodel_data = await self.get_submodel(submodel_id)
             submodel_elements = submodel_data.get('submodelElements', [])
 
             # element_id(property_path)와 일치하는 엘리먼트 찾기
@@ -177,6 +234,8 @@ class AASClient:
             raise AASConnectionError(
                 f"HTTP error while getting property {property_path}: {e.response.status_code}"
             ) from e
+        except AASConnectionError:
+            raise
         except Exception as e:
             raise AASConnectionError(f"Failed to get property {property_path}: {e}") from e
 
@@ -1,26 +1,57 @@
 """
 Container Client - Docker 시뮬레이션 실행 (Docker-only)
+
+같은 lineage의 이전 실행 결과가 있고 시나리오 변경이 작으면 warm-start seed 파일을
+시나리오 디렉터리에 함께 배치한다 (WARM_START_SEED 환경변수로 경로 전달).
+시뮬레이터는 BEST_SO_FAR_PATH에 현재까지의 최선 해를 주기적으로 기록한다 (anytime 모듈 참고).
 """
 import asyncio
 import json
 import logging
-import shutil
 import uuid
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 from datetime import datetime
 
 from ..exceptions import SimulationExecutionError
+from ..utils.interchange import load_interchange_file, materialize_for_container
+from ..warm_start import WarmStartStore, scenario_lineage
+from ..anytime import BEST_SO_FAR_FILE
 
 logger = logging.getLogger("querygoal.container_client")
 
+# 배치 실행 시 시나리오별 파라미터 (시나리오 디렉터리에 KEY=value 줄 단위로 기록)
+SCENARIO_PARAMS_FILE = "simulation_params.env"
+
+
+def parameter_env(parameters: Dict[str, Any]) -> List[str]:
+    """QueryGoal 파라미터 -> 컨테이너 환경 변수 (KEY=value)"""
+    return [f"{key.upper()}={value}" for key, value in parameters.items()]
+
 
 class ContainerClient:
     """컨테이너 실행 클라이언트 (Docker-only)"""
 
-    def __init__(self, execution_mode: str = "docker"):
+    def __init__(self, execution_mode: str = "docker", warm_start_store: Optional[WarmStartStore] = None):
         self.execution_mode = execution_mode  # "docker" only
 
+        if warm_start_store is None:
+            from config import WARM_START_ENABLED, WARM_START_DIR, WARM_START_MAX_JOB_CHANGE_RATIO
+            if WARM_START_ENABLED:
+                warm_start_store = WarmStartStore(WARM_START_DIR, WARM_START_MAX_JOB_CHANGE_RATIO)
+        self.warm_start_store = warm_start_store
+
+        from config import SIMULATION_TIME_LIMIT, ANYTIME_REPORT_INTERVAL_SECONDS
+        self.default_time_limit = SIMULATION_TIME_LIMIT
+        self.report_interval = ANYTIME_REPORT_INTERVAL_SECONDS
+
+    def time_limit(self, parameters: Dict[str, Any]) -> float:
+        """시뮬레이터 시간 제한 (초, QueryGoal 파라미터 timeLimit 우선)"""
+        try:
+            return float(parameters.get("timeLimit", self.default_time_limit))
+        except (TypeError, ValueError):
+            return float(self.default_time_limit)
+
     async def run_simulation(self,
                            image: str,
                            input_data: Dict[str, Any],
@@ -77,38 +108,23 @@ class ContainerClient:
 
             logger.info(f"📁 Creating scenario directory: {scenario_dir}")
 
-            # 파일 매핑 준비 (yamlBinding 출력 -> Docker 컨테이너 기대 형식)
-            file_mappings = {
-                "JobOrders": "jobs.json",
-                "Machines": "machines.json",
-                # 추가 필수 파일들은 기본값으로 생성
-                "operations": "operations.json",
-                "operation_durations": "operation_durations.json",
-                "machine_transfer_time": "machine_transfer_time.json",
-                "job_release": "job_release.json"
-            }
-
-            # yamlBinding에서 생성된 파일들 복사 및 이름 변경
-            data_files = input_data.get("data_files", {})
-            for source_name, target_name in file_mappings.items():
-                if source_name in data_files:
-                    # yamlBinding 파일 복사 및 이름 변경
-                    source_path = Path(data_files[source_name])
-                    if source_path.exists():
-                        target_path = scenario_dir / target_name
-                        shutil.copy2(source_path, target_path)
-                        logger.info(f"📄 Copied {source_name}.json -> {target_name}")
-                elif target_name in ["operations.json", "operation_durations.json",
-                                     "machine_transfer_time.json", "job_release.json"]:
-                    # 필수 파일이 없으면 기본값으로 생성
-                    target_path = scenario_dir / target_name
-                    await self._create_default_scenario_file(target_name, target_path, data_files)
-                    logger.info(f"📄 Created default {target_name}")
+            await self.stage_scenario(input_data, scenario_dir)
 
             # 결과 디렉터리 준비
             results_dir = work_directory / "results"
             results_dir.mkdir(exist_ok=True)
 
+            # 이전 실행 결과로 warm-start seed 배치 (QueryGoal 파라미터 coldStart로 비활성화)
+            parameters = input_data.get("parameters", {})
+            lineage = scenario_lineage(input_data.get("goal_type"), image, parameters)
+            warm_start = {"enabled": False, "lineage": lineage, "reason": "disabled"}
+            if self.warm_start_store is not None and not self._cold_start_requested(parameters):
+                try:
+                    warm_start = self.warm_start_store.prepare(lineage, scenario_dir)
+                except Exception as e:
+                    logger.warning(f"⚠️ Warm-start preparation failed, starting cold: {e}")
+                    warm_start["reason"] = f"preparation failed: {e}"
+
             # Docker 실행 명령어 구성 (시나리오 디렉터리를 볼륨 마운트)
             docker_cmd = [
                 "docker", "run",
@@ -118,41 +134,25 @@ class ContainerClient:
                 "-v", f"{work_directory}:/workspace",  # 작업 디렉터리 마운트
                 "--name", f"simulation-{execution_id}",
                 "-e", f"SCENARIO_NAME={scenario_name}",  # 시나리오 이름 환경변수
-                "-e", f"TIME_LIMIT=300",  # 시간 제한
+                "-e", f"TIME_LIMIT={self.time_limit(parameters):g}",  # 시간 제한
                 "-e", f"MAX_NODES=100000",  # 최대 노드 수
-                "-e", f"RESULT_PATH=/app/results"  # 결과 경로
+                "-e", f"RESULT_PATH=/app/results",  # 결과 경로
+                "-e", f"BEST_SO_FAR_PATH=/app/results/{BEST_SO_FAR_FILE}",  # best-so-far 기록 경로
+                "-e", f"BEST_SO_FAR_INTERVAL={self.report_interval:g}"  # best-so-far 기록 주기 (초)
             ]
+            if warm_start["enabled"]:
+                docker_cmd.extend(["-e", f"WARM_START_SEED=/app/scenarios/{scenario_name}/{warm_start['seedFile']}"])
 
             # 추가 파라미터 환경 변수로 전달
-            for key, value in input_data.get("parameters", {}).items():
-                docker_cmd.extend(["-e", f"{key.upper()}={value}"])
+            for variable in parameter_env(parameters):
+                docker_cmd.extend(["-e", variable])
 
             # 이미지 이름은 마지막에 추가
             docker_cmd.append(image)
 
             logger.info(f"🐳 Docker command: {' '.join(docker_cmd)}")
 
-            # 비동기 프로세스 실행
-            process = await asyncio.create_subprocess_exec(
-                *docker_cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=work_directory
-            )
-
-            stdout, stderr = await process.communicate()
-
-            # 결과 저장
-            logs_file = work_directory / f"container_logs_{execution_id}.txt"
-            with open(logs_file, 'w', encoding='utf-8') as f:
-                f.write(f"=== STDOUT ===\n{stdout.decode('utf-8', errors='replace')}\n")
-                f.write(f"=== STDERR ===\n{stderr.decode('utf-8', errors='replace')}\n")
-
-            if process.returncode != 0:
-                raise SimulationExecutionError(
-                    f"Docker container failed with exit code {process.returncode}: "
-                    f"{stderr.decode('utf-8', errors='replace')}"
-                )
+            process, stdout, logs_file = await self._run_process(docker_cmd, work_directory, execution_id)
 
             # 출력 결과 파싱 시도
             output_data = {}
@@ -166,38 +166,178 @@ class ContainerClient:
             except json.JSONDecodeError:
                 output_data = {"raw_output": stdout.decode('utf-8', errors='replace')}
 
+            # 다음 실행의 warm-start를 위해 최종 해 보관
+            if self.warm_start_store is not None:
+                self.warm_start_store.save(lineage, scenario_dir, results_dir, execution_id)
+
             return {
                 "execution_mode": "docker",
                 "container_image": image,
                 "exit_code": process.returncode,
                 "output": output_data,
-                "logs_path": str(logs_file)
+                "logs_path": str(logs_file),
+                "warm_start": warm_start
             }
 
         except Exception as e:
             raise SimulationExecutionError(f"Docker execution failed: {e}") from e
 
+    async def run_batch(self,
+                        image: str,
+                        scenario_names: List[str],
+                        work_directory: Path,
+                        goal_id: str,
+                        parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        여러 시나리오를 컨테이너 한 번으로 순차 실행 (파라미터 sweep용)
+
+        work_directory/scenarios/<name>/ 에 배치된 시나리오를 SCENARIO_NAMES로 전달하고,
+        결과는 시나리오별로 work_directory/results/<name>/ 에 기록된다.
+        parameters는 단일 실행과 같이 환경 변수로 전달하고, 시나리오별 파라미터는
+        write_scenario_parameters()로 기록한 파일을 시뮬레이터가 시나리오마다 export한다.
+        """
+        execution_id = f"{goal_id}_{uuid.uuid4().hex[:8]}"
+        start_time = datetime.utcnow()
+        parameters = parameters or {}
+
+        scenarios_dir = work_directory / "scenarios"
+        results_dir = work_directory / "results"
+        for name in scenario_names:
+            (results_dir / name).mkdir(parents=True, exist_ok=True)
+
+        docker_cmd = [
+            "docker", "run",
+            "--rm",
+            "-v", f"{scenarios_dir}:/app/scenarios",
+            "-v", f"{results_dir}:/app/results",
+            "--name", f"simulation-{execution_id}",
+            "-e", f"SCENARIO_NAMES={','.join(scenario_names)}",
+            "-e", f"TIME_LIMIT={self.time_limit(parameters):g}",
+            "-e", f"MAX_NODES=100000",
+            "-e", f"RESULT_PATH=/app/results",
+            "-e", f"BEST_SO_FAR_INTERVAL={self.report_interval:g}"
+        ]
+        for variable in parameter_env(parameters):
+            docker_cmd.extend(["-e", variable])
+        docker_cmd.append(image)
+
+        logger.info(f"🚀 Starting batch simulation container: {image} ({len(scenario_names)} scenarios)")
+        logger.info(f"🐳 Docker command: {' '.join(docker_cmd)}")
+
+        try:
+            process, _, logs_file = await self._run_process(docker_cmd, work_directory, execution_id)
+        except Exception as e:
+            raise SimulationExecutionError(f"Batch container execution failed: {e}") from e
+
+        execution_time = (datetime.utcnow() - start_time).total_seconds()
+        logger.info(f"✅ Batch simulation completed in {execution_time:.2f}s")
+        return {
+            "execution_mode": "docker",
+            "container_image": image,
+            "execution_id": execution_id,
+            "exit_code": process.returncode,
+            "execution_time": execution_time,
+            "logs_path": str(logs_file),
+            "results": {name: str(results_dir / name) for name in scenario_names}
+        }
+
+    def write_scenario_parameters(self, scenario_dir: Path, parameters: Dict[str, Any]):
+        """배치 실행용 시나리오별 파라미터 파일 (단일 실행의 -e 환경 변수와 같은 이름/값)"""
+        lines = [f"TIME_LIMIT={self.time_limit(parameters):g}"] + parameter_env(parameters)
+        with open(scenario_dir / SCENARIO_PARAMS_FILE, 'w', encoding='utf-8') as f:
+            f.write("\n".join(line.replace("\n", " ") for line in lines) + "\n")
+
+    async def _run_process(self, docker_cmd: List[str], work_directory: Path, execution_id: str):
+        """docker 프로세스 실행 후 로그 저장 (종료 코드가 0이 아니면 SimulationExecutionError)"""
+        process = await asyncio.create_subprocess_exec(
+            *docker_cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=work_directory
+        )
+
+        stdout, stderr = await process.communicate()
+
+        # 결과 저장
+        logs_file = work_directory / f"container_logs_{execution_id}.txt"
+        with open(logs_file, 'w', encoding='utf-8') as f:
+            f.write(f"=== STDOUT ===\n{stdout.decode('utf-8', errors='replace')}\n")
+            f.write(f"=== STDERR ===\n{stderr.decode('utf-8', errors='replace')}\n")
+
+        if process.returncode != 0:
+            raise SimulationExecutionError(
+                f"Docker container failed with exit code {process.returncode}: "
+                f"{stderr.decode('utf-8', errors='replace')}"
+            )
+        return process, stdout, logs_file
+
+    async def stage_scenario(self, input_data: Dict[str, Any], scenario_dir: Path):
+        """yamlBinding 출력 파일을 컨테이너가 기대하는 시나리오 파일로 배치 (없는 필수 파일은 기본값 생성)"""
+
+        # 파일 매핑 준비 (yamlBinding 출력 -> Docker 컨테이너 기대 형식)
+        file_mappings = {
+            "JobOrders": "jobs.json",
+            "Machines": "machines.json",
+            # 추가 필수 파일들은 기본값으로 생성
+            "operations": "operations.json",
+            "operation_durations": "operation_durations.json",
+            "machine_transfer_time": "machine_transfer_time.json",
+            "job_release": "job_release.json"
+        }
+
+        # yamlBinding에서 생성된 파일들 복사 및 이름 변경
+        data_files = input_data.get("data_files", {})
+        data_formats = input_data.get("data_formats", {})
+        accepted_formats = input_data.get("container_input_formats", ["json"])
+        for source_name, target_name in file_mappings.items():
+            if source_name in data_files:
+                # yamlBinding 파일 배치 (컨테이너가 읽을 수 없는 포맷이면 이 시점에 JSON 변환)
+                source_path = Path(data_files[source_name])
+                if source_path.exists():
+                    staged_path = materialize_for_container(
+                        source_path,
+                        data_formats.get(source_name),
+                        scenario_dir / target_name,
+                        accepted_formats
+                    )
+                    logger.info(f"📄 Staged {source_path.name} -> {staged_path.name}")
+            elif target_name in ["operations.json", "operation_durations.json",
+                                 "machine_transfer_time.json", "job_release.json"]:
+                # 필수 파일이 없으면 기본값으로 생성
+                target_path = scenario_dir / target_name
+                await self._create_default_scenario_file(
+                    target_name, target_path, data_files, data_formats
+                )
+                logger.info(f"📄 Created default {target_name}")
+
+    def _cold_start_requested(self, parameters: Dict[str, Any]) -> bool:
+        value = parameters.get("coldStart", False)
+        if isinstance(value, str):
+            return value.strip().lower() in ("true", "1", "yes")
+        return bool(value)
+
     async def _create_default_scenario_file(self,
                                            file_name: str,
                                            target_path: Path,
-                                           data_files: Dict[str, Any]):
+                                           data_files: Dict[str, Any],
+                                           data_formats: Dict[str, str] = None):
         """Goal3 시뮬레이션에 필요한 기본 시나리오 파일 생성"""
 
-        # JobOrders와 Machines 데이터 로드
+        data_formats = data_formats or {}
+
+        # JobOrders와 Machines 데이터 로드 (interchange 포맷 그대로 읽음)
         jobs_data = []
         machines_data = []
 
         if "JobOrders" in data_files:
             jobs_path = Path(data_files["JobOrders"])
             if jobs_path.exists():
-                with open(jobs_path, 'r', encoding='utf-8') as f:
-                    jobs_data = json.load(f)
+                jobs_data = load_interchange_file(jobs_path, data_formats.get("JobOrders"))
 
         if "Machines" in data_files:
             machines_path = Path(data_files["Machines"])
             if machines_path.exists():
-                with open(machines_path, 'r', encoding='utf-8') as f:
-                    machines_data = json.load(f)
+                machines_data = load_interchange_file(machines_path, data_formats.get("Machines"))
 
         # 파일별 기본 데이터 생성
         default_data = {}
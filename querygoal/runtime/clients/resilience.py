@@ -0,0 +1,382 @@
+"""
+AAS Client Resilience Layer
+엔드포인트별 지연시간 추적, hedged 요청, 지수 백오프 재시도, 서킷 브레이커
+
+서킷 브레이커/지연시간/last-value 캐시는 AAS 서버 단위 상태이므로
+get_resilient_requester()로 서버별 인스턴스 하나를 프로세스 전체에서 공유한다.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from ..exceptions import CircuitOpenError
+
+logger = logging.getLogger("querygoal.resilience")
+
+# 경로 정규화 시 그대로 유지하는 AAS REST 경로 세그먼트 (나머지는 ID로 간주)
+_LITERAL_SEGMENTS = {"shells", "submodels", "submodel-elements", "health", "value", "$value"}
+
+# 캐시에서 제공한 (서버 응답이 아닌) dict 응답에 추가되는 키
+STALE_KEY = "_stale"
+
+
+def _is_retryable_status(status_code: int) -> bool:
+    """재시도 및 브레이커 실패 대상 HTTP 상태 (429, 5xx), 그 외 4xx는 서버가 정상 응답한 것으로 간주"""
+    return status_code == 429 or status_code >= 500
+
+
+class StaleList(list):
+    """캐시에서 제공한 list 응답 (stale 속성에 경과 시간/사유)"""
+    stale: Dict[str, Any] = {}
+
+
+def mark_stale(value: Any, age: float, reason: str) -> Any:
+    """캐시 응답 표시: dict는 STALE_KEY를 추가한 복사본, list는 StaleList (원본 캐시 값은 그대로)"""
+    info = {"ageSeconds": round(age, 3), "reason": reason}
+    if isinstance(value, dict):
+        return {**value, STALE_KEY: info}
+    if isinstance(value, list):
+        marked = StaleList(value)
+        marked.stale = info
+        return marked
+    return value
+
+
+def is_stale(value: Any) -> bool:
+    """mark_stale()로 표시된 응답 여부"""
+    return (isinstance(value, dict) and STALE_KEY in value) or isinstance(value, StaleList)
+
+
+def _consume_exception(task: "asyncio.Future"):
+    """hedge로 버려진 요청의 예외 회수 (Task exception was never retrieved 방지)"""
+    if not task.cancelled():
+        task.exception()
+
+
+def endpoint_key(url: str) -> str:
+    """
+    URL을 엔드포인트 단위 키로 정규화
+
+    예: http://aas:5001/submodels/dXJu... -> GET /submodels/{id}
+    """
+    segments = [s for s in urlparse(url).path.split("/") if s]
+    normalized = [s if s in _LITERAL_SEGMENTS else "{id}" for s in segments]
+    return "GET /" + "/".join(normalized)
+
+
+class LatencyTracker:
+    """엔드포인트별 최근 지연시간 슬라이딩 윈도우"""
+
+    def __init__(self, window_size: int = 200, min_samples: int = 20):
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, key: str, seconds: float):
+        """지연시간 기록"""
+        window = self._samples.get(key)
+        if window is None:
+            window = self._samples[key] = deque(maxlen=self.window_size)
+        window.append(seconds)
+
+    def percentile(self, key: str, q: float) -> Optional[float]:
+        """q 분위수 (샘플이 부족하면 None)"""
+        window = self._samples.get(key)
+        if not window or len(window) < self.min_samples:
+            return None
+
+        ordered = sorted(window)
+        index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+        return ordered[index]
+
+    def snapshot(self, key: str) -> Dict[str, Any]:
+        """메트릭용 요약"""
+        window = self._samples.get(key, ())
+        return {
+            "samples": len(window),
+            "p50": self.percentile(key, 0.50),
+            "p95": self.percentile(key, 0.95),
+            "p99": self.percentile(key, 0.99)
+        }
+
+
+class CircuitBreaker:
+    """
+    연속 실패 기반 서킷 브레이커
+
+    closed -> (연속 실패 threshold회) -> open -> (reset_timeout 경과) -> half_open
+    half_open 상태에서는 probe 요청 1건만 허용하고, 성공하면 closed, 실패하면 다시 open
+    (probe 결과가 reset_timeout 안에 기록되지 않으면 다음 요청을 새 probe로 허용)
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.probe_started_at: Optional[float] = None
+        self.open_count = 0
+
+    def allow_request(self) -> bool:
+        """요청 허용 여부 (half_open에서는 진행 중인 probe가 없을 때 1건만)"""
+        now = time.monotonic()
+        if self.state == "open":
+            if now - self.opened_at < self.reset_timeout:
+                return False
+            self.state = "half_open"
+            logger.info("🔌 Circuit half-open, probing AAS server")
+        if self.state == "half_open":
+            if self.probe_started_at is not None and now - self.probe_started_at < self.reset_timeout:
+                return False
+            self.probe_started_at = now
+        return True
+
+    def record_success(self):
+        if self.state != "closed":
+            logger.info("✅ Circuit closed, AAS server recovered")
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.probe_started_at = None
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self.probe_started_at = None
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.open_count += 1
+                logger.warning(
+                    f"⚡ Circuit opened after {self.consecutive_failures} consecutive failures"
+                )
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+@dataclass
+class RetryPolicy:
+    """idempotent GET 재시도 정책 (지수 백오프 + full jitter)"""
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 2.0
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+@dataclass
+class EndpointStats:
+    """엔드포인트별 카운터"""
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    cache_served: int = 0
+    cache_expired: int = 0
+    rejected: int = 0
+
+
+@dataclass
+class _CachedResponse:
+    value: Any
+    stored_at: float = field(default_factory=time.monotonic)
+
+
+class ResilientRequester:
+    """
+    hedging / 재시도 / 서킷 브레이커 / last-value 캐시를 적용한 GET 실행기
+
+    서버 장애 시 마지막 성공 응답을 mark_stale()로 표시해 제공 (cache_max_age보다 오래된 값은 제공하지 않음)
+
+    Args:
+        hedge_enabled: 관측된 p95를 넘긴 요청에 대해 두 번째 요청 발사 여부
+        min_hedge_delay: hedge 발사 전 최소 대기 시간 (초)
+        cache_max_entries: last-value 캐시 최대 URL 수 (LRU)
+        cache_max_age: 캐시 값을 장애 시 대신 제공하는 최대 경과 시간 (초)
+    """
+
+    def __init__(self,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 latency_tracker: Optional[LatencyTracker] = None,
+                 hedge_enabled: bool = True,
+                 min_hedge_delay: float = 0.05,
+                 cache_max_entries: int = 1000,
+                 cache_max_age: float = 300.0):
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.latency_tracker = latency_tracker or LatencyTracker()
+        self.hedge_enabled = hedge_enabled
+        self.min_hedge_delay = min_hedge_delay
+        self.cache_max_entries = max(cache_max_entries, 1)
+        self.cache_max_age = cache_max_age
+        self.stats: Dict[str, EndpointStats] = {}
+        self._cache: "OrderedDict[str, _CachedResponse]" = OrderedDict()
+
+    async def get_json(self, send: Callable[[], Awaitable[httpx.Response]], url: str) -> Any:
+        """
+        GET 요청을 실행하고 JSON 응답 반환
+
+        Args:
+            send: 단일 HTTP 요청을 수행하는 코루틴 팩토리
+            url: 요청 URL (엔드포인트 키 및 캐시 키)
+
+        Raises:
+            httpx.HTTPStatusError: 재시도 대상이 아닌 HTTP 오류 (404 등)
+            CircuitOpenError: 서킷이 열려 있고 cache_max_age 이내의 캐시 값이 없는 경우
+        """
+        key = endpoint_key(url)
+        stats = self.stats.setdefault(key, EndpointStats())
+
+        if not self.circuit_breaker.allow_request():
+            stats.rejected += 1
+            return self._serve_cached(url, stats, CircuitOpenError(f"Circuit open for AAS server ({key})"))
+
+        last_error: Optional[Exception] = None
+        for attempt in range(self.retry_policy.max_attempts):
+            if attempt:
+                stats.retries += 1
+                await asyncio.sleep(self.retry_policy.delay(attempt))
+
+            stats.requests += 1
+            started = time.monotonic()
+            try:
+                response = await self._hedged_send(send, key, stats)
+                response.raise_for_status()
+                value = response.json()
+            except httpx.HTTPStatusError as e:
+                if not _is_retryable_status(e.response.status_code):
+                    # 4xx는 서버가 정상 응답한 것이므로 브레이커에는 성공으로 반영
+                    self.circuit_breaker.record_success()
+                    raise
+                last_error = e
+            except (httpx.TransportError, ValueError) as e:
+                last_error = e
+            else:
+                self.latency_tracker.record(key, time.monotonic() - started)
+                self.circuit_breaker.record_success()
+                self._store(url, value)
+                return value
+
+            stats.errors += 1
+            self.circuit_breaker.record_failure()
+            logger.warning(f"⚠️ {key} attempt {attempt + 1} failed: {last_error!r}")
+
+            if not self.circuit_breaker.allow_request():
+                break
+
+        return self._serve_cached(url, stats, last_error)
+
+    async def _hedged_send(self,
+                           send: Callable[[], Awaitable[httpx.Response]],
+                           key: str,
+                           stats: EndpointStats) -> httpx.Response:
+        """p95를 넘기면 두 번째 요청을 발사하고 먼저 성공한 응답 사용"""
+        # half_open probe는 요청 1건만 보냄
+        hedging = self.hedge_enabled and self.circuit_breaker.state == "closed"
+        p95 = self.latency_tracker.percentile(key, 0.95) if hedging else None
+        if p95 is None:
+            return await send()
+
+        primary = asyncio.ensure_future(send())
+        done, _ = await asyncio.wait({primary}, timeout=max(p95, self.min_hedge_delay))
+        if done:
+            return primary.result()
+
+        stats.hedges += 1
+        hedge = asyncio.ensure_future(send())
+        primary.add_done_callback(_consume_exception)
+        hedge.add_done_callback(_consume_exception)
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None and not _is_retryable_status(task.result().status_code):
+                        if task is hedge:
+                            stats.hedge_wins += 1
+                        return task.result()
+            # 두 요청 모두 실패: primary 예외(또는 오류 응답) 전파
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _store(self, url: str, value: Any):
+        self._cache[url] = _CachedResponse(value)
+        self._cache.move_to_end(url)
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+
+    def _serve_cached(self, url: str, stats: EndpointStats, error: Optional[Exception]) -> Any:
+        """서버가 비정상일 때 cache_max_age 이내의 마지막 성공 응답을 stale 표시와 함께 반환"""
+        cached = self._cache.get(url)
+        if cached is not None:
+            age = time.monotonic() - cached.stored_at
+            if age <= self.cache_max_age:
+                stats.cache_served += 1
+                logger.warning(f"📦 Serving stale cached response for {endpoint_key(url)} (age {age:.1f}s)")
+                reason = "circuit open" if isinstance(error, CircuitOpenError) else f"request failed: {error!r}"
+                return mark_stale(cached.value, age, reason)
+            stats.cache_expired += 1
+            del self._cache[url]
+
+        if error is None:
+            error = CircuitOpenError(f"AAS request failed: {url}")
+        raise error
+
+    def metrics(self) -> Dict[str, Any]:
+        """엔드포인트별 지연시간/카운터 및 서킷 상태"""
+        return {
+            "circuit": {
+                "state": self.circuit_breaker.state,
+                "probe_in_flight": self.circuit_breaker.probe_started_at is not None,
+                "consecutive_failures": self.circuit_breaker.consecutive_failures,
+                "open_count": self.circuit_breaker.open_count
+            },
+            "cached_responses": len(self._cache),
+            "endpoints": {
+                key: {**self.latency_tracker.snapshot(key), **vars(stats)}
+                for key, stats in self.stats.items()
+            }
+        }
+
+
+_requesters: Dict[str, ResilientRequester] = {}
+_requesters_lock = threading.Lock()
+
+
+def get_resilient_requester(server: str) -> ResilientRequester:
+    """AAS 서버별 ResilientRequester (서킷 브레이커/지연시간/캐시를 모든 AASClient가 공유, config.py 설정)"""
+    requester = _requesters.get(server)
+    if requester is None:
+        with _requesters_lock:
+            requester = _requesters.get(server)
+            if requester is None:
+                from config import (
+                    AAS_RETRY_ATTEMPTS,
+                    AAS_HEDGE_ENABLED,
+                    AAS_CIRCUIT_FAILURE_THRESHOLD,
+                    AAS_CIRCUIT_RESET_SECONDS,
+                    AAS_STALE_CACHE_MAX_ENTRIES,
+                    AAS_STALE_CACHE_MAX_AGE_SECONDS
+                )
+                requester = _requesters[server] = ResilientRequester(
+                    retry_policy=RetryPolicy(max_attempts=AAS_RETRY_ATTEMPTS),
+                    circuit_breaker=CircuitBreaker(
+                        failure_threshold=AAS_CIRCUIT_FAILURE_THRESHOLD,
+                        reset_timeout=AAS_CIRCUIT_RESET_SECONDS
+                    ),
+                    hedge_enabled=AAS_HEDGE_ENABLED,
+                    cache_max_entries=AAS_STALE_CACHE_MAX_ENTRIES,
+                    cache_max_age=AAS_STALE_CACHE_MAX_AGE_SECONDS
+                )
+    return requester
@@ -0,0 +1,336 @@
+"""
+AAS Request Scheduler
+프로세스 전역 AAS 요청 스케줄러 - 서버별 token bucket, 우선순위 큐, 동일 GET 요청 병합
+QueryGoal 런타임(AASClient, 비동기)과 ExecutionAgent(AASQueryHandler, 동기)가 같은 admission gate를 사용
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("querygoal.aas_scheduler")
+
+# 우선순위 클래스 (숫자가 작을수록 먼저 처리)
+PRIORITY_CLASSES = {
+    "interactive": 0,
+    "normal": 1,
+    "bulk": 2
+}
+
+# goalType 접두어별 기본 우선순위: Goal1/Goal4 조회는 대화형, Goal3 바인딩은 대량 처리
+GOAL_TYPE_PRIORITIES = {
+    "goal1": "interactive",
+    "goal2": "normal",
+    "goal3": "bulk",
+    "goal4": "interactive"
+}
+
+# ExecutionAgent(/execute-goal) goal 이름별 우선순위 (Goal1/Goal4 조회는 이 경로로 실행됨)
+AGENT_GOAL_PRIORITIES = {
+    "query_failed_jobs_with_cooling": "interactive",
+    "detect_anomaly_for_product": "normal",
+    "predict_first_completion_time": "bulk",
+    "track_product_position": "interactive"
+}
+
+_request_priority: contextvars.ContextVar = contextvars.ContextVar(
+    "aas_request_priority", default="normal"
+)
+
+
+def priority_for_goal_type(goal_type: Optional[str]) -> str:
+    """goalType (또는 ExecutionAgent goal 이름)에 해당하는 우선순위 클래스"""
+    if not goal_type:
+        return "normal"
+    if goal_type in AGENT_GOAL_PRIORITIES:
+        return AGENT_GOAL_PRIORITIES[goal_type]
+    # goal3_predict_production_time -> goal3
+    return GOAL_TYPE_PRIORITIES.get(goal_type.split("_")[0], "normal")
+
+
+def set_request_priority(priority: str) -> contextvars.Token:
+    """
+    현재 실행 컨텍스트(및 이후 생성되는 task)의 AAS 요청 우선순위 설정
+
+    Returns:
+        reset_request_priority()에 전달할 토큰
+    """
+    if priority not in PRIORITY_CLASSES:
+        raise ValueError(f"Unknown priority class: {priority}. Valid: {list(PRIORITY_CLASSES)}")
+    return _request_priority.set(priority)
+
+
+def reset_request_priority(token: contextvars.Token):
+    """set_request_priority() 이전 값으로 복원"""
+    _request_priority.reset(token)
+
+
+def current_request_priority() -> str:
+    """현재 컨텍스트의 AAS 요청 우선순위"""
+    return _request_priority.get()
+
+
+class _WaitStats:
+    """우선순위 클래스별 대기 시간 통계"""
+
+    def __init__(self, window_size: int = 500):
+        self.admitted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.max_queue_depth = 0
+        self._recent: Deque[float] = deque(maxlen=window_size)
+
+    def record(self, wait: float):
+        self.admitted += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self._recent.append(wait)
+
+    def snapshot(self, queue_depth: int) -> Dict[str, Any]:
+        recent = sorted(self._recent)
+        return {
+            "queue_depth": queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "admitted": self.admitted,
+            "avg_wait": self.total_wait / self.admitted if self.admitted else 0.0,
+            "p95_wait": recent[int(0.95 * (len(recent) - 1))] if recent else 0.0,
+            "max_wait": self.max_wait
+        }
+
+
+class _AsyncWaiter:
+    """이벤트 루프에서 대기하는 요청 (dispatcher 스레드가 루프 스레드로 깨움)"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.future = loop.create_future()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def wake(self):
+        def resolve():
+            if not self.future.done():
+                self.future.set_result(None)
+        try:
+            self.loop.call_soon_threadsafe(resolve)
+        except RuntimeError:
+            pass  # 이미 닫힌 루프
+
+
+class _BlockingWaiter:
+    """스레드에서 대기하는 요청 (ExecutionAgent 핸들러 등 동기 호출)"""
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def done(self) -> bool:
+        return self.event.is_set()
+
+    def wake(self):
+        self.event.set()
+
+
+class _ServerLane:
+    """
+    AAS 서버 하나에 대한 token bucket + 우선순위 대기열
+
+    비동기(AASClient)와 동기(ExecutionAgent) 호출이 같은 대기열을 공유하도록 lock으로 보호하고,
+    대기 요청은 lane별 dispatcher 스레드가 토큰이 생기는 대로 우선순위 순으로 깨운다.
+    rate가 0 이하면 제한 없음.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self.waiters: List[Tuple[int, int, float, str, Any]] = []
+        self.dispatcher: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+        self.stats = {name: _WaitStats() for name in PRIORITY_CLASSES}
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate <= 0
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_take(self) -> bool:
+        if self.unlimited:
+            return True
+        self.refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def queue_depth(self, priority: str) -> int:
+        return sum(1 for w in self.waiters if w[3] == priority and not w[4].done())
+
+
+class AASRequestScheduler:
+    """
+    프로세스 전역 AAS 요청 스케줄러
+
+    - 서버(base_url)별 token bucket으로 초당 요청 수 제한 (rate_per_second <= 0이면 제한 없음)
+    - 토큰을 기다리는 요청은 우선순위 클래스 → 도착 순으로 처리
+    - QueryGoal 런타임(acquire)과 ExecutionAgent(acquire_blocking)가 같은 서버 대기열을 공유
+    - 동일 URL에 대한 진행 중 GET은 하나의 요청으로 병합 (비동기 호출만)
+    """
+
+    def __init__(self, rate_per_second: float = 50.0, burst: int = 20):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self._lanes: Dict[str, _ServerLane] = {}
+        self._lanes_lock = threading.Lock()
+        self._inflight: Dict[Tuple[int, str], asyncio.Future] = {}
+        self._sequence = itertools.count()
+        self.coalesced = 0
+
+    def _lane(self, server: str) -> _ServerLane:
+        lane = self._lanes.get(server)
+        if lane is None:
+            with self._lanes_lock:
+                lane = self._lanes.get(server)
+                if lane is None:
+                    lane = self._lanes[server] = _ServerLane(self.rate_per_second, self.burst)
+        return lane
+
+    def _enqueue(self, server: str, priority: str, waiter) -> Optional[float]:
+        """
+        토큰이 있고 대기 요청이 없으면 바로 허가 (None 반환), 아니면 대기열에 추가하고 대기 시작 시각 반환
+        """
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class: {priority}. Valid: {list(PRIORITY_CLASSES)}")
+        lane = self._lane(server)
+        enqueued_at = time.monotonic()
+        with lane.lock:
+            if not lane.waiters and lane.try_take():
+                lane.stats[priority].record(0.0)
+                return None
+
+            heapq.heappush(lane.waiters, (PRIORITY_CLASSES[priority], next(self._sequence),
+                                          enqueued_at, priority, waiter))
+            stats = lane.stats[priority]
+            stats.max_queue_depth = max(stats.max_queue_depth, lane.queue_depth(priority))
+
+            if lane.dispatcher is None or not lane.dispatcher.is_alive():
+                lane.dispatcher = threading.Thread(
+                    target=self._dispatch, args=(lane,), name=f"aas-scheduler-{server}", daemon=True
+                )
+                lane.dispatcher.start()
+        return enqueued_at
+
+    def _record_wait(self, server: str, priority: str, enqueued_at: float):
+        lane = self._lane(server)
+        with lane.lock:
+            lane.stats[priority].record(time.monotonic() - enqueued_at)
+
+    async def acquire(self, server: str, priority: Optional[str] = None):
+        """요청 1건 발송 허가 대기 (token bucket + 우선순위)"""
+        priority = priority or current_request_priority()
+        waiter = _AsyncWaiter(asyncio.get_running_loop())
+        enqueued_at = self._enqueue(server, priority, waiter)
+        if enqueued_at is None:
+            return
+        await waiter.future
+        self._record_wait(server, priority, enqueued_at)
+
+    def acquire_blocking(self, server: str, priority: str = "normal"):
+        """동기 호출용 acquire (호출 스레드를 허가될 때까지 대기)"""
+        waiter = _BlockingWaiter()
+        enqueued_at = self._enqueue(server, priority, waiter)
+        if enqueued_at is None:
+            return
+        waiter.event.wait()
+        self._record_wait(server, priority, enqueued_at)
+
+    def _dispatch(self, lane: _ServerLane):
+        """토큰이 생기는 대로 우선순위가 가장 높은 대기 요청을 깨움 (대기열이 비면 종료)"""
+        while True:
+            with lane.lock:
+                if not lane.waiters:
+                    lane.dispatcher = None
+                    return
+                waiter = lane.waiters[0][4]
+                if waiter.done():  # 취소된 대기 요청
+                    heapq.heappop(lane.waiters)
+                    continue
+                if lane.try_take():
+                    heapq.heappop(lane.waiters)
+                    waiter.wake()
+                    continue
+                delay = (1 - lane.tokens) / lane.rate
+
+            time.sleep(delay)
+
+    async def coalesce(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        동일 key의 진행 중 요청이 있으면 그 결과를 공유하고, 없으면 fetch 실행
+
+        idempotent GET에만 사용해야 한다.
+        """
+        inflight_key = (id(asyncio.get_running_loop()), key)
+        existing = self._inflight.get(inflight_key)
+        if existing is not None:
+            self.coalesced += 1
+            return await asyncio.shield(existing)
+
+        future = asyncio.ensure_future(fetch())
+        self._inflight[inflight_key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                self._inflight.pop(inflight_key, None)
+            else:
+                # 호출자만 취소된 경우 다른 대기자를 위해 완료 시 정리
+                future.add_done_callback(lambda _: self._inflight.pop(inflight_key, None))
+
+    def metrics(self) -> Dict[str, Any]:
+        """서버/우선순위 클래스별 대기열 깊이 및 대기 시간"""
+        servers = {}
+        for server, lane in list(self._lanes.items()):
+            with lane.lock:
+                if not lane.unlimited:
+                    lane.refill()
+                servers[server] = {
+                    "tokens": None if lane.unlimited else round(lane.tokens, 2),
+                    "priorities": {
+                        name: stats.snapshot(lane.queue_depth(name))
+                        for name, stats in lane.stats.items()
+                    }
+                }
+        return {
+            "rate_per_second": self.rate_per_second,
+            "burst": self.burst,
+            "coalesced_requests": self.coalesced,
+            "inflight_requests": len(self._inflight),
+            "servers": servers
+        }
+
+
+_scheduler: Optional[AASRequestScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_request_scheduler() -> AASRequestScheduler:
+    """프로세스 전역 스케줄러 (config.py 설정으로 최초 1회 생성)"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                from config import AAS_RATE_LIMIT_RPS, AAS_RATE_LIMIT_BURST
+                _scheduler = AASRequestScheduler(AAS_RATE_LIMIT_RPS, AAS_RATE_LIMIT_BURST)
+                limit = f"{AAS_RATE_LIMIT_RPS} req/s" if AAS_RATE_LIMIT_RPS > 0 else "unlimited"
+                logger.info(f"🚦 AAS request scheduler: {limit}, burst {AAS_RATE_LIMIT_BURST}")
+    return _scheduler
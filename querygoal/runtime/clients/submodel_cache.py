@@ -0,0 +1,116 @@
+"""
+Submodel Warm Cache
+프로세스 전역 AAS Submodel 캐시 - 시작 시 prefetch, 접근 빈도 기반 주기적 갱신
+"""
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("querygoal.submodel_cache")
+
+
+@dataclass
+class CachedSubmodel:
+    """캐시된 Submodel 항목"""
+    value: Dict[str, Any]
+    fetched_at: float = field(default_factory=time.monotonic)
+    hits: int = 0                  # 누적 조회 수
+    hits_since_refresh: int = 0    # 마지막 갱신 이후 조회 수
+    last_access: float = field(default_factory=time.monotonic)
+    pinned: bool = False           # 메니페스트에 명시된 항목 (제거 대상 아님)
+
+
+class SubmodelCache:
+    """
+    (서버, submodel_id) 단위 Submodel 캐시
+
+    ttl 이내에 갱신된 항목만 조회에 사용되며, 그보다 오래된 항목은
+    클라이언트가 서버에서 다시 가져온다.
+    """
+
+    def __init__(self, ttl: float = 30.0):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, str], CachedSubmodel] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, server: str, submodel_id: str) -> Optional[Dict[str, Any]]:
+        """ttl 이내의 캐시 값 조회 (접근 빈도 기록)"""
+        entry = self._entries.get((server, submodel_id))
+        now = time.monotonic()
+
+        if entry is not None:
+            entry.hits += 1
+            entry.hits_since_refresh += 1
+            entry.last_access = now
+            if now - entry.fetched_at <= self.ttl:
+                self.hits += 1
+                return entry.value
+
+        self.misses += 1
+        return None
+
+    def put(self, server: str, submodel_id: str, value: Dict[str, Any], pinned: bool = False):
+        """서버에서 가져온 Submodel 저장 (기존 접근 통계는 유지)"""
+        entry = self._entries.get((server, submodel_id))
+        if entry is None:
+            self._entries[(server, submodel_id)] = CachedSubmodel(value=value, pinned=pinned)
+            return
+
+        entry.value = value
+        entry.fetched_at = time.monotonic()
+        entry.hits_since_refresh = 0
+        entry.pinned = entry.pinned or pinned
+
+    def refresh_candidates(self,
+                           base_interval: float,
+                           cold_multiplier: int = 4,
+                           evict_after: float = 600.0) -> List[Tuple[str, str]]:
+        """
+        갱신 대상 선정
+
+        - 마지막 갱신 이후 조회된 항목(hot): base_interval마다 갱신
+        - 조회되지 않은 항목(cold): base_interval * cold_multiplier마다 갱신
+        - evict_after 동안 조회되지 않은 비고정 항목: 제거
+        """
+        now = time.monotonic()
+        candidates = []
+
+        for key, entry in list(self._entries.items()):
+            if not entry.pinned and now - entry.last_access > evict_after:
+                del self._entries[key]
+                continue
+
+            interval = base_interval if entry.hits_since_refresh else base_interval * cold_multiplier
+            if now - entry.fetched_at >= interval:
+                candidates.append(key)
+
+        # 조회가 많은 항목부터 갱신
+        candidates.sort(key=lambda k: self._entries[k].hits_since_refresh, reverse=True)
+        return candidates
+
+    def metrics(self) -> Dict[str, Any]:
+        """캐시 적중률 및 항목별 신선도"""
+        now = time.monotonic()
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "ttl": self.ttl,
+            "stale_entries": sum(1 for e in self._entries.values() if now - e.fetched_at > self.ttl)
+        }
+
+
+_submodel_cache: Optional[SubmodelCache] = None
+
+
+def get_submodel_cache() -> SubmodelCache:
+    """프로세스 전역 Submodel 캐시"""
+    global _submodel_cache
+    if _submodel_cache is None:
+        from config import AAS_WARM_CACHE_TTL_SECONDS
+        _submodel_cache = SubmodelCache(ttl=AAS_WARM_CACHE_TTL_SECONDS)
+    return _submodel_cache
@@ -24,6 +24,11 @@ class AASConnectionError(RuntimeExecutionError):
     pass
 
 
+class CircuitOpenError(AASConnectionError):
+    """AAS 서버 서킷 브레이커 open 상태"""
+    pass
+
+
 class SimulationExecutionError(RuntimeExecutionError):
     """시뮬레이션 실행 실패"""
     pass
@@ -36,4 +41,9 @@ class ManifestParsingError(RuntimeExecutionError):
 
 class WorkDirectoryError(RuntimeExecutionError):
     """작업 디렉터리 오류"""
+    pass
+
+
+class PayloadDecodeError(RuntimeExecutionError):
+    """JSON 페이로드 디코딩 실패"""
     pass
\ No newline at end of file
@@ -15,6 +15,8 @@ from .handlers.yaml_binding_handler import YamlBindingHandler
 from .handlers.simulation_handler import SimulationHandler
 from .utils.work_directory import WorkDirectoryManager
 from .utils.stage_gate import StageGateValidator
+from .clients.scheduler import priority_for_goal_type, set_request_priority, reset_request_priority
+from .speculation import SpeculativeBinding, SpeculativePrebinder
 from .exceptions import (
     RuntimeExecutionError,
     StageExecutionError,
@@ -34,6 +36,7 @@ class ExecutionContext:
     pipeline_stages: List[str]
     current_stage: Optional[str] = None
     stage_results: Dict[str, Any] = field(default_factory=dict)
+    speculation: Optional[SpeculativeBinding] = None
 
 
 class QueryGoalExecutor:
@@ -53,6 +56,12 @@ class QueryGoalExecutor:
             "simulation": SimulationHandler()
         }
 
+        # swrlSelection과 yamlBinding 데이터 수집을 겹쳐 실행하기 위한 사전 바인딩
+        from config import SPECULATIVE_BINDING_ENABLED
+        self.prebinder = (
+            SpeculativePrebinder(self.stage_handlers["yamlBinding"]) if SPECULATIVE_BINDING_ENABLED else None
+        )
+
         # Stage-Gate 성공 기준
         self.stage_criteria = {
             "swrlSelection": {
@@ -74,7 +83,11 @@ class QueryGoalExecutor:
                 )
             },
             "simulation": {
-                "success_criteria": lambda result: result.get("status") == "completed"
+                # deadlineMs 응답 시점에 best-so-far가 없으면 pending (runId로 이후 결과 조회)
+                "success_criteria": lambda result: (
+                    result.get("status") == "completed" or
+                    (result.get("status") == "pending" and bool(result.get("anytime", {}).get("runId")))
+                )
             }
         }
 
@@ -85,6 +98,9 @@ class QueryGoalExecutor:
         start_time = datetime.utcnow()
         qg = querygoal["QueryGoal"]
 
+        # goalType 기반 AAS 요청 우선순위 (Goal1/Goal4 조회가 Goal3 바인딩 뒤에 밀리지 않도록)
+        priority_token = set_request_priority(priority_for_goal_type(qg.get("goalType")))
+
         try:
             # 실행 컨텍스트 초기화
             context = ExecutionContext(
@@ -98,6 +114,10 @@ class QueryGoalExecutor:
             logger.info(f"🚀 Starting QueryGoal execution for {context.goal_id}")
             logger.info(f"📋 Pipeline stages: {context.pipeline_stages}")
 
+            # 모델 선택이 끝나기 전에 예측한 메니페스트로 데이터 수집 시작
+            if self.prebinder is not None and "yamlBinding" in context.pipeline_stages:
+                context.speculation = self.prebinder.start(querygoal, context.work_directory)
+
             # Stage별 순차 실행
             execution_log = {
                 "goalId": context.goal_id,
@@ -110,28 +130,21 @@ class QueryGoalExecutor:
                 context.current_stage = stage_name
 
                 try:
-                    # Stage 실행
-                    stage_result = await self._execute_stage(
+                    # Stage 실행 및 Stage-Gate 검증
+                    stage_result, gate_result = await self.run_stage(
                         stage_name, querygoal, context
                     )
 
-                    # Stage-Gate 검증
-                    gate_result = self.stage_gate_validator.validate_stage(
-                        stage_name, stage_result, self.stage_criteria
-                    )
-
-                    if not gate_result.passed:
-                        raise StageGateFailureError(
-                            f"Stage-Gate failed for {stage_name}: {gate_result.reason}"
-                        )
-
-                    # 성공 시 결과 기록
+                    # 성공 시 결과 기록 (실행 로그에는 결과를 복제하지 않고 results 키로 참조)
                     context.stage_results[stage_name] = stage_result
 
+                    if stage_name == "swrlSelection" and self.prebinder is not None and stage_result.get("manifestPath"):
+                        self.prebinder.confirm(context.goal_type, stage_result["manifestPath"])
+
                     execution_log["stages"].append({
                         "stage": stage_name,
                         "status": "completed",
-                        "result": stage_result,
+                        "resultRef": f"results.{stage_name}",
                         "gate_check": {
                             "passed": gate_result.passed,
                             "reason": gate_result.reason
@@ -186,10 +199,43 @@ class QueryGoalExecutor:
             raise RuntimeExecutionError(f"QueryGoal execution failed: {e}") from e
 
         finally:
+            reset_request_priority(priority_token)
+
+            # 사용되지 않은 사전 바인딩 정리 (선택 실패, yamlBinding 미도달 등)
+            if 'context' in locals() and context.speculation is not None:
+                await context.speculation.discard()
+                self.prebinder.record_outcome(context.speculation)
+
             # 리소스 정리 (성공/실패 무관)
             if 'context' in locals():
                 await self._cleanup_resources(context)
 
+    async def run_stage(self,
+                        stage_name: str,
+                        querygoal: Dict[str, Any],
+                        context: ExecutionContext):
+        """
+        Stage 실행 후 Stage-Gate 검증 (파라미터 sweep 등 일부 Stage만 실행하는 경우에도 사용)
+
+        Returns:
+            (stage_result, gate_result)
+
+        Raises:
+            StageGateFailureError: Stage-Gate 검증 실패
+        """
+        stage_result = await self._execute_stage(stage_name, querygoal, context)
+
+        gate_result = self.stage_gate_validator.validate_stage(
+            stage_name, stage_result, self.stage_criteria
+        )
+
+        if not gate_result.passed:
+            raise StageGateFailureError(
+                f"Stage-Gate failed for {stage_name}: {gate_result.reason}"
+            )
+
+        return stage_result, gate_result
+
     async def _execute_stage(self,
                            stage_name: str,
                            querygoal: Dict[str, Any],
@@ -1,14 +1,26 @@
 """
 Simulation Handler
 Goal3의 simulation 단계 - Docker 시뮬레이션 실행
+
+surrogate 모델이 선택된 경우 먼저 surrogate로 추정하고, 신뢰도가 minConfidence 미만이거나
+QueryGoal 파라미터 forceSimulation이 설정된 경우에만 원본 시뮬레이터 컨테이너를 실행한다.
+컨테이너 실행 결과는 surrogate 학습 데이터로 기록된다.
+컨테이너 실행 시 이전 실행의 최종 해로 warm-start했는지는 결과의 warmStart에 기록된다 (ContainerClient 참고).
+QueryGoal 파라미터 deadlineMs가 있으면 마감 시각에 시뮬레이터의 best-so-far 추정치로 먼저 응답하고
+컨테이너 실행은 백그라운드에서 끝까지 진행된다 (anytime 모듈 참고).
 """
+import asyncio
 import json
-from typing import Dict, Any
+import time
+import uuid
+from typing import Dict, Any, Optional
 from pathlib import Path
 
 from .base_handler import BaseHandler
 from ..clients.container_client import ContainerClient
 from ..exceptions import SimulationExecutionError
+from ..anytime import AnytimeRun, get_anytime_registry
+from ..surrogate import SurrogateDataset, extract_scenario_features, surrogate_confidence
 
 
 class SimulationHandler(BaseHandler):
@@ -18,6 +30,12 @@ class SimulationHandler(BaseHandler):
         super().__init__()
         self.container_client = ContainerClient()
 
+        from config import SURROGATE_DATASET_PATH, SURROGATE_MIN_CONFIDENCE
+        self.surrogate_dataset = SurrogateDataset(SURROGATE_DATASET_PATH)
+        self.default_min_confidence = SURROGATE_MIN_CONFIDENCE
+
+        self.anytime_runs = get_anytime_registry()
+
     async def execute(self,
                      querygoal: Dict[str, Any],
                      context: 'ExecutionContext') -> Dict[str, Any]:
@@ -51,32 +69,46 @@ class SimulationHandler(BaseHandler):
                 qg, json_files, context.work_directory
             )
 
-            # 컨테이너 실행
+            features = self._scenario_features(simulation_input["parameters"], json_files)
+
+            # surrogate 선택 시: 신뢰도가 충분하면 컨테이너 없이 응답
+            if (selected_model.get("surrogateFor") and features is not None
+                    and not self._simulation_requested(simulation_input["parameters"])):
+                surrogate_output = await self._run_surrogate(selected_model, features)
+                if surrogate_output is not None:
+                    await self._update_querygoal_outputs(qg, surrogate_output)
+                    result_data = {
+                        "containerImage": None,
+                        "executionId": None,
+                        "status": "completed",
+                        "simulationOutput": surrogate_output,
+                        "executionTime": surrogate_output["execution_metadata"]["inferenceMs"] / 1000.0,
+                        "containerLogs": None,
+                        "surrogate": True
+                    }
+                    await self.post_execute(result_data, context)
+                    return self.create_success_result(result_data)
+
+            # 컨테이너가 직접 읽을 수 있는 입력 포맷 (없으면 JSON만 지원)
+            simulation_input["container_input_formats"] = container_info.get("inputFormats", ["json"])
+
+            # 컨테이너 실행 (deadlineMs가 있으면 마감 시각에 best-so-far로 먼저 응답)
             self.logger.info(f"🚀 Starting simulation with container: {container_image}")
 
-            execution_result = await self.container_client.run_simulation(
-                image=container_image,
-                input_data=simulation_input,
-                work_directory=context.work_directory,
-                goal_id=context.goal_id
-            )
-
-            # 시뮬레이션 결과 파싱
-            simulation_output = await self._parse_simulation_output(
-                execution_result, context.work_directory
-            )
+            deadline_ms = self._deadline_ms(simulation_input["parameters"])
+            if deadline_ms is not None:
+                result_data = await self._run_with_deadline(
+                    qg, container_image, simulation_input, features, selected_model, context, deadline_ms
+                )
+            else:
+                result_data = await self._run_container(
+                    qg, container_image, simulation_input, features, selected_model,
+                    context.work_directory, context.goal_id
+                )
 
-            # QueryGoal outputs 업데이트
-            await self._update_querygoal_outputs(qg, simulation_output)
-
-            result_data = {
-                "containerImage": container_image,
-                "executionId": execution_result.get("execution_id"),
-                "status": "completed",
-                "simulationOutput": simulation_output,
-                "executionTime": execution_result.get("execution_time"),
-                "containerLogs": execution_result.get("logs_path")
-            }
+            # QueryGoal outputs 업데이트 (pending이면 아직 추정치 없음)
+            if result_data["simulationOutput"] is not None:
+                await self._update_querygoal_outputs(qg, result_data["simulationOutput"])
 
             await self.post_execute(result_data, context)
             return self.create_success_result(result_data)
@@ -88,6 +120,204 @@ class SimulationHandler(BaseHandler):
                 {"container_image": container_image if 'container_image' in locals() else None}
             )
 
+    async def _run_container(self,
+                             qg: Dict[str, Any],
+                             container_image: str,
+                             simulation_input: Dict[str, Any],
+                             features: Optional[Dict[str, float]],
+                             selected_model: Dict[str, Any],
+                             work_directory: Path,
+                             goal_id: str) -> Dict[str, Any]:
+        """컨테이너 실행 -> 결과 파싱 -> surrogate 학습 데이터 기록"""
+        execution_result = await self.container_client.run_simulation(
+            image=container_image,
+            input_data=simulation_input,
+            work_directory=work_directory,
+            goal_id=goal_id
+        )
+
+        # 시뮬레이션 결과 파싱
+        simulation_output = await self._parse_simulation_output(
+            execution_result, work_directory
+        )
+
+        # surrogate 학습 데이터 기록 (시나리오 특징 -> 시뮬레이터 결과)
+        self._record_sample(features, simulation_output, qg, selected_model, execution_result)
+
+        return {
+            "containerImage": container_image,
+            "executionId": execution_result.get("execution_id"),
+            "status": "completed",
+            "simulationOutput": simulation_output,
+            "executionTime": execution_result.get("execution_time"),
+            "containerLogs": execution_result.get("logs_path"),
+            "warmStart": execution_result.get("warm_start")
+        }
+
+    async def _run_with_deadline(self,
+                                 qg: Dict[str, Any],
+                                 container_image: str,
+                                 simulation_input: Dict[str, Any],
+                                 features: Optional[Dict[str, float]],
+                                 selected_model: Dict[str, Any],
+                                 context: 'ExecutionContext',
+                                 deadline_ms: float) -> Dict[str, Any]:
+        """
+        컨테이너를 백그라운드 실행으로 시작하고 deadline_ms까지 완료되지 않으면 best-so-far로 응답
+
+        마감 시각까지 best-so-far 기록이 없으면 status "pending"과 runId로 바로 응답한다
+        (GET /simulations/{runId}로 이후 best-so-far/최종 결과 조회).
+        응답 이후에도 실행은 계속되고 최종 결과는 AnytimeRunRegistry와 anytime_result.json에 반영된다.
+        """
+        run = AnytimeRun(
+            run_id=f"{context.goal_id}_{uuid.uuid4().hex[:8]}",
+            goal_id=context.goal_id,
+            work_directory=context.work_directory,
+            time_limit=self.container_client.time_limit(simulation_input["parameters"])
+        )
+        final = self.anytime_runs.start(run, lambda: self._run_container(
+            qg, container_image, simulation_input, features, selected_model,
+            context.work_directory, context.goal_id
+        ))
+
+        done, _ = await asyncio.wait({final}, timeout=deadline_ms / 1000.0)
+        if done:
+            result_data = final.result()
+            result_data["anytime"] = {"runId": run.run_id, "partial": False}
+            return result_data
+
+        # 백그라운드 실행의 최종 예외는 registry에 기록되므로 여기서는 소비만 함
+        final.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+        estimate = run.best_estimate()
+        if estimate is None:
+            # 아직 best-so-far 기록이 없으면 기다리지 않고 runId로 조회하도록 응답
+            self.logger.info(f"⏱️ Deadline {deadline_ms:.0f}ms reached without best-so-far, "
+                             f"run {run.run_id} pending")
+            return {
+                "containerImage": container_image,
+                "executionId": run.run_id,
+                "status": "pending",
+                "simulationOutput": None,
+                "executionTime": time.time() - run.started_at,
+                "containerLogs": None,
+                "anytime": {"runId": run.run_id, "partial": True, "pending": True}
+            }
+
+        self.logger.info(f"⏱️ Deadline {deadline_ms:.0f}ms reached, returning best-so-far "
+                         f"(run {run.run_id} continues in background)")
+        return {
+            "containerImage": container_image,
+            "executionId": run.run_id,
+            "status": "completed",
+            "simulationOutput": estimate,
+            "executionTime": time.time() - run.started_at,
+            "containerLogs": None,
+            "anytime": {"runId": run.run_id, "partial": True}
+        }
+
+    def _deadline_ms(self, parameters: Dict[str, Any]) -> Optional[float]:
+        value = parameters.get("deadlineMs")
+        if value in (None, ""):
+            return None
+        try:
+            deadline_ms = float(value)
+        except (TypeError, ValueError):
+            self.logger.warning(f"⚠️ Ignoring invalid deadlineMs: {value}")
+            return None
+        return deadline_ms if deadline_ms > 0 else None
+
+    def _scenario_features(self,
+                           parameters: Dict[str, Any],
+                           json_files: Dict[str, Any]) -> Optional[Dict[str, float]]:
+        """surrogate 입력 특징 (계산 실패 시 None - 시뮬레이션은 그대로 진행)"""
+        try:
+            return extract_scenario_features(parameters, json_files)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Scenario feature extraction failed: {e}")
+            return None
+
+    def _simulation_requested(self, parameters: Dict[str, Any]) -> bool:
+        """호출자가 surrogate 대신 전체 시뮬레이션을 요청했는지 여부 (forceSimulation 파라미터)"""
+        value = parameters.get("forceSimulation")
+        if isinstance(value, str):
+            return value.strip().lower() in ("true", "1", "yes")
+        return bool(value)
+
+    async def _run_surrogate(self,
+                             selected_model: Dict[str, Any],
+                             features: Dict[str, float]) -> Optional[Dict[str, Any]]:
+        """
+        surrogate 추정 (추론 런타임 micro-batch 사용)
+
+        Returns:
+            Goal3 출력 형식의 결과 또는 None (추론 실패 / 신뢰도 미달 -> 시뮬레이터 실행)
+        """
+        from execution_engine.inference_runtime import InferenceError, get_inference_runtime
+        from config import MODEL_REGISTRY_FILE_PATH, INFERENCE_TIMEOUT_SECONDS
+
+        model_id = selected_model["modelId"]
+        min_confidence = selected_model.get("minConfidence")
+        if min_confidence is None:
+            min_confidence = self.default_min_confidence
+
+        started = time.perf_counter()
+        try:
+            runtime = get_inference_runtime(str(MODEL_REGISTRY_FILE_PATH))
+            prediction = await asyncio.wait_for(asyncio.wrap_future(runtime.submit(model_id, features)),
+                                                INFERENCE_TIMEOUT_SECONDS)
+        except InferenceError as e:
+            self.logger.warning(f"⚠️ Surrogate {model_id} unavailable, running simulator: {e}")
+            return None
+        except asyncio.TimeoutError:
+            self.logger.warning(f"⚠️ Surrogate {model_id} timed out after {INFERENCE_TIMEOUT_SECONDS}s, running simulator")
+            return None
+        inference_ms = (time.perf_counter() - started) * 1000
+
+        estimate = prediction.get("predicted_completion_time", float("nan"))
+        std = prediction.get("prediction_std", float("inf"))
+        confidence = surrogate_confidence(estimate, std)
+        if confidence < min_confidence:
+            self.logger.info(f"🔁 Surrogate confidence {confidence:.2f} < {min_confidence:.2f}, "
+                             f"running {selected_model['surrogateFor']}")
+            return None
+
+        self.logger.info(f"⚡ Surrogate estimate {estimate:.1f} (confidence {confidence:.2f}, {inference_ms:.1f} ms)")
+        return {
+            "estimatedTime": estimate,
+            "confidence": confidence,
+            "simulator_type": f"surrogate:{model_id}",
+            "productionPlan": {},
+            "bottlenecks": [],
+            "execution_metadata": {
+                "surrogate": True,
+                "modelId": model_id,
+                "modelVersion": selected_model.get("version"),
+                "fallbackModel": selected_model["surrogateFor"],
+                "predictionStd": std,
+                "inferenceMs": inference_ms,
+                "features": features
+            }
+        }
+
+    def _record_sample(self,
+                       features: Optional[Dict[str, float]],
+                       simulation_output: Dict[str, Any],
+                       qg: Dict[str, Any],
+                       selected_model: Dict[str, Any],
+                       execution_result: Dict[str, Any]):
+        target = simulation_output.get("estimatedTime")
+        if features is None or not isinstance(target, (int, float)) or isinstance(target, bool):
+            return
+        try:
+            self.surrogate_dataset.record(features, target, {
+                "goalId": qg.get("goalId"),
+                "modelId": selected_model.get("surrogateFor") or selected_model.get("modelId"),
+                "executionTime": execution_result.get("execution_time")
+            })
+        except OSError as e:
+            self.logger.warning(f"⚠️ Failed to record surrogate training sample: {e}")
+
     async def _prepare_simulation_input(self,
                                        qg: Dict[str, Any],
                                        json_files: Dict[str, Any],
@@ -102,15 +332,18 @@ class SimulationHandler(BaseHandler):
 
             # JSON 파일 경로 목록 생성
             data_files = {}
+            data_formats = {}
             for file_name, file_info in json_files.items():
                 if "path" in file_info:  # 성공적으로 생성된 파일만
                     data_files[file_name] = file_info["path"]
+                    data_formats[file_name] = file_info.get("format", "json")
 
             simulation_input = {
                 "goal_id": qg["goalId"],
                 "goal_type": qg["goalType"],
                 "parameters": parameters,
                 "data_files": data_files,
+                "data_formats": data_formats,
                 "work_directory": str(work_directory)
             }
 
@@ -3,13 +3,15 @@ YAML Binding Handler
 Goal3의 yamlBinding 단계 - AAS 서버에서 데이터 수집 및 JSON 파일 생성
 """
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from pathlib import Path
 
 from .base_handler import BaseHandler
 from ..clients.aas_client import AASClient
 from ..utils.manifest_parser import ManifestParser
-from ..exceptions import StageExecutionError, AASConnectionError
+from ..utils.json_stream import write_json_passthrough, write_json_records
+from ..utils.interchange import write_interchange_file, write_interchange_manifest
+from ..exceptions import StageExecutionError, AASConnectionError, PayloadDecodeError
 
 
 class YamlBindingHandler(BaseHandler):
@@ -20,6 +22,13 @@ class YamlBindingHandler(BaseHandler):
         self.aas_client = AASClient()
         self.manifest_parser = ManifestParser()
 
+        # JSON 문자열 Property 기록 방식 (passthrough | stream | parse)
+        self.default_binding_mode = "passthrough"
+
+        # 단계 간 교환 포맷 (json | msgpack | npz), manifest config의 interchange_format으로 소스별 지정 가능
+        from config import INTERCHANGE_FORMAT
+        self.interchange_format = INTERCHANGE_FORMAT
+
     async def execute(self,
                      querygoal: Dict[str, Any],
                      context: 'ExecutionContext') -> Dict[str, Any]:
@@ -47,71 +56,24 @@ class YamlBindingHandler(BaseHandler):
             if not data_sources:
                 return self.create_error_result("No data sources found in manifest")
 
-            # 작업 디렉터리에 JSON 파일 생성
-            json_files = {}
-            success_count = 0
-
-            # Required/Optional 소스 분류
-            required_sources = [s for s in data_sources if s.get("required", True)]
-            optional_sources = [s for s in data_sources if not s.get("required", True)]
+            # 사전 바인딩(swrlSelection과 동시에 시작)이 같은 메니페스트를 예측했으면 결과 재사용
+            speculation = getattr(context, "speculation", None)
+            json_files = None
+            if speculation is not None:
+                json_files = await speculation.adopt(manifest_path, context.work_directory)
 
-            required_count = len(required_sources)
-            required_success = 0
-
-            for source in data_sources:
-                try:
-                    source_name = source["name"]
-                    source_type = source["type"]
-                    is_required = source.get("required", True)
-
-                    self.logger.info(f"🔍 Processing data source: {source_name} (required={is_required})")
-
-                    if source_type == "aas_property":
-                        json_data = await self._fetch_aas_property_data(source)
-                    elif source_type == "aas_shell_collection":
-                        json_data = await self._fetch_aas_shell_collection(source)
-                    else:
-                        raise StageExecutionError(f"Unknown data source type: {source_type}")
-
-                    # JSON 파일 저장
-                    json_file_path = context.work_directory / f"{source_name}.json"
-                    with open(json_file_path, 'w', encoding='utf-8') as f:
-                        json.dump(json_data, f, indent=2, ensure_ascii=False)
-
-                    json_files[source_name] = {
-                        "path": str(json_file_path),
-                        "size": json_file_path.stat().st_size,
-                        "record_count": len(json_data) if isinstance(json_data, list) else 1
-                    }
-
-                    success_count += 1
-                    if is_required:
-                        required_success += 1
+            if json_files is None:
+                # 작업 디렉터리에 JSON 파일 생성
+                json_files = await self.bind_data_sources(data_sources, context.work_directory)
+            else:
+                # 사전 바인딩에서 실패한 소스만 다시 시도
+                retry_sources = [s for s in data_sources if "error" in json_files.get(s.get("name", "unknown"), {})]
+                if retry_sources:
+                    json_files.update(await self.bind_data_sources(retry_sources, context.work_directory))
 
-                    self.logger.info(f"✅ Created {source_name}.json")
-
-                except Exception as e:
-                    self.logger.error(f"❌ Failed to process {source.get('name', 'unknown')}: {e}")
-                    json_files[source.get('name', 'unknown')] = {"error": str(e)}
-
-            # 전체 성공률 및 필수 소스 성공률 계산
-            total_sources = len(data_sources)
-            success_rate = success_count / total_sources if total_sources > 0 else 0
-            required_success_rate = required_success / required_count if required_count > 0 else 0
-
-            result_data = {
-                "manifestPath": manifest_path,
-                "totalDataSources": total_sources,
-                "successfulSources": success_count,
-                "success_rate": success_rate,
-                # Required-flag filtering 정보
-                "required_sources_count": required_count,
-                "optional_sources_count": len(optional_sources),
-                "required_success_count": required_success,
-                "required_success_rate": required_success_rate,
-                "jsonFiles": json_files,
-                "workDirectory": str(context.work_directory)
-            }
+            result_data = self.summarize_binding(manifest_path, data_sources, json_files, context.work_directory)
+            if speculation is not None:
+                result_data["speculation"] = speculation.summary()
 
             await self.post_execute(result_data, context)
             return self.create_success_result(result_data)
@@ -123,26 +85,179 @@ class YamlBindingHandler(BaseHandler):
                 {"work_directory": str(context.work_directory)}
             )
 
-    async def _fetch_aas_property_data(self, source: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """AAS Property에서 데이터 수집"""
+    def summarize_binding(self,
+                          manifest_path: str,
+                          data_sources: List[Dict[str, Any]],
+                          json_files: Dict[str, Dict[str, Any]],
+                          work_directory: Path) -> Dict[str, Any]:
+        """
+        소스별 바인딩 결과로 yamlBinding 결과 구성 (Stage-Gate 판단용 필수 소스 성공률 포함)
+
+        소스를 나누어 바인딩한 경우(Airflow 동적 태스크 매핑 등)에도 결과를 모아 같은 형태로 만든다.
+        """
+        # Required/Optional 소스 분류
+        required_sources = [s for s in data_sources if s.get("required", True)]
+        optional_sources = [s for s in data_sources if not s.get("required", True)]
+
+        required_count = len(required_sources)
+        def succeeded(source: Dict[str, Any]) -> bool:
+            return "error" not in json_files.get(source.get("name", "unknown"), {"error": None})
+
+        success_count = sum(1 for s in data_sources if succeeded(s))
+        required_success = sum(1 for s in required_sources if succeeded(s))
+
+        # 전체 성공률 및 필수 소스 성공률 계산
+        total_sources = len(data_sources)
+        success_rate = success_count / total_sources if total_sources > 0 else 0
+        required_success_rate = required_success / required_count if required_count > 0 else 0
+
+        # 생성된 파일 목록/포맷을 기술하는 interchange manifest
+        interchange_manifest = write_interchange_manifest(work_directory, json_files)
+
+        return {
+            "manifestPath": manifest_path,
+            "totalDataSources": total_sources,
+            "successfulSources": success_count,
+            "success_rate": success_rate,
+            # Required-flag filtering 정보
+            "required_sources_count": required_count,
+            "optional_sources_count": len(optional_sources),
+            "required_success_count": required_success,
+            "required_success_rate": required_success_rate,
+            "jsonFiles": json_files,
+            "interchangeManifest": str(interchange_manifest),
+            "aasClientMetrics": self.aas_client.metrics(),
+            "workDirectory": str(work_directory)
+        }
+
+    async def bind_data_sources(self,
+                                data_sources: List[Dict[str, Any]],
+                                work_directory: Path) -> Dict[str, Dict[str, Any]]:
+        """
+        데이터 소스를 순서대로 바인딩
+
+        Returns:
+            소스 이름 -> jsonFiles 항목 (실패한 소스는 {"error": ...})
+        """
+        json_files = {}
+
+        for source in data_sources:
+            try:
+                source_name = source["name"]
+                is_required = source.get("required", True)
+
+                self.logger.info(f"🔍 Processing data source: {source_name} (required={is_required})")
+
+                json_files[source_name] = await self.bind_source(source, work_directory)
+
+                self.logger.info(f"✅ Created {Path(json_files[source_name]['path']).name}")
+
+            except Exception as e:
+                self.logger.error(f"❌ Failed to process {source.get('name', 'unknown')}: {e}")
+                json_files[source.get('name', 'unknown')] = {"error": str(e)}
+
+        return json_files
+
+    async def bind_source(self, source: Dict[str, Any], work_directory: Path) -> Dict[str, Any]:
+        """
+        단일 데이터 소스를 수집하여 작업 디렉터리에 파일로 기록
+
+        interchange_format이 json이 아니면 MessagePack/NPZ로 기록하고,
+        JSON 변환은 시뮬레이션 스테이징 시점으로 미룬다.
+
+        Returns:
+            jsonFiles 항목 (path, size, record_count, binding_mode, format)
+        """
+        source_name = source["name"]
+        source_type = source["type"]
+        json_file_path = work_directory / f"{source_name}.json"
+        interchange_format = source["config"].get("interchange_format", self.interchange_format)
+
+        if source_type not in ("aas_property", "aas_shell_collection"):
+            raise StageExecutionError(f"Unknown data source type: {source_type}")
+
+        if interchange_format != "json":
+            if source_type == "aas_property":
+                data = self._decode_property_value(await self._get_aas_property_value(source))
+            else:
+                data = await self._fetch_aas_shell_collection(source)
+
+            entry = write_interchange_file(data, work_directory / source_name, interchange_format)
+            entry["binding_mode"] = "parse"
+            return entry
+
+        if source_type == "aas_property":
+            record_count, binding_mode = await self._bind_aas_property(source, json_file_path)
+        elif source_type == "aas_shell_collection":
+            json_data = await self._fetch_aas_shell_collection(source)
+            with open(json_file_path, 'w', encoding='utf-8') as f:
+                json.dump(json_data, f, indent=2, ensure_ascii=False)
+            record_count = len(json_data) if isinstance(json_data, list) else 1
+            binding_mode = "parse"
+
+        return {
+            "path": str(json_file_path),
+            "size": json_file_path.stat().st_size,
+            "record_count": record_count,
+            "binding_mode": binding_mode,
+            "format": "json"
+        }
+
+    async def _bind_aas_property(self, source: Dict[str, Any], target_path: Path) -> Tuple[int, str]:
+        """
+        AAS Property 값을 파일로 기록
+
+        binding_mode (manifest config):
+            - passthrough (기본값): JSON 문자열을 스트리밍 검증 후 원문 그대로 기록
+            - stream: 레코드 단위로 디코딩하여 compact JSON으로 기록
+            - parse: 기존 방식 (json.loads 후 indent=2로 재직렬화)
+
+        Returns:
+            (레코드 수, 실제 적용된 binding_mode)
+        """
+        config = source["config"]
+        property_path = config["property_path"]
+        binding_mode = config.get("binding_mode", self.default_binding_mode)
+
+        property_data = await self._get_aas_property_value(source)
+
+        try:
+            if isinstance(property_data, str) and binding_mode == "passthrough":
+                return write_json_passthrough(property_data, target_path), binding_mode
+
+            if isinstance(property_data, str) and binding_mode == "stream":
+                return write_json_records(property_data, target_path), binding_mode
+
+        except PayloadDecodeError as e:
+            raise AASConnectionError(f"Invalid JSON payload in AAS property {property_path}: {e}") from e
+
+        json_data = self._decode_property_value(property_data)
+        with open(target_path, 'w', encoding='utf-8') as f:
+            json.dump(json_data, f, indent=2, ensure_ascii=False)
+
+        return (len(json_data) if isinstance(json_data, list) else 1), "parse"
+
+    async def _get_aas_property_value(self, source: Dict[str, Any]) -> Any:
+        """AAS Property 원본 값 조회 (JSON 문자열은 디코딩하지 않음)"""
         submodel_id = source["config"]["submodel_id"]
         property_path = source["config"]["property_path"]
 
         try:
-            property_data = await self.aas_client.get_submodel_property(
+            return await self.aas_client.get_submodel_property(
                 submodel_id, property_path
             )
-
-            if isinstance(property_data, str):
-                return json.loads(property_data)
-            elif isinstance(property_data, (list, dict)):
-                return property_data
-            else:
-                return [{"value": property_data}]
-
         except Exception as e:
             raise AASConnectionError(f"Failed to fetch AAS property {property_path}: {e}") from e
 
+    def _decode_property_value(self, property_data: Any) -> Any:
+        """Property 값을 Python 객체로 변환"""
+        if isinstance(property_data, str):
+            return json.loads(property_data)
+        elif isinstance(property_data, (list, dict)):
+            return property_data
+        else:
+            return [{"value": property_data}]
+
     async def _fetch_aas_shell_collection(self, source: Dict[str, Any]) -> List[Dict[str, Any]]:
         """AAS Shell 컬렉션에서 데이터 수집"""
         config = source.get("config", {})
@@ -0,0 +1,168 @@
+"""
+Speculative Pre-binding
+swrlSelection이 진행되는 동안 예측한 메니페스트의 데이터 소스를 미리 수집하고,
+선택 결과가 예측과 같으면 yamlBinding에서 그대로 사용, 다르면 폐기
+
+현재 swrlSelection은 파이프라인이 이미 선택한 모델의 메니페스트 경로만 확인하므로(I/O 없음)
+겹쳐 실행되는 구간이 거의 없다. 선택 단계가 원격 조회를 하게 되는 경우에만 이득이 있으므로
+기본값은 비활성화 (SPECULATIVE_BINDING_ENABLED=true로 사용).
+"""
+import asyncio
+import logging
+import os
+import shutil
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("querygoal.speculation")
+
+CONFIG_DIR = Path(__file__).parent.parent.parent / "config"
+STAGING_DIR_NAME = ".speculative"
+
+
+def resolve_manifest_path(metadata_file: str) -> Path:
+    """SwrlSelectionHandler와 같은 규칙으로 메니페스트 경로 결정 (상대 경로는 config/ 기준)"""
+    if metadata_file.startswith("/"):
+        return Path(metadata_file)
+    return CONFIG_DIR / metadata_file
+
+
+class SpeculativeBinding:
+    """진행 중인 사전 바인딩 1건 (작업 디렉터리 하위 staging 디렉터리에 기록)"""
+
+    def __init__(self, manifest_path: Path, staging_dir: Path, task: asyncio.Task, source: str):
+        self.manifest_path = manifest_path
+        self.staging_dir = staging_dir
+        self.task = task
+        self.source = source
+        self.started_at = time.perf_counter()
+        self.outcome = "pending"
+
+    def matches(self, manifest_path: str) -> bool:
+        return Path(manifest_path).resolve() == self.manifest_path.resolve()
+
+    async def adopt(self, manifest_path: str, work_directory: Path) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        확정된 메니페스트가 예측과 같으면 사전 바인딩 결과를 작업 디렉터리로 옮겨 반환
+
+        Returns:
+            jsonFiles 항목 (소스별 실패 항목 포함) 또는 None (예측 실패/사전 바인딩 오류)
+        """
+        if not self.matches(manifest_path):
+            self.outcome = "miss"
+            logger.info(f"🔀 Speculative binding discarded: predicted {self.manifest_path.name}, "
+                        f"selected {Path(manifest_path).name}")
+            await self.discard()
+            return None
+
+        try:
+            json_files = await self.task
+        except Exception as e:
+            self.outcome = "failed"
+            logger.warning(f"⚠️ Speculative binding failed, binding normally: {e}")
+            await self.discard()
+            return None
+
+        # staging 파일을 작업 디렉터리로 이동하고 경로 갱신
+        adopted = {}
+        for name, entry in json_files.items():
+            if "path" in entry:
+                target = work_directory / Path(entry["path"]).name
+                os.replace(entry["path"], target)
+                entry = {**entry, "path": str(target)}
+            adopted[name] = entry
+
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+        self.outcome = "hit"
+        logger.info(f"🎯 Speculative binding adopted for {self.manifest_path.name}")
+        return adopted
+
+    async def discard(self):
+        """사전 바인딩 취소 및 staging 디렉터리 삭제"""
+        if not self.task.done():
+            self.task.cancel()
+        try:
+            await self.task
+        except (asyncio.CancelledError, Exception):
+            pass
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+        if self.outcome == "pending":
+            self.outcome = "discarded"
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "predictedManifest": str(self.manifest_path),
+            "predictionSource": self.source,
+            "outcome": self.outcome
+        }
+
+
+class SpeculativePrebinder:
+    """
+    goalType별 메니페스트 예측 및 사전 바인딩 시작
+
+    예측 순서:
+    1. QueryGoal에 이미 바인딩된 selectedModel의 metaDataFile / MetaData (swrlSelection이 확정할 메니페스트)
+    2. selectedModel이 없으면 해당 goalType에서 가장 많이 확정된 메니페스트 (실행 이력)
+    """
+
+    def __init__(self, binding_handler):
+        self.binding_handler = binding_handler
+        self.history: Dict[str, Counter] = {}
+        self.stats = Counter()
+
+    def predict(self, querygoal: Dict[str, Any]) -> Optional[tuple]:
+        """(메니페스트 경로, 예측 근거) 또는 None"""
+        qg = querygoal["QueryGoal"]
+
+        selected_model = qg.get("selectedModel") or {}
+        metadata_file = selected_model.get("metaDataFile") or selected_model.get("MetaData")
+        if metadata_file:
+            return resolve_manifest_path(metadata_file), "selectedModel"
+
+        history = self.history.get(qg.get("goalType"))
+        if history:
+            manifest_path, _ = history.most_common(1)[0]
+            return Path(manifest_path), "history"
+
+        return None
+
+    def start(self, querygoal: Dict[str, Any], work_directory: Path) -> Optional[SpeculativeBinding]:
+        """예측 가능한 경우 현재 이벤트 루프에서 사전 바인딩 시작"""
+        prediction = self.predict(querygoal)
+        if prediction is None:
+            return None
+
+        manifest_path, source = prediction
+        if not manifest_path.exists():
+            return None
+
+        staging_dir = work_directory / STAGING_DIR_NAME
+        staging_dir.mkdir(parents=True, exist_ok=True)
+
+        task = asyncio.ensure_future(self._prebind(manifest_path, staging_dir))
+        self.stats["started"] += 1
+        logger.info(f"🔮 Speculatively binding {manifest_path.name} (predicted from {source})")
+        return SpeculativeBinding(manifest_path, staging_dir, task, source)
+
+    async def _prebind(self, manifest_path: Path, staging_dir: Path) -> Dict[str, Dict[str, Any]]:
+        manifest_data = await self.binding_handler.manifest_parser.parse_manifest(manifest_path)
+        return await self.binding_handler.bind_data_sources(
+            manifest_data.get("data_sources", []), staging_dir
+        )
+
+    def confirm(self, goal_type: str, manifest_path: str):
+        """swrlSelection이 확정한 메니페스트를 이력에 기록"""
+        self.history.setdefault(goal_type, Counter())[str(Path(manifest_path))] += 1
+
+    def record_outcome(self, speculation: SpeculativeBinding):
+        self.stats[speculation.outcome] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        started = self.stats["started"]
+        return {
+            **dict(self.stats),
+            "hit_rate": self.stats["hit"] / started if started else 0.0
+        }
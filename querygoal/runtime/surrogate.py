@@ -0,0 +1,336 @@
+"""
+Goal3 Surrogate Model
+NSGA-II 시뮬레이터 실행 결과(시나리오 특징 -> 예측 완료 시간)를 기록하고, 오프라인으로 가벼운 회귀 모델을 학습
+
+- SurrogateDataset: SimulationHandler가 컨테이너 실행마다 (features, estimatedTime) 한 줄씩 JSONL로 추가
+- RidgeSurrogate: 표준화 + ridge 회귀 (NumPy), 예측값과 함께 예측 표준편차를 반환하여 신뢰도 계산에 사용
+- train_surrogate: 데이터셋으로 학습 후 모델 파일 저장 및 레지스트리 항목(version/performance) 갱신
+
+학습 실행:
+    python -m querygoal.runtime.surrogate train [--min-samples 20]
+"""
+import argparse
+import json
+import logging
+import math
+import pickle
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .utils.interchange import load_interchange_file
+
+logger = logging.getLogger("querygoal.surrogate")
+
+SURROGATE_FEATURES = [
+    "quantity",
+    "job_count",
+    "operation_count",
+    "ops_per_job",
+    "machine_count",
+    "unavailable_machines",
+    "eligible_machines_per_op",
+    "mean_release_time",
+    "max_release_time",
+    "mean_operation_duration",
+    "max_operation_duration",
+    "mean_transfer_time",
+]
+SURROGATE_OUTPUTS = ["predicted_completion_time", "prediction_std"]
+
+# 입력 데이터 소스 이름 -> 특징 계산에 쓰는 yamlBinding jsonFiles 키
+_SOURCE_KEYS = {
+    "jobs": "JobOrders",
+    "release": "JobRelease",
+    "transfer": "MachineTransferTime",
+    "operations": "Operations",
+    "durations": "OperationDurations",
+    "machines": "Machines",
+}
+
+
+_UNAVAILABLE_STATUSES = {"down", "offline", "maintenance", "error", "broken"}
+
+
+def _load_source(json_files: Dict[str, Dict[str, Any]], name: str) -> Any:
+    entry = json_files.get(_SOURCE_KEYS[name]) or {}
+    if "path" not in entry:
+        return None
+    try:
+        return load_interchange_file(Path(entry["path"]), entry.get("format"))
+    except Exception as e:
+        logger.warning(f"⚠️ Surrogate feature source {name} unreadable: {e}")
+        return None
+
+
+def _as_list(data: Any, key: str) -> List[Any]:
+    """리스트 또는 {key: [...]} 형태로 감싼 리스트 (바인딩 변환 방식에 따라 둘 다 가능)"""
+    if isinstance(data, dict):
+        data = data.get(key)
+    return data if isinstance(data, list) else []
+
+
+def _distribution_means(matrix: Any) -> List[float]:
+    """{a: {b: {"mean": x}}} 또는 {a: {b: x}} 형태의 값 목록"""
+    means = []
+    if isinstance(matrix, dict):
+        for row in matrix.values():
+            if not isinstance(row, dict):
+                continue
+            for cell in row.values():
+                value = cell.get("mean") if isinstance(cell, dict) else cell
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    means.append(float(value))
+    return means
+
+
+def _stat(values: List[float], fn) -> float:
+    return float(fn(values)) if values else 0.0
+
+
+def extract_scenario_features(parameters: Dict[str, Any],
+                              json_files: Dict[str, Dict[str, Any]]) -> Dict[str, float]:
+    """
+    QueryGoal 파라미터와 yamlBinding 결과 파일로 시나리오 특징 계산
+
+    소스가 없거나 읽을 수 없으면 해당 특징은 0으로 둔다 (학습 데이터도 같은 규칙으로 기록됨).
+    """
+    jobs = _as_list(_load_source(json_files, "jobs"), "jobs")
+    release = _as_list(_load_source(json_files, "release"), "job_releases")
+    operations = _as_list(_load_source(json_files, "operations"), "operations")
+    machines = _as_list(_load_source(json_files, "machines"), "machines")
+    durations = _load_source(json_files, "durations")
+    transfer = _load_source(json_files, "transfer")
+
+    release_times = [float(r["release_time"]) for r in release
+                     if isinstance(r, dict) and isinstance(r.get("release_time"), (int, float))]
+    eligible = [len(op.get("machines") or []) for op in operations if isinstance(op, dict)]
+
+    machine_ids = {m for op in operations if isinstance(op, dict) for m in (op.get("machines") or [])}
+    unavailable = 0
+    for machine in machines:
+        if isinstance(machine, dict):
+            machine_ids.add(machine.get("machine_id") or machine.get("id"))
+            unavailable += str(machine.get("status", "")).lower() in _UNAVAILABLE_STATUSES
+    machine_ids.discard(None)
+
+    operation_count = len(operations) or sum(len(job.get("operations") or []) for job in jobs if isinstance(job, dict))
+    duration_means = _distribution_means(durations)
+    transfer_means = _distribution_means(transfer)
+
+    try:
+        quantity = float(parameters.get("quantity") or 0)
+    except (TypeError, ValueError):
+        quantity = 0.0
+
+    return {
+        "quantity": quantity,
+        "job_count": float(len(jobs)),
+        "operation_count": float(operation_count),
+        "ops_per_job": operation_count / len(jobs) if jobs else 0.0,
+        "machine_count": float(len(machine_ids)),
+        "unavailable_machines": float(unavailable),
+        "eligible_machines_per_op": _stat(eligible, np.mean),
+        "mean_release_time": _stat(release_times, np.mean),
+        "max_release_time": _stat(release_times, max),
+        "mean_operation_duration": _stat(duration_means, np.mean),
+        "max_operation_duration": _stat(duration_means, max),
+        "mean_transfer_time": _stat(transfer_means, np.mean),
+    }
+
+
+def surrogate_confidence(estimate: float, std: float) -> float:
+    """95% 예측 구간의 상대 폭으로 신뢰도 계산 (0~1, 구간이 좁을수록 1에 가까움)"""
+    if not math.isfinite(estimate) or not math.isfinite(std) or estimate <= 0:
+        return 0.0
+    return float(min(1.0, max(0.0, 1.0 - 1.96 * std / abs(estimate))))
+
+
+class SurrogateDataset:
+    """(시나리오 특징, 시뮬레이터 결과) 기록 - JSONL append-only"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def record(self, features: Dict[str, float], target: float, metadata: Optional[Dict[str, Any]] = None):
+        line = json.dumps({
+            "recordedAt": datetime.utcnow().isoformat(),
+            "features": features,
+            "target": float(target),
+            **(metadata or {})
+        }, ensure_ascii=False)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def load(self, feature_names: List[str] = SURROGATE_FEATURES) -> Tuple[np.ndarray, np.ndarray]:
+        """학습 행렬 (X: samples x features, y: samples) - 손상된 줄은 건너뜀"""
+        rows, targets = [], []
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        row = [float(record["features"].get(name, 0.0)) for name in feature_names]
+                        target = float(record["target"])
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        continue
+                    if math.isfinite(target):
+                        rows.append(row)
+                        targets.append(target)
+        return (np.array(rows, dtype=np.float64).reshape(-1, len(feature_names)),
+                np.array(targets, dtype=np.float64))
+
+
+class RidgeSurrogate:
+    """
+    표준화 ridge 회귀
+
+    predict는 (samples, 2) 배열 [예측값, 예측 표준편차]를 반환한다.
+    표준편차는 잔차 분산과 leverage(학습 분포에서 벗어난 정도)로 계산하며,
+    학습 범위를 벗어난 특징이 있으면 벗어난 비율만큼 키운다.
+    """
+
+    def __init__(self, alpha: float = 1.0):
+        self.alpha = alpha
+
+    def fit(self, X: np.ndarray, y: np.ndarray) -> "RidgeSurrogate":
+        self.mean_ = X.mean(axis=0)
+        self.scale_ = X.std(axis=0)
+        self.scale_[self.scale_ == 0] = 1.0
+        self.min_ = X.min(axis=0)
+        self.max_ = X.max(axis=0)
+
+        Z = np.hstack([np.ones((len(X), 1)), (X - self.mean_) / self.scale_])
+        penalty = self.alpha * np.eye(Z.shape[1])
+        penalty[0, 0] = 0.0  # 절편은 정규화하지 않음
+        self.precision_inv_ = np.linalg.pinv(Z.T @ Z + penalty)
+        self.coef_ = self.precision_inv_ @ Z.T @ y
+
+        residuals = y - Z @ self.coef_
+        dof = max(len(y) - Z.shape[1], 1)
+        self.sigma_ = float(np.sqrt(residuals @ residuals / dof))
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        Z = np.hstack([np.ones((len(X), 1)), (X - self.mean_) / self.scale_])
+        estimate = Z @ self.coef_
+
+        leverage = np.einsum("ij,jk,ik->i", Z, self.precision_inv_, Z)
+        span = np.where(self.max_ > self.min_, self.max_ - self.min_, 1.0)
+        outside = (np.maximum(self.min_ - X, 0) + np.maximum(X - self.max_, 0)) / span
+        std = self.sigma_ * np.sqrt(1.0 + leverage) * (1.0 + outside.sum(axis=1))
+        return np.column_stack([estimate, std])
+
+
+def _cross_validated_rmse(X: np.ndarray, y: np.ndarray, alpha: float, folds: int = 5) -> float:
+    folds = min(folds, len(y))
+    order = np.random.default_rng(0).permutation(len(y))
+    errors = []
+    for fold in np.array_split(order, folds):
+        train = np.setdiff1d(order, fold)
+        if len(train) < 2:
+            continue
+        model = RidgeSurrogate(alpha).fit(X[train], y[train])
+        errors.append(model.predict(X[fold])[:, 0] - y[fold])
+    if not errors:
+        return float("nan")
+    errors = np.concatenate(errors)
+    return float(np.sqrt(np.mean(errors ** 2)))
+
+
+def _bump_version(version: str) -> str:
+    parts = (version or "0.0.0").split(".")
+    try:
+        parts[-1] = str(int(parts[-1]) + 1)
+    except ValueError:
+        parts.append("1")
+    return ".".join(parts)
+
+
+def train_surrogate(dataset_path: Path,
+                    registry_file: Path,
+                    model_id: str = "NSGA2SurrogateModel",
+                    min_samples: int = 20,
+                    alpha: float = 1.0) -> Dict[str, Any]:
+    """
+    데이터셋으로 surrogate 학습 후 레지스트리 항목의 artifact 경로에 저장하고 version/performance 갱신
+
+    Raises:
+        ValueError: 레지스트리 항목이 없거나 학습 샘플이 부족한 경우
+    """
+    registry_file = Path(registry_file)
+    with open(registry_file, "r", encoding="utf-8") as f:
+        registry = json.load(f)
+
+    entry = next((model for model in registry.get("models", []) if model.get("modelId") == model_id), None)
+    if entry is None or not isinstance(entry.get("inference"), dict):
+        raise ValueError(f"Registry entry with inference spec not found: {model_id}")
+
+    X, y = SurrogateDataset(dataset_path).load(SURROGATE_FEATURES)
+    if len(y) < min_samples:
+        raise ValueError(f"Not enough samples to train {model_id}: {len(y)} < {min_samples}")
+
+    rmse = _cross_validated_rmse(X, y, alpha)
+    model = RidgeSurrogate(alpha).fit(X, y)
+
+    artifact = Path(entry["inference"]["artifact"])
+    if not artifact.is_absolute():
+        artifact = registry_file.parent / artifact
+    artifact.parent.mkdir(parents=True, exist_ok=True)
+    temp_artifact = artifact.with_suffix(artifact.suffix + ".tmp")
+    with open(temp_artifact, "wb") as f:
+        pickle.dump(model, f)
+    temp_artifact.replace(artifact)
+
+    trained_at = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+    entry["version"] = _bump_version(entry.get("version"))
+    entry["modelRef"] = f"aas://ModelCatalog/{model_id}@{entry['version']}"
+    entry["inference"]["features"] = list(SURROGATE_FEATURES)
+    entry["inference"]["outputs"] = list(SURROGATE_OUTPUTS)
+    entry.setdefault("performance", {}).update({
+        "cvRmse": rmse,
+        "trainingSamples": int(len(y)),
+        "lastUpdated": trained_at
+    })
+
+    # 레지스트리 파일 교체 (ModelRegistry가 mtime 변경으로 재로드 -> 추론 런타임이 새 version 로드)
+    temp_registry = registry_file.with_suffix(".json.tmp")
+    with open(temp_registry, "w", encoding="utf-8") as f:
+        json.dump(registry, f, indent=2, ensure_ascii=False)
+    temp_registry.replace(registry_file)
+
+    logger.info(f"🧠 Trained {model_id}@{entry['version']} on {len(y)} samples (CV RMSE {rmse:.3f})")
+    return {"modelId": model_id, "version": entry["version"], "samples": int(len(y)),
+            "cvRmse": rmse, "artifact": str(artifact)}
+
+
+def main():
+    from config import MODEL_REGISTRY_FILE_PATH, SURROGATE_DATASET_PATH
+
+    parser = argparse.ArgumentParser(description="Goal3 surrogate model trainer")
+    parser.add_argument("command", choices=["train"])
+    parser.add_argument("--dataset", default=str(SURROGATE_DATASET_PATH))
+    parser.add_argument("--registry", default=str(MODEL_REGISTRY_FILE_PATH))
+    parser.add_argument("--model-id", default="NSGA2SurrogateModel")
+    parser.add_argument("--min-samples", type=int, default=20)
+    parser.add_argument("--alpha", type=float, default=1.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    # `python -m`으로 실행하면 이 모듈이 __main__이 되어 pickle에 __main__.RidgeSurrogate로 기록되므로
+    # 추론 런타임이 import 가능한 모듈 경로의 train_surrogate/RidgeSurrogate를 사용
+    from querygoal.runtime.surrogate import train_surrogate
+    result = train_surrogate(Path(args.dataset), Path(args.registry), args.model_id, args.min_samples, args.alpha)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Goal3 Parameter Sweep (What-if)
+기준 QueryGoal 하나와 파라미터 grid로 여러 변형 시나리오를 시뮬레이션하고 비교표 생성
+
+- 바인딩 1회: simulation 이전 Stage(swrlSelection, yamlBinding)는 기준 QueryGoal로 한 번만 실행하고
+  시나리오 파일도 한 번만 배치 (scenarios/_base)
+- overlay: 변형별 시나리오 디렉터리는 기준 파일의 hard link + 바뀐 파일만 새로 작성
+  (docker bind mount 안에서도 유효하도록 symlink 대신 hard link, 실패 시 복사)
+- 실행: 변형을 batch_size개씩 묶어 컨테이너 한 번으로 실행 (SCENARIO_NAMES), 동시에 최대 max_parallel개 컨테이너
+
+grid 예시:
+    {"quantity": {"start": 10, "stop": 100, "step": 10}, "machineDown": [null, "M1"]}
+
+machineDown, jobPriorities는 시나리오 파일 overlay, 그 외 키는 변형별 QueryGoal 파라미터로
+시나리오 디렉터리의 simulation_params.env에 기록되어 시뮬레이터가 시나리오마다 환경 변수로 export한다
+(단일 실행에서 -e로 전달하는 것과 같은 이름/값, simulation_inputs.json은 비교용 기록).
+"""
+import asyncio
+import csv
+import itertools
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .executor import ExecutionContext, QueryGoalExecutor
+from .exceptions import RuntimeExecutionError, SimulationExecutionError
+from .clients.scheduler import priority_for_goal_type, set_request_priority, reset_request_priority
+
+logger = logging.getLogger("querygoal.sweep")
+
+BASE_SCENARIO = "_base"
+SIMULATION_INPUTS_FILE = "simulation_inputs.json"
+RESULT_FILE = "simulator_optimization_result.json"
+
+
+def _grid_values(key: str, values: Any) -> List[Any]:
+    """grid 값 -> 후보 목록 ({"start", "stop", "step"}은 stop 포함 범위, 단일 값은 1개짜리 목록)"""
+    if isinstance(values, dict):
+        try:
+            start, stop, step = values["start"], values["stop"], values.get("step", 1)
+        except KeyError:
+            raise ValueError(f"Range for '{key}' requires start and stop")
+        if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (start, stop, step)):
+            raise ValueError(f"Range start/stop/step for '{key}' must be numbers")
+        if step <= 0:
+            raise ValueError(f"Range step for '{key}' must be positive")
+        count = int((stop - start) // step) + 1
+        return [start + step * i for i in range(max(count, 0))]
+    if isinstance(values, list):
+        return values
+    return [values]
+
+
+def expand_grid(grid: Dict[str, Any], max_variants: int = 200) -> List[Dict[str, Any]]:
+    """
+    파라미터 grid의 모든 조합 (키 순서대로 앞 키가 가장 느리게 변함)
+
+    Raises:
+        ValueError: 빈 grid / 후보가 없는 키 / 조합 수가 max_variants 초과
+    """
+    if not grid:
+        raise ValueError("Parameter grid is empty")
+
+    keys = list(grid)
+    candidates = [_grid_values(key, grid[key]) for key in keys]
+    for key, values in zip(keys, candidates):
+        if not values:
+            raise ValueError(f"No values for grid parameter '{key}'")
+
+    total = 1
+    for values in candidates:
+        total *= len(values)
+    if total > max_variants:
+        raise ValueError(f"Parameter grid expands to {total} variants (max {max_variants})")
+
+    return [dict(zip(keys, combination)) for combination in itertools.product(*candidates)]
+
+
+def _load_json(path: Path) -> Any:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _items(data: Any, key: str) -> List[Dict[str, Any]]:
+    """리스트 또는 {key: [...]} 형태 모두 지원 (항목 dict를 그대로 반환하므로 수정하면 data에 반영)"""
+    items = data.get(key) if isinstance(data, dict) else data
+    return [item for item in items if isinstance(item, dict)] if isinstance(items, list) else []
+
+
+def _overlay_machine_down(data: Any, value: Any) -> Any:
+    machine_ids = {value} if isinstance(value, str) else set(value or [])
+    for machine in _items(data, "machines"):
+        if machine.get("id") in machine_ids:
+            machine["status"] = "down"
+    return data
+
+
+def _overlay_job_priorities(data: Any, value: Any) -> Any:
+    priorities = value or {}
+    for job in _items(data, "jobs"):
+        if job.get("job_id") in priorities:
+            job["priority"] = priorities[job["job_id"]]
+    return data
+
+
+# grid 키 -> (대상 시나리오 파일, overlay 함수)
+SCENARIO_OVERLAYS: Dict[str, Any] = {
+    "machineDown": ("machines.json", _overlay_machine_down),
+    "jobPriorities": ("jobs.json", _overlay_job_priorities),
+}
+
+
+def _link_or_copy(source: Path, target: Path):
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def build_variant_scenario(base_dir: Path,
+                           variant_dir: Path,
+                           overrides: Dict[str, Any],
+                           base_parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    기준 시나리오 위에 변형 overlay 적용
+
+    Returns:
+        변형의 QueryGoal 파라미터 (기준 파라미터 + overlay가 아닌 override)
+    """
+    variant_dir.mkdir(parents=True, exist_ok=True)
+
+    overlays: Dict[str, List[Callable[[Any], Any]]] = {}
+    parameters = dict(base_parameters)
+    for key, value in overrides.items():
+        if key in SCENARIO_OVERLAYS:
+            file_name, overlay = SCENARIO_OVERLAYS[key]
+            overlays.setdefault(file_name, []).append(lambda data, fn=overlay, v=value: fn(data, v))
+        else:
+            parameters[key] = value
+
+    for source in base_dir.iterdir():
+        if source.is_file() and source.name not in overlays and source.name != SIMULATION_INPUTS_FILE:
+            _link_or_copy(source, variant_dir / source.name)
+
+    # 바뀐 파일만 새로 작성 (hard link 원본은 그대로)
+    for file_name, functions in overlays.items():
+        data = _load_json(base_dir / file_name)
+        for overlay in functions:
+            data = overlay(data)
+        with open(variant_dir / file_name, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    with open(variant_dir / SIMULATION_INPUTS_FILE, 'w', encoding='utf-8') as f:
+        json.dump({"scenario": variant_dir.name, "parameters": parameters, "overrides": overrides},
+                  f, indent=2, ensure_ascii=False, default=str)
+    return parameters
+
+
+class ParameterSweep:
+    """
+    기준 QueryGoal + 파라미터 grid -> 변형별 Goal3 예측 비교표
+
+    Args:
+        executor: Stage 핸들러/Stage-Gate를 공유할 QueryGoalExecutor
+        batch_size: 컨테이너 한 번에 실행하는 변형 수
+        max_parallel: 동시에 실행하는 컨테이너 수
+        max_variants: 허용하는 최대 변형 수
+    """
+
+    def __init__(self,
+                 executor: QueryGoalExecutor,
+                 batch_size: Optional[int] = None,
+                 max_parallel: Optional[int] = None,
+                 max_variants: Optional[int] = None):
+        from config import SWEEP_BATCH_SIZE, SWEEP_MAX_PARALLEL, SWEEP_MAX_VARIANTS
+        self.executor = executor
+        self.batch_size = max(batch_size or SWEEP_BATCH_SIZE, 1)
+        self.max_parallel = max(max_parallel or SWEEP_MAX_PARALLEL, 1)
+        self.max_variants = max_variants or SWEEP_MAX_VARIANTS
+
+    async def run(self, querygoal: Dict[str, Any], grid: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Raises:
+            ValueError: 잘못된 grid
+            RuntimeExecutionError: 바인딩 Stage 실패 또는 컨테이너 이미지 없음
+        """
+        start_time = datetime.utcnow()
+        qg = querygoal["QueryGoal"]
+        variants = expand_grid(grid, self.max_variants)
+
+        context = ExecutionContext(
+            goal_id=qg["goalId"],
+            goal_type=qg["goalType"],
+            work_directory=self.executor.work_dir_manager.create_work_directory(f"{qg['goalId']}_sweep"),
+            start_time=start_time,
+            pipeline_stages=qg["metadata"]["pipelineStages"]
+        )
+        logger.info(f"🧮 Parameter sweep for {context.goal_id}: {len(variants)} variants")
+
+        # simulation 이전 Stage는 기준 QueryGoal로 한 번만 실행
+        priority_token = set_request_priority(priority_for_goal_type(qg.get("goalType")))
+        try:
+            for stage_name in context.pipeline_stages:
+                if stage_name == "simulation":
+                    continue
+                context.current_stage = stage_name
+                try:
+                    stage_result, _ = await self.executor.run_stage(stage_name, querygoal, context)
+                except Exception as e:
+                    raise RuntimeExecutionError(f"Sweep binding failed at stage '{stage_name}': {e}") from e
+                context.stage_results[stage_name] = stage_result
+        finally:
+            reset_request_priority(priority_token)
+
+        simulation = self.executor.stage_handlers["simulation"]
+        container_info = qg.get("selectedModel", {}).get("container", {})
+        image = container_info.get("image")
+        if not image:
+            raise RuntimeExecutionError("Container image not specified in selected model")
+
+        json_files = context.stage_results.get("yamlBinding", {}).get("jsonFiles", {})
+        simulation_input = await simulation._prepare_simulation_input(qg, json_files, context.work_directory)
+        simulation_input["container_input_formats"] = container_info.get("inputFormats", ["json"])
+
+        # 기준 시나리오 1회 배치 -> 변형별 overlay
+        scenarios_dir = context.work_directory / "scenarios"
+        base_dir = scenarios_dir / BASE_SCENARIO
+        base_dir.mkdir(parents=True, exist_ok=True)
+        await simulation.container_client.stage_scenario(simulation_input, base_dir)
+
+        names = [f"v{index:03d}" for index in range(len(variants))]
+        for name, overrides in zip(names, variants):
+            parameters = build_variant_scenario(base_dir, scenarios_dir / name, overrides,
+                                                simulation_input["parameters"])
+            simulation.container_client.write_scenario_parameters(scenarios_dir / name, parameters)
+
+        batches = [names[i:i + self.batch_size] for i in range(0, len(names), self.batch_size)]
+        errors = await self._run_batches(image, batches, context, simulation_input["parameters"])
+
+        rows = []
+        for name, overrides in zip(names, variants):
+            rows.append(await self._comparison_row(simulation, context.work_directory, name, overrides, errors))
+
+        completed = [row for row in rows if row["status"] == "completed" and row["estimatedTime"] is not None]
+        best = min(completed, key=lambda row: row["estimatedTime"]) if completed else None
+        columns = ["variant"] + list(grid) + ["estimatedTime", "confidence", "status", "error"]
+
+        result = {
+            "goalId": context.goal_id,
+            "goalType": context.goal_type,
+            "containerImage": image,
+            "variantCount": len(variants),
+            "completedCount": len(completed),
+            "containerRuns": len(batches),
+            "columns": columns,
+            "rows": rows,
+            "best": best,
+            "workDirectory": str(context.work_directory),
+            "executionTime": (datetime.utcnow() - start_time).total_seconds()
+        }
+        self._write_comparison(context.work_directory, columns, rows, result)
+
+        logger.info(f"✅ Sweep {context.goal_id} finished: {len(completed)}/{len(variants)} variants "
+                    f"in {len(batches)} container runs")
+        return result
+
+    async def _run_batches(self,
+                           image: str,
+                           batches: List[List[str]],
+                           context: ExecutionContext,
+                           parameters: Dict[str, Any]) -> Dict[str, str]:
+        """배치별 컨테이너 실행 (동시 max_parallel개), 실패한 배치의 변형별 오류 메시지 반환"""
+        container_client = self.executor.stage_handlers["simulation"].container_client
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        errors: Dict[str, str] = {}
+
+        async def run_batch(index: int, names: List[str]):
+            async with semaphore:
+                try:
+                    await container_client.run_batch(
+                        image, names, context.work_directory, f"{context.goal_id}_b{index:02d}", parameters
+                    )
+                except SimulationExecutionError as e:
+                    logger.error(f"❌ Sweep batch {index} failed: {e}")
+                    errors.update({name: str(e) for name in names})
+
+        await asyncio.gather(*(run_batch(index, names) for index, names in enumerate(batches)))
+        return errors
+
+    async def _comparison_row(self,
+                              simulation,
+                              work_directory: Path,
+                              name: str,
+                              overrides: Dict[str, Any],
+                              errors: Dict[str, str]) -> Dict[str, Any]:
+        row: Dict[str, Any] = {"variant": name, **overrides,
+                               "estimatedTime": None, "confidence": None, "status": "failed", "error": None}
+        results_dir = work_directory / "results" / name
+
+        if not (results_dir / RESULT_FILE).exists():
+            row["error"] = errors.get(name, "No simulation result generated")
+            return row
+
+        try:
+            output = await simulation._parse_simulation_output({}, results_dir)
+        except SimulationExecutionError as e:
+            row["error"] = str(e)
+            return row
+
+        row.update({
+            "estimatedTime": output.get("estimatedTime"),
+            "confidence": output.get("confidence"),
+            "status": "completed"
+        })
+        return row
+
+    def _write_comparison(self,
+                          work_directory: Path,
+                          columns: List[str],
+                          rows: List[Dict[str, Any]],
+                          result: Dict[str, Any]):
+        with open(work_directory / "sweep_comparison.csv", 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({key: json.dumps(value) if isinstance(value, (dict, list)) else value
+                                 for key, value in row.items()})
+
+        with open(work_directory / "sweep_result.json", 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False, default=str)
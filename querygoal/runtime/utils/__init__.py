@@ -5,10 +5,32 @@ Runtime Utilities
 from .stage_gate import StageGateValidator, StageGateResult
 from .work_directory import WorkDirectoryManager
 from .manifest_parser import ManifestParser
+from .json_stream import (
+    iter_json_array,
+    iter_json_records,
+    count_json_records,
+    write_json_passthrough,
+    write_json_records
+)
+from .interchange import (
+    write_interchange_file,
+    load_interchange_file,
+    materialize_for_container,
+    write_interchange_manifest
+)
 
 __all__ = [
     "StageGateValidator",
     "StageGateResult",
     "WorkDirectoryManager",
-    "ManifestParser"
+    "ManifestParser",
+    "iter_json_array",
+    "iter_json_records",
+    "count_json_records",
+    "write_json_passthrough",
+    "write_json_records",
+    "write_interchange_file",
+    "load_interchange_file",
+    "materialize_for_container",
+    "write_interchange_manifest"
 ]
\ No newline at end of file
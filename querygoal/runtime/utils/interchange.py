@@ -0,0 +1,279 @@
+"""
+Interchange Store
+yamlBinding 출력물을 단계 간에 전달하기 위한 compact 포맷(JSON / MessagePack / NPZ) 관리
+"""
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..exceptions import WorkDirectoryError
+
+try:
+    import msgpack
+except ImportError:  # 선택적 의존성
+    msgpack = None
+
+try:
+    import numpy as np
+except ImportError:  # 선택적 의존성
+    np = None
+
+logger = logging.getLogger("querygoal.interchange")
+
+INTERCHANGE_MANIFEST_NAME = "interchange_manifest.json"
+SUPPORTED_FORMATS = ["json", "msgpack", "npz"]
+
+FORMAT_SUFFIXES = {
+    "json": ".json",
+    "msgpack": ".msgpack",
+    "npz": ".npz"
+}
+
+
+def is_matrix_shaped(data: Any) -> bool:
+    """
+    {row: {col: cell}} 형태의 행렬 데이터인지 확인
+
+    cell은 숫자이거나, 숫자/문자열 값만 가지는 동일한 키 집합의 딕셔너리여야 한다.
+    필드(또는 숫자 cell)별 값은 모두 정수, 모두 실수, 모두 문자열 중 하나여야 한다.
+    (예: machine_transfer_time, operation_durations)
+    """
+    if not isinstance(data, dict) or not data:
+        return False
+
+    cell_keys = None
+    for row in data.values():
+        if not isinstance(row, dict) or not row:
+            return False
+        for cell in row.values():
+            if _is_number(cell):
+                keys = ()
+            elif isinstance(cell, dict) and cell and all(
+                    _is_number(v) or isinstance(v, str) for v in cell.values()):
+                keys = tuple(sorted(cell.keys()))
+            else:
+                return False
+
+            if cell_keys is None:
+                cell_keys = keys
+            elif cell_keys != keys:
+                return False
+
+    # 정수/실수 또는 숫자/문자열이 섞인 필드는 배열 하나로 타입을 보존할 수 없음
+    cells = [cell for row in data.values() for cell in row.values()]
+    if not cell_keys:
+        return _field_kind(cells) is not None
+    return all(_field_kind([cell[key] for cell in cells]) is not None for key in cell_keys)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _field_kind(values: List[Any]) -> Optional[type]:
+    """필드 값이 모두 같은 타입(int / float / str)이면 그 타입, 섞여 있으면 None"""
+    kinds = {type(value) for value in values}
+    if len(kinds) == 1 and kinds <= {int, float, str}:
+        return kinds.pop()
+    return None
+
+
+def _encode_matrix(data: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """행렬 데이터를 NPZ 배열 묶음으로 변환"""
+    rows = list(data.keys())
+    cols: List[str] = []
+    for row in data.values():
+        for col in row.keys():
+            if col not in cols:
+                cols.append(col)
+    col_index = {col: i for i, col in enumerate(cols)}
+
+    mask = np.zeros((len(rows), len(cols)), dtype=bool)
+    cells = []
+    for r, row in enumerate(data.values()):
+        for col, cell in row.items():
+            mask[r, col_index[col]] = True
+            cells.append((r, col_index[col], cell))
+
+    arrays = {
+        "rows": np.array(rows, dtype=str),
+        "cols": np.array(cols, dtype=str),
+        "mask": mask
+    }
+
+    first_cell = cells[0][2]
+    fields = sorted(first_cell.keys()) if isinstance(first_cell, dict) else [None]
+    arrays["fields"] = np.array([f for f in fields if f is not None], dtype=str)
+
+    for field in fields:
+        # 필드 타입은 is_matrix_shaped에서 단일 타입으로 확인됨
+        values = [cell if field is None else cell[field] for _, _, cell in cells]
+        kind = _field_kind(values)
+        if kind is str:
+            column = np.full(mask.shape, "", dtype=object)
+            dtype = str
+        elif kind is int:
+            column = np.zeros(mask.shape, dtype=np.int64)
+            dtype = np.int64
+        else:
+            column = np.zeros(mask.shape, dtype=np.float64)
+            dtype = np.float64
+
+        for (r, c, _), value in zip(cells, values):
+            column[r, c] = value
+
+        arrays[f"values__{field}" if field is not None else "values"] = column.astype(dtype)
+
+    return arrays
+
+
+def _decode_matrix(arrays: Any) -> Dict[str, Dict[str, Any]]:
+    """NPZ 배열 묶음을 {row: {col: cell}} 형태로 복원"""
+    rows = [str(r) for r in arrays["rows"]]
+    cols = [str(c) for c in arrays["cols"]]
+    mask = arrays["mask"]
+    fields = [str(f) for f in arrays["fields"]]
+
+    columns = {field: arrays[f"values__{field}"] for field in fields}
+    scalar = arrays["values"] if not fields else None
+
+    result: Dict[str, Dict[str, Any]] = {}
+    for r, row_name in enumerate(rows):
+        row_data = {}
+        for c, col_name in enumerate(cols):
+            if not mask[r, c]:
+                continue
+            if scalar is not None:
+                row_data[col_name] = scalar[r, c].item()
+            else:
+                row_data[col_name] = {field: columns[field][r, c].item() for field in fields}
+        result[row_name] = row_data
+
+    return result
+
+
+def resolve_format(requested: str, data: Any) -> str:
+    """요청 포맷과 데이터 형태, 설치된 의존성을 고려하여 실제 포맷 결정"""
+    if requested == "npz":
+        if np is not None and is_matrix_shaped(data):
+            return "npz"
+        requested = "msgpack"
+
+    if requested == "msgpack":
+        if msgpack is not None:
+            return "msgpack"
+        logger.warning("msgpack is not installed, falling back to JSON interchange")
+
+    return "json"
+
+
+def write_interchange_file(data: Any, target_base: Path, requested_format: str) -> Dict[str, Any]:
+    """
+    데이터를 요청된 interchange 포맷으로 기록
+
+    Args:
+        data: 파싱된 데이터
+        target_base: 확장자를 제외한 출력 경로
+        requested_format: json | msgpack | npz
+
+    Returns:
+        interchange manifest 항목
+    """
+    file_format = resolve_format(requested_format, data)
+    target_path = target_base.with_suffix(FORMAT_SUFFIXES[file_format])
+    entry: Dict[str, Any] = {"format": file_format}
+
+    if file_format == "npz":
+        arrays = _encode_matrix(data)
+        with open(target_path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+        entry["shape"] = list(arrays["mask"].shape)
+    elif file_format == "msgpack":
+        with open(target_path, 'wb') as f:
+            f.write(msgpack.packb(data, use_bin_type=True))
+    else:
+        with open(target_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+    entry.update({
+        "path": str(target_path),
+        "size": target_path.stat().st_size,
+        "record_count": len(data) if isinstance(data, list) else 1
+    })
+    return entry
+
+
+def load_interchange_file(path: Path, file_format: Optional[str] = None) -> Any:
+    """interchange 파일을 Python 객체로 로드"""
+    path = Path(path)
+    file_format = file_format or _format_from_suffix(path)
+
+    if file_format == "npz":
+        if np is None:
+            raise WorkDirectoryError(f"numpy is required to read {path}")
+        with np.load(path, allow_pickle=False) as arrays:
+            return _decode_matrix(arrays)
+
+    if file_format == "msgpack":
+        if msgpack is None:
+            raise WorkDirectoryError(f"msgpack is required to read {path}")
+        with open(path, 'rb') as f:
+            return msgpack.unpackb(f.read(), raw=False)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def materialize_for_container(path: Path,
+                              file_format: Optional[str],
+                              target_path: Path,
+                              accepted_formats: Optional[List[str]] = None) -> Path:
+    """
+    시나리오 디렉터리에 컨테이너 입력 파일 배치
+
+    컨테이너가 해당 포맷을 직접 읽을 수 있으면 변환 없이 복사하고,
+    그렇지 않으면 이 시점에 JSON으로 변환한다.
+
+    Returns:
+        실제로 생성된 파일 경로
+    """
+    path = Path(path)
+    file_format = file_format or _format_from_suffix(path)
+    accepted_formats = accepted_formats or ["json"]
+
+    if file_format in accepted_formats:
+        staged_path = target_path.with_suffix(FORMAT_SUFFIXES[file_format])
+        shutil.copy2(path, staged_path)
+        return staged_path
+
+    data = load_interchange_file(path, file_format)
+    with open(target_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    return target_path
+
+
+def write_interchange_manifest(work_directory: Path, files: Dict[str, Dict[str, Any]]) -> Path:
+    """작업 디렉터리에 interchange manifest 기록"""
+    manifest_path = work_directory / INTERCHANGE_MANIFEST_NAME
+    manifest = {
+        "version": 1,
+        "files": {
+            name: {key: entry[key] for key in ("path", "format", "size", "record_count", "shape") if key in entry}
+            for name, entry in files.items()
+            if "path" in entry
+        }
+    }
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    return manifest_path
+
+
+def _format_from_suffix(path: Path) -> str:
+    for file_format, suffix in FORMAT_SUFFIXES.items():
+        if path.suffix == suffix:
+            return file_format
+    return "json"
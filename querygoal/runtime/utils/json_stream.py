@@ -0,0 +1,207 @@
+"""
+JSON Stream Utilities
+JSON 문자열 Property를 전체 객체로 만들지 않고 검증/카운트/기록하는 유틸리티
+"""
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, Iterator, Tuple
+
+from ..exceptions import PayloadDecodeError
+
+logger = logging.getLogger("querygoal.json_stream")
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+def _skip_ws(payload: str, index: int) -> int:
+    """공백 문자 건너뛰기"""
+    return _WHITESPACE.match(payload, index).end()
+
+
+def sniff_container(payload: str) -> Tuple[str, int, int]:
+    """
+    페이로드의 최상위 컨테이너 종류를 저비용으로 확인
+
+    첫/마지막 비공백 문자만 검사하므로 전체 파싱 없이 종류를 구분한다.
+    배열/객체가 아닌 값(숫자, 문자열, true/false/null)은 "scalar"로 분류하고 json.loads로 처리한다.
+
+    Returns:
+        (종류 "[" / "{" / "scalar", 시작 인덱스, 끝 인덱스)
+    """
+    start = _skip_ws(payload, 0)
+    end = len(payload.rstrip(" \t\n\r")) - 1
+
+    if start > end:
+        raise PayloadDecodeError("Empty JSON payload")
+
+    opener, closer = payload[start], payload[end]
+    if (opener, closer) not in (("[", "]"), ("{", "}")):
+        return "scalar", start, end
+
+    return opener, start, end
+
+
+def _decode_scalar(payload: str) -> Any:
+    """배열/객체가 아닌 페이로드 전체 디코딩 (짝이 맞지 않는 괄호 등 잘못된 값은 PayloadDecodeError)"""
+    try:
+        return json.loads(payload)
+    except json.JSONDecodeError as e:
+        raise PayloadDecodeError(f"Invalid JSON payload at offset {e.pos}: {e.msg}") from e
+
+
+def iter_json_array(payload: str) -> Iterator[Any]:
+    """
+    최상위 JSON 배열의 원소를 하나씩 디코딩 (ijson 스타일)
+
+    원소 하나만 메모리에 유지되므로 배열 길이와 무관하게 메모리 사용량이 일정하다.
+    """
+    kind, start, end = sniff_container(payload)
+    if kind != "[":
+        raise PayloadDecodeError("JSON payload is not an array")
+
+    index = _skip_ws(payload, start + 1)
+    if index == end:
+        return
+
+    while True:
+        try:
+            item, index = _DECODER.raw_decode(payload, index)
+        except json.JSONDecodeError as e:
+            raise PayloadDecodeError(f"Invalid JSON array element at offset {index}: {e.msg}") from e
+
+        yield item
+
+        index = _skip_ws(payload, index)
+        separator = payload[index] if index <= end else ""
+        if separator == ",":
+            index = _skip_ws(payload, index + 1)
+        elif index == end:
+            return
+        else:
+            raise PayloadDecodeError(f"Expected ',' or ']' at offset {index}")
+
+
+def iter_json_members(payload: str) -> Iterator[Tuple[str, Any]]:
+    """최상위 JSON 객체의 (key, value) 쌍을 하나씩 디코딩"""
+    kind, start, end = sniff_container(payload)
+    if kind != "{":
+        raise PayloadDecodeError("JSON payload is not an object")
+
+    index = _skip_ws(payload, start + 1)
+    if index == end:
+        return
+
+    while True:
+        try:
+            key, index = _DECODER.raw_decode(payload, index)
+            index = _skip_ws(payload, index)
+            if payload[index] != ":" or not isinstance(key, str):
+                raise PayloadDecodeError(f"Expected string key and ':' at offset {index}")
+            value, index = _DECODER.raw_decode(payload, _skip_ws(payload, index + 1))
+        except json.JSONDecodeError as e:
+            raise PayloadDecodeError(f"Invalid JSON object member at offset {index}: {e.msg}") from e
+
+        yield key, value
+
+        index = _skip_ws(payload, index)
+        separator = payload[index] if index <= end else ""
+        if separator == ",":
+            index = _skip_ws(payload, index + 1)
+        elif index == end:
+            return
+        else:
+            raise PayloadDecodeError(f"Expected ',' or '}}' at offset {index}")
+
+
+def iter_json_records(payload: str) -> Iterator[Any]:
+    """
+    배열이면 원소 단위, 객체면 (key, value) 단위, 그 외 값은 값 하나로 순회
+    """
+    kind, _, _ = sniff_container(payload)
+    if kind == "[":
+        return iter_json_array(payload)
+    if kind == "scalar":
+        return iter([_decode_scalar(payload)])
+    return iter_json_members(payload)
+
+
+def count_json_records(payload: str) -> int:
+    """
+    스트리밍 디코딩으로 전체 페이로드를 검증하면서 레코드 수 계산
+
+    기존 record_count 규칙과 동일하게 배열은 원소 수, 객체와 그 외 값은 1로 센다.
+    """
+    kind, _, _ = sniff_container(payload)
+    if kind == "[":
+        return sum(1 for _ in iter_json_array(payload))
+    if kind == "scalar":
+        _decode_scalar(payload)
+        return 1
+
+    for _ in iter_json_members(payload):
+        pass
+    return 1
+
+
+def write_json_passthrough(payload: str, target_path: Path) -> int:
+    """
+    원본 JSON 문자열을 재직렬화 없이 그대로 파일에 기록
+
+    Returns:
+        스트리밍 검증 중 계산된 레코드 수
+    """
+    record_count = count_json_records(payload)
+
+    with open(target_path, 'w', encoding='utf-8') as f:
+        f.write(payload)
+
+    logger.debug(f"Passthrough write: {target_path} ({record_count} records)")
+    return record_count
+
+
+def write_json_records(payload: str, target_path: Path) -> int:
+    """
+    레코드를 하나씩 디코딩하여 compact JSON으로 기록
+
+    Args:
+        payload: JSON 문자열
+        target_path: 출력 파일 경로
+
+    Returns:
+        기록된 레코드 수 (객체와 그 외 값은 1)
+    """
+    kind, _, _ = sniff_container(payload)
+    count = 0
+
+    if kind == "scalar":
+        value = _decode_scalar(payload)
+        with open(target_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(value, ensure_ascii=False, separators=(",", ":")))
+        return 1
+
+    with open(target_path, 'w', encoding='utf-8') as f:
+        if kind == "[":
+            f.write("[")
+            for item in iter_json_array(payload):
+                if count:
+                    f.write(",")
+                f.write(json.dumps(item, ensure_ascii=False, separators=(",", ":")))
+                count += 1
+            f.write("]")
+            return count
+
+        f.write("{")
+        for key, value in iter_json_members(payload):
+            if count:
+                f.write(",")
+            f.write(json.dumps(key, ensure_ascii=False))
+            f.write(":")
+            f.write(json.dumps(value, ensure_ascii=False, separators=(",", ":")))
+            count += 1
+        f.write("}")
+
+    return 1
+
@@ -2,12 +2,14 @@
 Manifest Parser
 YAML 메니페스트 파일 파싱 및 검증
 """
+import copy
 import logging
 import yaml
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 from ..exceptions import ManifestParsingError
+from .interchange import SUPPORTED_FORMATS
 
 logger = logging.getLogger("querygoal.manifest_parser")
 
@@ -15,6 +17,9 @@ logger = logging.getLogger("querygoal.manifest_parser")
 class ManifestParser:
     """YAML 메니페스트 파서"""
 
+    # 프로세스 전역 파싱 결과 캐시: 경로 -> (mtime, 메니페스트)
+    _cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
     async def parse_manifest(self, manifest_path: Path) -> Dict[str, Any]:
         """
         메니페스트 파일 파싱
@@ -29,6 +34,12 @@ class ManifestParser:
             if not manifest_path.exists():
                 raise ManifestParsingError(f"Manifest file not found: {manifest_path}")
 
+            # 파일이 바뀌지 않았으면 캐시된 파싱 결과 사용 (호출자 수정에 대비해 복사본 반환)
+            mtime = manifest_path.stat().st_mtime
+            cached = self._cache.get(str(manifest_path))
+            if cached is not None and cached[0] == mtime:
+                return copy.deepcopy(cached[1])
+
             with open(manifest_path, 'r', encoding='utf-8') as f:
                 manifest_data = yaml.safe_load(f)
 
@@ -49,7 +60,8 @@ class ManifestParser:
                 self._validate_data_source(source, idx)
 
             logger.info(f"Parsed manifest: {len(data_sources)} data sources")
-            return manifest_data
+            self._cache[str(manifest_path)] = (mtime, manifest_data)
+            return copy.deepcopy(manifest_data)
 
         except yaml.YAMLError as e:
             raise ManifestParsingError(f"YAML parsing error: {e}") from e
@@ -83,6 +95,14 @@ class ManifestParser:
 
         # 타입별 config 검증
         config = source["config"]
+
+        interchange_format = config.get("interchange_format")
+        if interchange_format is not None and interchange_format not in SUPPORTED_FORMATS:
+            raise ManifestParsingError(
+                f"Data source {index} has invalid interchange_format: {interchange_format}. "
+                f"Valid formats: {SUPPORTED_FORMATS}"
+            )
+
         if source_type == "aas_property":
             if "submodel_id" not in config or "property_path" not in config:
                 raise ManifestParsingError(
@@ -90,6 +110,14 @@ class ManifestParser:
                     "'submodel_id' and 'property_path' in config"
                 )
 
+            valid_binding_modes = ["passthrough", "stream", "parse"]
+            binding_mode = config.get("binding_mode")
+            if binding_mode is not None and binding_mode not in valid_binding_modes:
+                raise ManifestParsingError(
+                    f"Data source {index} has invalid binding_mode: {binding_mode}. "
+                    f"Valid modes: {valid_binding_modes}"
+                )
+
         elif source_type == "aas_shell_collection":
             if "combination_rules" not in config:
                 raise ManifestParsingError(
@@ -3,6 +3,7 @@ Work Directory Manager
 Goal별 독립적인 작업 디렉터리 관리
 """
 import logging
+import re
 import shutil
 from pathlib import Path
 from datetime import datetime
@@ -12,6 +13,9 @@ from ..exceptions import WorkDirectoryError
 
 logger = logging.getLogger("querygoal.work_directory")
 
+# 디렉터리 이름에 쓸 수 없는 문자 (경로 구분자 등은 '_'로 치환하여 기본 경로 밖으로 나가지 않도록)
+_UNSAFE_NAME_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
 
 class WorkDirectoryManager:
     """작업 디렉터리 관리자"""
@@ -46,7 +50,7 @@ class WorkDirectoryManager:
         try:
             # 타임스탬프 추가로 중복 방지
             timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            work_dir_name = f"{goal_id}_{timestamp}"
+            work_dir_name = f"{_UNSAFE_NAME_CHARS.sub('_', goal_id)}_{timestamp}"
             work_directory = self.base_directory / work_dir_name
 
             # 디렉터리 생성
@@ -64,6 +68,19 @@ class WorkDirectoryManager:
         except Exception as e:
             raise WorkDirectoryError(f"Failed to create work directory for {goal_id}: {e}") from e
 
+    def resolve_work_directory(self, work_directory_id: str) -> Path:
+        """
+        작업 디렉터리 ID(기본 경로 아래 디렉터리 이름) -> 경로
+
+        Raises:
+            WorkDirectoryError: 기본 경로 바로 아래의 기존 작업 디렉터리가 아닌 경우
+        """
+        base_directory = self.base_directory.resolve()
+        work_directory = (base_directory / work_directory_id).resolve()
+        if work_directory.parent != base_directory or not work_directory.is_dir():
+            raise WorkDirectoryError(f"Unknown work directory: {work_directory_id}")
+        return work_directory
+
     def cleanup_work_directory(self, work_directory: Path, force: bool = False):
         """
         작업 디렉터리 정리
@@ -0,0 +1,309 @@
+"""
+Goal3 NSGA-II Warm-start
+이전 실행의 최종 해(Pareto front / population / 최적 스케줄)를 시나리오 lineage별로 보관하고,
+다음 실행의 시나리오가 크게 바뀌지 않았으면 seed 파일로 시나리오 디렉터리에 배치
+
+- ScenarioSnapshot: 스테이징된 시나리오 파일 요약 (job별 operation, 머신 상태, 나머지 파일 digest)
+- diff_scenarios: 이전/현재 스냅샷 비교 -> warm-start 가능 여부 판단
+  (머신 구성이 바뀌면 해 인코딩이 달라지므로 불가, job 변경 비율이 max_job_change_ratio 이하면 가능)
+- WarmStartStore: lineage별 최신 스냅샷 + seed 보관, seed 파일 생성
+
+seed 파일(warm_start_seed.json)은 현재 시나리오에 없는 operation과 사용 불가 상태 머신 배정을 제외한다.
+"""
+import csv
+import hashlib
+import json
+import logging
+import os
+import shutil
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("querygoal.warm_start")
+
+SEED_FILE_NAME = "warm_start_seed.json"
+
+# 시뮬레이터가 최종 해를 남기는 파일 (있는 것만 보관)
+POPULATION_FILES = ["pareto_front.json", "final_population.json"]
+SCHEDULE_FILE = "operation_info.csv"
+
+# 해 인코딩에는 영향이 없고 목적함수 값만 바뀌는 시나리오 파일
+_DIGEST_FILES = ["operation_durations.json", "machine_transfer_time.json", "job_release.json"]
+
+_UNAVAILABLE_STATUSES = {"down", "offline", "maintenance", "error", "broken"}
+
+
+def _load_json(path: Path) -> Any:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _as_list(data: Any, key: str) -> List[Any]:
+    if isinstance(data, dict):
+        data = data.get(key)
+    return data if isinstance(data, list) else []
+
+
+def _digest(data: Any) -> Optional[str]:
+    if data is None:
+        return None
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def scenario_lineage(goal_type: str, image: str, parameters: Dict[str, Any]) -> str:
+    """
+    시나리오 lineage 키 (Goal 유형 + 시뮬레이터 이미지, QueryGoal 파라미터 scenarioLineage로 분리 가능)
+    """
+    parts = [goal_type or "", image or "", str(parameters.get("scenarioLineage", ""))]
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class ScenarioSnapshot:
+    """스테이징된 시나리오 디렉터리 요약"""
+    jobs: Dict[str, List[str]]
+    machines: Dict[str, str]
+    digests: Dict[str, Optional[str]]
+
+    @classmethod
+    def from_directory(cls, scenario_dir: Path) -> "ScenarioSnapshot":
+        jobs = {}
+        for job in _as_list(_load_json(scenario_dir / "jobs.json"), "jobs"):
+            if isinstance(job, dict) and job.get("job_id") is not None:
+                jobs[str(job["job_id"])] = [str(op) for op in job.get("operations", [])]
+
+        machines = {}
+        for machine in _as_list(_load_json(scenario_dir / "machines.json"), "machines"):
+            if isinstance(machine, dict) and machine.get("id") is not None:
+                machines[str(machine["id"])] = str(machine.get("status", "")).lower()
+
+        digests = {name: _digest(_load_json(scenario_dir / name)) for name in _DIGEST_FILES}
+        return cls(jobs=jobs, machines=machines, digests=digests)
+
+    def operations(self) -> List[str]:
+        return [op for ops in self.jobs.values() for op in ops]
+
+    def unavailable_machines(self) -> List[str]:
+        return [m for m, status in self.machines.items() if status in _UNAVAILABLE_STATUSES]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"jobs": self.jobs, "machines": self.machines, "digests": self.digests}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScenarioSnapshot":
+        return cls(jobs=data.get("jobs", {}), machines=data.get("machines", {}), digests=data.get("digests", {}))
+
+
+@dataclass
+class ScenarioDiff:
+    """이전 실행 대비 시나리오 변경 내역과 warm-start 가능 여부"""
+    added_jobs: List[str] = field(default_factory=list)
+    removed_jobs: List[str] = field(default_factory=list)
+    changed_jobs: List[str] = field(default_factory=list)
+    added_machines: List[str] = field(default_factory=list)
+    removed_machines: List[str] = field(default_factory=list)
+    machine_status_changes: Dict[str, List[str]] = field(default_factory=dict)
+    changed_files: List[str] = field(default_factory=list)
+    job_change_ratio: float = 0.0
+    valid: bool = True
+    reason: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "addedJobs": self.added_jobs,
+            "removedJobs": self.removed_jobs,
+            "changedJobs": self.changed_jobs,
+            "addedMachines": self.added_machines,
+            "removedMachines": self.removed_machines,
+            "machineStatusChanges": self.machine_status_changes,
+            "changedFiles": self.changed_files,
+            "jobChangeRatio": round(self.job_change_ratio, 4),
+            "valid": self.valid,
+            "reason": self.reason
+        }
+
+
+def diff_scenarios(previous: ScenarioSnapshot,
+                   current: ScenarioSnapshot,
+                   max_job_change_ratio: float = 0.2) -> ScenarioDiff:
+    """
+    시나리오 비교
+
+    warm-start 불가 조건:
+    - 머신 추가/삭제 (머신 배정 인코딩이 달라짐)
+    - 추가/삭제/변경된 job 비율이 max_job_change_ratio 초과
+    """
+    diff = ScenarioDiff(
+        added_jobs=sorted(set(current.jobs) - set(previous.jobs)),
+        removed_jobs=sorted(set(previous.jobs) - set(current.jobs)),
+        changed_jobs=sorted(job for job in set(current.jobs) & set(previous.jobs)
+                            if current.jobs[job] != previous.jobs[job]),
+        added_machines=sorted(set(current.machines) - set(previous.machines)),
+        removed_machines=sorted(set(previous.machines) - set(current.machines)),
+        machine_status_changes={
+            machine: [previous.machines[machine], status]
+            for machine, status in sorted(current.machines.items())
+            if machine in previous.machines and previous.machines[machine] != status
+        },
+        changed_files=[name for name in _DIGEST_FILES
+                       if current.digests.get(name) != previous.digests.get(name)]
+    )
+
+    changed = len(diff.added_jobs) + len(diff.removed_jobs) + len(diff.changed_jobs)
+    diff.job_change_ratio = changed / max(len(previous.jobs), 1)
+
+    if diff.added_machines or diff.removed_machines:
+        diff.valid = False
+        diff.reason = "machine set changed"
+    elif diff.job_change_ratio > max_job_change_ratio:
+        diff.valid = False
+        diff.reason = f"job change ratio {diff.job_change_ratio:.2f} > {max_job_change_ratio}"
+    else:
+        diff.reason = "unchanged" if not (changed or diff.machine_status_changes or diff.changed_files) else "incremental"
+    return diff
+
+
+def _read_schedule(path: Path) -> List[Dict[str, Any]]:
+    """operation_info.csv -> 시작 시각 순 operation 배정 목록 (완료 시간 기준 최적 해)"""
+    schedule = []
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                if not row.get("operation_id"):
+                    continue
+                try:
+                    start = float(row.get("input_timestamp") or 0)
+                except ValueError:
+                    start = 0.0
+                schedule.append({
+                    "operation_id": row["operation_id"],
+                    "job_id": row.get("job_id"),
+                    "machine": row.get("location"),
+                    "start": start
+                })
+    except OSError:
+        return []
+    schedule.sort(key=lambda entry: entry["start"])
+    return schedule
+
+
+def _filter_individual(individual: Any, operations: set, unavailable: set) -> Any:
+    """operation 배정 목록 형태의 개체만 현재 시나리오 기준으로 정리 (그 외 형태는 그대로 전달)"""
+    if not isinstance(individual, list):
+        return individual
+    kept = []
+    for gene in individual:
+        if isinstance(gene, dict) and "operation_id" in gene:
+            if gene["operation_id"] not in operations or gene.get("machine") in unavailable:
+                continue
+        kept.append(gene)
+    return kept
+
+
+class WarmStartStore:
+    """
+    lineage별 이전 실행 결과 저장소
+
+    <base_dir>/<lineage>/scenario.json: 마지막 실행 시나리오 스냅샷 + 실행 정보
+    <base_dir>/<lineage>/seed/: 마지막 실행 results/의 최종 해 파일
+    """
+
+    def __init__(self, base_dir: Path, max_job_change_ratio: float = 0.2):
+        self.base_dir = Path(base_dir)
+        self.max_job_change_ratio = max_job_change_ratio
+
+    def _lineage_dir(self, lineage: str) -> Path:
+        return self.base_dir / lineage
+
+    def prepare(self, lineage: str, scenario_dir: Path) -> Dict[str, Any]:
+        """
+        이전 실행과 비교해 warm-start가 가능하면 scenario_dir에 seed 파일 생성
+
+        Returns:
+            {"enabled": bool, "lineage", "reason", ["diff", "sourceExecution", "seedFile"]}
+        """
+        info: Dict[str, Any] = {"enabled": False, "lineage": lineage}
+        stored = _load_json(self._lineage_dir(lineage) / "scenario.json")
+        if not isinstance(stored, dict):
+            info["reason"] = "no previous run"
+            return info
+
+        current = ScenarioSnapshot.from_directory(scenario_dir)
+        diff = diff_scenarios(ScenarioSnapshot.from_dict(stored.get("snapshot", {})), current,
+                              self.max_job_change_ratio)
+        info.update({"diff": diff.to_dict(), "sourceExecution": stored.get("executionId"), "reason": diff.reason})
+        if not diff.valid:
+            logger.info(f"🧊 Warm-start skipped for lineage {lineage}: {diff.reason}")
+            return info
+
+        operations = set(current.operations())
+        unavailable = set(current.unavailable_machines())
+        seed_dir = self._lineage_dir(lineage) / "seed"
+
+        population = []
+        for name in POPULATION_FILES:
+            data = _load_json(seed_dir / name)
+            if isinstance(data, list):
+                population.extend(_filter_individual(individual, operations, unavailable) for individual in data)
+        schedule = _filter_individual(_read_schedule(seed_dir / SCHEDULE_FILE), operations, unavailable)
+
+        if not population and not schedule:
+            info["reason"] = "no reusable solutions in previous results"
+            return info
+
+        seed = {
+            "lineage": lineage,
+            "sourceExecution": stored.get("executionId"),
+            "createdAt": datetime.utcnow().isoformat(),
+            "diff": diff.to_dict(),
+            "population": population,
+            "schedule": schedule
+        }
+        seed_path = scenario_dir / SEED_FILE_NAME
+        with open(seed_path, 'w', encoding='utf-8') as f:
+            json.dump(seed, f, ensure_ascii=False)
+
+        info.update({"enabled": True, "seedFile": seed_path.name,
+                     "populationSize": len(population), "scheduleLength": len(schedule)})
+        logger.info(f"🔥 Warm-start seed from {stored.get('executionId')} "
+                    f"({diff.reason}, {len(population)} individuals, {len(schedule)} scheduled ops)")
+        return info
+
+    def save(self, lineage: str, scenario_dir: Path, results_dir: Path, execution_id: str) -> bool:
+        """성공한 실행의 시나리오 스냅샷과 최종 해 파일 보관 (보관할 해가 없으면 False)"""
+        result_files = [name for name in POPULATION_FILES + [SCHEDULE_FILE] if (results_dir / name).exists()]
+        if not result_files:
+            return False
+
+        lineage_dir = self._lineage_dir(lineage)
+        staging = lineage_dir.with_name(f".{lineage}.{execution_id}")
+        try:
+            (staging / "seed").mkdir(parents=True, exist_ok=True)
+            for name in result_files:
+                shutil.copy2(results_dir / name, staging / "seed" / name)
+            with open(staging / "scenario.json", 'w', encoding='utf-8') as f:
+                json.dump({
+                    "executionId": execution_id,
+                    "savedAt": datetime.utcnow().isoformat(),
+                    "snapshot": ScenarioSnapshot.from_directory(scenario_dir).to_dict()
+                }, f, ensure_ascii=False)
+
+            # 이전 실행 교체 (동시 실행 시 마지막으로 끝난 실행이 남음)
+            previous = lineage_dir.with_name(f".{lineage}.{execution_id}.old")
+            if lineage_dir.exists():
+                os.replace(lineage_dir, previous)
+            os.replace(staging, lineage_dir)
+            shutil.rmtree(previous, ignore_errors=True)
+        except OSError as e:
+            logger.warning(f"⚠️ Failed to store warm-start results for lineage {lineage}: {e}")
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+
+        logger.info(f"💾 Warm-start results stored for lineage {lineage}: {', '.join(result_files)}")
+        return True
@@ -0,0 +1,226 @@
+"""
+Runtime Warm-up Service
+API 시작 시 config/ 메니페스트 로드 및 Submodel prefetch, 접근 빈도 기반 백그라운드 갱신
+"""
+import asyncio
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set
+
+from .clients.aas_client import AASClient
+from .clients.resilience import is_stale
+from .clients.scheduler import set_request_priority
+from .utils.manifest_parser import ManifestParser
+from .exceptions import AASConnectionError
+
+logger = logging.getLogger("querygoal.warmup")
+
+CONFIG_DIR = Path(__file__).parent.parent.parent / "config"
+
+
+def collect_manifest_submodels(manifest: Dict[str, Any]) -> List[str]:
+    """메니페스트 data_sources에서 바인딩 시 실제로 조회하는 Submodel ID 목록 (등장 순서 유지, 중복 제거)"""
+    submodel_ids: List[str] = []
+
+    def add(submodel_id: Optional[str]):
+        if submodel_id and submodel_id not in submodel_ids:
+            submodel_ids.append(submodel_id)
+
+    for source in manifest.get("data_sources", []):
+        config = source.get("config", {})
+        add(config.get("submodel_id"))
+
+        machine_sources = config.get("machine_sources", [])
+        for machine_source in machine_sources:
+            add(machine_source.get("capability_submodel"))
+            add(machine_source.get("status_submodel"))
+
+        # combination_rules는 machine_sources가 없을 때만 바인딩에 사용됨
+        # (machine_sources와 함께 있는 규칙의 submodel_id는 머신별 ID의 접두사일 뿐 조회 가능한 ID가 아님)
+        if not machine_sources:
+            for rule in config.get("combination_rules", []):
+                add(rule.get("submodel_id"))
+
+    return submodel_ids
+
+
+class WarmupService:
+    """
+    Submodel warm cache 관리
+
+    1. config/*.yaml 중 data_sources를 가진 메니페스트를 파싱 (ManifestParser 캐시 적재)
+    2. 메니페스트에 명시된 Submodel을 동시에 prefetch (캐시에 고정)
+    3. refresh_interval마다 접근 빈도에 따라 캐시 항목 갱신
+
+    일부 Submodel만 prefetch된 경우(degraded) 메니페스트 Submodel 중 성공 비율이
+    min_ready_fraction 이상이어야 ready로 보고 (하나도 prefetch하지 못하면 not ready)
+    """
+
+    def __init__(self,
+                 config_dir: Optional[Path] = None,
+                 aas_client: Optional[AASClient] = None,
+                 refresh_interval: Optional[float] = None,
+                 min_ready_fraction: Optional[float] = None):
+        if refresh_interval is None:
+            from config import AAS_WARM_CACHE_REFRESH_SECONDS
+            refresh_interval = AAS_WARM_CACHE_REFRESH_SECONDS
+        if min_ready_fraction is None:
+            from config import AAS_WARMUP_MIN_READY_FRACTION
+            min_ready_fraction = AAS_WARMUP_MIN_READY_FRACTION
+
+        self.config_dir = Path(config_dir) if config_dir else CONFIG_DIR
+        self.aas_client = aas_client or AASClient()
+        self.manifest_parser = ManifestParser()
+        self.refresh_interval = refresh_interval
+        self.min_ready_fraction = min_ready_fraction
+
+        self.status = "cold"
+        self.manifests: List[str] = []
+        self.manifest_submodels: Set[str] = set()
+        self.prefetched: Set[str] = set()
+        self.pending: Set[str] = set()
+        self.refresh_count = 0
+        self.last_refresh: Optional[str] = None
+        self.started_at: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def prefetched_fraction(self) -> float:
+        """메니페스트 Submodel 중 prefetch에 성공한 비율 (대상이 없으면 1.0)"""
+        if not self.manifest_submodels:
+            return 1.0
+        return len(self.manifest_submodels & self.prefetched) / len(self.manifest_submodels)
+
+    @property
+    def ready(self) -> bool:
+        """초기 warm-up 완료 여부 (degraded는 성공 비율이 min_ready_fraction 이상일 때만)"""
+        if self.status == "ready":
+            return True
+        if self.status == "degraded":
+            fraction = self.prefetched_fraction
+            return fraction > 0 and fraction >= self.min_ready_fraction
+        return False
+
+    def start(self) -> asyncio.Task:
+        """현재 이벤트 루프에서 백그라운드 warm-up 시작"""
+        if self._task is None or self._task.done():
+            self.started_at = datetime.utcnow().isoformat()
+            self._task = asyncio.ensure_future(self._run())
+        return self._task
+
+    async def stop(self):
+        """백그라운드 갱신 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        # warm-up/갱신 요청은 사용자 요청보다 낮은 우선순위로 처리
+        set_request_priority("bulk")
+
+        await self.warm_up()
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"⚠️ Warm cache refresh failed: {e}")
+
+    async def warm_up(self):
+        """메니페스트 로드 및 Submodel prefetch"""
+        self.status = "warming"
+        submodel_ids: List[str] = []
+
+        for manifest_path in sorted(self.config_dir.glob("*.yaml")):
+            try:
+                manifest = await self.manifest_parser.parse_manifest(manifest_path)
+            except Exception as e:
+                logger.debug(f"Skipping {manifest_path.name}: {e}")
+                continue
+
+            self.manifests.append(manifest_path.name)
+            for submodel_id in collect_manifest_submodels(manifest):
+                if submodel_id not in submodel_ids:
+                    submodel_ids.append(submodel_id)
+
+        logger.info(f"🔥 Warming {len(submodel_ids)} submodels from {len(self.manifests)} manifests")
+
+        self.manifest_submodels = set(submodel_ids)
+        self.pending = set(submodel_ids)
+        await self._prefetch(submodel_ids)
+
+        self.status = "ready" if not self.pending else "degraded"
+        self.last_refresh = datetime.utcnow().isoformat()
+        logger.info(
+            f"✅ Warm-up {self.status}: {len(self.prefetched)} cached, {len(self.pending)} failed"
+        )
+
+    async def refresh(self):
+        """접근 빈도 기반 캐시 갱신 및 실패한 prefetch 재시도"""
+        cache = self.aas_client.submodel_cache
+        candidates = [
+            submodel_id
+            for server, submodel_id in cache.refresh_candidates(self.refresh_interval)
+            if server == self.aas_client.base_url
+        ]
+        candidates.extend(sorted(self.pending - set(candidates)))
+
+        if candidates:
+            await self._prefetch(candidates)
+            if self.status == "degraded" and not self.pending:
+                self.status = "ready"
+
+        self.refresh_count += 1
+        self.last_refresh = datetime.utcnow().isoformat()
+
+    async def _prefetch(self, submodel_ids: List[str]):
+        """Submodel 동시 조회 후 캐시 저장 (메니페스트 항목은 고정)"""
+
+        async def fetch(submodel_id: str):
+            try:
+                submodel_data = await self.aas_client.get_submodel(
+                    submodel_id, use_cache=False, pin=submodel_id in self.manifest_submodels
+                )
+                if is_stale(submodel_data):
+                    # 서버 장애로 받은 stale 응답은 prefetch 성공으로 보지 않음
+                    raise AASConnectionError(f"Server unavailable, got stale response for {submodel_id}")
+                self.prefetched.add(submodel_id)
+                self.pending.discard(submodel_id)
+            except Exception as e:
+                if submodel_id in self.manifest_submodels:
+                    self.pending.add(submodel_id)
+                logger.warning(f"⚠️ Prefetch failed for {submodel_id}: {e}")
+
+        await asyncio.gather(*(fetch(submodel_id) for submodel_id in submodel_ids))
+
+    def readiness(self) -> Dict[str, Any]:
+        """/ready 엔드포인트용 상태"""
+        return {
+            "ready": self.ready,
+            "status": self.status,
+            "startedAt": self.started_at,
+            "manifests": self.manifests,
+            "prefetchedSubmodels": len(self.prefetched),
+            "prefetchedFraction": round(self.prefetched_fraction, 3),
+            "minReadyFraction": self.min_ready_fraction,
+            "pendingSubmodels": sorted(self.pending),
+            "refreshCount": self.refresh_count,
+            "lastRefresh": self.last_refresh,
+            "cache": self.aas_client.submodel_cache.metrics()
+        }
+
+
+_warmup_service: Optional[WarmupService] = None
+
+
+def get_warmup_service() -> WarmupService:
+    """프로세스 전역 WarmupService"""
+    global _warmup_service
+    if _warmup_service is None:
+        _warmup_service = WarmupService()
+    return _warmup_service
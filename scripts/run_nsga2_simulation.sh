@@ -11,7 +11,36 @@ TIME_LIMIT=${TIME_LIMIT:-600}
 MAX_NODES=${MAX_NODES:-50000}
 
 SCENARIO_PATH="/app/scenarios/${SCENARIO_NAME}"
-RESULT_PATH="/app/results"
+RESULT_PATH=${RESULT_PATH:-"/app/results"}
+
+# 여러 시나리오를 컨테이너 한 번으로 실행 (파라미터 sweep: SCENARIO_NAMES=v000,v001,...)
+# 시나리오별로 이 스크립트를 다시 실행하며 결과는 /app/results/<시나리오>/ 에 기록
+# 시나리오 디렉터리의 simulation_params.env (KEY=value 줄)는 해당 시나리오 실행에만 export
+if [ -n "$SCENARIO_NAMES" ]; then
+    IFS=',' read -ra BATCH_SCENARIOS <<< "$SCENARIO_NAMES"
+    failed=0
+    for name in "${BATCH_SCENARIOS[@]}"; do
+        echo "▶️  Batch scenario: ${name}"
+        if ! (
+            params_file="/app/scenarios/${name}/simulation_params.env"
+            if [ -f "$params_file" ]; then
+                while IFS= read -r line || [ -n "$line" ]; do
+                    [ -n "$line" ] || continue
+                    export "$line" 2>/dev/null || echo "⚠️  Skipping invalid parameter: ${line%%=*}"
+                done < "$params_file"
+            fi
+            SCENARIO_NAMES= RESULT_PATH="/app/results/${name}" \
+                BEST_SO_FAR_PATH="/app/results/${name}/best_so_far.jsonl" \
+                WARM_START_SEED="/app/scenarios/${name}/warm_start_seed.json" \
+                "$0" "$name"
+        ); then
+            failed=$((failed + 1))
+            echo "⚠️  Scenario ${name} failed"
+        fi
+    done
+    echo "🏁 Batch completed: ${#BATCH_SCENARIOS[@]} scenarios, ${failed} failed"
+    exit 0
+fi
 
 echo "🚀 NSGA-II Simulator for Factory Automation Goal3"
 echo "================================================"
@@ -74,13 +103,26 @@ for file in "${REQUIRED_FILES[@]}"; do
 done
 
 # 추가 파일들도 복사 (있는 경우)
-for extra_file in "initial_machine_status.json" "simulation_inputs.json"; do
+for extra_file in "initial_machine_status.json" "simulation_inputs.json" "warm_start_seed.json"; do
     if [ -f "$SCENARIO_PATH/$extra_file" ]; then
         cp "$SCENARIO_PATH/$extra_file" "/app/nsga2-simulator/scenarios/${SCENARIO_NAME}/"
         echo "    📄 Copied optional file: $extra_file"
     fi
 done
 
+# 이전 실행 결과 seed (ContainerClient가 시나리오 변경이 작을 때만 배치)
+if [ -n "$WARM_START_SEED" ] && [ -f "$WARM_START_SEED" ]; then
+    export WARM_START_SEED="/app/nsga2-simulator/scenarios/${SCENARIO_NAME}/warm_start_seed.json"
+    echo "  🔥 Warm-start seed: $WARM_START_SEED"
+else
+    unset WARM_START_SEED
+fi
+
+# best-so-far 기록 경로 (시뮬레이터가 BEST_SO_FAR_INTERVAL초마다 현재 최선 해를 한 줄씩 append)
+export BEST_SO_FAR_PATH=${BEST_SO_FAR_PATH:-"$RESULT_PATH/best_so_far.jsonl"}
+export BEST_SO_FAR_INTERVAL=${BEST_SO_FAR_INTERVAL:-1}
+echo "  ⏱️  Best-so-far path: $BEST_SO_FAR_PATH (every ${BEST_SO_FAR_INTERVAL}s)"
+
 # 작업 디렉터리 변경
 cd /app/nsga2-simulator
 
@@ -98,6 +140,9 @@ python3 simulator/main.py --help 2>&1 | head -15
 echo "  📊 Simulator command: python3 simulator/main.py --scenario scenarios/${SCENARIO_NAME}"
 echo "  ⚠️  Note: NSGA branch only supports --scenario, --print_queues_interval, --print_job_summary_interval, --agv_count"
 
+# 이전 시나리오 결과가 남아 있지 않도록 정리 (배치 실행 시 같은 컨테이너에서 연속 실행)
+rm -f /app/nsga2-simulator/results/job_info.csv /app/nsga2-simulator/results/operation_info.csv
+
 # 시뮬레이션 시작 시간 기록
 START_TIME=$(date +%s)
 echo "  🕐 Start time: $(date)"
@@ -144,7 +189,7 @@ if [ -f "$JOB_INFO_FILE" ] && [ -f "$OPERATION_INFO_FILE" ]; then
     echo "📤 Results copied to: $RESULT_PATH/"
 
     # 추가 결과 파일들도 복사 (있는 경우)
-    extra_results=("trace.xlsx" "trace.csv" "agv_logs_M1.xlsx" "agv_logs_M2.xlsx" "agv_logs_M4.xlsx" "agv_logs_M5.xlsx" "agv_logs_M6.xlsx" "agv_logs_M7.xlsx" "agv_logs_M8.xlsx")
+    extra_results=("trace.xlsx" "trace.csv" "pareto_front.json" "final_population.json" "agv_logs_M1.xlsx" "agv_logs_M2.xlsx" "agv_logs_M4.xlsx" "agv_logs_M5.xlsx" "agv_logs_M6.xlsx" "agv_logs_M7.xlsx" "agv_logs_M8.xlsx")
     for extra_file in "${extra_results[@]}"; do
         if [ -f "$RESULT_DIR_SIMULATOR/$extra_file" ]; then
             cp "$RESULT_DIR_SIMULATOR/$extra_file" "$RESULT_PATH/"
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Action DAG Test
+ExecutionAgent의 DAG 실행(max_workers=1 / 스레드 풀) 결과가 순차 실행과 같은지 확인합니다.
+(AAS 서버/Kubernetes 없이 stub 핸들러로 실행, 액션 플랜은 온톨로지에서 조회)
+
+- 순차 실행 기준: 모든 앞선 액션 결과를 컨텍스트로 넘기는 기존 ExecutionAgent.run 방식
+- stub 핸들러는 실제 핸들러의 context_reads에 해당하는 컨텍스트 값만 결과에 반영
+- 앞선 액션일수록 오래 걸리도록 하여 스레드 풀에서 완료 순서가 시퀀스 순서와 달라지게 함
+"""
+import sys
+import time
+
+from execution_engine.action_dag import READS_ALL
+from execution_engine.agent import (
+    AASQueryHandler, AIModelHandler, DataFilteringHandler, EnhancedDockerRunHandler,
+    ExecutionAgent, SimulationInputHandler
+)
+from execution_engine.planner import ExecutionPlanner
+
+HANDLER_CLASSES = {
+    "aas_query": AASQueryHandler,
+    "aas_query_multiple": AASQueryHandler,
+    "internal_processing": SimulationInputHandler,
+    "docker_run": EnhancedDockerRunHandler,
+    "data_filtering": DataFilteringHandler,
+    "ai_model_inference": AIModelHandler,
+}
+
+GOALS = [
+    ("query_failed_jobs_with_cooling", {"goal": "query_failed_jobs_with_cooling", "date": "2025-07-17"}),
+    ("predict_first_completion_time", {"goal": "predict_first_completion_time", "product_id": "P1", "quantity": 30}),
+    ("track_product_position", {"goal": "track_product_position", "product_id": "P1"}),
+]
+
+FINAL_TYPES = ("data_filtering", "docker_run", "ai_model_inference")
+
+
+class StubHandler:
+    """실제 핸들러와 같은 context_reads로 읽은 값을 그대로 결과에 담는 핸들러"""
+
+    def __init__(self, handler_class, plan_length: int):
+        self.context_reads = getattr(handler_class, "context_reads", READS_ALL)
+        self.plan_length = plan_length
+
+    def execute(self, step: dict, context: dict) -> dict:
+        index = int(step["index"])
+        time.sleep(0.02 * (self.plan_length - index))
+
+        inputs = {
+            key: value for key, value in context.items()
+            if self.context_reads is READS_ALL or any(pattern in key for pattern in self.context_reads)
+        }
+        result = {"action": step["action_id"], "params": step["params"], "inputs": inputs}
+        if step["type"] in FINAL_TYPES:
+            return {"final_result": result}
+        return result
+
+
+def make_agent(plan: list, max_workers: int) -> ExecutionAgent:
+    handlers = {exec_type: StubHandler(cls, len(plan)) for exec_type, cls in HANDLER_CLASSES.items()}
+    return ExecutionAgent(max_workers=max_workers, handlers=handlers)
+
+
+def sequential_reference(agent: ExecutionAgent, plan: list, params: dict):
+    """기존 순차 실행 (각 액션이 앞선 모든 액션 결과를 받음)"""
+    context = {}
+    for index, step in enumerate(plan):
+        result = agent.handlers[step["type"]].execute({**step, "params": params}, context)
+        if result is not None:
+            context[f"step_{index + 1}_{step['action_id']}"] = result
+
+    final_result = {}
+    for step_result in context.values():
+        if "final_result" in step_result:
+            final_result = step_result
+    return context, (final_result if final_result else context)
+
+
+def run_action_dag_test() -> bool:
+    print("=" * 60)
+    print("🧪 Action DAG: sequential vs max_workers=1 vs thread pool")
+    print("=" * 60)
+
+    planner = ExecutionPlanner()
+    results = []
+
+    for goal, params in GOALS:
+        plan = [dict(step, index=index) for index, step in enumerate(planner.create_plan(goal))]
+        print(f"\n📋 {goal}: {[step['action_id'] for step in plan]}")
+
+        expected_context, expected_result = sequential_reference(make_agent(plan, 1), plan, params)
+
+        for max_workers in (1, 4):
+            agent = make_agent(plan, max_workers)
+            steps = [{**step, "params": params} for step in plan]
+            context, timings = agent.dag_executor.run(steps, agent._execute_step, agent._context_reads)
+            result = agent.run(plan, params)
+
+            same_context = context == expected_context and list(context) == list(expected_context)
+            same_result = result == expected_result
+            passed = same_context and same_result and "action_timings" not in result
+            results.append(passed)
+            print(f"  max_workers={max_workers}: context {'✅' if same_context else '❌'} "
+                  f"final_result {'✅' if same_result else '❌'} "
+                  f"(max start offset {max(t['startOffsetMs'] for t in timings):.0f} ms)")
+
+        if goal == "predict_first_completion_time":
+            # 독립적인 두 조회 액션이 실제로 동시에 실행되었는지 확인
+            _, timings = make_agent(plan, 4).run_with_timings(plan, params)
+            overlapped = timings[1]["startOffsetMs"] < timings[0]["durationMs"]
+            results.append(overlapped)
+            print(f"  {'✅' if overlapped else '❌'} {timings[0]['action_id']} / {timings[1]['action_id']} ran concurrently")
+
+    passed = all(results)
+    print("\n" + "=" * 60)
+    print("✅ Action DAG Test PASSED" if passed else "❌ Action DAG Test FAILED")
+    print("=" * 60)
+    return passed
+
+
+def test_action_dag():
+    assert run_action_dag_test()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_action_dag_test() else 1)
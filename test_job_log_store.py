@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Goal 1 Job Log Store Test
+JobLogStore.query_plan 결과가 FilterPlan.evaluate(클라이언트 필터)와 같은지 확인합니다.
+(API 서버/AAS 서버 없이 실행)
+
+- 리스트 / 문자열 / 누락된 process_steps
+- 원문이 그대로인 경우(unchanged), 뒤에 job이 추가된 경우(appended), 기존 job이 바뀐 경우(rebuilt)
+"""
+import json
+import sys
+
+from execution_engine.filter_plan import compile_filter_plan
+from execution_engine.job_log_store import JobLogStore
+
+DATES = ["2025-07-17", "2025-07-18"]
+
+BASE_JOBS = [
+    {"job_id": "J1", "date": "2025-07-17", "status": "FAILED", "process_steps": ["heating", "cooling"]},
+    {"job_id": "J2", "date": "2025-07-17", "status": "COMPLETED", "process_steps": ["cooling"]},
+    {"job_id": "J3", "date": "2025-07-17", "status": "FAILED", "process_steps": ["heating"]},
+    # 문자열 process_steps: 기존 필터('cooling' in process_steps)는 부분 문자열로 일치
+    {"job_id": "J4", "date": "2025-07-17", "status": "FAILED", "process_steps": "heating,cooling"},
+    {"job_id": "J5", "date": "2025-07-17", "status": "FAILED", "process_steps": "pre-cooling"},
+    {"job_id": "J6", "date": "2025-07-17", "status": "FAILED"},
+    {"job_id": "J7", "date": "2025-07-18", "status": "FAILED", "process_steps": ["cooling"]},
+]
+
+APPENDED_JOBS = [
+    {"job_id": "J8", "date": "2025-07-17", "status": "FAILED", "process_steps": ["cooling", "cooling"]},
+    {"job_id": "J9", "date": "2025-07-18", "status": "FAILED", "process_steps": "cooling"},
+]
+
+
+def check(store: JobLogStore, jobs, expected_refresh: str, raw_log: str) -> bool:
+    outcome = store.refresh(raw_log)
+    passed = outcome == expected_refresh
+    print(f"  refresh: {outcome} (expected {expected_refresh}) {'✅' if passed else '❌'}")
+
+    for date in DATES:
+        plan = compile_filter_plan("query_failed_jobs_with_cooling", {"date": date})
+        indexed = [job["job_id"] for job in store.query_plan(plan)]
+        evaluated = [job["job_id"] for job in plan.evaluate(jobs)]
+        same = indexed == evaluated
+        passed = passed and same
+        print(f"  {date}: index={indexed} evaluate={evaluated} {'✅' if same else '❌'}")
+
+    return passed
+
+
+def run_job_log_store_test() -> bool:
+    print("=" * 60)
+    print("🧪 Goal 1: JobLogStore.query_plan vs FilterPlan.evaluate")
+    print("=" * 60)
+
+    store = JobLogStore(":memory:")
+    jobs = list(BASE_JOBS)
+    raw_log = json.dumps(jobs, indent=2)
+    results = []
+
+    print("\n📥 Initial load")
+    results.append(check(store, jobs, "rebuilt", raw_log))
+
+    print("\n🔁 Same log again")
+    results.append(check(store, jobs, "unchanged", raw_log))
+
+    print("\n➕ Jobs appended")
+    jobs = jobs + APPENDED_JOBS
+    raw_log = raw_log.rstrip()[:-1].rstrip() + ",\n" + ",\n".join(json.dumps(job) for job in APPENDED_JOBS) + "\n]"
+    results.append(check(store, jobs, "appended", raw_log))
+
+    print("\n✏️ Existing job changed")
+    jobs = [dict(job, status="COMPLETED") if job["job_id"] == "J1" else job for job in jobs]
+    raw_log = json.dumps(jobs)
+    results.append(check(store, jobs, "rebuilt", raw_log))
+
+    store.close()
+    passed = all(results)
+    print("\n" + "=" * 60)
+    print("✅ JobLogStore Test PASSED" if passed else "❌ JobLogStore Test FAILED")
+    print("=" * 60)
+    return passed
+
+
+def test_job_log_store():
+    assert run_job_log_store_test()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_job_log_store_test() else 1)
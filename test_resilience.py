@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+AAS Resilience Test
+ResilientRequester가 반복되는 HTTP 500 응답에서 서킷을 열고 마지막 성공 응답(stale)으로 대체하는지 확인합니다.
+(AAS 서버 없이 실행)
+
+- 500은 재시도 대상이며 서킷 브레이커에 실패로 기록
+- 404(4xx)는 재시도하지 않고 서버 정상 응답으로 기록
+- 서킷이 열린 뒤에는 요청을 보내지 않고 캐시 값을 stale 표시와 함께 반환
+"""
+import asyncio
+import sys
+
+import httpx
+
+from querygoal.runtime.clients.resilience import CircuitBreaker, ResilientRequester, RetryPolicy, is_stale
+
+URL = "http://aas.test/submodels/dXJuOnRlc3Q"
+
+
+def respond(status_code: int, calls: list):
+    async def send() -> httpx.Response:
+        calls.append(status_code)
+        return httpx.Response(status_code, json={"value": "ok"}, request=httpx.Request("GET", URL))
+    return send
+
+
+async def run_checks() -> bool:
+    requester = ResilientRequester(
+        retry_policy=RetryPolicy(max_attempts=2, base_delay=0, max_delay=0),
+        circuit_breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60),
+        hedge_enabled=False
+    )
+    breaker = requester.circuit_breaker
+    results = []
+
+    def check(name: str, passed: bool, detail: str = ""):
+        print(f"  {'✅' if passed else '❌'} {name} {detail}")
+        results.append(passed)
+
+    print("\n📥 Successful response (cached for fallback)")
+    calls = []
+    value = await requester.get_json(respond(200, calls), URL)
+    check("fresh value", value == {"value": "ok"} and not is_stale(value), str(value))
+
+    print("\n🔎 404 is not retried and keeps the circuit closed")
+    calls = []
+    try:
+        await requester.get_json(respond(404, calls), URL + "x")
+        check("404 raised", False)
+    except httpx.HTTPStatusError:
+        check("404 raised", True)
+    check("single attempt", calls == [404], str(calls))
+    check("circuit closed", breaker.state == "closed" and breaker.consecutive_failures == 0, breaker.state)
+
+    print("\n💥 Repeated 500 responses")
+    calls = []
+    value = await requester.get_json(respond(500, calls), URL)
+    check("500 retried", calls == [500, 500], str(calls))
+    check("stale fallback", is_stale(value), str(value))
+
+    calls = []
+    value = await requester.get_json(respond(500, calls), URL)
+    check("circuit open after 3 failures", breaker.state == "open", f"{breaker.state} ({breaker.consecutive_failures} failures)")
+    check("stale fallback", is_stale(value))
+
+    print("\n🔌 Circuit open: no request sent")
+    calls = []
+    value = await requester.get_json(respond(500, calls), URL)
+    check("no request", calls == [], str(calls))
+    check("stale fallback", is_stale(value) and value["value"] == "ok", str(value))
+
+    return all(results)
+
+
+def run_resilience_test() -> bool:
+    print("=" * 60)
+    print("🧪 AAS Resilience: HTTP 500 -> circuit open -> stale cache")
+    print("=" * 60)
+
+    passed = asyncio.run(run_checks())
+    print("\n" + "=" * 60)
+    print("✅ Resilience Test PASSED" if passed else "❌ Resilience Test FAILED")
+    print("=" * 60)
+    return passed
+
+
+def test_resilience():
+    assert run_resilience_test()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_resilience_test() else 1)